@@ -83,7 +83,7 @@ from .connection_pool import (
     create_firs_connection_pool
 )
 
-from .party_cache import PartyCache, TINCache
+from .party_cache import PartyCache, TINCache, SingleFlightTTLCache
 from .certificate_provider import FIRSCertificateProvider
 
 __all__ = [
@@ -140,6 +140,7 @@ __all__ = [
     # Cache helpers
     'PartyCache',
     'TINCache',
+    'SingleFlightTTLCache',
 
     # Certificate helpers
     'FIRSCertificateProvider',
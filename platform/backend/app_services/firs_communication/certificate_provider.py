@@ -52,6 +52,7 @@ class FIRSCertificateProvider:
 
         self._cache_lock = threading.Lock()
         self._cache: Dict[Tuple[Optional[str], Optional[str]], _CacheEntry] = {}
+        self._generation = 0
 
     # ------------------------------------------------------------------
     # Public API
@@ -79,6 +80,11 @@ class FIRSCertificateProvider:
         self._set_cached(cache_key, certificate)
         return certificate
 
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every refresh; lets callers drop values derived from a rotated certificate."""
+        return self._generation
+
     def refresh(
         self,
         organization_id: Optional[str] = None,
@@ -90,6 +96,7 @@ class FIRSCertificateProvider:
         with self._cache_lock:
             if cache_key in self._cache:
                 del self._cache[cache_key]
+            self._generation += 1
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -217,8 +217,6 @@ class FIRSAPIClient:
         # Cache layers for repeated lookups
         self.party_cache = party_cache or PartyCache()
         self.tin_cache = tin_cache or TINCache()
-        self._party_refresh_tasks: Dict[str, asyncio.Task] = {}
-        self._tin_refresh_tasks: Dict[str, asyncio.Task] = {}
     
     async def start(self) -> None:
         """Start the FIRS API client"""
@@ -276,13 +274,9 @@ class FIRSAPIClient:
                 await self.session.close()
                 self.session = None
 
-            for task in list(self._party_refresh_tasks.values()):
-                task.cancel()
-            self._party_refresh_tasks.clear()
-
-            for task in list(self._tin_refresh_tasks.values()):
-                task.cancel()
-            self._tin_refresh_tasks.clear()
+            for cache in (self.party_cache, self.tin_cache):
+                if hasattr(cache, "cancel_refreshes"):
+                    cache.cancel_refreshes()
 
             if self.auth_handler and hasattr(self.auth_handler, "stop"):
                 try:
@@ -628,102 +622,47 @@ class FIRSAPIClient:
         return response
 
     async def get_party(self, party_id: str) -> FIRSResponse:
-        """Fetch a party record from FIRS with caching and background revalidation."""
-
-        cached = await self.party_cache.get(party_id, allow_stale=True)
-        if cached:
-            is_fresh = await self.party_cache.is_fresh(party_id)
-            logger.debug("Party cache hit for %s (fresh=%s)", party_id, is_fresh)
-            if not is_fresh:
-                self._schedule_party_refresh(party_id)
-            return cached
+        """Fetch a party record from FIRS with caching and background revalidation.
 
-        return await self._load_party(party_id)
+        Concurrent lookups of the same party share one FIRS call; expired
+        entries are served while a single background refresh runs.
+        """
+        return await self.party_cache.get_or_load(
+            party_id,
+            lambda: self._fetch_party(party_id),
+            should_cache=lambda response: response.success,
+        )
 
-    async def _load_party(self, party_id: str) -> FIRSResponse:
+    async def _fetch_party(self, party_id: str) -> FIRSResponse:
         endpoint = FIRSEndpoint.INVOICE_PARTY_DETAIL.value.format(party_id=party_id)
-        response = await self.make_request(
+        return await self.make_request(
             endpoint=endpoint,
             method="GET",
         )
-        if response.success:
-            await self.party_cache.set(party_id, response)
-        return response
-
-    def _schedule_party_refresh(self, party_id: str) -> None:
-        task = self._party_refresh_tasks.get(party_id)
-        if task and not task.done():
-            return
-
-        async def _runner():
-            try:
-                await self._load_party(party_id)
-            except Exception as exc:  # pragma: no cover - background refresh should not raise
-                logger.debug("Party cache refresh failed for %s: %s", party_id, exc)
-            finally:
-                self._party_refresh_tasks.pop(party_id, None)
-
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:  # pragma: no cover - typically shouldn't happen inside async context
-            return
-
-        self._party_refresh_tasks[party_id] = loop.create_task(_runner())
 
     async def verify_tin(self, payload: Dict[str, Any]) -> FIRSResponse:
         """Verify a taxpayer identification number with caching and revalidation."""
         tin_value = payload.get("tin") or payload.get("TIN")
         tin = str(tin_value).strip() if tin_value else None
         branch = payload.get("branchCode") or payload.get("branch_code")
+        request_payload = dict(payload)
 
         if tin:
-            cached = await self.tin_cache.get(tin, extra=branch, allow_stale=True)
-            if cached:
-                is_fresh = await self.tin_cache.is_fresh(tin, extra=branch)
-                logger.debug("TIN cache hit for %s (fresh=%s)", tin, is_fresh)
-                if not is_fresh:
-                    self._schedule_tin_refresh(tin, dict(payload), branch)
-                return cached
+            return await self.tin_cache.get_or_load(
+                tin,
+                lambda: self._fetch_tin_verification(request_payload),
+                extra=branch,
+                should_cache=lambda response: response.success,
+            )
 
-        return await self._load_tin_verification(dict(payload), tin, branch)
+        return await self._fetch_tin_verification(request_payload)
 
-    async def _load_tin_verification(self, payload: Dict[str, Any], tin: Optional[str], branch: Optional[str]) -> FIRSResponse:
-        response = await self.make_request(
+    async def _fetch_tin_verification(self, payload: Dict[str, Any]) -> FIRSResponse:
+        return await self.make_request(
             endpoint=FIRSEndpoint.UTILITIES_VERIFY_TIN,
             method="POST",
             data=payload,
         )
-        if tin:
-            if response.success:
-                await self.tin_cache.set(tin, response, extra=branch)
-            else:
-                await self.tin_cache.invalidate(tin, extra=branch)
-        return response
-
-    def _tin_refresh_key(self, tin: str, branch: Optional[str]) -> str:
-        branch_component = (branch or "").strip().upper()
-        return f"{tin.strip().upper()}::{branch_component}"
-
-    def _schedule_tin_refresh(self, tin: str, payload: Dict[str, Any], branch: Optional[str]) -> None:
-        key = self._tin_refresh_key(tin, branch)
-        task = self._tin_refresh_tasks.get(key)
-        if task and not task.done():
-            return
-
-        async def _runner():
-            try:
-                await self._load_tin_verification(payload, tin, branch)
-            except Exception as exc:  # pragma: no cover - background refresh
-                logger.debug("TIN cache refresh failed for %s: %s", tin, exc)
-            finally:
-                self._tin_refresh_tasks.pop(key, None)
-
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:  # pragma: no cover
-            return
-
-        self._tin_refresh_tasks[key] = loop.create_task(_runner())
 
     async def get_resources(self, resource: str) -> FIRSResponse:
         """Fetch resource metadata (currencies, invoice types, etc.)."""
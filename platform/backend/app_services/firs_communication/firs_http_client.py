@@ -15,12 +15,21 @@ Scope:
 Notes:
 - Network host, creds and certificate are read from env.
 - Errors are returned as dicts with {success, status_code, data|error}.
+- Connections are pooled per host with keep-alive and a DNS cache
+  (FIRS_HTTP_* env vars, see FIRSHttpPoolSettings).
+- The static header block (credentials + certificate) is cached and rebuilt
+  when the certificate provider rotates or the cache ages out.
+- Read-only GETs can be hedged: if no response arrives within
+  FIRS_HTTP_HEDGE_AFTER_MS, one duplicate request is sent and the first
+  usable response wins.
 """
+import asyncio
 import os
 import time
 import uuid
 import logging
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
 
 import aiohttp
 
@@ -30,6 +39,40 @@ from .certificate_provider import FIRSCertificateProvider
 logger = logging.getLogger(__name__)
 
 
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class FIRSHttpPoolSettings:
+    """Connection pool, timeout and hedging settings for FIRSHttpClient."""
+
+    limit: int = 100
+    limit_per_host: int = 20
+    keepalive_timeout: float = 30.0
+    dns_ttl_seconds: int = 300
+    total_timeout: float = 30.0
+    connect_timeout: float = 10.0
+    header_cache_seconds: float = 60.0
+    hedge_after_ms: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "FIRSHttpPoolSettings":
+        return cls(
+            limit=int(_env_float("FIRS_HTTP_POOL_LIMIT", cls.limit)),
+            limit_per_host=int(_env_float("FIRS_HTTP_POOL_LIMIT_PER_HOST", cls.limit_per_host)),
+            keepalive_timeout=_env_float("FIRS_HTTP_KEEPALIVE_SECONDS", cls.keepalive_timeout),
+            dns_ttl_seconds=int(_env_float("FIRS_HTTP_DNS_TTL_SECONDS", cls.dns_ttl_seconds)),
+            total_timeout=_env_float("FIRS_HTTP_TIMEOUT_SECONDS", cls.total_timeout),
+            connect_timeout=_env_float("FIRS_HTTP_CONNECT_TIMEOUT_SECONDS", cls.connect_timeout),
+            header_cache_seconds=_env_float("FIRS_HTTP_HEADER_CACHE_SECONDS", cls.header_cache_seconds),
+            hedge_after_ms=_env_float("FIRS_HTTP_HEDGE_AFTER_MS", cls.hedge_after_ms),
+        )
+
+
 class FIRSHttpClient:
     """Thin async HTTP client for FIRS APIs (header-based auth)."""
 
@@ -38,30 +81,67 @@ class FIRSHttpClient:
         base_url: Optional[str] = None,
         *,
         certificate_provider: Optional[FIRSCertificateProvider] = None,
+        pool_settings: Optional[FIRSHttpPoolSettings] = None,
     ):
         self.base_url = (base_url or os.getenv("FIRS_API_URL") or "").rstrip("/")
         self.api_key = os.getenv("FIRS_API_KEY", "")
         self.api_secret = os.getenv("FIRS_API_SECRET", "")
         self._certificate_provider = certificate_provider or FIRSCertificateProvider()
+        self.pool_settings = pool_settings or FIRSHttpPoolSettings.from_env()
         self._session: Optional[aiohttp.ClientSession] = None
+        # (static headers, provider generation, built at)
+        self._static_headers: Optional[Tuple[Dict[str, str], int, float]] = None
+        self._metrics: Dict[str, int] = {
+            "requests": 0,
+            "header_builds": 0,
+            "hedged_requests": 0,
+            "hedge_wins": 0,
+        }
 
     async def start(self):
         if not self._session:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            settings = self.pool_settings
+            connector = aiohttp.TCPConnector(
+                limit=settings.limit,
+                limit_per_host=settings.limit_per_host,
+                keepalive_timeout=settings.keepalive_timeout,
+                ttl_dns_cache=settings.dns_ttl_seconds,
+                use_dns_cache=settings.dns_ttl_seconds > 0,
+            )
+            timeout = aiohttp.ClientTimeout(total=settings.total_timeout, connect=settings.connect_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
 
     async def stop(self):
         if self._session:
             await self._session.close()
             self._session = None
 
-    def _headers(self) -> Dict[str, str]:
+    def invalidate_headers(self) -> None:
+        """Drop the cached header block (e.g. after rotating API credentials)."""
+        self._static_headers = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Request, header cache and hedging counters."""
+        requests = self._metrics["requests"]
+        return {
+            **self._metrics,
+            "hedge_rate": self._metrics["hedged_requests"] / requests if requests else 0.0,
+        }
+
+    def _base_headers(self) -> Dict[str, str]:
+        generation = getattr(self._certificate_provider, "generation", 0)
+        cached = self._static_headers
+        if (
+            cached is not None
+            and cached[1] == generation
+            and time.monotonic() - cached[2] < self.pool_settings.header_cache_seconds
+        ):
+            return cached[0]
+
         headers = {
             "accept": "application/json",
             "x-api-key": self.api_key,
             "x-api-secret": self.api_secret,
-            "x-timestamp": str(int(time.time())),
-            "x-request-id": str(uuid.uuid4()),
             "Content-Type": "application/json"
         }
 
@@ -69,29 +149,80 @@ class FIRSHttpClient:
         if certificate:
             headers["x-certificate"] = certificate
 
+        self._metrics["header_builds"] += 1
+        self._static_headers = (headers, generation, time.monotonic())
         return headers
 
-    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def _headers(self) -> Dict[str, str]:
+        headers = dict(self._base_headers())
+        headers["x-timestamp"] = str(int(time.time()))
+        headers["x-request-id"] = str(uuid.uuid4())
+        return headers
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        payload: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        success_statuses: Tuple[int, ...] = (200,),
+    ) -> Dict[str, Any]:
         url = f"{self.base_url}{path}"
         try:
             await self.start()
-            async with self._session.post(url, json=payload, headers=self._headers()) as resp:
+            async with self._session.request(
+                method, url, json=payload, headers=headers or self._headers()
+            ) as resp:
                 data = await _safe_json(resp)
-                return {"success": resp.status == 200, "status_code": resp.status, "data": data}
+                return {"success": resp.status in success_statuses, "status_code": resp.status, "data": data}
         except Exception as e:
-            logger.error(f"FIRS POST {path} failed: {e}")
+            logger.error(f"FIRS {method} {path} failed: {e}")
             return {"success": False, "status_code": 0, "error": str(e)}
 
-    async def _get(self, path: str) -> Dict[str, Any]:
-        url = f"{self.base_url}{path}"
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self._metrics["requests"] += 1
+        return await self._request("POST", path, payload=payload)
+
+    async def _get(self, path: str, *, hedge: bool = False) -> Dict[str, Any]:
+        self._metrics["requests"] += 1
+        if hedge and self.pool_settings.hedge_after_ms > 0:
+            return await self._hedged_get(path)
+        return await self._request("GET", path)
+
+    async def _hedged_get(self, path: str) -> Dict[str, Any]:
+        """GET with one duplicate sent after hedge_after_ms; first usable response wins.
+
+        Only for idempotent reads. Both attempts carry the same request ID so
+        FIRS-side logs show them as one logical request.
+        """
+        headers = self._headers()
+        primary = asyncio.ensure_future(self._request("GET", path, headers=headers))
+        pending = {primary}
+        result: Dict[str, Any] = {}
         try:
-            await self.start()
-            async with self._session.get(url, headers=self._headers()) as resp:
-                data = await _safe_json(resp)
-                return {"success": resp.status == 200, "status_code": resp.status, "data": data}
-        except Exception as e:
-            logger.error(f"FIRS GET {path} failed: {e}")
-            return {"success": False, "status_code": 0, "error": str(e)}
+            # Inside the try so a caller cancelled during the hedge delay
+            # does not leave the primary request running
+            done, pending = await asyncio.wait(pending, timeout=self.pool_settings.hedge_after_ms / 1000.0)
+            if done:
+                return primary.result()
+
+            self._metrics["hedged_requests"] += 1
+            hedge = asyncio.ensure_future(self._request("GET", path, headers=headers))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    # Transport errors and 5xx may still be beaten by the other attempt
+                    if result.get("status_code", 0) and result["status_code"] < 500:
+                        if task is hedge:
+                            self._metrics["hedge_wins"] += 1
+                        return result
+            return result
+        finally:
+            for task in pending:
+                task.cancel()
 
     # Public API
     async def validate_invoice(self, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -104,11 +235,11 @@ class FIRSHttpClient:
         return await self._post("/api/v1/invoice/party", payload)
 
     async def get_party(self, party_id: str) -> Dict[str, Any]:
-        return await self._get(f"/api/v1/invoice/party/{party_id}")
+        return await self._get(f"/api/v1/invoice/party/{party_id}", hedge=True)
 
     async def get_resource(self, resource: str) -> Dict[str, Any]:
         # resource: currencies | invoice-types | services-codes | vat-exemptions
-        return await self._get(f"/api/v1/invoice/resources/{resource}")
+        return await self._get(f"/api/v1/invoice/resources/{resource}", hedge=True)
 
     async def verify_tin(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return await self._post("/api/v1/utilities/verify-tin/", payload)
@@ -128,21 +259,14 @@ class FIRSHttpClient:
         return await self._get(f"/api/v1/invoice/confirm/{irn}")
 
     async def _patch(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        url = f"{self.base_url}{path}"
-        try:
-            await self.start()
-            async with self._session.patch(url, json=payload, headers=self._headers()) as resp:
-                data = await _safe_json(resp)
-                return {"success": resp.status in (200, 204), "status_code": resp.status, "data": data}
-        except Exception as e:
-            logger.error(f"FIRS PATCH {path} failed: {e}")
-            return {"success": False, "status_code": 0, "error": str(e)}
+        self._metrics["requests"] += 1
+        return await self._request("PATCH", path, payload=payload, success_statuses=(200, 204))
 
     async def download_invoice(self, irn: str) -> Dict[str, Any]:
-        return await self._get(f"/api/v1/invoice/download/{irn}")
+        return await self._get(f"/api/v1/invoice/download/{irn}", hedge=True)
 
     async def search_invoice(self, business_id: str) -> Dict[str, Any]:
-        return await self._get(f"/api/v1/invoice/{business_id}")
+        return await self._get(f"/api/v1/invoice/{business_id}", hedge=True)
 
     async def update_invoice(self, irn: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         return await self._patch(f"/api/v1/invoice/update/{irn}", payload)
@@ -159,13 +283,13 @@ class FIRSHttpClient:
         return await self._patch(f"/api/v1/invoice/transmit/{irn}", payload or {})
 
     async def lookup_transmit_by_irn(self, irn: str) -> Dict[str, Any]:
-        return await self._get(f"/api/v1/invoice/transmit/lookup/{irn}")
+        return await self._get(f"/api/v1/invoice/transmit/lookup/{irn}", hedge=True)
 
     async def lookup_transmit_by_tin(self, party_id: str) -> Dict[str, Any]:
-        return await self._get(f"/api/v1/invoice/transmit/lookup/tin/{party_id}")
+        return await self._get(f"/api/v1/invoice/transmit/lookup/tin/{party_id}", hedge=True)
 
     async def lookup_transmit_by_party(self, party_id: str) -> Dict[str, Any]:
-        return await self._get(f"/api/v1/invoice/transmit/lookup/party/{party_id}")
+        return await self._get(f"/api/v1/invoice/transmit/lookup/party/{party_id}", hedge=True)
 
     async def transmit_self_health(self) -> Dict[str, Any]:
         return await self._get("/api/v1/invoice/transmit/self-health-check")
@@ -1,10 +1,26 @@
-"""Caching helpers for FIRS party lookups and TIN verification."""
+"""Caching helpers for FIRS party lookups and TIN verification.
+
+Both caches are bounded LRU maps with TTL expiry and share a single-flight
+loader: concurrent misses for the same key wait on one FIRS call, expired
+entries are served while one background refresh runs (stale-while-revalidate),
+and fresh entries are refreshed shortly before expiry at a jittered time so
+popular keys do not all expire together. A coalesced load runs as its own
+task, so a cancelled caller does not cancel it for the others waiting on it.
+"""
 from __future__ import annotations
 
 import asyncio
+import logging
+import random
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+Clock = Callable[[], float]
 
 
 def _seconds_from_minutes(minutes: float) -> float:
@@ -17,60 +33,296 @@ class CacheEntry:
     expires_at: float
     etag: Optional[str] = None
     last_modified: Optional[float] = None
+    refresh_at: Optional[float] = None
 
-    def is_fresh(self) -> bool:
-        return time.time() < self.expires_at
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) < self.expires_at
 
+    def needs_refresh(self, now: Optional[float] = None) -> bool:
+        return self.refresh_at is not None and (time.time() if now is None else now) >= self.refresh_at
 
-class PartyCache:
-    """TTL cache for party lookups keyed by party ID."""
 
-    def __init__(self, ttl_minutes: float = 30.0):
-        self.ttl_seconds = _seconds_from_minutes(ttl_minutes)
-        self._entries: Dict[str, CacheEntry] = {}
+class SingleFlightTTLCache:
+    """
+    Bounded LRU TTL cache with single-flight loading and stale-while-revalidate.
+
+    Args:
+        ttl_seconds: Freshness lifetime of an entry
+        max_entries: LRU bound (least recently used entries are evicted)
+        max_stale_seconds: How long past expiry an entry may still be served
+            while it is revalidated (None = until replaced or evicted)
+        refresh_ahead_ratio: Fraction of the TTL before expiry at which a
+            background refresh is started for entries that are still read
+        refresh_jitter_ratio: Random spread (fraction of TTL) applied to the
+            refresh-ahead point
+        clock: Wall-clock source for expiry (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        *,
+        max_entries: int = 10000,
+        max_stale_seconds: Optional[float] = None,
+        refresh_ahead_ratio: float = 0.1,
+        refresh_jitter_ratio: float = 0.1,
+        clock: Clock = time.time,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_stale_seconds = max_stale_seconds
+        self.refresh_ahead_ratio = refresh_ahead_ratio
+        self.refresh_jitter_ratio = refresh_jitter_ratio
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self._lock = asyncio.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self._refreshing: Set[str] = set()
+        self._metrics: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "stale_serves": 0,
+            "coalesced": 0,
+            "loads": 0,
+            "load_errors": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+        }
 
-    async def get(self, party_id: str, *, allow_stale: bool = False) -> Optional[Any]:
+    # -- entry helpers -------------------------------------------------
+
+    def _new_entry(self, payload: Any, ttl: float) -> CacheEntry:
+        now = self._clock()
+        refresh_at = None
+        if self.refresh_ahead_ratio > 0 and ttl > 0:
+            lead = ttl * self.refresh_ahead_ratio + random.uniform(0.0, ttl * self.refresh_jitter_ratio)
+            refresh_at = now + max(0.0, ttl - lead)
+        return CacheEntry(data=payload, expires_at=now + ttl, refresh_at=refresh_at)
+
+    def _servable_stale(self, entry: CacheEntry) -> bool:
+        if self.max_stale_seconds is None:
+            return True
+        return self._clock() < entry.expires_at + self.max_stale_seconds
+
+    async def _get_entry(self, key: str, *, allow_stale: bool) -> Optional[Any]:
         async with self._lock:
-            entry = self._entries.get(party_id)
+            entry = self._entries.get(key)
             if not entry:
                 return None
-            if entry.is_fresh():
-                return entry.data
-            if allow_stale:
+            if entry.is_fresh(self._clock()) or (allow_stale and self._servable_stale(entry)):
+                self._entries.move_to_end(key)
                 return entry.data
             return None
 
-    async def set(self, party_id: str, payload: Any, *, ttl_override: Optional[float] = None) -> None:
-        expires_at = time.time() + (ttl_override or self.ttl_seconds)
+    async def _set_entry(self, key: str, payload: Any, ttl_override: Optional[float] = None) -> None:
+        entry = self._new_entry(payload, ttl_override or self.ttl_seconds)
         async with self._lock:
-            self._entries[party_id] = CacheEntry(data=payload, expires_at=expires_at)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
 
-    async def is_fresh(self, party_id: str) -> bool:
+    async def _is_fresh(self, key: str) -> bool:
+        async with self._lock:
+            entry = self._entries.get(key)
+            return bool(entry and entry.is_fresh(self._clock()))
+
+    async def _invalidate(self, key: str) -> None:
         async with self._lock:
-            entry = self._entries.get(party_id)
-            return bool(entry and entry.is_fresh())
+            self._entries.pop(key, None)
 
-    async def get_or_set(self, party_id: str, loader) -> Any:
-        cached = await self.get(party_id)
-        if cached is not None:
-            return cached
+    # -- single-flight loading -----------------------------------------
+
+    async def _get_or_load(
+        self,
+        key: str,
+        loader: Loader,
+        *,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        evict_on_reject: bool = False,
+    ) -> Any:
+        """
+        Return the cached value for key, loading it at most once concurrently.
+
+        Args:
+            key: Normalized cache key
+            loader: Coroutine factory fetching the value from FIRS
+            should_cache: Predicate deciding whether a loaded value is cached
+            evict_on_reject: Drop the existing entry when a loaded value is rejected
+        """
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                now = self._clock()
+                if entry.is_fresh(now):
+                    self._entries.move_to_end(key)
+                    self._metrics["hits"] += 1
+                    if entry.needs_refresh(now):
+                        self._schedule_refresh(key, loader, should_cache, evict_on_reject)
+                    return entry.data
+                if self._servable_stale(entry):
+                    self._entries.move_to_end(key)
+                    self._metrics["stale_serves"] += 1
+                    self._schedule_refresh(key, loader, should_cache, evict_on_reject)
+                    return entry.data
+
+            self._metrics["misses"] += 1
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.get_running_loop().create_task(
+                    self._load(key, loader, should_cache, evict_on_reject)
+                )
+                self._inflight[key] = task
+                task.add_done_callback(lambda done, key=key: self._load_done(key, done))
+            else:
+                self._metrics["coalesced"] += 1
+
+        # The load is shared: a cancelled caller stops waiting but leaves it
+        # running for the rest, and only a failed load raises in every waiter
+        return await asyncio.shield(task)
+
+    def _load_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self._metrics["load_errors"] += 1
+
+    async def _load(
+        self,
+        key: str,
+        loader: Loader,
+        should_cache: Optional[Callable[[Any], bool]],
+        evict_on_reject: bool,
+    ) -> Any:
+        self._metrics["loads"] += 1
         payload = await loader()
-        await self.set(party_id, payload)
+        if should_cache is None or should_cache(payload):
+            await self._set_entry(key, payload)
+        elif evict_on_reject:
+            await self._invalidate(key)
         return payload
 
+    def _schedule_refresh(
+        self,
+        key: str,
+        loader: Loader,
+        should_cache: Optional[Callable[[Any], bool]],
+        evict_on_reject: bool,
+    ) -> None:
+        """Start one background refresh for key (caller holds the lock)."""
+        if key in self._refreshing or key in self._inflight:
+            return
+
+        async def _runner():
+            try:
+                self._metrics["refreshes"] += 1
+                await self._load(key, loader, should_cache, evict_on_reject)
+            except Exception as exc:  # background refresh should not raise
+                self._metrics["refresh_errors"] += 1
+                logger.debug("Cache refresh failed for %s: %s", key, exc)
+            finally:
+                self._refreshing.discard(key)
+
+        self._refreshing.add(key)
+        task = asyncio.get_running_loop().create_task(_runner())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def cancel_refreshes(self) -> None:
+        """Cancel background refreshes and pending loads (used on client shutdown)."""
+        for task in [*self._refresh_tasks, *self._inflight.values()]:
+            task.cancel()
+        self._refresh_tasks.clear()
+        self._refreshing.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Cache counters plus coalesce and stale-serve rates."""
+        lookups = self._metrics["hits"] + self._metrics["misses"] + self._metrics["stale_serves"]
+        return {
+            **self._metrics,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self._inflight),
+            "refreshing": len(self._refreshing),
+            "stale_serve_rate": self._metrics["stale_serves"] / lookups if lookups else 0.0,
+            "coalesce_rate": self._metrics["coalesced"] / lookups if lookups else 0.0,
+        }
+
+
+class PartyCache(SingleFlightTTLCache):
+    """TTL cache for party lookups keyed by party ID."""
+
+    def __init__(
+        self,
+        ttl_minutes: float = 30.0,
+        *,
+        max_entries: int = 10000,
+        max_stale_minutes: Optional[float] = None,
+        refresh_ahead_ratio: float = 0.1,
+        refresh_jitter_ratio: float = 0.1,
+        clock: Clock = time.time,
+    ):
+        super().__init__(
+            _seconds_from_minutes(ttl_minutes),
+            max_entries=max_entries,
+            max_stale_seconds=None if max_stale_minutes is None else _seconds_from_minutes(max_stale_minutes),
+            refresh_ahead_ratio=refresh_ahead_ratio,
+            refresh_jitter_ratio=refresh_jitter_ratio,
+            clock=clock,
+        )
+
+    async def get(self, party_id: str, *, allow_stale: bool = False) -> Optional[Any]:
+        return await self._get_entry(party_id, allow_stale=allow_stale)
+
+    async def set(self, party_id: str, payload: Any, *, ttl_override: Optional[float] = None) -> None:
+        await self._set_entry(party_id, payload, ttl_override)
+
+    async def is_fresh(self, party_id: str) -> bool:
+        return await self._is_fresh(party_id)
+
+    async def get_or_set(self, party_id: str, loader) -> Any:
+        return await self._get_or_load(party_id, loader)
+
+    async def get_or_load(
+        self,
+        party_id: str,
+        loader: Loader,
+        *,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        evict_on_reject: bool = False,
+    ) -> Any:
+        return await self._get_or_load(
+            party_id, loader, should_cache=should_cache, evict_on_reject=evict_on_reject
+        )
+
     async def invalidate(self, party_id: str) -> None:
-        async with self._lock:
-            self._entries.pop(party_id, None)
+        await self._invalidate(party_id)
 
 
-class TINCache:
+class TINCache(SingleFlightTTLCache):
     """Cache for TIN verification results with TTL and optional grace period."""
 
-    def __init__(self, ttl_minutes: float = 15.0):
-        self.ttl_seconds = _seconds_from_minutes(ttl_minutes)
-        self._entries: Dict[str, CacheEntry] = {}
-        self._lock = asyncio.Lock()
+    def __init__(
+        self,
+        ttl_minutes: float = 15.0,
+        *,
+        max_entries: int = 50000,
+        max_stale_minutes: Optional[float] = None,
+        refresh_ahead_ratio: float = 0.1,
+        refresh_jitter_ratio: float = 0.1,
+        clock: Clock = time.time,
+    ):
+        super().__init__(
+            _seconds_from_minutes(ttl_minutes),
+            max_entries=max_entries,
+            max_stale_seconds=None if max_stale_minutes is None else _seconds_from_minutes(max_stale_minutes),
+            refresh_ahead_ratio=refresh_ahead_ratio,
+            refresh_jitter_ratio=refresh_jitter_ratio,
+            clock=clock,
+        )
 
     @staticmethod
     def _normalize_key(tin: str, extra: Optional[str] = None) -> str:
@@ -80,30 +332,26 @@ class TINCache:
         return base
 
     async def get(self, tin: str, *, extra: Optional[str] = None, allow_stale: bool = False) -> Optional[Any]:
-        key = self._normalize_key(tin, extra)
-        async with self._lock:
-            entry = self._entries.get(key)
-            if not entry:
-                return None
-            if entry.is_fresh():
-                return entry.data
-            if allow_stale:
-                return entry.data
-            return None
+        return await self._get_entry(self._normalize_key(tin, extra), allow_stale=allow_stale)
 
     async def set(self, tin: str, payload: Any, *, extra: Optional[str] = None, ttl_override: Optional[float] = None) -> None:
-        key = self._normalize_key(tin, extra)
-        expires_at = time.time() + (ttl_override or self.ttl_seconds)
-        async with self._lock:
-            self._entries[key] = CacheEntry(data=payload, expires_at=expires_at)
+        await self._set_entry(self._normalize_key(tin, extra), payload, ttl_override)
 
     async def is_fresh(self, tin: str, *, extra: Optional[str] = None) -> bool:
-        key = self._normalize_key(tin, extra)
-        async with self._lock:
-            entry = self._entries.get(key)
-            return bool(entry and entry.is_fresh())
+        return await self._is_fresh(self._normalize_key(tin, extra))
+
+    async def get_or_load(
+        self,
+        tin: str,
+        loader: Loader,
+        *,
+        extra: Optional[str] = None,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        evict_on_reject: bool = True,
+    ) -> Any:
+        return await self._get_or_load(
+            self._normalize_key(tin, extra), loader, should_cache=should_cache, evict_on_reject=evict_on_reject
+        )
 
     async def invalidate(self, tin: str, *, extra: Optional[str] = None) -> None:
-        key = self._normalize_key(tin, extra)
-        async with self._lock:
-            self._entries.pop(key, None)
+        await self._invalidate(self._normalize_key(tin, extra))
@@ -9,33 +9,104 @@ In-memory cache with TTL for FIRS static resources:
 
 Provides simple get/refresh helpers and returns shaped payloads.
 """
+import asyncio
+import logging
+import random
 import time
 import hashlib
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set
 
 from .firs_http_client import FIRSHttpClient
 
+logger = logging.getLogger(__name__)
+
+RESOURCE_KEYS = ("currencies", "invoice-types", "services-codes", "vat-exemptions")
+
 
 class FIRSResourceCache:
-    def __init__(self, client: Optional[FIRSHttpClient] = None, ttl_seconds: int = 3600):
+    """
+    TTL cache for FIRS reference resources.
+
+    Refreshes are single-flight per resource (concurrent callers share one
+    FIRS call). Stale resources are served while a background refresh runs,
+    and fresh ones are refreshed slightly before expiry at a jittered point.
+    A failed refresh keeps the last good payload. A fetch runs as its own
+    task, so cancelling one caller does not cancel it for the others.
+    """
+
+    def __init__(
+        self,
+        client: Optional[FIRSHttpClient] = None,
+        ttl_seconds: int = 3600,
+        *,
+        max_entries: int = 256,
+        refresh_ahead_ratio: float = 0.1,
+        refresh_jitter_ratio: float = 0.1,
+        clock: Callable[[], float] = time.time,
+    ):
         self.client = client or FIRSHttpClient()
         self.ttl = ttl_seconds
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        self.max_entries = max_entries
+        self.refresh_ahead_ratio = refresh_ahead_ratio
+        self.refresh_jitter_ratio = refresh_jitter_ratio
+        self._clock = clock
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._etag_index: Dict[str, str] = {}
         self._last_modified_index: Dict[str, float] = {}
-        # cache entry shape: {"data": <payload>, "ts": epoch}
+        # cache entry shape: {"data": <payload>, "ts": epoch, "refresh_at": epoch, "ok": bool}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self._metrics: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "stale_serves": 0,
+            "coalesced": 0,
+            "fetches": 0,
+            "fetch_failures": 0,
+            "background_refreshes": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def cached_resources(self) -> list:
+        return list(self._cache.keys())
 
     def _is_fresh(self, key: str) -> bool:
         entry = self._cache.get(key)
         if not entry:
             return False
-        return (time.time() - entry.get("ts", 0)) < self.ttl
+        return (self._clock() - entry.get("ts", 0)) < self.ttl
+
+    def _needs_refresh(self, key: str) -> bool:
+        entry = self._cache.get(key)
+        return bool(entry and self._clock() >= entry.get("refresh_at", float("inf")))
 
-    def _set(self, key: str, data: Any):
-        self._cache[key] = {"data": data, "ts": time.time()}
+    def _has_good_data(self, key: str) -> bool:
+        entry = self._cache.get(key)
+        return bool(entry and entry.get("ok", True))
+
+    def _set(self, key: str, data: Any, *, ok: bool = True):
+        now = self._clock()
+        lead = self.ttl * self.refresh_ahead_ratio + random.uniform(0.0, self.ttl * self.refresh_jitter_ratio)
+        self._cache[key] = {
+            "data": data,
+            # Failed fetches are never considered fresh so the next caller retries
+            "ts": now if ok else 0,
+            "refresh_at": now + max(0.0, self.ttl - lead),
+            "ok": ok,
+        }
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            evicted, _ = self._cache.popitem(last=False)
+            self._etag_index.pop(evicted, None)
+            self._last_modified_index.pop(evicted, None)
+            self._metrics["evictions"] += 1
 
     def _get(self, key: str) -> Optional[Any]:
         entry = self._cache.get(key)
+        if entry:
+            self._cache.move_to_end(key)
         return entry.get("data") if entry else None
 
     def get_resource_etag(self, key: str) -> Optional[str]:
@@ -52,7 +123,7 @@ class FIRSResourceCache:
             serialized = str(payload)
         digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
         self._etag_index[key] = digest
-        self._last_modified_index[key] = time.time()
+        self._last_modified_index[key] = self._clock()
 
     def get_combined_etag(self) -> Optional[str]:
         if not self._etag_index:
@@ -66,21 +137,52 @@ class FIRSResourceCache:
         return max(self._last_modified_index.values())
 
     async def get_resources(self) -> Dict[str, Any]:
-        # Returns all resources, fetching missing/stale as needed
-        out: Dict[str, Any] = {}
-        for key in ("currencies", "invoice-types", "services-codes", "vat-exemptions"):
-            if not self._is_fresh(key):
-                await self.refresh_resource(key)
-            out[key] = self._get(key)
-        return out
+        # Returns all resources, fetching missing ones concurrently and
+        # serving stale ones while they revalidate in the background
+        missing = []
+        for key in RESOURCE_KEYS:
+            if self._is_fresh(key):
+                self._metrics["hits"] += 1
+                if self._needs_refresh(key):
+                    self._schedule_refresh(key)
+            elif self._has_good_data(key):
+                self._metrics["stale_serves"] += 1
+                self._schedule_refresh(key)
+            else:
+                self._metrics["misses"] += 1
+                missing.append(key)
+
+        if missing:
+            await asyncio.gather(*(self.refresh_resource(key) for key in missing))
+
+        return {key: self._get(key) for key in RESOURCE_KEYS}
 
     async def refresh_all(self) -> Dict[str, Any]:
-        for key in ("currencies", "invoice-types", "services-codes", "vat-exemptions"):
-            await self.refresh_resource(key)
+        await asyncio.gather(*(self.refresh_resource(key) for key in RESOURCE_KEYS))
         return await self.get_resources()
 
     async def refresh_resource(self, resource: str) -> Dict[str, Any]:
+        # Single-flight: concurrent refreshes of a resource share one FIRS call.
+        # A cancelled caller stops waiting without cancelling the shared fetch.
+        task = self._inflight.get(resource)
+        if task is not None:
+            self._metrics["coalesced"] += 1
+        else:
+            task = asyncio.get_running_loop().create_task(self._fetch_resource(resource))
+            self._inflight[resource] = task
+            task.add_done_callback(lambda done, resource=resource: self._fetch_done(resource, done))
+        await asyncio.shield(task)
+        return {resource: self._get(resource)}
+
+    def _fetch_done(self, resource: str, task: asyncio.Task) -> None:
+        if self._inflight.get(resource) is task:
+            del self._inflight[resource]
+        if not task.cancelled():
+            task.exception()  # waiters re-raise; avoid "never retrieved" warnings
+
+    async def _fetch_resource(self, resource: str) -> None:
         # Fetch single resource from FIRS
+        self._metrics["fetches"] += 1
         res = await self.client.get_resource(resource)
         if res.get("success"):
             # Store the 'data' field from FIRS response directly
@@ -88,8 +190,33 @@ class FIRSResourceCache:
             self._set(resource, payload)
             self._update_metadata(resource, payload)
         else:
-            # Preserve any previous cache on failure
-            # Attach error to a meta field for callers if needed
-            self._set(resource, {"error": res.get("error"), "status_code": res.get("status_code")})
-        return {resource: self._get(resource)}
-
+            self._metrics["fetch_failures"] += 1
+            if not self._has_good_data(resource):
+                # Attach error to the entry for callers if there is nothing to preserve
+                self._set(resource, {"error": res.get("error"), "status_code": res.get("status_code")}, ok=False)
+            # Otherwise preserve the previous payload; it stays stale so the next read retries
+
+    def _schedule_refresh(self, resource: str) -> None:
+        if resource in self._inflight:
+            return
+
+        async def _runner():
+            try:
+                self._metrics["background_refreshes"] += 1
+                await self.refresh_resource(resource)
+            except Exception as exc:  # background refresh should not raise
+                logger.debug("FIRS resource refresh failed for %s: %s", resource, exc)
+
+        task = asyncio.get_running_loop().create_task(_runner())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self._metrics["hits"] + self._metrics["misses"] + self._metrics["stale_serves"]
+        return {
+            **self._metrics,
+            "size": len(self._cache),
+            "inflight": len(self._inflight),
+            "stale_serve_rate": self._metrics["stale_serves"] / lookups if lookups else 0.0,
+            "coalesce_rate": self._metrics["coalesced"] / max(1, self._metrics["fetches"] + self._metrics["coalesced"]),
+        }
@@ -8,13 +8,14 @@ preserving the route-facing contract.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import uuid
 from contextlib import asynccontextmanager, nullcontext
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from uuid import UUID
 
 from sqlalchemy import select
@@ -64,6 +65,9 @@ from si_services.certificate_management.digital_certificate_service import Digit
 
 
 InvoiceRecord = invoice_repo.InvoiceRecord
+PreparedInvoice = Tuple[Dict[str, Any], Dict[str, Any], List[str]]
+
+DEFAULT_PREPARE_CONCURRENCY = 16
 
 
 class TransmissionService:
@@ -331,18 +335,52 @@ class TransmissionService:
         organization_id: Optional[str],
         invoice_number: Optional[str],
     ) -> Dict[str, Any]:
-        context = {
-            "organization_id": organization_id,
-            "invoice_number": invoice_number,
-            "source": "app_transmission",
-        }
-        report = compliance_checker.check_full_compliance(
+        # Validation is synchronous CPU work; keep it off the event loop
+        report = await asyncio.to_thread(
+            compliance_checker.check_full_compliance,
             invoice_payload,
             compliance_level=ComplianceLevel.STRICT,
             transform_if_needed=True,
-            context=context,
+            context=self._validation_context(organization_id, invoice_number),
         )
+        return self._check_validation_report(report)
 
+    async def _validate_invoices(
+        self,
+        invoice_payloads: List[Dict[str, Any]],
+        *,
+        organization_id: Optional[str],
+        invoice_numbers: List[Optional[str]],
+        max_workers: int,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Validate a batch in one call: off the event loop, across up to ``max_workers`` processes.
+
+        Returns the report, or the validation error, for each payload in order.
+        """
+        reports = await compliance_checker.check_batch_compliance_async(
+            invoice_payloads,
+            compliance_level=ComplianceLevel.STRICT,
+            transform_if_needed=True,
+            contexts=[self._validation_context(organization_id, number) for number in invoice_numbers],
+            max_workers=max_workers,
+        )
+        outcomes: List[Union[Dict[str, Any], Exception]] = []
+        for report in reports:
+            try:
+                outcomes.append(self._check_validation_report(report))
+            except ValueError as exc:
+                outcomes.append(exc)
+        return outcomes
+
+    @staticmethod
+    def _validation_context(organization_id: Optional[str], invoice_number: Optional[str]) -> Dict[str, Any]:
+        return {
+            "organization_id": organization_id,
+            "invoice_number": invoice_number,
+            "source": "app_transmission",
+        }
+
+    def _check_validation_report(self, report: Dict[str, Any]) -> Dict[str, Any]:
         overall = report.get("overall_status")
         total_errors = report.get("summary", {}).get("total_errors", 0)
         if (
@@ -401,7 +439,8 @@ class TransmissionService:
             return invoice_payload, None, warnings
 
         try:
-            signature_info = self._digital_certificate_service.sign_invoice_document(
+            signature_info = await asyncio.to_thread(
+                self._digital_certificate_service.sign_invoice_document,
                 document=invoice_payload,
                 certificate_id=certificate_id,
             )
@@ -430,6 +469,22 @@ class TransmissionService:
             organization_id=organization_id,
             invoice_number=invoice_number,
         )
+        return await self._complete_prepared_invoice(
+            firs_invoice,
+            validation_report,
+            organization_id=organization_id,
+            options=options,
+        )
+
+    async def _complete_prepared_invoice(
+        self,
+        firs_invoice: Dict[str, Any],
+        validation_report: Dict[str, Any],
+        *,
+        organization_id: Optional[str],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> PreparedInvoice:
+        """Sign a validated invoice and assemble its pipeline metadata"""
         validation_warnings = self._extract_validation_warnings(validation_report)
         signed_invoice, signature_info, signing_warnings = await self._maybe_sign_invoice(
             firs_invoice,
@@ -444,6 +499,87 @@ class TransmissionService:
         combined_warnings = validation_warnings + [w for w in signing_warnings if w not in validation_warnings]
         return signed_invoice, pipeline_metadata, combined_warnings
 
+    def _resolve_prepare_concurrency(self, options: Optional[Dict[str, Any]]) -> int:
+        raw_value: Any = os.getenv("APP_TRANSMISSION_PREPARE_CONCURRENCY")
+        if isinstance(options, dict) and options.get("prepare_concurrency") is not None:
+            raw_value = options["prepare_concurrency"]
+        try:
+            return max(1, int(raw_value))
+        except (TypeError, ValueError):
+            return DEFAULT_PREPARE_CONCURRENCY
+
+    async def _prepare_invoices_for_submission(
+        self,
+        invoices: List[Dict[str, Any]],
+        *,
+        organization_id: Optional[str],
+        options: Optional[Dict[str, Any]] = None,
+        concurrency: Optional[int] = None,
+    ) -> List[Union[PreparedInvoice, Exception]]:
+        """Prepare a batch with bounded concurrency.
+
+        Payloads are validated in one batch call that runs off the event loop
+        across at most ``concurrency`` worker processes; signing then runs in
+        threads, at most ``concurrency`` at a time. Returns one entry per
+        invoice in input order: the prepared tuple, or the exception that
+        invoice raised. A failure never cancels siblings.
+        """
+        if not invoices:
+            return []
+
+        limit = max(1, concurrency or self._resolve_prepare_concurrency(options))
+        sign_enabled, _ = self._resolve_signature_preferences(options)
+        if sign_enabled:
+            # Warm the certificate cache once rather than per concurrent invoice
+            try:
+                await self._get_signing_certificate_id(organization_id)
+            except Exception:
+                self.logger.debug("Signing certificate prefetch failed; resolving per invoice")
+
+        outcomes: List[Union[PreparedInvoice, Exception, None]] = [None] * len(invoices)
+        built: List[Tuple[int, Dict[str, Any]]] = []
+        for index, invoice in enumerate(invoices):
+            try:
+                built.append((index, build_firs_invoice(invoice)))
+            except Exception as exc:
+                outcomes[index] = exc
+
+        reports: List[Union[Dict[str, Any], Exception]] = []
+        if built:
+            try:
+                reports = await self._validate_invoices(
+                    [firs_invoice for _, firs_invoice in built],
+                    organization_id=organization_id,
+                    invoice_numbers=[
+                        self._select_invoice_number(None, None, None, invoices[index]) for index, _ in built
+                    ],
+                    max_workers=min(limit, os.cpu_count() or 1),
+                )
+            except Exception as exc:
+                reports = [exc] * len(built)
+
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _complete(index: int, firs_invoice: Dict[str, Any], report: Union[Dict[str, Any], Exception]) -> None:
+            if isinstance(report, Exception):
+                outcomes[index] = report
+                return
+            async with semaphore:
+                try:
+                    outcomes[index] = await self._complete_prepared_invoice(
+                        firs_invoice,
+                        report,
+                        organization_id=organization_id,
+                        options=options,
+                    )
+                except Exception as exc:
+                    outcomes[index] = exc
+
+        await asyncio.gather(
+            *(_complete(index, firs_invoice, report) for (index, firs_invoice), report in zip(built, reports))
+        )
+        return outcomes
+
     def _is_b2c_invoice(self, invoice: Dict[str, Any]) -> bool:
         if not isinstance(invoice, dict):
             return False
@@ -1548,9 +1684,9 @@ class TransmissionService:
                 references.append(ref_dict)
 
         if references:
-            async with self._session_scope() as session:
-                for ref in references:
-                    invoice_number = self._select_invoice_number(
+            lookups = [
+                invoice_repo.InvoiceReference(
+                    invoice_number=self._select_invoice_number(
                         ref.get("invoice_number")
                         or ref.get("invoiceNumber")
                         or ref.get("invoice_id")
@@ -1558,23 +1694,28 @@ class TransmissionService:
                         None,
                         None,
                         ref,
-                    )
-                    record = await invoice_repo.get_invoice_record(
-                        session,
-                        organization_id=organization_id,
-                        invoice_number=invoice_number,
-                        submission_id=ref.get("submission_id") or ref.get("transmission_id"),
-                        irn=ref.get("irn"),
-                        correlation_id=ref.get("correlation_id"),
-                        si_invoice_id=ref.get("si_invoice_id"),
-                    )
-                    if not record or not record.invoice_data:
-                        identifier = invoice_number or ref.get("submission_id") or ref.get("irn") or "invoice_reference_missing"
-                        raise ValueError(f"invoice_payload_unavailable:{identifier}")
-                    invoice_payload = dict(record.invoice_data)
-                    if record.irn and "irn" not in invoice_payload:
-                        invoice_payload.setdefault("irn", record.irn)
-                    resolved_invoices.append(invoice_payload)
+                    ),
+                    submission_id=ref.get("submission_id") or ref.get("transmission_id"),
+                    irn=ref.get("irn"),
+                    correlation_id=ref.get("correlation_id"),
+                    si_invoice_id=ref.get("si_invoice_id"),
+                )
+                for ref in references
+            ]
+            async with self._session_scope() as session:
+                records = await invoice_repo.get_invoice_records_bulk(
+                    session,
+                    organization_id=organization_id,
+                    references=lookups,
+                )
+            for ref, lookup, record in zip(references, lookups, records):
+                if not record or not record.invoice_data:
+                    identifier = lookup.invoice_number or ref.get("submission_id") or ref.get("irn") or "invoice_reference_missing"
+                    raise ValueError(f"invoice_payload_unavailable:{identifier}")
+                invoice_payload = dict(record.invoice_data)
+                if record.irn and "irn" not in invoice_payload:
+                    invoice_payload.setdefault("irn", record.irn)
+                resolved_invoices.append(invoice_payload)
 
         if not resolved_invoices:
             raise ValueError("invoice_payload_unavailable")
@@ -1590,14 +1731,16 @@ class TransmissionService:
         pipeline_reports: List[Dict[str, Any]] = []
         pipeline_warnings: List[str] = []
 
-        for invoice_entry in resolved_invoices:
-            invoice_number_hint = self._select_invoice_number(None, None, None, invoice_entry)
-            prepared_invoice, meta, warnings = await self._prepare_invoice_for_submission(
-                invoice_entry,
-                organization_id=organization_id,
-                invoice_number=invoice_number_hint,
-                options=batch_options,
-            )
+        outcomes = await self._prepare_invoices_for_submission(
+            resolved_invoices,
+            organization_id=organization_id,
+            options=batch_options,
+        )
+        for outcome in outcomes:
+            # Fail the batch on the first invoice (in input order) that failed
+            if isinstance(outcome, Exception):
+                raise outcome
+            prepared_invoice, meta, warnings = outcome
             prepared_invoices.append(prepared_invoice)
             pipeline_reports.append(meta)
             pipeline_warnings.extend(warnings)
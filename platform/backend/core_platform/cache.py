@@ -6,6 +6,7 @@ Unified cache service interface for the core platform.
 
 from typing import Any, Dict, List, Optional, Union, Callable
 from uuid import UUID
+import inspect
 import logging
 
 from .data_management.cache_manager import (
@@ -24,8 +25,9 @@ class CacheService:
     """
     Unified cache service for core platform components.
     
-    Provides a simplified interface over the enterprise cache manager
-    for consistent usage across all platform services.
+    Provides a simplified async interface over the enterprise cache manager
+    for consistent usage across all platform services. Data operations are
+    coroutines backed by the manager's redis.asyncio client.
     """
     
     def __init__(self, cache_manager: Optional[CacheManager] = None):
@@ -75,7 +77,7 @@ class CacheService:
             logger.error(f"Failed to initialize cache service: {e}")
             return False
     
-    def get(self, key: str, default: Any = None) -> Any:
+    async def get(self, key: str, default: Any = None) -> Any:
         """
         Get value from cache.
         
@@ -88,9 +90,9 @@ class CacheService:
         """
         if self._cache_manager is None:
             return default
-        return self._cache_manager.get(key, default)
+        return await self._cache_manager.aget(key, default)
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """
         Set value in cache.
         
@@ -104,9 +106,9 @@ class CacheService:
         """
         if self._cache_manager is None:
             return False
-        return self._cache_manager.set(key, value, ttl)
+        return await self._cache_manager.aset(key, value, ttl)
     
-    def delete(self, key: str) -> bool:
+    async def delete(self, key: str) -> bool:
         """
         Delete value from cache.
         
@@ -118,25 +120,26 @@ class CacheService:
         """
         if self._cache_manager is None:
             return False
-        return self._cache_manager.delete(key)
+        return await self._cache_manager.adelete(key)
     
-    def get_or_set(self, key: str, factory: Callable[[], Any], ttl: Optional[int] = None) -> Any:
+    async def get_or_set(self, key: str, factory: Callable[[], Any], ttl: Optional[int] = None) -> Any:
         """
         Get value from cache or set using factory function.
         
         Args:
             key: Cache key
-            factory: Function to generate value if not in cache
+            factory: Function (sync or async) to generate value if not in cache
             ttl: Time to live in seconds
             
         Returns:
             Cached or generated value
         """
         if self._cache_manager is None:
-            return factory()
-        return self._cache_manager.get_or_set(key, factory, ttl)
+            value = factory()
+            return await value if inspect.isawaitable(value) else value
+        return await self._cache_manager.aget_or_set(key, factory, ttl)
     
-    def increment(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+    async def increment(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
         """
         Increment numeric value in cache.
         
@@ -150,9 +153,9 @@ class CacheService:
         """
         if self._cache_manager is None:
             return amount
-        return self._cache_manager.increment(key, amount, ttl)
+        return await self._cache_manager.aincrement(key, amount, ttl)
     
-    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
         """
         Get multiple values from cache.
         
@@ -164,9 +167,9 @@ class CacheService:
         """
         if self._cache_manager is None:
             return {}
-        return self._cache_manager.get_many(keys)
+        return await self._cache_manager.aget_many(keys)
     
-    def set_many(self, data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+    async def set_many(self, data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
         """
         Set multiple values in cache.
         
@@ -179,9 +182,9 @@ class CacheService:
         """
         if self._cache_manager is None:
             return False
-        return self._cache_manager.set_many(data, ttl)
+        return await self._cache_manager.aset_many(data, ttl)
     
-    def clear_tenant_cache(self, tenant_id: Union[str, UUID]):
+    async def clear_tenant_cache(self, tenant_id: Union[str, UUID]):
         """
         Clear all cache entries for a specific tenant.
         
@@ -194,7 +197,7 @@ class CacheService:
         if isinstance(tenant_id, str):
             tenant_id = UUID(tenant_id)
         
-        self._cache_manager.clear_tenant_cache(tenant_id)
+        await self._cache_manager.aclear_tenant_cache(tenant_id)
     
     def set_tenant_context(self, tenant_id: Union[str, UUID], organization_id: Union[str, UUID]):
         """
@@ -70,6 +70,8 @@ from .cache_manager import (
     SerializationFormat,
     CircuitBreaker,
     MemoryCache,
+    CompressionCodec,
+    register_compression_codec,
     get_cache_manager,
     initialize_cache_manager
 )
@@ -562,6 +564,8 @@ __all__ = [
     "SerializationFormat",
     "CircuitBreaker",
     "MemoryCache",
+    "CompressionCodec",
+    "register_compression_codec",
     "get_cache_manager",
     "initialize_cache_manager",
     
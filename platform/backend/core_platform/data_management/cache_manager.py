@@ -11,6 +11,11 @@ import pickle
 import hashlib
 import time
 import asyncio
+import gzip
+import heapq
+import inspect
+import zlib
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union, Callable, Set, Tuple
 from uuid import UUID
@@ -18,12 +23,23 @@ from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 from enum import Enum
 import redis
+import redis.asyncio as aioredis
 from redis.sentinel import Sentinel
 from redis.cluster import RedisCluster
 import threading
 from concurrent.futures import ThreadPoolExecutor, Future
 import os
 
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional codec
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional codec
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +66,45 @@ class SerializationFormat(Enum):
     COMPRESSED = "compressed"            # Gzip compressed JSON
 
 
+@dataclass(frozen=True)
+class CompressionCodec:
+    """Compression codec for cached payloads."""
+    name: str
+    codec_id: int                        # Stored in the payload frame header
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+# Non-gzip payloads are framed as _CODEC_FRAME + codec_id byte + data.
+# 0xff never starts UTF-8 JSON or a pickle, and gzip keeps its own magic
+# so values written before codecs were pluggable still decode.
+_CODEC_FRAME = b"\xffC"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+COMPRESSION_CODECS: Dict[str, CompressionCodec] = {
+    "gzip": CompressionCodec("gzip", 0, gzip.compress, gzip.decompress),
+    "zlib": CompressionCodec("zlib", 1, lambda data: zlib.compress(data, 1), zlib.decompress),
+}
+
+if lz4_frame is not None:
+    COMPRESSION_CODECS["lz4"] = CompressionCodec("lz4", 2, lz4_frame.compress, lz4_frame.decompress)
+
+if zstandard is not None:
+    COMPRESSION_CODECS["zstd"] = CompressionCodec(
+        "zstd", 3,
+        lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data)
+    )
+
+
+def register_compression_codec(codec: CompressionCodec):
+    """Register an additional compression codec by name."""
+    if any(existing.codec_id == codec.codec_id and existing.name != codec.name
+           for existing in COMPRESSION_CODECS.values()):
+        raise ValueError(f"Codec id {codec.codec_id} already registered")
+    COMPRESSION_CODECS[codec.name] = codec
+
+
 @dataclass
 class CacheConfig:
     """Cache configuration settings."""
@@ -64,6 +119,11 @@ class CacheConfig:
     cache_strategy: CacheStrategy = CacheStrategy.WRITE_THROUGH
     enable_metrics: bool = True
     circuit_breaker_threshold: int = 10  # Failed operations before circuit break
+    compression_codec: str = "gzip"      # gzip, zlib, lz4, zstd (if installed)
+    redis_max_connections: int = 50      # Async connection pool size
+    tenant_namespace_versioning: bool = False  # O(1) tenant invalidation via key version
+    namespace_version_ttl_seconds: float = 5.0  # Local cache of tenant key versions
+    scan_batch_size: int = 500           # SCAN/UNLINK batch when clearing tenants
 
 
 @dataclass
@@ -121,6 +181,26 @@ class CircuitBreaker:
                 self._on_failure()
                 raise
     
+    async def call_async(self, func: Callable, *args, **kwargs):
+        """Await coroutine function with circuit breaker protection."""
+        with self._lock:
+            if self.state == "open":
+                if self._should_attempt_reset():
+                    self.state = "half-open"
+                else:
+                    raise Exception("Circuit breaker is open")
+        
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._on_failure()
+            raise
+        
+        with self._lock:
+            self._on_success()
+        return result
+    
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset."""
         if self.last_failure_time is None:
@@ -142,74 +222,138 @@ class CircuitBreaker:
 
 
 class MemoryCache:
-    """Thread-safe in-memory LRU cache."""
+    """
+    Thread-safe in-memory LRU cache.
     
-    def __init__(self, max_size: int = 1000):
+    Recency is kept by an OrderedDict (O(1) touch and eviction). Expiry is
+    lazy: expired keys are dropped on access or when the expiry heap is
+    drained during writes. Keys can optionally be grouped into partitions
+    (e.g. per tenant) so a whole partition is removed without a full scan.
+    """
+    
+    def __init__(self, max_size: int = 1000,
+                 partition_key: Optional[Callable[[str], Optional[str]]] = None):
         self.max_size = max_size
-        self._cache: Dict[str, Tuple[Any, float]] = {}  # key -> (value, expiry_time)
-        self._access_order: List[str] = []
+        self._cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()  # key -> (value, expiry_time)
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._partition_key = partition_key
+        self._partitions: Dict[str, Set[str]] = {}
         self._lock = threading.RLock()
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from memory cache."""
         with self._lock:
-            if key in self._cache:
-                value, expiry = self._cache[key]
-                
-                # Check if expired
-                if expiry > 0 and time.time() > expiry:
-                    self._remove_key(key)
-                    return None
-                
-                # Update access order for LRU
-                if key in self._access_order:
-                    self._access_order.remove(key)
-                self._access_order.append(key)
-                
-                return value
-            return None
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            
+            value, expiry = entry
+            
+            # Check if expired
+            if expiry > 0 and time.time() > expiry:
+                self._remove_key(key)
+                return None
+            
+            # Update access order for LRU
+            self._cache.move_to_end(key)
+            return value
     
     def set(self, key: str, value: Any, ttl: int = 0):
         """Set value in memory cache with optional TTL."""
         with self._lock:
-            expiry = time.time() + ttl if ttl > 0 else 0
+            now = time.time()
+            expiry = now + ttl if ttl > 0 else 0
             
-            # Remove if already exists
             if key in self._cache:
-                self._access_order.remove(key)
+                self._cache.move_to_end(key)
+            elif self._partition_key is not None:
+                partition = self._partition_key(key)
+                if partition is not None:
+                    self._partitions.setdefault(partition, set()).add(key)
             
-            # Add new entry
             self._cache[key] = (value, expiry)
-            self._access_order.append(key)
+            if expiry:
+                heapq.heappush(self._expiry_heap, (expiry, key))
             
-            # Evict oldest if over size limit
+            self._purge_expired(now)
+            
+            # Evict least recently used if over size limit
             while len(self._cache) > self.max_size:
-                oldest_key = self._access_order.pop(0)
-                del self._cache[oldest_key]
+                oldest_key, _ = self._cache.popitem(last=False)
+                self._discard_partition_key(oldest_key)
     
     def delete(self, key: str):
         """Delete key from memory cache."""
         with self._lock:
             self._remove_key(key)
     
+    def delete_partition(self, partition: str) -> int:
+        """Delete every key in a partition; returns number of keys removed."""
+        with self._lock:
+            keys = self._partitions.pop(partition, set())
+            for key in keys:
+                self._cache.pop(key, None)
+            return len(keys)
+    
+    def purge_expired(self) -> int:
+        """Drop all expired entries now; returns number of keys removed."""
+        with self._lock:
+            return self._purge_expired(time.time())
+    
+    def _purge_expired(self, now: float) -> int:
+        """Pop due heap entries, skipping ones superseded by a later set."""
+        heap = self._expiry_heap
+        removed = 0
+        while heap and heap[0][0] <= now:
+            expiry, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] == expiry:
+                self._remove_key(key)
+                removed += 1
+        
+        # Stale heap records pile up when keys are overwritten or evicted
+        if len(heap) > 2 * max(len(self._cache), 64):
+            self._expiry_heap = [(entry[1], key) for key, entry in self._cache.items() if entry[1]]
+            heapq.heapify(self._expiry_heap)
+        return removed
+    
     def _remove_key(self, key: str):
-        """Remove key from cache and access order."""
-        if key in self._cache:
-            del self._cache[key]
-        if key in self._access_order:
-            self._access_order.remove(key)
+        """Remove key from cache and its partition."""
+        if self._cache.pop(key, None) is not None:
+            self._discard_partition_key(key)
+    
+    def _discard_partition_key(self, key: str):
+        """Forget a key in the partition index."""
+        if self._partition_key is None:
+            return
+        partition = self._partition_key(key)
+        keys = self._partitions.get(partition)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._partitions[partition]
     
     def clear(self):
         """Clear all cache entries."""
         with self._lock:
             self._cache.clear()
-            self._access_order.clear()
+            self._expiry_heap.clear()
+            self._partitions.clear()
     
     def size(self) -> int:
         """Get current cache size."""
         return len(self._cache)
 
 
+def tenant_partition_key(key: str) -> Optional[str]:
+    """Partition of a tenant-prefixed cache key ("tenant:<id>:..." -> "tenant:<id>:")."""
+    if key.startswith("tenant:"):
+        end = key.find(":", 7)
+        if end != -1:
+            return key[:end + 1]
+    return None
+
+
 class CacheManager:
     """
     Enterprise cache manager with multi-level caching and Redis integration.
@@ -219,25 +363,36 @@ class CacheManager:
     - Circuit breaker for fault tolerance
     - Performance metrics and monitoring
     - Tenant-aware cache keys
-    - Compression for large data
-    - Async operations with thread pool
+    - Compression for large data (pluggable codec)
+    - Native asyncio API (aget/aset/...) on a pooled redis.asyncio client
+    - O(1) tenant invalidation via namespace versions (optional)
     - Redis cluster/sentinel support
     """
     
-    def __init__(self, config: CacheConfig):
+    def __init__(self, config: CacheConfig, async_redis_client: Optional[Any] = None):
         """
         Initialize cache manager.
         
         Args:
             config: Cache configuration
+            async_redis_client: Optional pre-built redis.asyncio compatible client
         """
         self.config = config
         self.metrics = CacheMetrics()
         
         # Initialize components
-        self._memory_cache = MemoryCache(config.max_memory_cache_size)
+        self._memory_cache = MemoryCache(config.max_memory_cache_size, partition_key=tenant_partition_key)
         self._redis_client = self._initialize_redis()
+        self._async_redis_client = async_redis_client
+        self._async_redis_initialized = async_redis_client is not None
         self._circuit_breaker = CircuitBreaker(config.circuit_breaker_threshold)
+        self._codec = COMPRESSION_CODECS.get(config.compression_codec)
+        if self._codec is None:
+            logger.warning(f"Unknown compression codec {config.compression_codec}, using gzip")
+            self._codec = COMPRESSION_CODECS["gzip"]
+        
+        # organization_id -> (namespace version, fetched_at)
+        self._namespace_versions: Dict[str, Tuple[int, float]] = {}
         self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-mgr")
         
         # Thread-local tenant context
@@ -294,15 +449,137 @@ class CacheManager:
             logger.error(f"Failed to initialize Redis: {e}")
             return None
     
+    def _initialize_async_redis(self) -> Optional[Any]:
+        """Initialize pooled redis.asyncio client from the same configuration."""
+        try:
+            if self.config.redis_cluster_nodes:
+                from redis.asyncio.cluster import RedisCluster as AsyncRedisCluster, ClusterNode
+                return AsyncRedisCluster(
+                    startup_nodes=[ClusterNode(node.split(":")[0], int(node.split(":")[1]))
+                                   for node in self.config.redis_cluster_nodes],
+                    decode_responses=False,
+                    max_connections=self.config.redis_max_connections
+                )
+            
+            if self.config.redis_sentinel_hosts:
+                from redis.asyncio.sentinel import Sentinel as AsyncSentinel
+                sentinel = AsyncSentinel([
+                    tuple(host.split(":")) for host in self.config.redis_sentinel_hosts
+                ])
+                return sentinel.master_for('mymaster', decode_responses=False)
+            
+            redis_url = self.config.redis_url or os.getenv("REDIS_URL")
+            if redis_url:
+                return aioredis.from_url(
+                    redis_url,
+                    decode_responses=False,
+                    max_connections=self.config.redis_max_connections,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                    retry_on_timeout=True,
+                    health_check_interval=30
+                )
+            
+            return None
+            
+        except Exception as e:
+            logger.error(f"Failed to initialize async Redis: {e}")
+            return None
+    
+    def _get_async_redis(self) -> Optional[Any]:
+        """Get async Redis client, creating it on first use."""
+        if not self._async_redis_initialized:
+            self._async_redis_client = self._initialize_async_redis()
+            self._async_redis_initialized = True
+        return self._async_redis_client
+
+    def get_async_redis_client(self) -> Optional[Any]:
+        """Shared async Redis client for components needing raw Redis access (None if unavailable)."""
+        return self._get_async_redis()
+
     def set_tenant_context(self, tenant_id: UUID, organization_id: UUID):
         """Set tenant context for cache operations."""
         self._local.tenant_id = tenant_id
         self._local.organization_id = organization_id
     
+    def _current_organization(self) -> Optional[Any]:
+        """Organization of the current tenant context, if any."""
+        return getattr(self._local, 'organization_id', None)
+    
+    @staticmethod
+    def _namespace_version_key(organization_id: Any) -> str:
+        """Redis key holding a tenant's cache namespace version."""
+        return f"cache_ns:tenant:{organization_id}"
+    
+    def _tenant_namespace(self, organization_id: Any, version: Optional[int]) -> str:
+        """Key prefix for a tenant (includes the namespace version when enabled)."""
+        if version is None:
+            return f"tenant:{organization_id}:"
+        return f"tenant:{organization_id}:v{version}:"
+    
+    def _cached_namespace_version(self, organization_id: Any) -> Optional[int]:
+        """Locally cached namespace version if still fresh."""
+        cached = self._namespace_versions.get(str(organization_id))
+        if cached and time.time() - cached[1] < self.config.namespace_version_ttl_seconds:
+            return cached[0]
+        return None
+    
+    def _remember_namespace_version(self, organization_id: Any, version: int) -> int:
+        self._namespace_versions[str(organization_id)] = (version, time.time())
+        return version
+    
+    def _namespace_version(self, organization_id: Any) -> Optional[int]:
+        """Current namespace version for a tenant (sync Redis)."""
+        if not self.config.tenant_namespace_versioning:
+            return None
+        version = self._cached_namespace_version(organization_id)
+        if version is not None:
+            return version
+        
+        stale = self._namespace_versions.get(str(organization_id), (0, 0.0))[0]
+        if self._redis_client:
+            try:
+                raw = self._circuit_breaker.call(
+                    self._redis_client.get, self._namespace_version_key(organization_id)
+                )
+                return self._remember_namespace_version(organization_id, int(raw or 0))
+            except Exception as e:
+                logger.warning(f"Namespace version lookup failed for {organization_id}: {e}")
+        return self._remember_namespace_version(organization_id, stale)
+    
+    async def _anamespace_version(self, organization_id: Any) -> Optional[int]:
+        """Current namespace version for a tenant (async Redis)."""
+        if not self.config.tenant_namespace_versioning:
+            return None
+        version = self._cached_namespace_version(organization_id)
+        if version is not None:
+            return version
+        
+        stale = self._namespace_versions.get(str(organization_id), (0, 0.0))[0]
+        client = self._get_async_redis()
+        if client is not None:
+            try:
+                raw = await self._circuit_breaker.call_async(
+                    client.get, self._namespace_version_key(organization_id)
+                )
+                return self._remember_namespace_version(organization_id, int(raw or 0))
+            except Exception as e:
+                logger.warning(f"Namespace version lookup failed for {organization_id}: {e}")
+        return self._remember_namespace_version(organization_id, stale)
+    
     def _get_tenant_key(self, key: str) -> str:
         """Get tenant-prefixed cache key."""
-        if hasattr(self._local, 'organization_id') and self._local.organization_id:
-            return f"tenant:{self._local.organization_id}:{key}"
+        organization_id = self._current_organization()
+        if organization_id:
+            return f"{self._tenant_namespace(organization_id, self._namespace_version(organization_id))}{key}"
+        return f"global:{key}"
+    
+    async def _aget_tenant_key(self, key: str) -> str:
+        """Get tenant-prefixed cache key (async namespace version lookup)."""
+        organization_id = self._current_organization()
+        if organization_id:
+            version = await self._anamespace_version(organization_id)
+            return f"{self._tenant_namespace(organization_id, version)}{key}"
         return f"global:{key}"
     
     def _serialize_value(self, value: Any) -> bytes:
@@ -319,8 +596,7 @@ class CacheManager:
             # Apply compression if enabled and data is large enough
             if (self.config.enable_compression and 
                 len(serialized) > self.config.compression_threshold):
-                import gzip
-                serialized = gzip.compress(serialized)
+                serialized = self._compress(serialized)
             
             return serialized
             
@@ -331,13 +607,7 @@ class CacheManager:
     def _deserialize_value(self, data: bytes) -> Any:
         """Deserialize value based on configuration."""
         try:
-            # Try decompression first
-            if self.config.enable_compression:
-                try:
-                    import gzip
-                    data = gzip.decompress(data)
-                except:
-                    pass  # Data might not be compressed
+            data = self._decompress(data)
             
             if self.config.serialization_format == SerializationFormat.JSON:
                 return json.loads(data.decode('utf-8'))
@@ -351,6 +621,26 @@ class CacheManager:
             logger.error(f"Deserialization failed: {e}")
             raise
     
+    def _compress(self, data: bytes) -> bytes:
+        """Compress payload with the configured codec."""
+        codec = self._codec
+        if codec.name == "gzip":
+            return codec.compress(data)
+        return _CODEC_FRAME + bytes([codec.codec_id]) + codec.compress(data)
+    
+    @staticmethod
+    def _decompress(data: bytes) -> bytes:
+        """Decompress payload written by any registered codec (or pass through)."""
+        if data[:2] == _GZIP_MAGIC:
+            return gzip.decompress(data)
+        if data[:2] == _CODEC_FRAME:
+            codec_id = data[2]
+            for codec in COMPRESSION_CODECS.values():
+                if codec.codec_id == codec_id:
+                    return codec.decompress(data[3:])
+            raise ValueError(f"No compression codec registered for id {codec_id}")
+        return data
+    
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get value from cache with multi-level fallback.
@@ -618,28 +908,260 @@ class CacheManager:
             return False
     
     def clear_tenant_cache(self, tenant_id: UUID):
-        """Clear all cache entries for a specific tenant."""
-        pattern = f"tenant:{tenant_id}:*"
+        """
+        Clear all cache entries for a specific tenant.
+        
+        With namespace versioning the tenant's version is bumped (O(1)) and
+        old keys age out by TTL; otherwise keys are removed with SCAN/UNLINK
+        in batches (never KEYS, which blocks Redis).
+        """
+        prefix = self._tenant_namespace(tenant_id, None)
         
         try:
-            # Clear memory cache
-            keys_to_delete = [key for key in self._memory_cache._cache.keys() 
-                            if key.startswith(pattern.replace("*", ""))]
-            for key in keys_to_delete:
-                self._memory_cache.delete(key)
+            # Clear memory cache (tenant partition, no full scan)
+            self._memory_cache.delete_partition(prefix)
             
             # Clear Redis cache
             if self._redis_client:
                 try:
-                    keys = self._circuit_breaker.call(
-                        self._redis_client.keys, pattern
+                    if self.config.tenant_namespace_versioning:
+                        version = self._circuit_breaker.call(
+                            self._redis_client.incr, self._namespace_version_key(tenant_id)
+                        )
+                        self._remember_namespace_version(tenant_id, int(version))
+                    else:
+                        batch = []
+                        for key in self._redis_client.scan_iter(match=f"{prefix}*", count=self.config.scan_batch_size):
+                            batch.append(key)
+                            if len(batch) >= self.config.scan_batch_size:
+                                self._circuit_breaker.call(self._redis_client.unlink, *batch)
+                                batch = []
+                        if batch:
+                            self._circuit_breaker.call(self._redis_client.unlink, *batch)
+                except Exception as e:
+                    logger.warning(f"Redis clear tenant cache failed: {e}")
+            elif self.config.tenant_namespace_versioning:
+                current = self._namespace_versions.get(str(tenant_id), (0, 0.0))[0]
+                self._remember_namespace_version(tenant_id, current + 1)
+            
+            logger.info(f"Cleared cache for tenant {tenant_id}")
+            
+        except Exception as e:
+            logger.error(f"Failed to clear tenant cache for {tenant_id}: {e}")
+    
+    # ------------------------------------------------------------------
+    # Async API (redis.asyncio; never blocks the event loop on Redis I/O)
+    # ------------------------------------------------------------------
+    
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Async variant of get()."""
+        start_time = time.time()
+        tenant_key = await self._aget_tenant_key(key)
+        
+        try:
+            # L1: Check memory cache first
+            value = self._memory_cache.get(tenant_key)
+            if value is not None:
+                self._update_metrics("hit", start_time)
+                return value
+            
+            # L2: Check Redis cache
+            client = self._get_async_redis()
+            if client is not None:
+                try:
+                    redis_value = await self._circuit_breaker.call_async(client.get, tenant_key)
+                    if redis_value is not None:
+                        value = self._deserialize_value(redis_value)
+                        self._memory_cache.set(tenant_key, value, self.config.default_ttl_seconds)
+                        self._update_metrics("hit", start_time)
+                        return value
+                except Exception as e:
+                    logger.warning(f"Redis get failed for key {tenant_key}: {e}")
+            
+            self._update_metrics("miss", start_time)
+            return default
+            
+        except Exception as e:
+            logger.error(f"Cache get failed for key {tenant_key}: {e}")
+            self._update_metrics("error", start_time)
+            return default
+    
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Async variant of set()."""
+        start_time = time.time()
+        tenant_key = await self._aget_tenant_key(key)
+        cache_ttl = ttl or self.config.default_ttl_seconds
+        
+        try:
+            self._memory_cache.set(tenant_key, value, cache_ttl)
+            
+            client = self._get_async_redis()
+            if client is not None:
+                try:
+                    serialized_value = self._serialize_value(value)
+                    await self._circuit_breaker.call_async(
+                        client.setex, tenant_key, cache_ttl, serialized_value
                     )
-                    if keys:
-                        self._circuit_breaker.call(
-                            self._redis_client.delete, *keys
+                except Exception as e:
+                    logger.warning(f"Redis set failed for key {tenant_key}: {e}")
+            
+            self._update_metrics("write", start_time)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Cache set failed for key {tenant_key}: {e}")
+            self._update_metrics("error", start_time)
+            return False
+    
+    async def adelete(self, key: str) -> bool:
+        """Async variant of delete()."""
+        start_time = time.time()
+        tenant_key = await self._aget_tenant_key(key)
+        
+        try:
+            self._memory_cache.delete(tenant_key)
+            
+            client = self._get_async_redis()
+            if client is not None:
+                try:
+                    await self._circuit_breaker.call_async(client.unlink, tenant_key)
+                except Exception as e:
+                    logger.warning(f"Redis delete failed for key {tenant_key}: {e}")
+            
+            self._update_metrics("delete", start_time)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Cache delete failed for key {tenant_key}: {e}")
+            self._update_metrics("error", start_time)
+            return False
+    
+    async def aget_or_set(self, key: str, factory: Callable[[], Any], ttl: Optional[int] = None) -> Any:
+        """Async variant of get_or_set(); factory may be sync or a coroutine function."""
+        value = await self.aget(key)
+        if value is not None:
+            return value
+        
+        new_value = factory()
+        if inspect.isawaitable(new_value):
+            new_value = await new_value
+        await self.aset(key, new_value, ttl)
+        return new_value
+    
+    async def aincrement(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        """Async variant of increment()."""
+        tenant_key = await self._aget_tenant_key(key)
+        cache_ttl = ttl or self.config.default_ttl_seconds
+        
+        try:
+            client = self._get_async_redis()
+            if client is not None:
+                result = await self._circuit_breaker.call_async(client.incrby, tenant_key, amount)
+                # Set TTL if this is a new key
+                if result == amount:
+                    await client.expire(tenant_key, cache_ttl)
+                return result
+            
+            current = await self.aget(key, 0)
+            new_value = current + amount
+            await self.aset(key, new_value, cache_ttl)
+            return new_value
+            
+        except Exception as e:
+            logger.error(f"Cache increment failed for key {tenant_key}: {e}")
+            return 0
+    
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Async variant of get_many(); Redis misses are fetched in one pipeline."""
+        result = {}
+        tenant_keys = {key: await self._aget_tenant_key(key) for key in keys}
+        
+        missing = []
+        for key, tenant_key in tenant_keys.items():
+            value = self._memory_cache.get(tenant_key)
+            if value is not None:
+                result[key] = value
+            else:
+                missing.append(key)
+        
+        client = self._get_async_redis()
+        if missing and client is not None:
+            try:
+                # Pipelined GETs (unlike MGET) also work across cluster slots
+                pipe = client.pipeline(transaction=False)
+                for key in missing:
+                    pipe.get(tenant_keys[key])
+                redis_values = await self._circuit_breaker.call_async(pipe.execute)
+                
+                for key, redis_value in zip(missing, redis_values):
+                    if redis_value is None:
+                        continue
+                    try:
+                        value = self._deserialize_value(redis_value)
+                        result[key] = value
+                        self._memory_cache.set(tenant_keys[key], value, self.config.default_ttl_seconds)
+                    except Exception as e:
+                        logger.warning(f"Failed to deserialize value for key {key}: {e}")
+                        
+            except Exception as e:
+                logger.error(f"Redis pipelined get failed: {e}")
+        
+        return result
+    
+    async def aset_many(self, data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Async variant of set_many(); Redis writes go out in one pipeline."""
+        cache_ttl = ttl or self.config.default_ttl_seconds
+        
+        try:
+            tenant_keys = {key: await self._aget_tenant_key(key) for key in data}
+            for key, value in data.items():
+                self._memory_cache.set(tenant_keys[key], value, cache_ttl)
+            
+            client = self._get_async_redis()
+            if client is not None:
+                try:
+                    pipe = client.pipeline(transaction=False)
+                    for key, value in data.items():
+                        pipe.setex(tenant_keys[key], cache_ttl, self._serialize_value(value))
+                    await self._circuit_breaker.call_async(pipe.execute)
+                except Exception as e:
+                    logger.warning(f"Redis pipelined set failed: {e}")
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Cache set_many failed: {e}")
+            return False
+    
+    async def aclear_tenant_cache(self, tenant_id: UUID):
+        """Async variant of clear_tenant_cache()."""
+        prefix = self._tenant_namespace(tenant_id, None)
+        
+        try:
+            self._memory_cache.delete_partition(prefix)
+            
+            client = self._get_async_redis()
+            if client is not None:
+                try:
+                    if self.config.tenant_namespace_versioning:
+                        version = await self._circuit_breaker.call_async(
+                            client.incr, self._namespace_version_key(tenant_id)
                         )
+                        self._remember_namespace_version(tenant_id, int(version))
+                    else:
+                        batch = []
+                        async for key in client.scan_iter(match=f"{prefix}*", count=self.config.scan_batch_size):
+                            batch.append(key)
+                            if len(batch) >= self.config.scan_batch_size:
+                                await self._circuit_breaker.call_async(client.unlink, *batch)
+                                batch = []
+                        if batch:
+                            await self._circuit_breaker.call_async(client.unlink, *batch)
                 except Exception as e:
                     logger.warning(f"Redis clear tenant cache failed: {e}")
+            elif self.config.tenant_namespace_versioning:
+                current = self._namespace_versions.get(str(tenant_id), (0, 0.0))[0]
+                self._remember_namespace_version(tenant_id, current + 1)
             
             logger.info(f"Cleared cache for tenant {tenant_id}")
             
@@ -735,6 +1257,18 @@ class CacheManager:
                 self._redis_client.close()
             except:
                 pass
+    
+    async def aclose(self):
+        """Cleanup resources including the async Redis connection pool."""
+        client = self._async_redis_client
+        self._async_redis_client = None
+        if client is not None:
+            try:
+                close = getattr(client, "aclose", None) or client.close
+                await close()
+            except Exception as e:
+                logger.warning(f"Async Redis close failed: {e}")
+        self.close()
 
 
 # Global cache manager instance
@@ -10,6 +10,7 @@ from .user import User, UserRole, UserServiceAccess
 from .organization import Organization, OrganizationUser
 from .integration import Integration, IntegrationCredentials
 from .firs_submission import FIRSSubmission
+from .firs_submission_rollup import FIRSSubmissionDailyRollup
 from .validation_batch import ValidationBatchResult
 from .onboarding_state import OnboardingStateORM
 from .si_app_correlation import SIAPPCorrelation, CorrelationStatus
@@ -19,6 +20,7 @@ from .banking import (
     BankingWebhook, BankingSyncLog, BankingCredentials,
     BankingProvider, ConnectionStatus, TransactionType, AccountType
 )
+from .banking_sync_state import BankingSyncCursor, BankingSyncDedupeKey
 from .business_systems import (
     # ERP Models
     ERPConnection, ERPSyncLog,
@@ -66,6 +68,7 @@ __all__ = [
     "Integration",
     "IntegrationCredentials",
     "FIRSSubmission",
+    "FIRSSubmissionDailyRollup",
     "ValidationBatchResult",
     "OnboardingStateORM",
     "SIAPPCorrelation",
@@ -82,6 +85,8 @@ __all__ = [
     "ConnectionStatus",
     "TransactionType",
     "AccountType",
+    "BankingSyncCursor",
+    "BankingSyncDedupeKey",
     # Business Systems Models
     "ERPConnection",
     "ERPSyncLog",
@@ -0,0 +1,43 @@
+"""
+Banking Sync State
+==================
+
+Durable cursor and dedupe state for provider transaction syncs (see
+``providers.mono.sync_state.SqlSyncStateStore``). Dedupe keys are held
+exactly in ``banking_sync_dedupe_keys`` for the retention window; older keys
+are folded into the per-account Bloom filter stored on the cursor row and
+deleted.
+"""
+
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, String, func
+
+from .base import Base
+
+
+class BankingSyncCursor(Base):
+    """Pagination cursor and compacted dedupe filter for one provider account."""
+
+    __tablename__ = "banking_sync_cursors"
+
+    provider = Column(String(50), primary_key=True)
+    account_id = Column(String(255), primary_key=True)
+
+    cursor = Column(String(512), nullable=True)
+    seen_filter = Column(LargeBinary, nullable=True)
+    seen_filter_items = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True)
+
+
+class BankingSyncDedupeKey(Base):
+    """Transaction dedupe key seen within the retention window."""
+
+    __tablename__ = "banking_sync_dedupe_keys"
+
+    provider = Column(String(50), primary_key=True)
+    account_id = Column(String(255), primary_key=True)
+    dedupe_key = Column(String(64), primary_key=True)
+    seen_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_banking_sync_dedupe_keys_account_seen_at", "provider", "account_id", "seen_at"),
+    )
@@ -0,0 +1,228 @@
+"""
+FIRS Submission Daily Rollups
+=============================
+
+Per-organization, per-day (UTC ``created_at`` date) submission counts by
+status, plus the summed submitted→accepted processing time. Rows are kept in
+step with ``firs_submissions`` by a ``before_flush`` hook that turns every ORM
+insert, status transition and delete into signed deltas, written in the same
+transaction as the submission change.
+
+Bulk ``update()``/``delete()`` statements bypass the hook; use
+``backfill_submission_rollups`` / ``check_submission_rollups`` in
+``repositories.firs_submission_rollups_async`` to rebuild or verify rows.
+"""
+
+import logging
+import time
+import weakref
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String, event, func, inspect, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from .base import Base
+from .firs_submission import FIRSSubmission, SubmissionStatus
+
+logger = logging.getLogger(__name__)
+
+RollupKey = Tuple[Any, date, str]
+
+_TRACKED_ATTRIBUTES = ("organization_id", "created_at", "status", "submitted_at", "accepted_at")
+
+
+class FIRSSubmissionDailyRollup(Base):
+    """Daily submission counters for dashboard queries."""
+
+    __tablename__ = "firs_submission_daily_rollups"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+
+    submission_count = Column(Integer, nullable=False, default=0)
+    processing_seconds_total = Column(Float, nullable=False, default=0.0)
+    processing_samples = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True)
+
+
+def rollup_day(created_at: Optional[datetime]) -> date:
+    """UTC calendar day a submission is counted under."""
+    if created_at is None:
+        # Not yet populated by the server default; it will be "now"
+        return datetime.now(timezone.utc).date()
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+def processing_seconds(submitted_at: Optional[datetime], accepted_at: Optional[datetime]) -> Optional[float]:
+    """Submitted→accepted duration, or None when not measurable."""
+    if not submitted_at or not accepted_at:
+        return None
+    try:
+        seconds = (accepted_at - submitted_at).total_seconds()
+    except TypeError:
+        # Mixed naive/aware values; SQLite drops tzinfo on read
+        seconds = (accepted_at.replace(tzinfo=None) - submitted_at.replace(tzinfo=None)).total_seconds()
+    return seconds if seconds > 0 else None
+
+
+def submission_contribution(values: Dict[str, Any]) -> Optional[Tuple[RollupKey, float, int]]:
+    """Rollup key, processing seconds and sample count contributed by one submission."""
+    organization_id = values.get("organization_id")
+    status = values.get("status")
+    if organization_id is None or status is None:
+        return None
+
+    status_value = status.value if isinstance(status, SubmissionStatus) else str(status)
+    seconds = processing_seconds(values.get("submitted_at"), values.get("accepted_at"))
+    key = (organization_id, rollup_day(values.get("created_at")), status_value)
+    return key, seconds or 0.0, 1 if seconds is not None else 0
+
+
+def _previous_values(submission: FIRSSubmission) -> Dict[str, Any]:
+    state = inspect(submission)
+    values = {}
+    for name in _TRACKED_ATTRIBUTES:
+        history = state.attrs[name].load_history()
+        if history.deleted:
+            values[name] = history.deleted[0]
+        elif history.unchanged:
+            values[name] = history.unchanged[0]
+        else:
+            values[name] = None
+    return values
+
+
+def _current_values(submission: FIRSSubmission) -> Dict[str, Any]:
+    return {name: getattr(submission, name) for name in _TRACKED_ATTRIBUTES}
+
+
+def _add(deltas: Dict[RollupKey, list], contribution, sign: int) -> None:
+    if contribution is None:
+        return
+    key, seconds, samples = contribution
+    delta = deltas[key]
+    delta[0] += sign
+    delta[1] += sign * seconds
+    delta[2] += sign * samples
+
+
+def collect_rollup_deltas(session: Session) -> Dict[RollupKey, list]:
+    """Net [count, seconds, samples] change per rollup key for pending ORM changes."""
+    deltas: Dict[RollupKey, list] = defaultdict(lambda: [0, 0.0, 0])
+
+    for obj in session.new:
+        if isinstance(obj, FIRSSubmission):
+            _add(deltas, submission_contribution(_current_values(obj)), 1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, FIRSSubmission) or not session.is_modified(obj):
+            continue
+        before = submission_contribution(_previous_values(obj))
+        after = submission_contribution(_current_values(obj))
+        if before != after:
+            _add(deltas, before, -1)
+            _add(deltas, after, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, FIRSSubmission):
+            _add(deltas, submission_contribution(_previous_values(obj)), -1)
+
+    return {key: delta for key, delta in deltas.items() if delta[0] or delta[1] or delta[2]}
+
+
+def apply_rollup_deltas(connection, deltas: Dict[RollupKey, list]) -> None:
+    """Upsert signed deltas into the rollup table."""
+    if not deltas:
+        return
+
+    table = FIRSSubmissionDailyRollup.__table__
+    rows = [
+        {
+            "organization_id": organization_id,
+            "day": day,
+            "status": status,
+            "submission_count": count,
+            "processing_seconds_total": seconds,
+            "processing_samples": samples,
+        }
+        for (organization_id, day, status), (count, seconds, samples) in deltas.items()
+    ]
+
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(connection.dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.organization_id, table.c.day, table.c.status],
+            set_={
+                "submission_count": table.c.submission_count + stmt.excluded.submission_count,
+                "processing_seconds_total": table.c.processing_seconds_total + stmt.excluded.processing_seconds_total,
+                "processing_samples": table.c.processing_samples + stmt.excluded.processing_samples,
+                "updated_at": func.now(),
+            },
+        )
+        connection.execute(stmt, rows)
+        return
+
+    # Portable fallback: update in place, insert keys that do not exist yet
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(
+                table.c.organization_id == row["organization_id"],
+                table.c.day == row["day"],
+                table.c.status == row["status"],
+            )
+            .values(
+                submission_count=table.c.submission_count + row["submission_count"],
+                processing_seconds_total=table.c.processing_seconds_total + row["processing_seconds_total"],
+                processing_samples=table.c.processing_samples + row["processing_samples"],
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**row))
+
+
+# Engines known to have the rollup table are cached for good; a missing table
+# is rechecked after MISSING_TABLE_RECHECK_SECONDS so a later migration is
+# picked up without a restart
+MISSING_TABLE_RECHECK_SECONDS = 300.0
+_engines_with_rollups: "weakref.WeakSet" = weakref.WeakSet()
+_engines_missing_rollups: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def rollup_table_available(connection) -> bool:
+    """Whether the rollup table exists for the connection's engine (cached)."""
+    engine = connection.engine
+    if engine in _engines_with_rollups:
+        return True
+    now = time.monotonic()
+    missing_since = _engines_missing_rollups.get(engine)
+    if missing_since is not None and now - missing_since < MISSING_TABLE_RECHECK_SECONDS:
+        return False
+    if inspect(connection).has_table(FIRSSubmissionDailyRollup.__tablename__):
+        _engines_with_rollups.add(engine)
+        _engines_missing_rollups.pop(engine, None)
+        return True
+    if missing_since is None:
+        logger.warning(
+            "Table %s missing; skipping rollup maintenance and reading firs_submissions until it is migrated",
+            FIRSSubmissionDailyRollup.__tablename__,
+        )
+    _engines_missing_rollups[engine] = now
+    return False
+
+
+@event.listens_for(Session, "before_flush")
+def _maintain_submission_rollups(session: Session, flush_context, instances) -> None:
+    deltas = collect_rollup_deltas(session)
+    if deltas:
+        connection = session.connection()
+        if rollup_table_available(connection):
+            apply_rollup_deltas(connection, deltas)
@@ -28,6 +28,10 @@ from core_platform.data_management.models.firs_submission import (
 from core_platform.data_management.repositories.validation_batch_repo_async import (
     list_recent_validation_batches,
 )
+from core_platform.data_management.repositories.firs_submission_rollups_async import (
+    get_rollup_daily_totals,
+    get_rollup_status_totals,
+)
 from core_platform.monitoring.prometheus_integration import get_prometheus_integration
 
 
@@ -187,58 +191,24 @@ async def get_submission_metrics(
                 "todayTransmissions": 0,
             }
 
-    from sqlalchemy import select, func
-    from datetime import datetime, timezone
-    from core_platform.data_management.models.firs_submission import SubmissionStatus, FIRSSubmission
-
     start = time.monotonic()
     outcome = "success"
     try:
-        # Totals by status
-        status_stmt = (
-        select(FIRSSubmission.status, func.count(FIRSSubmission.id))
-        .where(FIRSSubmission.organization_id == org_id)
-        .group_by(FIRSSubmission.status)
-        )
-        res = await db.execute(status_stmt)
-        by_status = {row[0]: row[1] for row in res.all()}
+        # Single read over the daily rollups (O(days x statuses))
+        totals = await get_rollup_status_totals(db, organization_id=org_id)
+        by_status = totals["by_status"]
 
         total = sum(by_status.values())
-        processing = sum(by_status.get(s, 0) for s in (SubmissionStatus.PENDING, SubmissionStatus.PROCESSING))
-        completed = by_status.get(SubmissionStatus.ACCEPTED, 0)
-        failed = sum(by_status.get(s, 0) for s in (SubmissionStatus.REJECTED, SubmissionStatus.FAILED))
-        submitted = by_status.get(SubmissionStatus.SUBMITTED, 0)
-
-        # Today transmissions (UTC, created_at date)
-        today = datetime.now(timezone.utc).date()
-        today_stmt = (
-            select(func.count(FIRSSubmission.id))
-            .where(
-                FIRSSubmission.organization_id == org_id,
-                func.date(FIRSSubmission.created_at) == today.isoformat(),
-            )
-        )
-        today_count = (await db.execute(today_stmt)).scalar_one_or_none() or 0
+        processing = sum(by_status.get(s.value, 0) for s in (SubmissionStatus.PENDING, SubmissionStatus.PROCESSING))
+        completed = by_status.get(SubmissionStatus.ACCEPTED.value, 0)
+        failed = sum(by_status.get(s.value, 0) for s in (SubmissionStatus.REJECTED, SubmissionStatus.FAILED))
+        submitted = by_status.get(SubmissionStatus.SUBMITTED.value, 0)
+        today_count = totals["today"]
 
         # Average processing time over accepted submissions (in minutes)
-        time_stmt = (
-            select(FIRSSubmission.submitted_at, FIRSSubmission.accepted_at)
-            .where(
-                FIRSSubmission.organization_id == org_id,
-                FIRSSubmission.accepted_at.isnot(None),
-                FIRSSubmission.submitted_at.isnot(None),
-            )
-        )
-        times = (await db.execute(time_stmt)).all()
         avg_minutes = None
-        if times:
-            deltas = [
-                (acc - sub).total_seconds() / 60.0
-                for (sub, acc) in times
-                if acc and sub and acc > sub
-            ]
-            if deltas:
-                avg_minutes = round(sum(deltas) / len(deltas), 2)
+        if totals["processing_samples"]:
+            avg_minutes = round(totals["processing_seconds_total"] / totals["processing_samples"] / 60.0, 2)
 
         success_rate = round((completed / total) * 100.0, 2) if total else 0.0
 
@@ -261,11 +231,11 @@ async def get_submission_metrics(
         if integ:
             integ.record_metric(
                 "taxpoynt_repository_queries_total", 1,
-                {"repository": "firs_submission", "method": "get_submission_metrics", "table": "firs_submissions", "outcome": outcome}
+                {"repository": "firs_submission", "method": "get_submission_metrics", "table": "firs_submission_daily_rollups", "outcome": outcome}
             )
             integ.record_metric(
                 "taxpoynt_repository_query_duration_seconds", dt,
-                {"repository": "firs_submission", "method": "get_submission_metrics", "table": "firs_submissions"}
+                {"repository": "firs_submission", "method": "get_submission_metrics", "table": "firs_submission_daily_rollups"}
             )
 
 
@@ -622,16 +592,8 @@ async def get_status_distribution(
         except Exception:
             return {}
 
-    stmt = (
-        select(FIRSSubmission.status, func.count(FIRSSubmission.id))
-        .where(FIRSSubmission.organization_id == org_id)
-        .group_by(FIRSSubmission.status)
-    )
-    res = await db.execute(stmt)
-    return {
-        (status.value if status else "unknown"): int(count)
-        for status, count in res.all()
-    }
+    totals = await get_rollup_status_totals(db, organization_id=org_id)
+    return dict(totals["by_status"])
 
 
 async def get_validation_metrics_data(
@@ -975,18 +937,11 @@ async def get_tracking_overview_data(
                 org_id = None
         if org_id:
             start_date = datetime.now(timezone.utc).date()
-            day_counts: Dict[str, int] = {}
-            stmt = (
-                select(func.date(FIRSSubmission.created_at), func.count(FIRSSubmission.id))
-                .where(
-                    FIRSSubmission.organization_id == org_id,
-                    FIRSSubmission.created_at >= datetime.now(timezone.utc) - timedelta(days=trend_days - 1),
-                )
-                .group_by(func.date(FIRSSubmission.created_at))
+            day_counts = await get_rollup_daily_totals(
+                db,
+                organization_id=org_id,
+                since=start_date - timedelta(days=trend_days - 1),
             )
-            res = await db.execute(stmt)
-            for date_str, count in res.all():
-                day_counts[str(date_str)] = int(count)
             for idx in range(trend_days - 1, -1, -1):
                 day = start_date - timedelta(days=idx)
                 key = day.isoformat()
@@ -0,0 +1,291 @@
+"""
+Async Repository: FIRS Submission Rollups
+=========================================
+
+Dashboard reads over ``firs_submission_daily_rollups`` plus the backfill and
+consistency-check jobs that keep the table honest. Reads touch one row per
+(day, status) for an organization instead of scanning its submissions. Until
+the table has been migrated they aggregate ``firs_submissions`` instead.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+from uuid import UUID as UUIDType
+import uuid
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core_platform.data_management.models.firs_submission import FIRSSubmission
+from core_platform.data_management.models.firs_submission_rollup import (
+    FIRSSubmissionDailyRollup,
+    RollupKey,
+    rollup_table_available,
+    submission_contribution,
+)
+
+# Float sums of processing seconds drift slightly with update order
+_SECONDS_TOLERANCE = 1e-3
+
+
+def _normalize_org_id(organization_id: Optional[Union[UUIDType, str]]) -> Optional[UUIDType]:
+    if organization_id is None or isinstance(organization_id, uuid.UUID):
+        return organization_id
+    try:
+        return uuid.UUID(str(organization_id))
+    except Exception:
+        return None
+
+
+async def _rollups_available(db: AsyncSession) -> bool:
+    return await db.run_sync(lambda session: rollup_table_available(session.connection()))
+
+
+async def get_rollup_status_totals(
+    db: AsyncSession,
+    *,
+    organization_id: UUIDType,
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Counts by status, today's count and summed processing time, in one query."""
+    today = today or datetime.now(timezone.utc).date()
+    if not await _rollups_available(db):
+        rows = _group_source_rollups(
+            await _compute_rollups_from_source(db, organization_id=organization_id, batch_size=5000),
+            lambda key: key[2],
+            today=today,
+        )
+    else:
+        rows = await _query_status_totals(db, organization_id=organization_id, today=today)
+
+    by_status: Dict[str, int] = {}
+    today_count = 0
+    seconds_total = 0.0
+    samples = 0
+    for status, count, count_today, seconds, sample_count in rows:
+        if count:
+            by_status[status] = int(count)
+        today_count += int(count_today or 0)
+        seconds_total += float(seconds or 0.0)
+        samples += int(sample_count or 0)
+
+    return {
+        "by_status": by_status,
+        "today": today_count,
+        "processing_seconds_total": seconds_total,
+        "processing_samples": samples,
+    }
+
+
+async def _query_status_totals(db: AsyncSession, *, organization_id: UUIDType, today: date) -> list:
+    rollup = FIRSSubmissionDailyRollup
+    stmt = (
+        select(
+            rollup.status,
+            func.sum(rollup.submission_count),
+            func.sum(case((rollup.day == today, rollup.submission_count), else_=0)),
+            func.sum(rollup.processing_seconds_total),
+            func.sum(rollup.processing_samples),
+        )
+        .where(rollup.organization_id == organization_id)
+        .group_by(rollup.status)
+    )
+    return (await db.execute(stmt)).all()
+
+
+async def get_rollup_daily_totals(
+    db: AsyncSession,
+    *,
+    organization_id: UUIDType,
+    since: date,
+) -> Dict[str, int]:
+    """Submissions created per day (ISO date keys) from ``since`` onwards."""
+    if not await _rollups_available(db):
+        totals = await _compute_rollups_from_source(db, organization_id=organization_id, batch_size=5000)
+        rows = _group_source_rollups(
+            {key: entry for key, entry in totals.items() if key[1] >= since}, lambda key: key[1]
+        )
+        return {day.isoformat(): int(count) for day, count, *_ in rows}
+
+    rollup = FIRSSubmissionDailyRollup
+    stmt = (
+        select(rollup.day, func.sum(rollup.submission_count))
+        .where(rollup.organization_id == organization_id, rollup.day >= since)
+        .group_by(rollup.day)
+    )
+    rows = (await db.execute(stmt)).all()
+    return {day.isoformat(): int(count or 0) for day, count in rows}
+
+
+async def _compute_rollups_from_source(
+    db: AsyncSession,
+    *,
+    organization_id: Optional[UUIDType],
+    batch_size: int,
+) -> Dict[RollupKey, List[float]]:
+    """Aggregate rollup rows straight from ``firs_submissions``."""
+    stmt = select(
+        FIRSSubmission.organization_id,
+        FIRSSubmission.created_at,
+        FIRSSubmission.status,
+        FIRSSubmission.submitted_at,
+        FIRSSubmission.accepted_at,
+    ).execution_options(yield_per=batch_size)
+    if organization_id is not None:
+        stmt = stmt.where(FIRSSubmission.organization_id == organization_id)
+
+    totals: Dict[RollupKey, List[float]] = defaultdict(lambda: [0, 0.0, 0])
+    result = await db.stream(stmt)
+    async for partition in result.partitions(batch_size):
+        for org_id, created_at, status, submitted_at, accepted_at in partition:
+            contribution = submission_contribution({
+                "organization_id": org_id,
+                "created_at": created_at,
+                "status": status,
+                "submitted_at": submitted_at,
+                "accepted_at": accepted_at,
+            })
+            if contribution is None:
+                continue
+            key, seconds, samples = contribution
+            entry = totals[key]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += samples
+    return totals
+
+
+def _group_source_rollups(
+    totals: Dict[RollupKey, List[float]],
+    group_key,
+    *,
+    today: Optional[date] = None,
+) -> List[tuple]:
+    """(group, count, count_today, seconds, samples) rows shaped like the rollup queries."""
+    grouped: Dict[Any, List[float]] = defaultdict(lambda: [0, 0, 0.0, 0])
+    for key, (count, seconds, samples) in totals.items():
+        entry = grouped[group_key(key)]
+        entry[0] += count
+        entry[1] += count if key[1] == today else 0
+        entry[2] += seconds
+        entry[3] += samples
+    return [(group, *entry) for group, entry in grouped.items()]
+
+
+async def _load_rollups(
+    db: AsyncSession,
+    *,
+    organization_id: Optional[UUIDType],
+) -> Dict[RollupKey, List[float]]:
+    rollup = FIRSSubmissionDailyRollup
+    stmt = select(
+        rollup.organization_id,
+        rollup.day,
+        rollup.status,
+        rollup.submission_count,
+        rollup.processing_seconds_total,
+        rollup.processing_samples,
+    )
+    if organization_id is not None:
+        stmt = stmt.where(rollup.organization_id == organization_id)
+    rows = (await db.execute(stmt)).all()
+    return {
+        (org_id, day, status): [count, seconds, samples]
+        for org_id, day, status, count, seconds, samples in rows
+        if count or seconds or samples
+    }
+
+
+async def backfill_submission_rollups(
+    db: AsyncSession,
+    *,
+    organization_id: Optional[Union[UUIDType, str]] = None,
+    batch_size: int = 5000,
+) -> Dict[str, int]:
+    """Rebuild rollup rows from ``firs_submissions`` and commit.
+
+    Scope to one organization with ``organization_id``; otherwise every
+    organization is rebuilt. Submissions written concurrently by other
+    sessions may be missed, so run it while writers are quiet or follow it
+    with ``check_submission_rollups``.
+    """
+    org_id = _normalize_org_id(organization_id)
+    if organization_id is not None and org_id is None:
+        return {"rows": 0, "submissions": 0}
+
+    totals = await _compute_rollups_from_source(db, organization_id=org_id, batch_size=batch_size)
+
+    delete_stmt = delete(FIRSSubmissionDailyRollup)
+    if org_id is not None:
+        delete_stmt = delete_stmt.where(FIRSSubmissionDailyRollup.organization_id == org_id)
+    await db.execute(delete_stmt)
+
+    rows = [
+        {
+            "organization_id": key[0],
+            "day": key[1],
+            "status": key[2],
+            "submission_count": int(count),
+            "processing_seconds_total": float(seconds),
+            "processing_samples": int(samples),
+        }
+        for key, (count, seconds, samples) in totals.items()
+    ]
+    if rows:
+        await db.execute(FIRSSubmissionDailyRollup.__table__.insert(), rows)
+    await db.commit()
+
+    return {"rows": len(rows), "submissions": int(sum(entry[0] for entry in totals.values()))}
+
+
+async def check_submission_rollups(
+    db: AsyncSession,
+    *,
+    organization_id: Optional[Union[UUIDType, str]] = None,
+    repair: bool = False,
+    batch_size: int = 5000,
+) -> Dict[str, Any]:
+    """Compare rollup rows with a fresh aggregation of ``firs_submissions``.
+
+    Returns ``consistent`` and a list of mismatching keys. With ``repair``,
+    organizations that drifted are rebuilt via ``backfill_submission_rollups``.
+    """
+    org_id = _normalize_org_id(organization_id)
+    if organization_id is not None and org_id is None:
+        return {"consistent": True, "checked": 0, "mismatches": [], "repaired": []}
+
+    expected = await _compute_rollups_from_source(db, organization_id=org_id, batch_size=batch_size)
+    actual = await _load_rollups(db, organization_id=org_id)
+
+    mismatches: List[Dict[str, Any]] = []
+    for key in set(expected) | set(actual):
+        want = expected.get(key, [0, 0.0, 0])
+        have = actual.get(key, [0, 0.0, 0])
+        if (
+            int(want[0]) != int(have[0])
+            or int(want[2]) != int(have[2])
+            or abs(float(want[1]) - float(have[1])) > _SECONDS_TOLERANCE
+        ):
+            mismatches.append({
+                "organization_id": str(key[0]),
+                "day": key[1].isoformat(),
+                "status": key[2],
+                "expected": {"count": int(want[0]), "processing_seconds": float(want[1]), "samples": int(want[2])},
+                "actual": {"count": int(have[0]), "processing_seconds": float(have[1]), "samples": int(have[2])},
+            })
+
+    repaired: List[str] = []
+    if repair and mismatches:
+        for drifted in sorted({m["organization_id"] for m in mismatches}):
+            await backfill_submission_rollups(db, organization_id=drifted, batch_size=batch_size)
+            repaired.append(drifted)
+
+    mismatches.sort(key=lambda m: (m["organization_id"], m["day"], m["status"]))
+    return {
+        "consistent": not mismatches,
+        "checked": len(set(expected) | set(actual)),
+        "mismatches": mismatches,
+        "repaired": repaired,
+    }
@@ -9,7 +9,7 @@ correlation ID).
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 from uuid import UUID
 import uuid
 
@@ -22,6 +22,21 @@ from core_platform.data_management.models.si_app_correlation import (
 )
 
 
+# Keeps IN (...) lists well below driver parameter limits
+BULK_LOOKUP_CHUNK_SIZE = 500
+
+
+@dataclass
+class InvoiceReference:
+    """Identifiers for one invoice, as accepted by get_invoice_record."""
+
+    invoice_number: Optional[str] = None
+    submission_id: Optional[str | UUID] = None
+    irn: Optional[str] = None
+    correlation_id: Optional[str] = None
+    si_invoice_id: Optional[str] = None
+
+
 @dataclass
 class InvoiceRecord:
     """Resolved invoice payload and related identifiers."""
@@ -131,6 +146,124 @@ async def get_invoice_records_by_numbers(
     return results
 
 
+async def get_invoice_records_bulk(
+    session: AsyncSession,
+    *,
+    organization_id: Optional[str | UUID],
+    references: Sequence[InvoiceReference],
+) -> List[Optional[InvoiceRecord]]:
+    """Resolve many references with a fixed number of set-based queries.
+
+    Returns one entry per reference, in order, with the same precedence as
+    get_invoice_record: submission by ID, then by invoice number, then by
+    IRN, then the correlation matching every identifier supplied. Each
+    lookup kind is a single IN query per BULK_LOOKUP_CHUNK_SIZE identifiers.
+    """
+    if not references:
+        return []
+
+    org_uuid = _coerce_uuid(organization_id)
+    submission_ids = {_coerce_uuid(ref.submission_id) for ref in references} - {None}
+    invoice_numbers = {ref.invoice_number for ref in references if ref.invoice_number}
+    irns = {ref.irn for ref in references if ref.irn}
+
+    by_id: Dict[UUID, FIRSSubmission] = {}
+    by_number: Dict[str, FIRSSubmission] = {}
+    by_irn: Dict[str, FIRSSubmission] = {}
+    for submission in await _select_in_chunks(session, FIRSSubmission, FIRSSubmission.id, submission_ids, org_uuid):
+        by_id[submission.id] = submission
+    for submission in await _select_in_chunks(
+        session, FIRSSubmission, FIRSSubmission.invoice_number, invoice_numbers, org_uuid
+    ):
+        by_number.setdefault(submission.invoice_number, submission)
+    for submission in await _select_in_chunks(session, FIRSSubmission, FIRSSubmission.irn, irns, org_uuid):
+        by_irn.setdefault(submission.irn, submission)
+
+    results: List[Optional[InvoiceRecord]] = []
+    unresolved: List[int] = []
+    for index, ref in enumerate(references):
+        submission = (
+            by_id.get(_coerce_uuid(ref.submission_id))
+            or (by_number.get(ref.invoice_number) if ref.invoice_number else None)
+            or (by_irn.get(ref.irn) if ref.irn else None)
+        )
+        results.append(_record_from_submission(submission) if submission else None)
+        if submission is None:
+            unresolved.append(index)
+
+    if unresolved:
+        correlations = await _select_correlation_candidates(
+            session, org_uuid, [references[index] for index in unresolved]
+        )
+        correlation_index: Dict[str, Dict[Any, List[SIAPPCorrelation]]] = {
+            field: {} for field in _CORRELATION_FIELDS
+        }
+        for correlation in correlations:
+            for field in _CORRELATION_FIELDS:
+                correlation_index[field].setdefault(getattr(correlation, field), []).append(correlation)
+        for index in unresolved:
+            correlation = _match_correlation(correlation_index, references[index])
+            if correlation:
+                results[index] = _record_from_correlation(correlation)
+
+    return results
+
+
+async def _select_in_chunks(
+    session: AsyncSession,
+    model: Any,
+    column: Any,
+    values: Iterable[Any],
+    organization_id: Optional[UUID],
+) -> List[Any]:
+    values = list(values)
+    rows: List[Any] = []
+    for start in range(0, len(values), BULK_LOOKUP_CHUNK_SIZE):
+        stmt = select(model).where(column.in_(values[start:start + BULK_LOOKUP_CHUNK_SIZE]))
+        if organization_id:
+            stmt = stmt.where(model.organization_id == organization_id)
+        rows.extend((await session.execute(stmt)).scalars().all())
+    return rows
+
+
+_CORRELATION_FIELDS = ("correlation_id", "invoice_number", "irn", "si_invoice_id")
+
+
+async def _select_correlation_candidates(
+    session: AsyncSession,
+    organization_id: Optional[UUID],
+    references: Sequence[InvoiceReference],
+) -> List[SIAPPCorrelation]:
+    values: Dict[str, set] = {
+        field: {getattr(ref, field) for ref in references if getattr(ref, field)}
+        for field in _CORRELATION_FIELDS
+    }
+    candidates: Dict[Any, SIAPPCorrelation] = {}
+    for field, field_values in values.items():
+        for correlation in await _select_in_chunks(
+            session, SIAPPCorrelation, getattr(SIAPPCorrelation, field), field_values, organization_id
+        ):
+            candidates.setdefault(correlation.id, correlation)
+    return list(candidates.values())
+
+
+def _match_correlation(
+    correlation_index: Mapping[str, Mapping[Any, List[SIAPPCorrelation]]],
+    reference: InvoiceReference,
+) -> Optional[SIAPPCorrelation]:
+    # Mirrors _find_correlation: every supplied identifier must match
+    wanted: Mapping[str, Any] = {
+        field: getattr(reference, field) for field in _CORRELATION_FIELDS if getattr(reference, field)
+    }
+    if not wanted:
+        return None
+    field, value = next(iter(wanted.items()))
+    for correlation in correlation_index[field].get(value, ()):
+        if all(getattr(correlation, field) == value for field, value in wanted.items()):
+            return correlation
+    return None
+
+
 async def _find_submission(
     session: AsyncSession,
     *,
@@ -247,5 +380,11 @@ def _extract_irn(data: Any) -> Optional[str]:
     return None
 
 
-__all__ = ["InvoiceRecord", "get_invoice_record", "get_invoice_records_by_numbers"]
+__all__ = [
+    "InvoiceRecord",
+    "InvoiceReference",
+    "get_invoice_record",
+    "get_invoice_records_bulk",
+    "get_invoice_records_by_numbers",
+]
 
@@ -2,26 +2,52 @@
 Idempotency Store (Async)
 =========================
 Helper for DB-backed idempotency using the IdempotencyKey model.
-Falls back to in-memory cache if DB operations fail (best-effort).
+
+- On PostgreSQL and SQLite a key is reserved with one
+  ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` statement that either
+  inserts the IN_PROGRESS row or returns the existing one; other dialects use
+  SELECT then INSERT.
+- SUCCEEDED keys are kept in a short-TTL in-process tier, so replays of a
+  finished request are answered without touching the database.
+- Falls back to an in-memory cache if DB operations fail (best-effort, per
+  process only; logged as a warning).
 """
 from __future__ import annotations
 
 import asyncio
 import json
 import hashlib
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
 from typing import Any, Dict, Optional, Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 
 from core_platform.data_management.models import IdempotencyKey, IdempotencyStatus
 
+logger = logging.getLogger(__name__)
 
 _MEM_CACHE: Dict[str, Dict[str, Any]] = {}
 _MEM_LOCK = asyncio.Lock()
 
+# (requester_id, key) -> (expires_at, request_hash, response, status_code)
+_SUCCEEDED_CACHE: "OrderedDict[Tuple[Optional[uuid.UUID], str], Tuple[float, str, Dict[str, Any], int]]" = OrderedDict()
+_SUCCEEDED_CACHE_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_HOT_CACHE_SECONDS", "60"))
+_SUCCEEDED_CACHE_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_HOT_CACHE_MAX_ENTRIES", "10000"))
+
+# Namespace for requester labels that are not UUIDs (e.g. "firs_webhook")
+_REQUESTER_NAMESPACE = uuid.UUID("5d1f0f0e-2c55-4c1e-9a43-6f1c2b7f7a10")
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+TryBeginResult = Tuple[bool, Optional[Dict[str, Any]], Optional[int], bool]
+
 
 def _canonical_json_hash(data: Any) -> str:
     try:
@@ -31,6 +57,71 @@ def _canonical_json_hash(data: Any) -> str:
     return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
+def _requester_uuid(requester_id: Any) -> Optional[uuid.UUID]:
+    """Map a requester to the UUID stored in ``requester_id``.
+
+    UUIDs (and UUID strings) are kept; other labels get a stable UUIDv5 so
+    service callers share one scope instead of failing to bind.
+    """
+    if requester_id is None or isinstance(requester_id, uuid.UUID):
+        return requester_id
+    try:
+        return uuid.UUID(str(requester_id))
+    except ValueError:
+        return uuid.uuid5(_REQUESTER_NAMESPACE, str(requester_id))
+
+
+def _hot_lookup(scope: Tuple[Optional[uuid.UUID], str], request_hash: str) -> Optional[TryBeginResult]:
+    entry = _SUCCEEDED_CACHE.get(scope)
+    if entry is None:
+        return None
+    expires_at, stored_hash, response, status_code = entry
+    if time.monotonic() >= expires_at:
+        _SUCCEEDED_CACHE.pop(scope, None)
+        return None
+    _SUCCEEDED_CACHE.move_to_end(scope)
+    if stored_hash and stored_hash != request_hash:
+        return True, None, None, True
+    return True, response, status_code, False
+
+
+def _hot_store(
+    scope: Tuple[Optional[uuid.UUID], str],
+    request_hash: Optional[str],
+    response: Dict[str, Any],
+    status_code: int,
+) -> None:
+    if _SUCCEEDED_CACHE_TTL_SECONDS <= 0 or _SUCCEEDED_CACHE_MAX_ENTRIES <= 0:
+        return
+    _SUCCEEDED_CACHE[scope] = (
+        time.monotonic() + _SUCCEEDED_CACHE_TTL_SECONDS,
+        request_hash or "",
+        response,
+        status_code,
+    )
+    _SUCCEEDED_CACHE.move_to_end(scope)
+    while len(_SUCCEEDED_CACHE) > _SUCCEEDED_CACHE_MAX_ENTRIES:
+        _SUCCEEDED_CACHE.popitem(last=False)
+
+
+def _result_from_row(
+    scope: Tuple[Optional[uuid.UUID], str],
+    request_hash: str,
+    row_hash: Optional[str],
+    status: Any,
+    response_data: Optional[Dict[str, Any]],
+    status_code: Optional[int],
+) -> TryBeginResult:
+    # Body mismatch => conflict
+    if row_hash and row_hash != request_hash:
+        return True, None, None, True
+    if status == IdempotencyStatus.SUCCEEDED and response_data is not None:
+        _hot_store(scope, row_hash, response_data, status_code or 200)
+        return True, response_data, status_code or 200, False
+    # In-progress or failed: treat as existing but not ready
+    return True, None, None, False
+
+
 class IdempotencyStore:
     @staticmethod
     def compute_request_hash(body: Any) -> str:
@@ -45,85 +136,171 @@ class IdempotencyStore:
         method: str,
         endpoint: str,
         request_hash: str,
-    ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[int], bool]:
+    ) -> TryBeginResult:
         """
         Attempt to create an idempotency record.
-        Returns (existing, response_data, status_code) if a completed record exists.
-        If not existing, creates an IN_PROGRESS record and returns (False, None, None).
+        Returns (existing, response_data, status_code, conflict); response_data
+        is set when a completed record exists.
+        If not existing, creates an IN_PROGRESS record and returns (False, None, None, False).
         """
+        requester = _requester_uuid(requester_id)
+        scope = (requester, key)
+        hot = _hot_lookup(scope, request_hash)
+        if hot is not None:
+            return hot
+
         try:
-            # Check existing
-            stmt = select(IdempotencyKey).where(
-                IdempotencyKey.requester_id == requester_id,
-                IdempotencyKey.key == key,
+            dialect_insert = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+            # NULL requesters never conflict on the unique constraint
+            if dialect_insert is not None and requester is not None:
+                return await IdempotencyStore._reserve_atomic(
+                    db, dialect_insert, scope, method=method, endpoint=endpoint, request_hash=request_hash
+                )
+            return await IdempotencyStore._reserve_select_insert(
+                db, scope, method=method, endpoint=endpoint, request_hash=request_hash
             )
-            res = await db.execute(stmt)
-            row: Optional[IdempotencyKey] = res.scalars().first()
-            if row:
-                # Body mismatch => conflict
-                if row.request_hash and row.request_hash != request_hash:
-                    return True, None, None, True
-                if row.status == IdempotencyStatus.SUCCEEDED and row.response_data is not None:
-                    return True, row.response_data, row.status_code or 200, False
-                # In-progress or failed: treat as existing but not ready
-                return True, None, None, False
-
-            # Insert IN_PROGRESS
-            idem = IdempotencyKey(
-                requester_id=requester_id,
-                key=key,
+        except Exception as e:
+            logger.warning(f"Idempotency store unavailable, using per-process fallback for {key}: {e}")
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+            # Fallback to per-process memory cache
+            async with _MEM_LOCK:
+                mem_scope = f"{requester}:{key}"
+                if mem_scope in _MEM_CACHE:
+                    entry = _MEM_CACHE[mem_scope]
+                    if entry.get("hash") and entry.get("hash") != request_hash:
+                        return True, None, None, True
+                    if entry.get("status") == "succeeded":
+                        return True, entry.get("response"), entry.get("status_code") or 200, False
+                    return True, None, None, False
+                _MEM_CACHE[mem_scope] = {"status": "in_progress", "endpoint": endpoint, "method": method, "hash": request_hash}
+            return False, None, None, False
+
+    @staticmethod
+    async def _reserve_atomic(
+        db: AsyncSession,
+        dialect_insert: Any,
+        scope: Tuple[Optional[uuid.UUID], str],
+        *,
+        method: str,
+        endpoint: str,
+        request_hash: str,
+    ) -> TryBeginResult:
+        """Insert-or-fetch in one statement; our own id coming back means we inserted."""
+        table = IdempotencyKey.__table__
+        row_id = uuid.uuid4()
+        now = datetime.utcnow()
+        stmt = dialect_insert(table).values(
+            id=row_id,
+            requester_id=scope[0],
+            key=scope[1],
+            method=method.upper(),
+            endpoint=endpoint,
+            request_hash=request_hash,
+            status=IdempotencyStatus.IN_PROGRESS,
+            response_data=None,
+            created_at=now,
+            updated_at=now,
+        )
+        # No-op update so the existing row is returned by RETURNING
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.requester_id, table.c.key],
+            set_={"updated_at": table.c.updated_at},
+        ).returning(
+            table.c.id, table.c.request_hash, table.c.status, table.c.response_data, table.c.status_code
+        )
+        row = (await db.execute(stmt)).one()
+        await db.commit()
+
+        if row.id == row_id:
+            return False, None, None, False
+        return _result_from_row(scope, request_hash, row.request_hash, row.status, row.response_data, row.status_code)
+
+    @staticmethod
+    async def _reserve_select_insert(
+        db: AsyncSession,
+        scope: Tuple[Optional[uuid.UUID], str],
+        *,
+        method: str,
+        endpoint: str,
+        request_hash: str,
+    ) -> TryBeginResult:
+        stmt = select(IdempotencyKey).where(
+            IdempotencyKey.requester_id == scope[0],
+            IdempotencyKey.key == scope[1],
+        )
+        row: Optional[IdempotencyKey] = (await db.execute(stmt)).scalars().first()
+        if row:
+            return _result_from_row(
+                scope, request_hash, row.request_hash, row.status, row.response_data, row.status_code
+            )
+
+        # Insert IN_PROGRESS
+        try:
+            db.add(IdempotencyKey(
+                requester_id=scope[0],
+                key=scope[1],
                 method=method.upper(),
                 endpoint=endpoint,
                 request_hash=request_hash,
                 status=IdempotencyStatus.IN_PROGRESS,
                 created_at=datetime.utcnow(),
                 updated_at=datetime.utcnow(),
-            )
-            db.add(idem)
+            ))
             await db.commit()
             return False, None, None, False
         except IntegrityError:
             await db.rollback()
             # Someone else inserted concurrently; re-check
-            stmt = select(IdempotencyKey).where(
-                IdempotencyKey.requester_id == requester_id,
-                IdempotencyKey.key == key,
-            )
-            res = await db.execute(stmt)
-            row = res.scalars().first()
+            row = (await db.execute(stmt)).scalars().first()
             if row:
-                if row.request_hash and row.request_hash != request_hash:
-                    return True, None, None, True
-                if row.status == IdempotencyStatus.SUCCEEDED and row.response_data is not None:
-                    return True, row.response_data, row.status_code or 200, False
+                return _result_from_row(
+                    scope, request_hash, row.request_hash, row.status, row.response_data, row.status_code
+                )
             return True, None, None, False
-        except Exception:
-            # Fallback to per-process memory cache
-            async with _MEM_LOCK:
-                scope = f"{requester_id}:{key}"
-                if scope in _MEM_CACHE:
-                    entry = _MEM_CACHE[scope]
-                    if entry.get("hash") and entry.get("hash") != request_hash:
-                        return True, None, None, True
-                    if entry.get("status") == "succeeded":
-                        return True, entry.get("response"), entry.get("status_code") or 200, False
-                    return True, None, None, False
-                _MEM_CACHE[scope] = {"status": "in_progress", "endpoint": endpoint, "method": method, "hash": request_hash}
-            return False, None, None, False
 
     @staticmethod
-    async def cleanup(db: AsyncSession, *, older_than_days: int = 7) -> int:
-        """Delete idempotency rows older than TTL. Returns rows deleted."""
-        from sqlalchemy import delete, func
+    async def cleanup(
+        db: AsyncSession,
+        *,
+        older_than_days: int = 7,
+        batch_size: int = 1000,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        """Delete idempotency rows older than TTL in chunks. Returns rows deleted.
+
+        Each chunk of at most ``batch_size`` rows is its own short transaction,
+        so cleanup never holds locks on a large range; ``max_batches`` caps one run.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        deleted = 0
+        batches = 0
         try:
-            cutoff = func.now() - func.make_interval(0,0,0, older_than_days)
-            # Use plain SQL to be dialect-friendly if needed
-            stmt = delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)
-            res = await db.execute(stmt)
-            await db.commit()
-            return res.rowcount or 0
-        except Exception:
-            return 0
+            while max_batches is None or batches < max_batches:
+                ids = (
+                    await db.execute(
+                        select(IdempotencyKey.id)
+                        .where(IdempotencyKey.created_at < cutoff)
+                        .limit(batch_size)
+                    )
+                ).scalars().all()
+                if not ids:
+                    break
+                res = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(ids)))
+                await db.commit()
+                deleted += res.rowcount or 0
+                batches += 1
+                if len(ids) < batch_size:
+                    break
+        except Exception as e:
+            logger.warning(f"Idempotency cleanup stopped after {deleted} rows: {e}")
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+        return deleted
 
     @staticmethod
     async def finalize_success(
@@ -134,10 +311,12 @@ class IdempotencyStore:
         response: Dict[str, Any],
         status_code: int,
     ) -> None:
+        requester = _requester_uuid(requester_id)
         try:
+            scope_filter = (IdempotencyKey.requester_id == requester, IdempotencyKey.key == key)
             stmt = (
                 update(IdempotencyKey)
-                .where(IdempotencyKey.requester_id == requester_id, IdempotencyKey.key == key)
+                .where(*scope_filter)
                 .values(
                     status=IdempotencyStatus.SUCCEEDED,
                     response_data=response,
@@ -145,12 +324,22 @@ class IdempotencyStore:
                     updated_at=datetime.utcnow(),
                 )
             )
-            await db.execute(stmt)
+            if db.get_bind().dialect.name in _UPSERT_DIALECTS:
+                request_hash = (await db.execute(stmt.returning(IdempotencyKey.request_hash))).scalar_one_or_none()
+            else:
+                # No UPDATE ... RETURNING here: read the hash back only if a row was updated
+                request_hash = None
+                if (await db.execute(stmt)).rowcount:
+                    request_hash = (
+                        await db.execute(select(IdempotencyKey.request_hash).where(*scope_filter))
+                    ).scalar_one_or_none()
             await db.commit()
+            if request_hash is not None:
+                _hot_store((requester, key), request_hash, response, status_code)
         except Exception:
             # Best-effort memory cache update
             async with _MEM_LOCK:
-                scope = f"{requester_id}:{key}"
+                scope = f"{requester}:{key}"
                 if scope in _MEM_CACHE:
                     _MEM_CACHE[scope].update({
                         "status": "succeeded",
@@ -74,6 +74,8 @@ from .trace_collector import (
     Trace,
     SpanContext,
     SamplingRule,
+    TailSamplingConfig,
+    LatencySketch,
     SpanKind,
     SpanStatus,
     trace_collector,
@@ -181,6 +183,8 @@ __all__ = [
     'Trace',
     'SpanContext',
     'SamplingRule',
+    'TailSamplingConfig',
+    'LatencySketch',
     'SpanKind',
     'SpanStatus',
     'trace_collector',
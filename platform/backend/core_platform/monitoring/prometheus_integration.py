@@ -332,6 +332,12 @@ class PrometheusIntegration:
             description="Tenant cache hit/miss stats",
             labels=["metric"]
         ))
+        self.register_metric(PrometheusMetric(
+            name="taxpoynt_compliance_report_cache_total",
+            metric_type=PrometheusMetricsType.COUNTER,
+            description="Compliance report cache lookups and evictions",
+            labels=["result"]
+        ))
         # Outbound AP delivery/queue metrics
         self.register_metric(PrometheusMetric(
             name="taxpoynt_ap_outbound_current_queue_size",
@@ -7,6 +7,8 @@ Collects, processes, and analyzes traces across all services and components.
 
 import asyncio
 import logging
+import math
+import os
 import time
 import uuid
 import json
@@ -14,12 +16,15 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Set, Union, Callable, Tuple
 from enum import Enum
 from dataclasses import dataclass, field, asdict
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 import threading
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Distinct error messages tracked per hour of analytics before new ones are ignored
+MAX_ERROR_MESSAGES_PER_HOUR = 1000
+
 
 class SpanKind(Enum):
     """Types of spans in distributed tracing"""
@@ -99,6 +104,149 @@ class SamplingRule:
     priority: int = 0  # Higher priority rules evaluated first
 
 
+@dataclass
+class TailSamplingConfig:
+    """
+    Configuration for tail-based sampling.
+
+    Finished spans are buffered per trace and the keep/drop decision is made
+    once the root span finishes or ``decision_window_seconds`` after the trace
+    was first seen, whichever comes first. Traces with errors, or with a span
+    slower than its operation's latency threshold, are always kept; the rest
+    go through the sampling rules. When ``max_buffered_spans`` is reached the
+    oldest buffered traces are decided early.
+    """
+    enabled: bool = True
+    decision_window_seconds: float = 10.0
+    max_buffered_spans: int = 20000
+    max_spans_per_trace: int = 1000
+    keep_errors: bool = True
+    default_latency_threshold_ms: float = 2000.0
+    # "service.operation" or "operation" -> threshold in ms
+    latency_thresholds_ms: Dict[str, float] = field(default_factory=dict)
+    decision_memory: int = 10000  # Decided trace IDs remembered for late spans
+
+    @classmethod
+    def from_env(cls) -> "TailSamplingConfig":
+        defaults = cls()
+        return cls(
+            enabled=os.getenv("TRACE_TAIL_SAMPLING_ENABLED", "true").lower() in ("1", "true", "yes"),
+            decision_window_seconds=float(
+                os.getenv("TRACE_TAIL_DECISION_WINDOW_SECONDS", defaults.decision_window_seconds)
+            ),
+            max_buffered_spans=int(os.getenv("TRACE_TAIL_MAX_BUFFERED_SPANS", defaults.max_buffered_spans)),
+            max_spans_per_trace=int(os.getenv("TRACE_TAIL_MAX_SPANS_PER_TRACE", defaults.max_spans_per_trace)),
+            default_latency_threshold_ms=float(
+                os.getenv("TRACE_TAIL_LATENCY_THRESHOLD_MS", defaults.default_latency_threshold_ms)
+            ),
+        )
+
+
+@dataclass
+class _BufferedTrace:
+    """Spans of a trace awaiting a tail sampling decision"""
+    first_seen: float
+    spans: List[Span] = field(default_factory=list)
+
+
+class LatencySketch:
+    """
+    Mergeable quantile sketch of latencies.
+
+    Values are counted in logarithmic bins, so every quantile is answered
+    within ``relative_accuracy`` of the true value and merging two sketches
+    is adding their bin counts. Size grows with the value range, not with
+    the number of values.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = defaultdict(int)
+        self._zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            self._zero_count += 1
+        else:
+            self._bins[math.ceil(math.log(value) / self._log_gamma)] += 1
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        for index, count in other._bins.items():
+            self._bins[index] += count
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if rank < seen:
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+@dataclass
+class _OperationStats:
+    """Running latency/error totals for one service.operation"""
+    call_count: int = 0
+    error_count: int = 0
+    total_duration_ms: float = 0.0
+    sketch: LatencySketch = field(default_factory=LatencySketch)
+
+    def merge(self, other: "_OperationStats") -> None:
+        self.call_count += other.call_count
+        self.error_count += other.error_count
+        self.total_duration_ms += other.total_duration_ms
+        self.sketch.merge(other.sketch)
+
+
+@dataclass
+class _AnalyticsBucket:
+    """Trace analytics accumulated for one hour"""
+    operations: Dict[str, _OperationStats] = field(default_factory=lambda: defaultdict(_OperationStats))
+    dependencies: Dict[str, Dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    trace_count: int = 0
+    error_trace_count: int = 0
+    span_count: int = 0
+    error_span_count: int = 0
+    errors_by_service: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    errors_by_operation: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    error_messages: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def merge(self, other: "_AnalyticsBucket") -> None:
+        for operation, stats in other.operations.items():
+            self.operations[operation].merge(stats)
+        for parent_service, children in other.dependencies.items():
+            for child_service, count in children.items():
+                self.dependencies[parent_service][child_service] += count
+        self.trace_count += other.trace_count
+        self.error_trace_count += other.error_trace_count
+        self.span_count += other.span_count
+        self.error_span_count += other.error_span_count
+        for service, count in other.errors_by_service.items():
+            self.errors_by_service[service] += count
+        for operation, count in other.errors_by_operation.items():
+            self.errors_by_operation[operation] += count
+        for message, count in other.error_messages.items():
+            self.error_messages[message] += count
+
+
 class TraceCollector:
     """
     Distributed tracing collector for the TaxPoynt platform.
@@ -111,7 +259,12 @@ class TraceCollector:
     - External Integrations (third-party API calls, etc.)
     """
     
-    def __init__(self, max_spans: int = 100000, trace_retention_hours: int = 168):
+    def __init__(
+        self,
+        max_spans: int = 100000,
+        trace_retention_hours: int = 168,
+        tail_sampling: Optional[TailSamplingConfig] = None
+    ):
         # Span storage
         self.active_spans: Dict[str, Span] = {}  # span_id -> Span
         self.completed_spans: deque = deque(maxlen=max_spans)
@@ -121,6 +274,30 @@ class TraceCollector:
         self.trace_retention_hours = trace_retention_hours
         self.sampling_rules: List[SamplingRule] = []
         self.default_sample_rate = 0.1  # 10% sampling by default
+        self.tail_sampling = tail_sampling or TailSamplingConfig.from_env()
+        
+        # Tail sampling state (trace_id -> buffered spans, oldest first)
+        self._tail_buffer: "OrderedDict[str, _BufferedTrace]" = OrderedDict()
+        self._tail_buffered_spans = 0
+        self._tail_decisions: "OrderedDict[str, bool]" = OrderedDict()  # trace_id -> kept
+        self._active_span_counts: Dict[str, int] = defaultdict(int)  # trace_id -> open spans
+        self._tail_lock = threading.Lock()
+        
+        # Incremental analytics (hour -> per-operation sketches, dependency edges, error counts)
+        self._analytics: Dict[datetime, _AnalyticsBucket] = {}
+        self._analytics_lock = threading.Lock()
+        self._error_spans_recorded = 0
+        self.tail_stats = {
+            "traces_kept_error": 0,
+            "traces_kept_latency": 0,
+            "traces_kept_sampled": 0,
+            "traces_dropped": 0,
+            "spans_over_trace_limit": 0,
+            "late_spans": 0,
+            "decisions_on_root": 0,
+            "decisions_on_window": 0,
+            "decisions_on_budget": 0
+        }
         
         # Thread-local storage for current span context
         self._local = threading.local()
@@ -207,8 +384,10 @@ class TraceCollector:
                 # Start new trace
                 trace_id = str(uuid.uuid4())
         
-        # Apply sampling
-        if not self._should_sample(trace_id, service_name, operation_name, tags or {}):
+        # Apply head sampling; with tail sampling the decision waits for the whole trace
+        if not self.tail_sampling.enabled and not self._should_sample(
+            trace_id, service_name, operation_name, tags or {}
+        ):
             # Return a no-op span ID
             return f"noop_{span_id}"
         
@@ -228,6 +407,9 @@ class TraceCollector:
         
         # Store active span
         self.active_spans[span_id] = span
+        if self.tail_sampling.enabled:
+            with self._tail_lock:
+                self._active_span_counts[trace_id] += 1
         
         # Update current context
         new_context = SpanContext(
@@ -273,13 +455,17 @@ class TraceCollector:
         
         # Move to completed spans
         del self.active_spans[span_id]
-        self.completed_spans.append(span)
         
         # Update statistics
         self.stats["total_spans"] += 1
         
-        # Queue for processing
-        asyncio.create_task(self.span_queue.put(span))
+        if self.tail_sampling.enabled:
+            # Buffered until the trace is decided; kept traces are published whole
+            self._buffer_span(span)
+        else:
+            self.completed_spans.append(span)
+            # Queue for processing
+            asyncio.create_task(self.span_queue.put(span))
         
         # Reset context if this was the current span
         current_context = self._get_current_context()
@@ -297,7 +483,8 @@ class TraceCollector:
                 self._set_current_context(None)
         
         # Notify handlers
-        asyncio.create_task(self._notify_span_finished_handlers(span))
+        if not self.tail_sampling.enabled:
+            asyncio.create_task(self._notify_span_finished_handlers(span))
         
         logger.debug(f"Finished span: {span.operation_name} [{span_id}] - {span.duration_ms}ms")
         return True
@@ -377,6 +564,7 @@ class TraceCollector:
         if await self._is_trace_complete(trace_id):
             trace = await self._assemble_trace(trace_id)
             if trace:
+                previous = self.traces.get(trace_id)
                 self.traces[trace_id] = trace
                 await self.trace_complete_queue.put(trace)
                 await self._notify_trace_finished_handlers(trace)
@@ -384,7 +572,7 @@ class TraceCollector:
                 # Update statistics
                 self.stats["total_traces"] += 1
                 self.stats["traces_completed"] += 1
-                self._update_trace_stats(trace)
+                self._update_trace_stats(trace, previous)
     
     async def _is_trace_complete(self, trace_id: str) -> bool:
         """Check if a trace has all spans completed"""
@@ -406,6 +594,10 @@ class TraceCollector:
         if not trace_spans:
             return None
         
+        return self._build_trace(trace_id, trace_spans)
+    
+    def _build_trace(self, trace_id: str, trace_spans: List[Span]) -> Trace:
+        """Build a Trace from its finished spans"""
         # Sort spans by start time
         trace_spans.sort(key=lambda s: s.start_time)
         
@@ -528,6 +720,157 @@ class TraceCollector:
         
         return trace_hash < threshold
     
+    # === Tail Sampling ===
+    
+    def set_latency_threshold(
+        self,
+        operation_name: str,
+        threshold_ms: float,
+        service_name: Optional[str] = None
+    ):
+        """Keep every trace in which this operation runs slower than ``threshold_ms``"""
+        key = f"{service_name}.{operation_name}" if service_name else operation_name
+        self.tail_sampling.latency_thresholds_ms[key] = threshold_ms
+    
+    def _latency_threshold_ms(self, span: Span) -> float:
+        thresholds = self.tail_sampling.latency_thresholds_ms
+        threshold = thresholds.get(f"{span.service_name}.{span.operation_name}")
+        if threshold is None:
+            threshold = thresholds.get(span.operation_name, self.tail_sampling.default_latency_threshold_ms)
+        return threshold
+    
+    def _buffer_span(self, span: Span):
+        """Add a finished span to its trace's buffer and decide any traces that are due"""
+        decided: List[Trace] = []
+        late_trace: Optional[Trace] = None
+        
+        with self._tail_lock:
+            trace_id = span.trace_id
+            open_spans = self._active_span_counts.get(trace_id, 0) - 1
+            if open_spans > 0:
+                self._active_span_counts[trace_id] = open_spans
+            else:
+                self._active_span_counts.pop(trace_id, None)
+            
+            kept = self._tail_decisions.get(trace_id)
+            if kept is not None:
+                # Span finished after its trace was decided; follow that decision
+                self.tail_stats["late_spans"] += 1
+                if kept and trace_id in self.traces:
+                    self.completed_spans.append(span)
+                    previous = self.traces[trace_id]
+                    late_trace = self._build_trace(trace_id, previous.spans + [span])
+                    self.traces[trace_id] = late_trace
+                    self._record_trace_analytics(late_trace, previous)
+                else:
+                    self.stats["spans_dropped"] += 1
+            else:
+                buffered = self._tail_buffer.get(trace_id)
+                if buffered is None:
+                    buffered = self._tail_buffer[trace_id] = _BufferedTrace(first_seen=time.monotonic())
+                if len(buffered.spans) < self.tail_sampling.max_spans_per_trace:
+                    buffered.spans.append(span)
+                    self._tail_buffered_spans += 1
+                else:
+                    self.tail_stats["spans_over_trace_limit"] += 1
+                    self.stats["spans_dropped"] += 1
+                
+                if span.parent_span_id is None and open_spans <= 0:
+                    decided.append(self._decide_trace(trace_id, "root"))
+            
+            # Memory budget: decide the oldest traces early
+            while self._tail_buffered_spans > self.tail_sampling.max_buffered_spans and self._tail_buffer:
+                decided.append(self._decide_trace(next(iter(self._tail_buffer)), "budget"))
+            
+            decided.extend(self._expire_tail_buffer(time.monotonic()))
+        
+        if late_trace is not None:
+            self._schedule(self._notify_span_finished_handlers(span))
+        for trace in decided:
+            if trace is not None:
+                self._schedule(self._publish_sampled_trace(trace))
+    
+    def _expire_tail_buffer(self, now: float, force: bool = False) -> List[Optional[Trace]]:
+        """Decide buffered traces whose decision window has elapsed (caller holds the lock)"""
+        decided = []
+        window = self.tail_sampling.decision_window_seconds
+        while self._tail_buffer:
+            trace_id, buffered = next(iter(self._tail_buffer.items()))
+            if not force and now - buffered.first_seen < window:
+                break
+            decided.append(self._decide_trace(trace_id, "window"))
+        return decided
+    
+    def _decide_trace(self, trace_id: str, trigger: str) -> Optional[Trace]:
+        """Make the keep/drop decision for a buffered trace (caller holds the lock)"""
+        buffered = self._tail_buffer.pop(trace_id)
+        spans = buffered.spans
+        self._tail_buffered_spans -= len(spans)
+        self.tail_stats[f"decisions_on_{trigger}"] += 1
+        
+        reason = self._tail_decision(trace_id, spans)
+        kept = reason is not None
+        self._tail_decisions[trace_id] = kept
+        while len(self._tail_decisions) > self.tail_sampling.decision_memory:
+            self._tail_decisions.popitem(last=False)
+        
+        if not kept:
+            self.tail_stats["traces_dropped"] += 1
+            self.stats["spans_dropped"] += len(spans)
+            return None
+        
+        self.tail_stats[f"traces_kept_{reason}"] += 1
+        self.completed_spans.extend(spans)
+        trace = self._build_trace(trace_id, spans)
+        self.traces[trace_id] = trace
+        return trace
+    
+    def _tail_decision(self, trace_id: str, spans: List[Span]) -> Optional[str]:
+        """Return why a trace is kept ("error", "latency", "sampled"), or None to drop it"""
+        if self.tail_sampling.keep_errors and any(
+            s.status in (SpanStatus.ERROR, SpanStatus.TIMEOUT) for s in spans
+        ):
+            return "error"
+        
+        if any(s.duration_ms is not None and s.duration_ms > self._latency_threshold_ms(s) for s in spans):
+            return "latency"
+        
+        root = next((s for s in spans if s.parent_span_id is None), spans[0])
+        if self._should_sample(trace_id, root.service_name, root.operation_name, root.tags):
+            return "sampled"
+        return None
+    
+    def flush_tail_buffer(self, force: bool = False) -> int:
+        """Decide traces past their decision window (all buffered traces if ``force``)"""
+        with self._tail_lock:
+            decided = self._expire_tail_buffer(time.monotonic(), force=force)
+        for trace in decided:
+            if trace is not None:
+                self._schedule(self._publish_sampled_trace(trace))
+        return len(decided)
+    
+    async def _publish_sampled_trace(self, trace: Trace):
+        """Run span/trace handlers and metrics for a kept trace"""
+        for span in trace.spans:
+            await self._notify_span_finished_handlers(span)
+            if self.metrics_aggregator:
+                await self._send_span_metrics(span)
+        
+        await self.trace_complete_queue.put(trace)
+        await self._notify_trace_finished_handlers(trace)
+        
+        self.stats["total_traces"] += 1
+        self.stats["traces_completed"] += 1
+        self._update_trace_stats(trace)
+    
+    @staticmethod
+    def _schedule(coro):
+        try:
+            asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            # No running loop (sync caller); the trace is already stored
+            coro.close()
+    
     # === Querying and Analysis ===
     
     def get_trace_by_id(self, trace_id: str) -> Optional[Trace]:
@@ -577,125 +920,131 @@ class TraceCollector:
         return traces[:limit]
     
     def get_service_dependencies(self, hours: int = 24) -> Dict[str, List[str]]:
-        """Analyze service dependencies from traces"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        recent_traces = [t for t in self.traces.values() if t.start_time >= cutoff_time]
-        
-        dependencies = defaultdict(set)
-        
-        for trace in recent_traces:
-            # Build dependency graph from span relationships
-            spans_by_id = {s.span_id: s for s in trace.spans}
-            
-            for span in trace.spans:
-                if span.parent_span_id and span.parent_span_id in spans_by_id:
-                    parent_span = spans_by_id[span.parent_span_id]
-                    
-                    # Parent service depends on child service
-                    if parent_span.service_name != span.service_name:
-                        dependencies[parent_span.service_name].add(span.service_name)
-        
-        # Convert sets to lists
-        return {service: list(deps) for service, deps in dependencies.items()}
+        """Analyze service dependencies from traces (hour resolution)"""
+        analytics = self._merged_analytics(hours)
+        return {service: sorted(children) for service, children in analytics.dependencies.items()}
     
     def get_operation_performance(self, hours: int = 24) -> Dict[str, Dict[str, Any]]:
-        """Analyze operation performance metrics"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        recent_spans = [
-            s for s in self.completed_spans
-            if s.start_time >= cutoff_time and s.duration_ms is not None
-        ]
-        
-        # Group by operation
-        by_operation = defaultdict(list)
-        for span in recent_spans:
-            operation_key = f"{span.service_name}.{span.operation_name}"
-            by_operation[operation_key].append(span)
+        """Analyze operation performance metrics (hour resolution)"""
+        analytics = self._merged_analytics(hours)
         
         # Calculate metrics for each operation
         performance = {}
-        for operation, spans in by_operation.items():
-            durations = [s.duration_ms for s in spans]
-            errors = [s for s in spans if s.status == SpanStatus.ERROR]
-            
+        for operation, stats in analytics.operations.items():
+            sketch = stats.sketch
             performance[operation] = {
-                "call_count": len(spans),
-                "error_count": len(errors),
-                "error_rate": len(errors) / len(spans) * 100,
-                "avg_duration_ms": sum(durations) / len(durations),
-                "min_duration_ms": min(durations),
-                "max_duration_ms": max(durations),
-                "p95_duration_ms": self._calculate_percentile(durations, 95),
-                "p99_duration_ms": self._calculate_percentile(durations, 99)
+                "call_count": stats.call_count,
+                "error_count": stats.error_count,
+                "error_rate": stats.error_count / stats.call_count * 100,
+                "avg_duration_ms": stats.total_duration_ms / stats.call_count,
+                "min_duration_ms": sketch.min,
+                "max_duration_ms": sketch.max,
+                "p50_duration_ms": sketch.quantile(0.50),
+                "p95_duration_ms": sketch.quantile(0.95),
+                "p99_duration_ms": sketch.quantile(0.99)
             }
         
         return performance
     
     def get_error_analysis(self, hours: int = 24) -> Dict[str, Any]:
-        """Analyze errors across traces and spans"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        
-        # Analyze traces with errors
-        recent_traces = [t for t in self.traces.values() if t.start_time >= cutoff_time]
-        error_traces = [t for t in recent_traces if t.error_count > 0]
-        
-        # Analyze error spans
-        recent_spans = [s for s in self.completed_spans if s.start_time >= cutoff_time]
-        error_spans = [s for s in recent_spans if s.status == SpanStatus.ERROR]
-        
-        # Group errors by service
-        errors_by_service = defaultdict(int)
-        for span in error_spans:
-            errors_by_service[span.service_name] += 1
-        
-        # Group errors by operation
-        errors_by_operation = defaultdict(int)
-        for span in error_spans:
-            operation = f"{span.service_name}.{span.operation_name}"
-            errors_by_operation[operation] += 1
+        """Analyze errors across traces and spans (hour resolution)"""
+        analytics = self._merged_analytics(hours)
+        total_traces, error_traces = analytics.trace_count, analytics.error_trace_count
+        total_spans, error_spans = analytics.span_count, analytics.error_span_count
+        errors_by_operation = analytics.errors_by_operation
+        error_messages = analytics.error_messages
         
         return {
-            "total_traces": len(recent_traces),
-            "error_traces": len(error_traces),
-            "trace_error_rate": len(error_traces) / len(recent_traces) * 100 if recent_traces else 0,
-            "total_spans": len(recent_spans),
-            "error_spans": len(error_spans),
-            "span_error_rate": len(error_spans) / len(recent_spans) * 100 if recent_spans else 0,
-            "errors_by_service": dict(errors_by_service),
+            "total_traces": total_traces,
+            "error_traces": error_traces,
+            "trace_error_rate": error_traces / total_traces * 100 if total_traces else 0,
+            "total_spans": total_spans,
+            "error_spans": error_spans,
+            "span_error_rate": error_spans / total_spans * 100 if total_spans else 0,
+            "errors_by_service": dict(analytics.errors_by_service),
             "errors_by_operation": dict(sorted(errors_by_operation.items(), key=lambda x: x[1], reverse=True)[:10]),
-            "common_errors": self._get_common_error_messages(error_spans)
+            "common_errors": [
+                {"message": msg, "count": count}
+                for msg, count in sorted(error_messages.items(), key=lambda x: x[1], reverse=True)[:5]
+            ]
         }
     
-    def _calculate_percentile(self, values: List[float], percentile: int) -> float:
-        """Calculate percentile of values"""
-        if not values:
-            return 0.0
-        
-        sorted_values = sorted(values)
-        k = (len(sorted_values) - 1) * percentile / 100
-        f = int(k)
-        c = k - f
-        
-        if f + 1 < len(sorted_values):
-            return sorted_values[f] * (1 - c) + sorted_values[f + 1] * c
-        else:
-            return sorted_values[f]
+    # === Incremental Analytics ===
     
-    def _get_common_error_messages(self, error_spans: List[Span]) -> List[Dict[str, Any]]:
-        """Get most common error messages"""
-        error_counts = defaultdict(int)
-        
-        for span in error_spans:
-            if span.error:
-                # Normalize error message (first line only)
-                error_msg = span.error.split('\n')[0][:100]
-                error_counts[error_msg] += 1
-        
-        # Return top 5 errors
-        return [
-            {"message": msg, "count": count}
-            for msg, count in sorted(error_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        ]
+    @staticmethod
+    def _hour(timestamp: datetime) -> datetime:
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    
+    def _merged_analytics(self, hours: int) -> _AnalyticsBucket:
+        """Copy of the hourly buckets overlapping the last ``hours`` hours, merged into one"""
+        first_hour = self._hour(datetime.utcnow() - timedelta(hours=hours))
+        merged = _AnalyticsBucket()
+        # Merge under the lock: recording threads mutate the live buckets
+        with self._analytics_lock:
+            for hour, bucket in self._analytics.items():
+                if hour >= first_hour:
+                    merged.merge(bucket)
+        return merged
+    
+    def _analytics_bucket(self, timestamp: datetime) -> _AnalyticsBucket:
+        # Caller holds the analytics lock
+        hour = self._hour(timestamp)
+        bucket = self._analytics.get(hour)
+        if bucket is None:
+            bucket = self._analytics[hour] = _AnalyticsBucket()
+        return bucket
+    
+    def _record_trace_analytics(self, trace: Trace, previous: Optional[Trace] = None):
+        """Fold a trace into the hourly analytics; only spans not in ``previous`` are counted"""
+        seen = {s.span_id for s in previous.spans} if previous else set()
+        new_spans = [s for s in trace.spans if s.span_id not in seen]
+        spans_by_id = {s.span_id: s for s in trace.spans}
+        
+        with self._analytics_lock:
+            trace_bucket = self._analytics_bucket(trace.start_time)
+            if previous is None:
+                trace_bucket.trace_count += 1
+            if trace.error_count and not (previous and previous.error_count):
+                trace_bucket.error_trace_count += 1
+            
+            for span in new_spans:
+                bucket = self._analytics_bucket(span.start_time)
+                operation = f"{span.service_name}.{span.operation_name}"
+                failed = span.status == SpanStatus.ERROR
+                bucket.span_count += 1
+                
+                if span.duration_ms is not None:
+                    stats = bucket.operations[operation]
+                    stats.call_count += 1
+                    stats.error_count += 1 if failed else 0
+                    stats.total_duration_ms += span.duration_ms
+                    stats.sketch.add(span.duration_ms)
+                
+                if failed:
+                    self._error_spans_recorded += 1
+                    bucket.error_span_count += 1
+                    bucket.errors_by_service[span.service_name] += 1
+                    bucket.errors_by_operation[operation] += 1
+                    if span.error:
+                        # Normalize error message (first line only)
+                        message = span.error.split('\n')[0][:100]
+                        if (message in bucket.error_messages
+                                or len(bucket.error_messages) < MAX_ERROR_MESSAGES_PER_HOUR):
+                            bucket.error_messages[message] += 1
+                
+                # Parent service depends on child service
+                parent = spans_by_id.get(span.parent_span_id) if span.parent_span_id else None
+                if parent and parent.service_name != span.service_name:
+                    trace_bucket.dependencies[parent.service_name][span.service_name] += 1
+    
+    def _prune_analytics(self, cutoff_time: datetime) -> int:
+        """Drop hourly analytics older than the retention window"""
+        first_hour = self._hour(cutoff_time)
+        with self._analytics_lock:
+            old_hours = [hour for hour in self._analytics if hour < first_hour]
+            for hour in old_hours:
+                del self._analytics[hour]
+        return len(old_hours)
     
     # === Background Tasks ===
     
@@ -716,6 +1065,10 @@ class TraceCollector:
         """Stop background trace processing"""
         self._running = False
         
+        # Decide whatever is still buffered
+        if self.tail_sampling.enabled:
+            self.flush_tail_buffer(force=True)
+        
         # Cancel tasks
         for task in [self._processor_task, self._cleanup_task]:
             if task:
@@ -741,6 +1094,8 @@ class TraceCollector:
                 self.span_queue.task_done()
                 
             except asyncio.TimeoutError:
+                if self.tail_sampling.enabled:
+                    self.flush_tail_buffer()
                 continue
             except asyncio.CancelledError:
                 break
@@ -763,6 +1118,8 @@ class TraceCollector:
                 for trace_id in old_trace_ids:
                     del self.traces[trace_id]
                 
+                self._prune_analytics(cutoff_time)
+                
                 if old_trace_ids:
                     logger.info(f"Cleaned up {len(old_trace_ids)} old traces")
                 
@@ -827,8 +1184,10 @@ class TraceCollector:
         except Exception as e:
             logger.error(f"Error sending span metrics: {e}")
     
-    def _update_trace_stats(self, trace: Trace):
-        """Update trace statistics"""
+    def _update_trace_stats(self, trace: Trace, previous: Optional[Trace] = None):
+        """Update trace statistics and the incremental analytics"""
+        self._record_trace_analytics(trace, previous)
+        
         # Update average trace duration
         current_avg = self.stats["avg_trace_duration_ms"]
         trace_count = self.stats["total_traces"]
@@ -852,8 +1211,7 @@ class TraceCollector:
         # Update error rate
         total_spans = self.stats["total_spans"]
         if total_spans > 0:
-            error_spans = sum(1 for s in self.completed_spans if s.status == SpanStatus.ERROR)
-            self.stats["error_rate"] = error_spans / total_spans * 100
+            self.stats["error_rate"] = self._error_spans_recorded / total_spans * 100
     
     # === Handler Management ===
     
@@ -889,8 +1247,31 @@ class TraceCollector:
                 "span_queue": self.span_queue.qsize(),
                 "trace_complete_queue": self.trace_complete_queue.qsize()
             },
+            "tail_sampling": self._get_tail_sampling_health(),
             "statistics": self.stats.copy()
         }
+    
+    def _get_tail_sampling_health(self) -> Dict[str, Any]:
+        """Buffer occupancy and decision/drop counters for tail sampling"""
+        config = self.tail_sampling
+        with self._tail_lock:
+            oldest_age = (
+                time.monotonic() - next(iter(self._tail_buffer.values())).first_seen
+                if self._tail_buffer else 0.0
+            )
+            return {
+                "enabled": config.enabled,
+                "buffered_traces": len(self._tail_buffer),
+                "buffered_spans": self._tail_buffered_spans,
+                "max_buffered_spans": config.max_buffered_spans,
+                "buffer_occupancy": (
+                    self._tail_buffered_spans / config.max_buffered_spans if config.max_buffered_spans else 0.0
+                ),
+                "oldest_buffered_age_seconds": round(oldest_age, 3),
+                "decision_window_seconds": config.decision_window_seconds,
+                "spans_dropped": self.stats["spans_dropped"],
+                **self.tail_stats
+            }
 
 
 # Global instance for platform-wide access
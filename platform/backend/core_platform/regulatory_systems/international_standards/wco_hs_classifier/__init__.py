@@ -7,6 +7,7 @@ Harmonized System standards as required for Nigerian FIRS e-invoicing compliance
 Components:
 - hs_classifier.py: Core HS code classification engine
 - hs_database.py: HS code database and lookup system
+- hs_memo.py: Per-tenant memo of confirmed product classifications
 - nigerian_hs_rules.py: Nigerian-specific HS code customizations
 - ai_classifier.py: AI-powered product classification
 - models.py: HS code data models and structures
@@ -17,14 +18,18 @@ Features:
 - AI-powered product description analysis
 - Multi-language product name support
 - Validation against FIRS requirements
+- Batch classification with per-tenant memoization
 """
 
 from .hs_classifier import HSClassifier, HSClassificationResult
+from .hs_memo import HSClassificationMemo, normalize_product_text
 from .models import HSCode, ProductClassification, HSClassificationError
 
 __all__ = [
     'HSClassifier',
     'HSClassificationResult', 
+    'HSClassificationMemo',
+    'normalize_product_text',
     'HSCode',
     'ProductClassification',
     'HSClassificationError'
@@ -17,6 +17,7 @@ from .models import (
     HSSearchCriteria, HSValidationResult
 )
 from .hs_database import HSDatabase
+from .hs_memo import HSClassificationMemo, normalize_product_text
 
 
 class HSClassifier:
@@ -30,14 +31,16 @@ class HSClassifier:
     - Multi-method classification (exact, fuzzy, AI)
     - FIRS compliance validation
     - Confidence scoring and alternative suggestions
+    - Batch classification with per-tenant confirmed-classification memo
     """
     
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, memo: Optional[HSClassificationMemo] = None):
         """
         Initialize HS classifier.
         
         Args:
             config: Classifier configuration options
+            memo: Optional shared per-tenant classification memo
         """
         self.config = config or {}
         self.logger = logging.getLogger(__name__)
@@ -45,6 +48,12 @@ class HSClassifier:
         # Initialize HS database
         self.hs_db = HSDatabase()
         
+        # Per-tenant memo of confirmed classifications
+        self.memo = memo or HSClassificationMemo(self.config.get('memo_path'))
+        # Automatic results at or above this score are memoized as confirmed (None disables)
+        self.memo_auto_confirm_score = self.config.get('memo_auto_confirm_score')
+        self._batch_stats = {'batches': 0, 'products': 0, 'deduplicated': 0, 'memo_hits': 0, 'classified': 0}
+        
         # Classification settings
         self.min_confidence_threshold = self.config.get('min_confidence', 0.7)
         self.enable_fuzzy_matching = self.config.get('fuzzy_matching', True)
@@ -115,6 +124,104 @@ class HSClassifier:
             self.logger.error(f"HS classification error: {str(e)}")
             return self._create_failed_result(f"Classification error: {str(e)}", product)
     
+    def classify_products(self, batch: List[ProductClassification],
+                          tenant_id: Optional[str] = None) -> List[HSClassificationResult]:
+        """
+        Classify a batch of products, reusing work across identical lines.
+        
+        Identical normalized product texts are classified once per batch, and
+        products already confirmed for the tenant are served from the memo.
+        Only the remaining misses run through the strategy chain.
+        
+        Args:
+            batch: Products to classify (e.g. invoice lines)
+            tenant_id: Tenant whose memo should be consulted
+            
+        Returns:
+            List[HSClassificationResult]: One result per product, in input order
+        """
+        start_time = time.time()
+        results: List[Optional[HSClassificationResult]] = [None] * len(batch)
+        
+        # Group positions by SKU (when present) or normalized text
+        groups: Dict[str, List[int]] = {}
+        texts: Dict[str, str] = {}
+        for index, product in enumerate(batch):
+            text = normalize_product_text(product)
+            key = f"sku:{product.sku.strip()}" if product.sku else f"text:{text}"
+            groups.setdefault(key, []).append(index)
+            texts.setdefault(key, text)
+        
+        memo_hits = 0
+        classified = 0
+        for key, positions in groups.items():
+            product = batch[positions[0]]
+            result = None
+            
+            if tenant_id is not None:
+                memo_code = self.memo.lookup(
+                    tenant_id, product, texts[key],
+                    validator=lambda code: self.hs_db.get_hs_code(code) is not None
+                )
+                if memo_code:
+                    result = self._create_memo_result(memo_code)
+                    if result:
+                        # Counted per product line, like 'products'
+                        memo_hits += len(positions)
+            
+            if result is None:
+                result = self.classify_product(product)
+                classified += 1
+                if (tenant_id is not None and result.success and result.hs_code
+                        and self.memo_auto_confirm_score is not None
+                        and result.confidence_score >= self.memo_auto_confirm_score):
+                    self.memo.confirm(tenant_id, product, result.hs_code.code)
+            
+            results[positions[0]] = result
+            for position in positions[1:]:
+                results[position] = result.copy(deep=True)
+        
+        self._batch_stats['batches'] += 1
+        self._batch_stats['products'] += len(batch)
+        self._batch_stats['deduplicated'] += len(batch) - len(groups)
+        self._batch_stats['memo_hits'] += memo_hits
+        self._batch_stats['classified'] += classified
+        
+        self.logger.info(
+            f"Classified batch of {len(batch)} products: {len(groups)} unique, "
+            f"{memo_hits} lines from memo, {classified} classified in "
+            f"{(time.time() - start_time) * 1000:.1f}ms"
+        )
+        return results
+    
+    def confirm_classification(self, tenant_id: str, product: ProductClassification, hs_code: str) -> bool:
+        """
+        Record a confirmed HS code for a tenant product so later batches reuse it.
+        
+        Args:
+            tenant_id: Tenant owning the product
+            product: Product that was classified
+            hs_code: Confirmed HS code (XXXX.XX)
+            
+        Returns:
+            bool: True if the code was valid and memoized
+        """
+        if not self.hs_db.get_hs_code(hs_code):
+            self.logger.warning(f"Refusing to memoize unknown HS code {hs_code} for tenant {tenant_id}")
+            return False
+        self.memo.confirm(tenant_id, product, hs_code)
+        return True
+    
+    def get_memo_metrics(self) -> Dict[str, Any]:
+        """Batch deduplication and memo hit-rate metrics."""
+        products = self._batch_stats['products']
+        return {
+            **self._batch_stats,
+            'memo_hit_rate': (self._batch_stats['memo_hits'] / products) if products else 0.0,
+            'dedup_rate': (self._batch_stats['deduplicated'] / products) if products else 0.0,
+            'memo': self.memo.get_stats(),
+        }
+    
     def validate_hs_code(self, hs_code: str) -> HSValidationResult:
         """
         Validate HS code format and existence.
@@ -379,6 +486,24 @@ class HSClassifier:
         
         return result
     
+    def _create_memo_result(self, hs_code_str: str) -> Optional[HSClassificationResult]:
+        """Create classification result from a memoized confirmed HS code."""
+        hs_code = self.hs_db.get_hs_code(hs_code_str)
+        if not hs_code:
+            return None
+        
+        result = HSClassificationResult(
+            success=True,
+            hs_code=hs_code,
+            confidence_level=HSConfidenceLevel.HIGH,
+            confidence_score=1.0,
+            classification_method="tenant_memo",
+            reasoning="Previously confirmed classification for this tenant product",
+            firs_compliant=True,
+            processing_time_ms=0
+        )
+        return self._validate_firs_compliance(result)
+    
     def _create_failed_result(self, error_message: str, product: ProductClassification) -> HSClassificationResult:
         """Create failed classification result."""
         return HSClassificationResult(
@@ -0,0 +1,263 @@
+"""
+HS Classification Memo
+======================
+Per-tenant memo of confirmed product → HS code assignments.
+
+Tenants sell the same catalogue repeatedly, so once a classification has been
+confirmed (by a reviewer or by a high-confidence automatic match) the HS code
+is remembered against the product SKU and its normalized text. Batch
+classification consults the memo before running the strategy chain.
+
+Persistence is an append-only JSON-lines journal: each confirm/forget/clear
+appends one record, and the journal is compacted into a single snapshot
+record (atomic replace) once it is mostly superseded history.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .models import ProductClassification
+
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Compact once the journal holds this many records and twice the live entries
+_COMPACT_MIN_RECORDS = 1000
+
+
+def normalize_product_text(product: ProductClassification) -> str:
+    """
+    Build the canonical text used to deduplicate and memoize products.
+
+    Case, punctuation and whitespace differences are ignored and suggested
+    keywords are order-insensitive, so "Rice, 50KG" and "rice 50kg" share a key.
+    """
+    parts = [product.product_name, product.product_description or ""]
+    text = " ".join(parts).lower()
+    text = _WHITESPACE.sub(" ", _NON_WORD.sub(" ", text)).strip()
+
+    keywords = sorted({kw.strip().lower() for kw in product.suggested_keywords if kw.strip()})
+    if keywords:
+        text = f"{text}|{','.join(keywords)}"
+    return text
+
+
+class HSClassificationMemo:
+    """
+    Persistent per-tenant SKU/text → HS code memo.
+
+    Features:
+    - Lookup by SKU first, then by normalized product text
+    - Optional file persistence (append-only journal, periodically compacted)
+    - Hit/miss counters for memo effectiveness reporting
+    """
+
+    def __init__(self, storage_path: Optional[str] = None):
+        """
+        Initialize memo.
+
+        Args:
+            storage_path: Optional journal file used to persist confirmed entries
+        """
+        self.logger = logging.getLogger(__name__)
+        self.storage_path = Path(storage_path) if storage_path else None
+
+        # tenant_id -> {"sku": {sku: entry}, "text": {normalized_text: entry}}
+        self._entries: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        self._lock = threading.RLock()
+        self._stats = {'hits': 0, 'misses': 0, 'rejected': 0, 'confirmations': 0}
+        self._journal_records = 0
+
+        if self.storage_path:
+            self._load()
+
+    def lookup(self, tenant_id: str, product: ProductClassification,
+               normalized_text: Optional[str] = None,
+               validator: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Return the memoized HS code for a product, if any.
+
+        Args:
+            tenant_id: Tenant owning the catalogue
+            product: Product to look up
+            normalized_text: Pre-computed normalized text (avoids recomputation)
+            validator: Check the memoized code must pass to count as a hit
+
+        Returns:
+            Optional[str]: HS code (XXXX.XX) if memoized and valid
+        """
+        text_key = normalized_text or normalize_product_text(product)
+        with self._lock:
+            tenant = self._entries.get(tenant_id)
+            entry = None
+            if tenant:
+                if product.sku:
+                    entry = tenant['sku'].get(product.sku.strip())
+                if entry is None:
+                    entry = tenant['text'].get(text_key)
+
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            if validator is not None and not validator(entry['hs_code']):
+                self._stats['misses'] += 1
+                self._stats['rejected'] += 1
+                return None
+
+            self._stats['hits'] += 1
+            return entry['hs_code']
+
+    def confirm(self, tenant_id: str, product: ProductClassification, hs_code: str) -> None:
+        """
+        Record a confirmed classification for a tenant product.
+
+        Args:
+            tenant_id: Tenant owning the catalogue
+            product: Classified product
+            hs_code: Confirmed HS code (XXXX.XX)
+        """
+        entry = {'hs_code': hs_code, 'confirmed_at': datetime.now().isoformat()}
+        text_key = normalize_product_text(product)
+        sku = product.sku.strip() if product.sku else None
+
+        with self._lock:
+            self._apply({'op': 'confirm', 'tenant': tenant_id, 'sku': sku, 'text': text_key, 'entry': entry})
+            self._stats['confirmations'] += 1
+            if self.storage_path:
+                self._append({'op': 'confirm', 'tenant': tenant_id, 'sku': sku, 'text': text_key, 'entry': entry})
+
+    def forget(self, tenant_id: str, product: ProductClassification) -> bool:
+        """Remove a memoized product (e.g. after a reviewer rejects the code)."""
+        text_key = normalize_product_text(product)
+        with self._lock:
+            tenant = self._entries.get(tenant_id)
+            if not tenant:
+                return False
+            record = {'op': 'forget', 'tenant': tenant_id,
+                      'sku': product.sku.strip() if product.sku else None, 'text': text_key}
+            removed = self._apply(record)
+            if removed and self.storage_path:
+                self._append(record)
+            return removed
+
+    def clear_tenant(self, tenant_id: str) -> None:
+        """Drop every memoized entry for a tenant."""
+        with self._lock:
+            record = {'op': 'clear', 'tenant': tenant_id}
+            if self._apply(record) and self.storage_path:
+                self._append(record)
+
+    def size(self, tenant_id: Optional[str] = None) -> int:
+        """Number of memoized product texts (for one tenant or all)."""
+        with self._lock:
+            if tenant_id is not None:
+                return len(self._entries.get(tenant_id, {}).get('text', {}))
+            return sum(len(t['text']) for t in self._entries.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memo hit/miss counters and hit rate."""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'lookups': lookups,
+                'hit_rate': (self._stats['hits'] / lookups) if lookups else 0.0,
+                'tenants': len(self._entries),
+                'entries': self.size(),
+            }
+
+    def _apply(self, record: Dict[str, Any]) -> bool:
+        """Apply one journal record to the in-memory entries; returns whether anything changed."""
+        op, tenant_id = record.get('op'), record.get('tenant')
+        if op == 'snapshot':
+            self._entries = {
+                tenant_id: {'sku': dict(tenant.get('sku', {})), 'text': dict(tenant.get('text', {}))}
+                for tenant_id, tenant in record.get('entries', {}).items()
+            }
+            return True
+        if op == 'clear':
+            return self._entries.pop(tenant_id, None) is not None
+        if op == 'confirm':
+            tenant = self._entries.setdefault(tenant_id, {'sku': {}, 'text': {}})
+            if record.get('sku'):
+                tenant['sku'][record['sku']] = record['entry']
+            tenant['text'][record['text']] = record['entry']
+            return True
+        if op == 'forget':
+            tenant = self._entries.get(tenant_id)
+            if not tenant:
+                return False
+            removed = tenant['text'].pop(record['text'], None) is not None
+            if record.get('sku'):
+                removed = tenant['sku'].pop(record['sku'], None) is not None or removed
+            return removed
+        return False
+
+    def _load(self) -> None:
+        """Replay the journal (or a legacy single-object JSON file) into memory."""
+        if not self.storage_path.exists():
+            return
+        try:
+            with self.storage_path.open('r', encoding='utf-8') as handle:
+                content = handle.read()
+            try:
+                legacy = json.loads(content)
+            except ValueError:
+                legacy = None
+            is_legacy = isinstance(legacy, dict) and 'op' not in legacy
+            needs_rewrite = is_legacy
+            if is_legacy:
+                records = [{'op': 'snapshot', 'entries': legacy}]
+            else:
+                records = []
+                for line in content.splitlines():
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # A torn final line from an interrupted append
+                        needs_rewrite = True
+                        self.logger.warning(f"Skipping unreadable HS memo journal record in {self.storage_path}")
+            for record in records:
+                self._apply(record)
+            self._journal_records = len(records)
+            if needs_rewrite:
+                # Convert the old single-object format (or drop a torn record)
+                # before appending to the file
+                self._save()
+            self.logger.info(f"Loaded HS memo for {len(self._entries)} tenants")
+        except Exception as e:
+            self.logger.error(f"Failed to load HS memo from {self.storage_path}: {str(e)}")
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append one record to the journal, compacting when it is mostly history."""
+        try:
+            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.storage_path.open('a', encoding='utf-8') as handle:
+                handle.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self._journal_records += 1
+        except Exception as e:
+            self.logger.error(f"Failed to persist HS memo to {self.storage_path}: {str(e)}")
+            return
+        if self._journal_records >= max(_COMPACT_MIN_RECORDS, 2 * self.size()):
+            self._save()
+
+    def _save(self) -> None:
+        """Rewrite the journal as one snapshot record (write temp file, then replace)."""
+        try:
+            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.storage_path.with_suffix(self.storage_path.suffix + '.tmp')
+            with tmp_path.open('w', encoding='utf-8') as handle:
+                handle.write(json.dumps({'op': 'snapshot', 'entries': self._entries}, separators=(',', ':')) + '\n')
+            os.replace(tmp_path, self.storage_path)
+            self._journal_records = 1
+        except Exception as e:
+            self.logger.error(f"Failed to persist HS memo to {self.storage_path}: {str(e)}")
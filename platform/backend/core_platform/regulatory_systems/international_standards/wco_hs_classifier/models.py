@@ -115,6 +115,7 @@ class ProductClassification(BaseModel):
     product_description: Optional[str] = Field(None, description="Detailed product description")
     brand: Optional[str] = Field(None, description="Product brand")
     model: Optional[str] = Field(None, description="Product model/variant")
+    sku: Optional[str] = Field(None, description="Seller SKU used to memoize confirmed classifications")
     
     # Business context
     business_sector: Optional[str] = Field(None, description="Business sector (retail, manufacturing, etc.)")
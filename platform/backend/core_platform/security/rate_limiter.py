@@ -5,11 +5,17 @@ Comprehensive rate limiting for high-volume financial platform.
 Protects against DDoS attacks, API abuse, and ensures fair usage.
 """
 
+import os
+import re
 import time
 import math
+import fnmatch
+import itertools
 import redis
+import redis.asyncio as aioredis
 import logging
-from typing import Dict, Any, Optional, Tuple, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, List, Pattern
 from enum import Enum
 from dataclasses import dataclass
 from fastapi import Request, HTTPException, status
@@ -21,6 +27,50 @@ import asyncio
 logger = logging.getLogger(__name__)
 
 
+# Sliding-window log over several rules in one atomic round trip.
+# KEYS: one sorted set per rule. ARGV: now_ms, member, then (window_ms, max_allowed) per key.
+# The request is recorded in every window only if all rules allow it.
+# Returns {allowed, violated_index (1-based, 0 if none), retry_after_ms, count_1..count_n}.
+SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+local counts = {}
+local violated = 0
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    local window = tonumber(ARGV[1 + i * 2])
+    local max_allowed = tonumber(ARGV[2 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    counts[i] = count
+    if violated == 0 and count >= max_allowed then
+        violated = i
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        if oldest[2] then
+            retry_after = tonumber(oldest[2]) + window - now
+        else
+            retry_after = window
+        end
+    end
+end
+
+if violated == 0 then
+    for i, key in ipairs(KEYS) do
+        local window = tonumber(ARGV[1 + i * 2])
+        redis.call('ZADD', key, now, member)
+        redis.call('PEXPIRE', key, window + 60000)
+    end
+end
+
+local result = {violated == 0 and 1 or 0, violated, retry_after}
+for i = 1, #counts do
+    result[#result + 1] = counts[i]
+end
+return result
+"""
+
+
 def _normalize_role_key(role_value: str) -> Optional[str]:
     """Normalize various role strings to coordinator rate-limit keys."""
     if not role_value:
@@ -115,13 +165,28 @@ class ProductionRateLimiter:
     - Burst protection
     - Role-based limits
     - IP whitelisting
-    - Sliding window algorithm
+    - Sliding window algorithm (all applicable rules in one atomic Lua call)
+    - Precompiled, cached endpoint -> rule resolution
     - Real-time metrics and monitoring
     """
     
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+    RULE_CACHE_SIZE = 4096
+    
+    def __init__(self, redis_client: Optional[redis.Redis] = None,
+                 async_redis_client: Optional[Any] = None):
         self.redis_client = redis_client or self._get_redis_client()
+        # Async client for the request path; when only a sync client was
+        # supplied, the script runs in a worker thread instead of the loop
+        self.async_redis_client = async_redis_client
+        if async_redis_client is None and redis_client is None:
+            self.async_redis_client = self._get_async_redis_client()
+        self._sync_script = None
+        self._async_script = None
+        self._member_sequence = itertools.count()
+        
         self.rules: Dict[str, RateLimitRule] = {}
+        self._compiled_rules: List[Tuple[RateLimitRule, Optional[Pattern[str]]]] = []
+        self._rule_cache: "OrderedDict[Tuple[str, Optional[str]], List[RateLimitRule]]" = OrderedDict()
         self.metrics = {
             "total_requests": 0,
             "blocked_requests": 0,
@@ -136,7 +201,6 @@ class ProductionRateLimiter:
     
     def _get_redis_client(self) -> redis.Redis:
         """Get Redis client for distributed rate limiting"""
-        import os
         redis_url = os.getenv("REDIS_URL")
         if redis_url:
             return redis.from_url(redis_url, decode_responses=True)
@@ -148,6 +212,19 @@ class ProductionRateLimiter:
             decode_responses=True
         )
     
+    def _get_async_redis_client(self) -> Any:
+        """Get asyncio Redis client (same settings as the sync client)"""
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            return aioredis.from_url(redis_url, decode_responses=True)
+        
+        return aioredis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", "6379")),
+            db=int(os.getenv("REDIS_DB", "1")),
+            decode_responses=True
+        )
+    
     def _setup_production_rules(self):
         """Setup production-grade rate limiting rules"""
         
@@ -242,14 +319,26 @@ class ProductionRateLimiter:
     def add_rule(self, rule: RateLimitRule):
         """Add rate limiting rule"""
         self.rules[rule.name] = rule
+        self._compile_rules()
         logger.info(f"Added rate limit rule: {rule.name}")
     
     def remove_rule(self, rule_name: str):
         """Remove rate limiting rule"""
         if rule_name in self.rules:
             del self.rules[rule_name]
+            self._compile_rules()
             logger.info(f"Removed rate limit rule: {rule_name}")
     
+    def _compile_rules(self):
+        """Precompile endpoint patterns (priority order) and reset the resolution cache"""
+        compiled = []
+        for rule in sorted(self.rules.values(), key=lambda r: r.priority, reverse=True):
+            pattern = rule.endpoint_pattern
+            regex = re.compile(fnmatch.translate(pattern)) if "*" in pattern and pattern != "*" else None
+            compiled.append((rule, regex))
+        self._compiled_rules = compiled
+        self._rule_cache.clear()
+    
     async def check_rate_limit(self, request: Request) -> Tuple[bool, Dict[str, Any]]:
         """
         Check if request should be rate limited
@@ -281,12 +370,12 @@ class ProductionRateLimiter:
                 "limits": {}
             }
             
-            # Check each applicable rule
-            for rule in applicable_rules:
-                is_allowed, rule_info = await self._check_rule(
-                    rule, client_ip, user_id, api_key, endpoint
-                )
-                
+            # Check all applicable rules in one round trip
+            results = await self._check_rules(
+                applicable_rules, client_ip, user_id, api_key, endpoint
+            )
+            
+            for rule, (is_allowed, rule_info) in zip(applicable_rules, results):
                 rate_limit_info["limits"][rule.name] = rule_info
                 
                 if not is_allowed:
@@ -313,96 +402,116 @@ class ProductionRateLimiter:
             # Fail open - allow request if rate limiting fails
             return True, {"status": "error", "error": str(e)}
     
-    async def _check_rule(
-        self, 
-        rule: RateLimitRule, 
-        client_ip: str, 
-        user_id: Optional[str], 
-        api_key: Optional[str], 
+    def _rule_key(
+        self,
+        rule: RateLimitRule,
+        client_ip: str,
+        user_id: Optional[str],
+        api_key: Optional[str],
+        endpoint: str
+    ) -> str:
+        """Redis key for a rule and the request's identity"""
+        if rule.limit_type == RateLimitType.PER_IP:
+            key_identifier = client_ip
+        elif rule.limit_type == RateLimitType.PER_USER:
+            key_identifier = user_id or client_ip  # Fallback to IP if no user
+        elif rule.limit_type == RateLimitType.PER_API_KEY:
+            key_identifier = api_key or client_ip  # Fallback to IP if no API key
+        elif rule.limit_type == RateLimitType.PER_ENDPOINT:
+            key_identifier = f"{endpoint}:{client_ip}"
+        elif rule.limit_type == RateLimitType.GLOBAL:
+            key_identifier = "global"
+        else:
+            key_identifier = client_ip
+        
+        return f"taxpoynt:rate_limit:{rule.name}:{key_identifier}"
+    
+    def _request_member(self, now_ms: int) -> str:
+        """Unique sorted-set member so same-millisecond requests are all counted"""
+        return f"{now_ms}:{os.getpid()}:{next(self._member_sequence)}"
+    
+    async def _run_sliding_window(self, keys: List[str], args: List[Any]) -> List[int]:
+        """Execute the sliding-window script (async client, or sync client off-loop)"""
+        if self.async_redis_client is not None:
+            if self._async_script is None:
+                self._async_script = self.async_redis_client.register_script(SLIDING_WINDOW_LUA)
+            return await self._async_script(keys=keys, args=args)
+        
+        if self._sync_script is None:
+            self._sync_script = self.redis_client.register_script(SLIDING_WINDOW_LUA)
+        return await asyncio.to_thread(self._sync_script, keys=keys, args=args)
+    
+    async def _check_rules(
+        self,
+        rules: List[RateLimitRule],
+        client_ip: str,
+        user_id: Optional[str],
+        api_key: Optional[str],
         endpoint: str
-    ) -> Tuple[bool, Dict[str, Any]]:
-        """Check specific rate limiting rule"""
+    ) -> List[Tuple[bool, Dict[str, Any]]]:
+        """
+        Check all rules with one atomic script call.
+        
+        The request is only recorded when every rule allows it, so rejected
+        requests do not consume quota.
+        """
+        if not rules:
+            return []
+        
         try:
-            # Generate rate limit key based on rule type
-            if rule.limit_type == RateLimitType.PER_IP:
-                key_identifier = client_ip
-            elif rule.limit_type == RateLimitType.PER_USER:
-                key_identifier = user_id or client_ip  # Fallback to IP if no user
-            elif rule.limit_type == RateLimitType.PER_API_KEY:
-                key_identifier = api_key or client_ip  # Fallback to IP if no API key
-            elif rule.limit_type == RateLimitType.PER_ENDPOINT:
-                key_identifier = f"{endpoint}:{client_ip}"
-            elif rule.limit_type == RateLimitType.GLOBAL:
-                key_identifier = "global"
-            else:
-                key_identifier = client_ip
-            
-            # Create Redis key
-            redis_key = f"taxpoynt:rate_limit:{rule.name}:{key_identifier}"
-            
-            # Use sliding window algorithm
-            current_time = int(time.time())
-            window_start = current_time - rule.window_seconds
+            now_ms = int(time.time() * 1000)
+            keys = [self._rule_key(rule, client_ip, user_id, api_key, endpoint) for rule in rules]
+            args: List[Any] = [now_ms, self._request_member(now_ms)]
+            for rule in rules:
+                args.extend([rule.window_seconds * 1000, rule.max_requests + rule.burst_allowance])
             
-            # Get current request count in window
-            pipe = self.redis_client.pipeline()
-            
-            # Remove old entries
-            pipe.zremrangebyscore(redis_key, 0, window_start)
-            
-            # Count current requests
-            pipe.zcard(redis_key)
-            
-            # Add current request
-            pipe.zadd(redis_key, {str(current_time): current_time})
-            
-            # Set expiration
-            pipe.expire(redis_key, rule.window_seconds + 60)
-            
-            results = pipe.execute()
-            current_count = results[1]  # Count after removing old entries
-            
-            # Calculate limits
+            result = await self._run_sliding_window(keys, args)
+            allowed, violated_index, retry_after_ms = int(result[0]), int(result[1]), int(result[2])
+            counts = [int(count) for count in result[3:]]
+        except Exception as e:
+            logger.error(f"Error checking rate limit rules: {e}")
+            # Fail open for rule evaluation errors
+            return [(True, {"error": str(e)}) for _ in rules]
+        
+        outcomes = []
+        for index, (rule, current_count) in enumerate(zip(rules, counts), start=1):
             max_allowed = rule.max_requests + rule.burst_allowance
-            remaining = max(0, max_allowed - current_count - 1)  # -1 for current request
-            retry_after = rule.window_seconds
-            
-            rule_info = {
+            rule_allowed = index != violated_index
+            recorded = 1 if allowed else 0
+            retry_after = (
+                max(1, math.ceil(retry_after_ms / 1000)) if not rule_allowed else rule.window_seconds
+            )
+            outcomes.append((rule_allowed, {
                 "rule_name": rule.name,
                 "limit": rule.max_requests,
                 "burst_allowance": rule.burst_allowance,
-                "current_count": current_count + 1,  # +1 for current request
-                "remaining": remaining,
+                "current_count": current_count + recorded,
+                "remaining": max(0, max_allowed - current_count - 1),  # -1 for current request
                 "window_seconds": rule.window_seconds,
                 "retry_after": retry_after
-            }
-            
-            # Check if limit exceeded
-            if current_count >= max_allowed:
-                return False, rule_info
-            
-            return True, rule_info
-            
-        except Exception as e:
-            logger.error(f"Error checking rule {rule.name}: {e}")
-            # Fail open for individual rule errors
-            return True, {"error": str(e)}
+            }))
+        return outcomes
     
     def _find_applicable_rules(self, endpoint: str, user_id: Optional[str], role_key: Optional[str]) -> list:
-        """Find rate limiting rules applicable to the request"""
-        applicable_rules = []
+        """Find rate limiting rules applicable to the request (cached per endpoint/role)"""
+        cache_key = (endpoint, role_key)
+        cached = self._rule_cache.get(cache_key)
+        if cached is not None:
+            self._rule_cache.move_to_end(cache_key)
+            return cached
         
-        for rule in self.rules.values():
-            # Check endpoint pattern
-            if self._pattern_matches(rule.endpoint_pattern, endpoint):
+        applicable_rules = []
+        for rule, regex in self._compiled_rules:
+            pattern = rule.endpoint_pattern
+            if pattern == "*" or pattern == endpoint or (regex is not None and regex.match(endpoint)):
                 # Check user role restrictions if any
                 if rule.user_roles and role_key not in rule.user_roles:
                     continue
-                
                 applicable_rules.append(rule)
         
-        # Sort by priority (highest first)
-        applicable_rules.sort(key=lambda r: r.priority, reverse=True)
+        self._rule_cache[cache_key] = applicable_rules
+        if len(self._rule_cache) > self.RULE_CACHE_SIZE:
+            self._rule_cache.popitem(last=False)
         return applicable_rules
     
     def _pattern_matches(self, pattern: str, text: str) -> bool:
@@ -414,7 +523,6 @@ class ProductionRateLimiter:
         
         # Simple wildcard matching
         if "*" in pattern:
-            import fnmatch
             return fnmatch.fnmatch(text, pattern)
         
         return False
@@ -476,7 +584,6 @@ class ProductionRateLimiter:
         ]
         
         # Add environment-specific whitelists
-        import os
         env_whitelist = os.getenv("RATE_LIMIT_IP_WHITELIST", "").split(",")
         whitelist.extend([ip.strip() for ip in env_whitelist if ip.strip()])
         
@@ -493,11 +600,16 @@ class ProductionRateLimiter:
             redis_key = f"taxpoynt:rate_limit:{rule_name}:{identifier}"
             
             current_time = int(time.time())
-            window_start = current_time - rule.window_seconds
+            # Window entries are scored in milliseconds
+            window_start_ms = int(time.time() * 1000) - rule.window_seconds * 1000
             
             # Get current count
-            self.redis_client.zremrangebyscore(redis_key, 0, window_start)
-            current_count = self.redis_client.zcard(redis_key)
+            if self.async_redis_client is not None:
+                await self.async_redis_client.zremrangebyscore(redis_key, "-inf", window_start_ms)
+                current_count = await self.async_redis_client.zcard(redis_key)
+            else:
+                self.redis_client.zremrangebyscore(redis_key, "-inf", window_start_ms)
+                current_count = self.redis_client.zcard(redis_key)
             
             max_allowed = rule.max_requests + rule.burst_allowance
             remaining = max(0, max_allowed - current_count)
@@ -535,7 +647,10 @@ class ProductionRateLimiter:
         """Reset rate limit for specific identifier and rule"""
         try:
             redis_key = f"taxpoynt:rate_limit:{rule_name}:{identifier}"
-            self.redis_client.delete(redis_key)
+            if self.async_redis_client is not None:
+                await self.async_redis_client.delete(redis_key)
+            else:
+                self.redis_client.delete(redis_key)
             logger.info(f"Reset rate limit for {identifier} on rule {rule_name}")
             return True
         except Exception as e:
@@ -555,10 +670,11 @@ def get_rate_limiter() -> ProductionRateLimiter:
     return _rate_limiter
 
 
-def initialize_rate_limiter(redis_client: Optional[redis.Redis] = None) -> ProductionRateLimiter:
-    """Initialize rate limiter with custom Redis client"""
+def initialize_rate_limiter(redis_client: Optional[redis.Redis] = None,
+                            async_redis_client: Optional[Any] = None) -> ProductionRateLimiter:
+    """Initialize rate limiter with custom Redis client(s)"""
     global _rate_limiter
-    _rate_limiter = ProductionRateLimiter(redis_client)
+    _rate_limiter = ProductionRateLimiter(redis_client, async_redis_client)
     return _rate_limiter
 
 
@@ -45,7 +45,8 @@ from .privacy_protection import (
 from .cache_manager import (
     ClassificationCacheManager,
     CacheKey,
-    CacheEntry
+    CacheEntry,
+    AdmissionPolicy
 )
 
 from .rule_fallback import (
@@ -54,6 +55,16 @@ from .rule_fallback import (
     PatternMatcher
 )
 
+from .keyword_engine import KeywordAutomaton
+
+from .request_batcher import (
+    ClassificationBatcher,
+    BatchingConfig,
+    ClassificationProvider,
+    OpenAIBatchProvider,
+    LocalStubProvider
+)
+
 from .usage_tracker import (
     ClassificationUsageTracker,
     UsageMetrics,
@@ -93,11 +104,20 @@ __all__ = [
     "ClassificationCacheManager",
     "CacheKey",
     "CacheEntry",
+    "AdmissionPolicy",
     
     # Rule-based Fallback
     "NigerianRuleFallback",
     "BusinessIndicator",
     "PatternMatcher",
+    "KeywordAutomaton",
+    
+    # Request Batching
+    "ClassificationBatcher",
+    "BatchingConfig",
+    "ClassificationProvider",
+    "OpenAIBatchProvider",
+    "LocalStubProvider",
     
     # Usage Tracking
     "ClassificationUsageTracker",
@@ -6,11 +6,15 @@ Smart caching system with Redis integration for transaction classification.
 Optimizes costs by caching similar transaction patterns and results.
 """
 
+import re
 import json
+import asyncio
 import hashlib
 import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from itertools import islice
+from typing import Dict, List, Optional, Any, Set, Tuple
 from decimal import Decimal
 from dataclasses import dataclass
 from enum import Enum
@@ -31,6 +35,18 @@ from .classification_models import (
 
 logger = logging.getLogger(__name__)
 
+_DIGIT_RUN = re.compile(r"\d+")
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+def normalize_narration(narration: str) -> str:
+    """
+    Normalize a narration for pattern keys and request deduplication.
+    
+    Lowercases, collapses whitespace and masks digit runs (references,
+    phone numbers, terminal IDs) so near-identical narrations share a key.
+    """
+    return _WHITESPACE_RUN.sub(' ', _DIGIT_RUN.sub('#', narration.lower().strip()))
+
 class CacheStrategy(str, Enum):
     """Cache strategy options"""
     CONSERVATIVE = "conservative"    # Cache only high-confidence results
@@ -124,21 +140,75 @@ class CacheEntry:
             expires_at=datetime.fromisoformat(data['expires_at']) if data['expires_at'] else None
         )
 
+class AdmissionPolicy(str, Enum):
+    """Memory cache admission policy when the cache is full"""
+    LRU = "lru"              # Always admit, evict least recently used
+    TINY_LFU = "tiny_lfu"    # Admit only if the newcomer is used at least as often as the LRU victim
+
+class FrequencySketch:
+    """
+    Count-min sketch of key access frequency with periodic aging.
+    
+    Used by the TinyLFU admission policy; counters are halved every
+    sample_size increments so old popularity fades.
+    """
+    
+    def __init__(self, width: int = 4096, depth: int = 4, sample_size: Optional[int] = None):
+        self.width = width
+        self.depth = depth
+        self.sample_size = sample_size or width * 10
+        self._rows = [[0] * width for _ in range(depth)]
+        self._additions = 0
+    
+    def _indexes(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=self.depth * 4).digest()
+        return [int.from_bytes(digest[i * 4:(i + 1) * 4], 'little') % self.width for i in range(self.depth)]
+    
+    def increment(self, key: str) -> None:
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._age()
+    
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+    
+    def _age(self) -> None:
+        for row in self._rows:
+            for index, count in enumerate(row):
+                row[index] = count >> 1
+        self._additions //= 2
+
 class ClassificationCacheManager:
     """
     Smart caching system for transaction classification results
+    
+    The in-process cache is an O(1) LRU (OrderedDict) bounded by entry count
+    and optionally by serialized byte size, with an optional TinyLFU
+    admission filter. Redis acts as the secondary cache and is written
+    behind in pipelined batches rather than awaited per entry.
     """
     
     def __init__(self, 
                  redis_url: Optional[str] = None,
                  strategy: CacheStrategy = CacheStrategy.BALANCED,
                  default_ttl_hours: int = 24,
-                 max_cache_size: int = 100000):
+                 max_cache_size: int = 100000,
+                 max_cache_bytes: Optional[int] = None,
+                 admission_policy: AdmissionPolicy = AdmissionPolicy.LRU,
+                 write_behind_batch_size: int = 100,
+                 write_behind_interval_seconds: float = 0.05):
         """Initialize cache manager"""
         
         self.strategy = strategy
         self.default_ttl_hours = default_ttl_hours
         self.max_cache_size = max_cache_size
+        self.max_cache_bytes = max_cache_bytes
+        self.admission_policy = admission_policy
+        self.write_behind_batch_size = write_behind_batch_size
+        self.write_behind_interval_seconds = write_behind_interval_seconds
         self.logger = logging.getLogger(f"{__name__}.ClassificationCacheManager")
         
         # Redis client setup
@@ -158,8 +228,20 @@ class ClassificationCacheManager:
             self.redis_available = False
             self.logger.info("Redis not available. Using in-memory cache.")
         
-        # In-memory fallback cache
-        self.memory_cache: Dict[str, CacheEntry] = {}
+        # In-memory LRU cache (least recently used first)
+        self.memory_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._entry_sizes: Dict[str, int] = {}
+        self.memory_cache_bytes = 0
+        self._frequency = FrequencySketch() if admission_policy == AdmissionPolicy.TINY_LFU else None
+        
+        # Pending Redis writes (key -> serialized entry), flushed by a background
+        # task; entries stay queued until Redis has accepted them
+        self._write_behind: "OrderedDict[str, str]" = OrderedDict()
+        self._write_behind_task: Optional[asyncio.Task] = None
+        # Keys of in-flight flush batches (refcounted) and those removed meanwhile,
+        # whose write has to be undone once the batch lands
+        self._flushing_keys: Dict[str, int] = {}
+        self._removed_while_flushing: Set[str] = set()
         
         # Cache statistics
         self.stats = {
@@ -167,6 +249,10 @@ class ClassificationCacheManager:
             'misses': 0,
             'sets': 0,
             'evictions': 0,
+            'admissions': 0,
+            'admission_rejections': 0,
+            'write_behind_flushes': 0,
+            'write_behind_errors': 0,
             'total_cost_saved_ngn': Decimal('0.0')
         }
         
@@ -324,7 +410,7 @@ class ClassificationCacheManager:
     def _extract_narration_pattern(self, narration: str) -> str:
         """Extract pattern from narration for caching"""
         
-        narration_lower = narration.lower().strip()
+        narration_lower = normalize_narration(narration)
         
         # Business indicators
         business_keywords = [
@@ -410,58 +496,199 @@ class ClassificationCacheManager:
             return result.confidence >= 0.3
     
     async def _get_cache_entry(self, cache_key: str) -> Optional[CacheEntry]:
-        """Get cache entry from storage"""
+        """Get cache entry from storage (memory first, then Redis)"""
         
         try:
+            if self._frequency is not None:
+                self._frequency.increment(cache_key)
+            
+            entry = self.memory_cache.get(cache_key)
+            if entry is not None:
+                if entry.is_expired:
+                    self._memory_pop(cache_key)
+                    return None
+                self.memory_cache.move_to_end(cache_key)
+                return entry
+            
             if self.redis_available and self.async_redis_client:
-                # Try Redis first
+                # Secondary cache; promote hits into memory
                 data = await self.async_redis_client.get(cache_key)
                 if data:
-                    entry_dict = json.loads(data)
-                    return CacheEntry.from_dict(entry_dict)
+                    entry = CacheEntry.from_dict(json.loads(data))
+                    self._memory_put(entry, len(data))
+                    return entry
             
-            # Fall back to memory cache
-            return self.memory_cache.get(cache_key)
+            return None
             
         except Exception as e:
             self.logger.error(f"Error getting cache entry: {e}")
             return None
     
     async def _set_cache_entry(self, cache_entry: CacheEntry) -> bool:
-        """Set cache entry in storage"""
+        """Set cache entry in memory and queue it for Redis write-behind"""
         
         try:
-            entry_data = json.dumps(cache_entry.to_dict())
+            entry_data = json.dumps(cache_entry.to_dict(), default=str)
+            
+            if self._frequency is not None:
+                self._frequency.increment(cache_entry.cache_key)
+            
+            self._memory_put(cache_entry, len(entry_data))
             
             if self.redis_available and self.async_redis_client:
-                # Store in Redis with TTL
-                ttl_seconds = self.default_ttl_hours * 3600
-                await self.async_redis_client.setex(
-                    cache_entry.cache_key, 
-                    ttl_seconds, 
-                    entry_data
-                )
-            
-            # Also store in memory cache (with size limit)
-            if len(self.memory_cache) >= self.max_cache_size:
-                await self._evict_oldest_entries()
-            
-            self.memory_cache[cache_entry.cache_key] = cache_entry
+                self._write_behind[cache_entry.cache_key] = entry_data
+                self._write_behind.move_to_end(cache_entry.cache_key)
+                self._schedule_write_behind()
+            
             return True
             
         except Exception as e:
             self.logger.error(f"Error setting cache entry: {e}")
             return False
     
+    def _memory_put(self, cache_entry: CacheEntry, size_bytes: int) -> bool:
+        """Insert into the memory LRU, evicting from the cold end as needed"""
+        
+        key = cache_entry.cache_key
+        
+        if self.max_cache_bytes is not None and size_bytes > self.max_cache_bytes:
+            # Would evict everything, itself included; drop any stale copy instead
+            self._memory_pop(key)
+            self.stats['admission_rejections'] += 1
+            return False
+        
+        if key in self.memory_cache:
+            self.memory_cache_bytes -= self._entry_sizes.get(key, 0)
+        elif self._is_full(size_bytes) and not self._admit(key):
+            self.stats['admission_rejections'] += 1
+            return False
+        
+        self.memory_cache[key] = cache_entry
+        self.memory_cache.move_to_end(key)
+        self._entry_sizes[key] = size_bytes
+        self.memory_cache_bytes += size_bytes
+        self.stats['admissions'] += 1
+        
+        self._evict_oldest_entries()
+        return True
+    
+    def _memory_pop(self, cache_key: str) -> Optional[CacheEntry]:
+        """Remove a key from the memory LRU and its byte accounting"""
+        
+        entry = self.memory_cache.pop(cache_key, None)
+        if entry is not None:
+            self.memory_cache_bytes -= self._entry_sizes.pop(cache_key, 0)
+        return entry
+    
+    def _is_full(self, incoming_bytes: int = 0) -> bool:
+        """Whether adding an entry would exceed the count or byte budget"""
+        
+        if len(self.memory_cache) >= self.max_cache_size:
+            return True
+        if self.max_cache_bytes is not None:
+            return self.memory_cache_bytes + incoming_bytes > self.max_cache_bytes
+        return False
+    
+    def _admit(self, cache_key: str) -> bool:
+        """TinyLFU admission: newcomer must be at least as popular as the LRU victim"""
+        
+        if self._frequency is None or not self.memory_cache:
+            return True
+        victim_key = next(iter(self.memory_cache))
+        return self._frequency.estimate(cache_key) >= self._frequency.estimate(victim_key)
+    
+    def _schedule_write_behind(self):
+        """Start the background Redis flusher if it is not already running"""
+        
+        if self._write_behind_task is None or self._write_behind_task.done():
+            self._write_behind_task = asyncio.get_running_loop().create_task(self._write_behind_loop())
+    
+    async def _write_behind_loop(self):
+        """Flush queued writes until the queue drains, backing off while Redis fails"""
+        
+        delay = self.write_behind_interval_seconds
+        while self._write_behind:
+            await asyncio.sleep(delay)
+            errors = self.stats['write_behind_errors']
+            await self.flush_write_behind()
+            if self.stats['write_behind_errors'] > errors:
+                delay = min(max(delay, 0.05) * 2, 30.0)
+            else:
+                delay = self.write_behind_interval_seconds
+    
+    async def flush_write_behind(self) -> int:
+        """Write queued entries to Redis in pipelined batches; returns entries written"""
+        
+        written = 0
+        if not (self.redis_available and self.async_redis_client):
+            self._write_behind.clear()
+            return written
+        
+        ttl_seconds = self.default_ttl_hours * 3600
+        while self._write_behind:
+            batch = list(islice(self._write_behind.items(), self.write_behind_batch_size))
+            for key, _ in batch:
+                self._flushing_keys[key] = self._flushing_keys.get(key, 0) + 1
+            
+            try:
+                pipe = self.async_redis_client.pipeline(transaction=False)
+                for key, entry_data in batch:
+                    pipe.setex(key, ttl_seconds, entry_data)
+                await pipe.execute()
+            except Exception as e:
+                self._release_flush_batch(batch)
+                self.stats['write_behind_errors'] += 1
+                self.logger.warning(f"Write-behind flush of {len(batch)} entries failed, keeping them queued: {e}")
+                break
+            
+            removed = self._release_flush_batch(batch)
+            for key, entry_data in batch:
+                # Entries re-queued with newer data meanwhile stay for the next batch
+                if self._write_behind.get(key) is entry_data:
+                    del self._write_behind[key]
+            written += len(batch)
+            self.stats['write_behind_flushes'] += 1
+            
+            if removed:
+                try:
+                    await self.async_redis_client.delete(*removed)
+                except Exception as e:
+                    self.logger.warning(f"Failed to delete {len(removed)} entries removed during flush: {e}")
+        
+        return written
+    
+    def _release_flush_batch(self, batch: List[Tuple[str, str]]) -> List[str]:
+        """Release a finished batch's in-flight keys; returns those removed while it was in flight"""
+        
+        removed = []
+        for key, _ in batch:
+            if key in self._removed_while_flushing:
+                removed.append(key)
+            remaining = self._flushing_keys.get(key, 1) - 1
+            if remaining > 0:
+                self._flushing_keys[key] = remaining
+            else:
+                self._flushing_keys.pop(key, None)
+                self._removed_while_flushing.discard(key)
+        return removed
+    
+    def _forget_pending_write(self, cache_key: str) -> None:
+        """Drop a queued write and make any in-flight write of the key get undone"""
+        
+        self._write_behind.pop(cache_key, None)
+        if cache_key in self._flushing_keys:
+            self._removed_while_flushing.add(cache_key)
+    
     async def _remove_cache_entry(self, cache_key: str) -> bool:
         """Remove cache entry from storage"""
         
         try:
+            self._forget_pending_write(cache_key)
+            
             if self.redis_available and self.async_redis_client:
                 await self.async_redis_client.delete(cache_key)
             
-            if cache_key in self.memory_cache:
-                del self.memory_cache[cache_key]
+            self._memory_pop(cache_key)
             
             return True
             
@@ -478,27 +705,21 @@ class ClassificationCacheManager:
         # Estimate cost savings (assuming ₦3.2 for premium API call)
         self.stats['total_cost_saved_ngn'] += Decimal('3.2')
     
-    async def _evict_oldest_entries(self):
-        """Evict oldest entries from memory cache"""
-        
-        if not self.memory_cache:
-            return
-        
-        # Sort by last accessed time
-        sorted_entries = sorted(
-            self.memory_cache.items(),
-            key=lambda x: x[1].last_accessed
-        )
-        
-        # Remove oldest 10% of entries
-        evict_count = max(1, len(sorted_entries) // 10)
-        
-        for i in range(evict_count):
-            cache_key = sorted_entries[i][0]
-            del self.memory_cache[cache_key]
-            self.stats['evictions'] += 1
-        
-        self.logger.debug(f"Evicted {evict_count} cache entries")
+    def _evict_oldest_entries(self):
+        """Evict least recently used entries until within count and byte budgets (O(1) each)"""
+        
+        evict_count = 0
+        while self.memory_cache and (
+            len(self.memory_cache) > self.max_cache_size or
+            (self.max_cache_bytes is not None and self.memory_cache_bytes > self.max_cache_bytes)
+        ):
+            cache_key, _ = self.memory_cache.popitem(last=False)
+            self.memory_cache_bytes -= self._entry_sizes.pop(cache_key, 0)
+            evict_count += 1
+        
+        if evict_count:
+            self.stats['evictions'] += evict_count
+            self.logger.debug(f"Evicted {evict_count} cache entries")
     
     async def get_cache_statistics(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
@@ -525,7 +746,15 @@ class ClassificationCacheManager:
             'total_misses': self.stats['misses'],
             'total_sets': self.stats['sets'],
             'total_evictions': self.stats['evictions'],
+            'total_admissions': self.stats['admissions'],
+            'admission_rejections': self.stats['admission_rejections'],
+            'admission_policy': self.admission_policy,
             'memory_cache_size': memory_cache_size,
+            'memory_cache_bytes': self.memory_cache_bytes,
+            'max_cache_bytes': self.max_cache_bytes,
+            'write_behind_pending': len(self._write_behind),
+            'write_behind_flushes': self.stats['write_behind_flushes'],
+            'write_behind_errors': self.stats['write_behind_errors'],
             'redis_cache_size': redis_cache_size,
             'total_cost_saved_ngn': float(self.stats['total_cost_saved_ngn']),
             'average_cost_per_hit_ngn': (
@@ -553,8 +782,10 @@ class ClassificationCacheManager:
                 # Clear from memory cache
                 keys_to_remove = [key for key in self.memory_cache.keys() if pattern in key]
                 for key in keys_to_remove:
-                    del self.memory_cache[key]
-                    cleared_count += len(keys_to_remove)
+                    self._memory_pop(key)
+                for key in [key for key in (*self._write_behind, *self._flushing_keys) if pattern in key]:
+                    self._forget_pending_write(key)
+                cleared_count += len(keys_to_remove)
             
             else:
                 # Clear all cache
@@ -566,6 +797,10 @@ class ClassificationCacheManager:
                 
                 cleared_count += len(self.memory_cache)
                 self.memory_cache.clear()
+                self._entry_sizes.clear()
+                self.memory_cache_bytes = 0
+                self._write_behind.clear()
+                self._removed_while_flushing.update(self._flushing_keys)
             
             self.logger.info(f"Cleared {cleared_count} cache entries")
             return cleared_count
@@ -578,6 +813,10 @@ class ClassificationCacheManager:
         """Close cache connections"""
         
         try:
+            # Persist queued writes before closing the connection
+            if self._write_behind:
+                await self.flush_write_behind()
+            
             if self.async_redis_client:
                 await self.async_redis_client.close()
             
@@ -0,0 +1,80 @@
+"""
+Compiled Keyword Engine
+=======================
+
+Multi-keyword matcher used by the rule-based fallback classifier.
+
+Keywords are compiled once into a single trie-structured alternation regex, so
+a narration is scanned in one pass by the C regex engine instead of running a
+Python substring check per keyword. Results keep plain substring semantics:
+every keyword contained in the text is reported, including overlapping ones.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+
+def _build_trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a factored regex (shared prefixes merged) matching the longest keyword at a position."""
+
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        terminal = '' in node
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # Greedy optional group: prefer the longest keyword ending here
+        return group + '?' if terminal else group
+
+    return build(trie)
+
+
+class KeywordAutomaton:
+    """
+    Compiled matcher returning every keyword contained in a text.
+
+    The compiled pattern finds the longest keyword starting at each match
+    position; shorter keywords that are prefixes of it are resolved through a
+    precomputed prefix closure, and scanning resumes one character after the
+    match start so overlapping keywords are not lost.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(k.lower() for k in keywords if k))
+        self._pattern: Optional[Pattern[str]] = (
+            re.compile(_build_trie_pattern(self.keywords)) if self.keywords else None
+        )
+        self._prefix_closure: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(other for other in self.keywords if keyword.startswith(other))
+            for keyword in self.keywords
+        }
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the set of keywords that occur in text (case-insensitive)."""
+
+        if not self._pattern or not text:
+            return set()
+
+        text = text.lower()
+        search = self._pattern.search
+        closure = self._prefix_closure
+        hits: Set[str] = set()
+
+        match = search(text)
+        while match:
+            hits.update(closure[match.group()])
+            match = search(text, match.start() + 1)
+
+        return hits
+
+    def __len__(self) -> int:
+        return len(self.keywords)
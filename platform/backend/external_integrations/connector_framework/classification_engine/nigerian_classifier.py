@@ -8,6 +8,7 @@ Includes FIRS compliance focus, privacy protection, and comprehensive Nigerian c
 
 import os
 import json
+import asyncio
 import time
 import hashlib
 import logging
@@ -30,9 +31,65 @@ from .classification_models import (
     UserContext,
     NigerianBusinessContext
 )
+from .cost_optimizer import CostOptimizer
+from .request_batcher import (
+    BatchingConfig,
+    ClassificationBatcher,
+    ClassificationProvider,
+    OpenAIBatchProvider
+)
 
 logger = logging.getLogger(__name__)
 
+NIGERIAN_CLASSIFICATION_GUIDANCE = """NIGERIAN BUSINESS PATTERNS:
+- Common business payments: "transfer for goods", "payment for services", "invoice settlement"
+- Personal transfers: "family support", "personal loan", "salary payment"
+- USSD patterns: Often short descriptions like "TRF/PMT", "Mobile Transfer"
+- Business hours: 8AM-6PM Lagos time indicates higher business probability
+- Weekend transactions: Less likely to be business (except retail/hospitality)
+
+FIRS COMPLIANCE REQUIREMENTS:
+- All business income must be invoiced for tax compliance
+- VAT applicable at 7.5% for most business transactions
+- Customer identification required for invoice generation
+
+CLASSIFICATION CRITERIA:
+✅ BUSINESS INCOME: 
+- Customer payments for goods/services
+- Invoice settlements
+- Professional service fees
+- Product sales revenue
+- Contract payments
+
+❌ NOT BUSINESS INCOME:
+- Salary payments
+- Personal transfers
+- Loan disbursements/repayments
+- Refunds and reversals
+- Internal transfers
+- Family support
+- Investment returns
+
+NIGERIAN-SPECIFIC PATTERNS:
+- "Alaba Market" mentions → likely business
+- "Salary" keywords → personal income
+- Repeat senders → likely customers
+- Round amounts → often business transactions
+- Transfer times during business hours → higher business probability"""
+
+CLASSIFICATION_RESULT_FIELDS = """    "is_business_income": true/false,
+    "confidence": 0.0-1.0,
+    "reasoning": "detailed explanation of decision factors",
+    "customer_name": "extracted customer name or null",
+    "suggested_invoice_description": "proposed invoice line item description",
+    "tax_category": "standard_rate|zero_rate|exempt|unknown",
+    "requires_human_review": true/false,
+    "nigerian_compliance_notes": ["FIRS-specific considerations"],
+    "business_probability_factors": ["list", "of", "supporting", "factors"],
+    "risk_factors": ["list", "of", "concerning", "patterns"],
+    "similar_pattern_confidence": 0.0-1.0,
+    "nigerian_patterns_detected": ["detected", "nigerian", "patterns"]"""
+
 class ClassificationError(Exception):
     """Base exception for classification errors"""
     pass
@@ -81,8 +138,20 @@ class NigerianTransactionClassifier:
     OpenAI GPT-4o-mini powered transaction classifier optimized for Nigerian business patterns
     """
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the Nigerian transaction classifier"""
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 provider: Optional[ClassificationProvider] = None,
+                 batching: Optional[BatchingConfig] = None):
+        """
+        Initialize the Nigerian transaction classifier
+        
+        Args:
+            api_key: OpenAI API key (defaults to OPENAI_API_KEY)
+            provider: Batch classification provider; enables request batching
+                (e.g. LocalStubProvider for offline use)
+            batching: Batching configuration; enables batching through OpenAI
+                when an API key is available
+        """
         
         # OpenAI client setup
         api_key = api_key or os.getenv("OPENAI_API_KEY")
@@ -99,6 +168,12 @@ class NigerianTransactionClassifier:
         
         # Cost tracking
         self.cost_tracker = CostTracker()
+        self.cost_optimizer = CostOptimizer()
+        
+        # Optional batching front end (coalesces concurrent API requests)
+        if provider is None and batching is not None and self.client is not None:
+            provider = OpenAIBatchProvider(self.client, self._build_nigerian_batch_prompt)
+        self.batcher = ClassificationBatcher(provider, batching) if provider is not None else None
         
         # Logger
         self.logger = logging.getLogger(f"{__name__}.NigerianTransactionClassifier")
@@ -164,18 +239,20 @@ class NigerianTransactionClassifier:
         try:
             # Determine classification tier if not specified
             if not request.classification_tier:
-                from .cost_optimizer import CostOptimizer
-                optimizer = CostOptimizer()
-                request.classification_tier = optimizer.determine_classification_tier(
+                request.classification_tier = self.cost_optimizer.determine_classification_tier(
                     request, request.user_context
                 )
             
-            # Use rule-based fallback if no OpenAI client or tier is rule-based
-            if not self.client or request.classification_tier == ClassificationTier.RULE_BASED:
+            # Use rule-based fallback if no API provider or tier is rule-based
+            has_provider = self.client is not None or self.batcher is not None
+            if not has_provider or request.classification_tier == ClassificationTier.RULE_BASED:
                 return await self._nigerian_rule_fallback(request)
             
-            # Process with OpenAI API
-            result = await self._classify_with_openai(request)
+            # Process with the API, batched when a batcher is configured
+            if self.batcher is not None:
+                result = await self._classify_with_batcher(request)
+            else:
+                result = await self._classify_with_openai(request)
             
             # Update processing time
             processing_time = int((time.time() - start_time) * 1000)
@@ -233,41 +310,13 @@ class NigerianTransactionClassifier:
             # Parse response
             result_data = json.loads(response.choices[0].message.content)
             
-            # Calculate API cost
-            cost_info = self.cost_tracker.calculate_cost(
-                response.usage.prompt_tokens,
-                response.usage.completion_tokens
-            )
-            
-            # Build classification metadata
-            metadata = ClassificationMetadata(
-                classification_method="api_gpt4o_mini",
-                model_version="gpt-4o-mini",
-                api_cost_estimate_ngn=Decimal(str(cost_info['total_cost_ngn'])),
+            result = self._build_api_result(
+                request,
+                result_data,
                 prompt_tokens=response.usage.prompt_tokens,
                 completion_tokens=response.usage.completion_tokens,
-                privacy_level_applied=request.privacy_level or PrivacyLevel.STANDARD,
-                nigerian_patterns_detected=result_data.get('nigerian_patterns_detected', []),
-                business_hours_factor=self._calculate_business_hours_factor(request),
-                amount_category=self._categorize_amount(request.amount)
-            )
-            
-            # Build classification result
-            result = TransactionClassificationResult(
-                is_business_income=result_data.get('is_business_income', False),
-                confidence=max(0.0, min(1.0, result_data.get('confidence', 0.5))),
-                reasoning=result_data.get('reasoning', 'No reasoning provided'),
-                tax_category=TaxCategory(result_data.get('tax_category', 'unknown')),
-                vat_applicable=result_data.get('tax_category') == 'standard_rate',
-                customer_name=result_data.get('customer_name'),
-                suggested_invoice_description=result_data.get('suggested_invoice_description'),
-                requires_human_review=result_data.get('requires_human_review', False),
-                nigerian_compliance_notes=result_data.get('nigerian_compliance_notes', []),
-                business_probability_factors=result_data.get('business_probability_factors', []),
-                risk_factors=result_data.get('risk_factors', []),
-                similar_pattern_confidence=max(0.0, min(1.0, result_data.get('similar_pattern_confidence', 0.0))),
-                metadata=metadata,
-                request_id=request.request_id
+                model="gpt-4o-mini",
+                method="api_gpt4o_mini"
             )
             
             # Store classification data for training
@@ -283,87 +332,169 @@ class NigerianTransactionClassifier:
             else:
                 raise ClassificationError(f"OpenAI API error: {str(e)}")
     
+    async def classify_transactions(self,
+                                    requests: List[TransactionClassificationRequest]) -> List[TransactionClassificationResult]:
+        """
+        Classify many transactions (e.g. a bank statement import).
+        
+        With batching enabled the requests are submitted concurrently so the
+        batcher can coalesce and deduplicate them; otherwise they are
+        classified one after another. Results keep input order.
+        """
+        
+        if self.batcher is not None:
+            return list(await asyncio.gather(*(self.classify_transaction(r) for r in requests)))
+        
+        results = []
+        for request in requests:
+            results.append(await self.classify_transaction(request))
+        return results
+    
+    async def _classify_with_batcher(self,
+                                     request: TransactionClassificationRequest) -> TransactionClassificationResult:
+        """Classify transaction through the coalescing batch front end"""
+        
+        batched = await self.batcher.submit(request)
+        result = self._build_api_result(
+            request,
+            batched.data,
+            prompt_tokens=batched.prompt_tokens,
+            completion_tokens=batched.completion_tokens,
+            model=batched.model,
+            method="api_batched"
+        )
+        
+        if not batched.coalesced:
+            await self._store_classification_data(request, result)
+        
+        return result
+    
+    def _build_api_result(self,
+                          request: TransactionClassificationRequest,
+                          result_data: Dict[str, Any],
+                          prompt_tokens: int,
+                          completion_tokens: int,
+                          model: str,
+                          method: str) -> TransactionClassificationResult:
+        """Build classification result from a provider JSON payload"""
+        
+        # Calculate API cost
+        cost_info = self.cost_tracker.calculate_cost(prompt_tokens, completion_tokens)
+        
+        # Build classification metadata
+        metadata = ClassificationMetadata(
+            classification_method=method,
+            model_version=model,
+            api_cost_estimate_ngn=Decimal(str(cost_info['total_cost_ngn'])),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            privacy_level_applied=request.privacy_level or PrivacyLevel.STANDARD,
+            nigerian_patterns_detected=result_data.get('nigerian_patterns_detected', []),
+            business_hours_factor=self._calculate_business_hours_factor(request),
+            amount_category=self._categorize_amount(request.amount)
+        )
+        
+        # Build classification result
+        return TransactionClassificationResult(
+            is_business_income=result_data.get('is_business_income', False),
+            confidence=max(0.0, min(1.0, result_data.get('confidence', 0.5))),
+            reasoning=result_data.get('reasoning', 'No reasoning provided'),
+            tax_category=TaxCategory(result_data.get('tax_category', 'unknown')),
+            vat_applicable=result_data.get('tax_category') == 'standard_rate',
+            customer_name=result_data.get('customer_name'),
+            suggested_invoice_description=result_data.get('suggested_invoice_description'),
+            requires_human_review=result_data.get('requires_human_review', False),
+            nigerian_compliance_notes=result_data.get('nigerian_compliance_notes', []),
+            business_probability_factors=result_data.get('business_probability_factors', []),
+            risk_factors=result_data.get('risk_factors', []),
+            similar_pattern_confidence=max(0.0, min(1.0, result_data.get('similar_pattern_confidence', 0.0))),
+            metadata=metadata,
+            request_id=request.request_id
+        )
+    
     def _build_nigerian_classification_prompt(self, 
                                             request: TransactionClassificationRequest) -> str:
         """Build Nigerian-optimized classification prompt"""
         
-        business_context = request.user_context.business_context
-        
         prompt = f"""
 Analyze this Nigerian bank transaction for TAX COMPLIANCE purposes.
 
-BUSINESS CONTEXT:
-- Nigerian SME: {request.user_context.business_name or 'Unknown'}
-- Industry: {business_context.industry}
-- Location: {business_context.location}, {business_context.state or 'Nigeria'}
-- Business type: {business_context.business_size}
-- Years in operation: {business_context.years_in_operation or 'unknown'}
-- Previous patterns: {len(request.user_context.learned_patterns)} learned patterns
+{self._build_business_context_section(request)}
 
 TRANSACTION DETAILS:
-- Amount: ₦{request.amount:,}
-- Narration: "{request.narration}"
-- Sender: {request.sender_name or 'Unknown'}
-- Date: {request.date.strftime('%Y-%m-%d')}
-- Time: {request.time or 'Unknown'}
-- Bank: {request.bank or 'Unknown'}
-- Reference: {request.reference or 'Unknown'}
-
-NIGERIAN BUSINESS PATTERNS:
-- Common business payments: "transfer for goods", "payment for services", "invoice settlement"
-- Personal transfers: "family support", "personal loan", "salary payment"
-- USSD patterns: Often short descriptions like "TRF/PMT", "Mobile Transfer"
-- Business hours: 8AM-6PM Lagos time indicates higher business probability
-- Weekend transactions: Less likely to be business (except retail/hospitality)
+{self._build_transaction_details(request)}
 
-FIRS COMPLIANCE REQUIREMENTS:
-- All business income must be invoiced for tax compliance
-- VAT applicable at 7.5% for most business transactions
-- Customer identification required for invoice generation
+{NIGERIAN_CLASSIFICATION_GUIDANCE}
 
-CLASSIFICATION CRITERIA:
-✅ BUSINESS INCOME: 
-- Customer payments for goods/services
-- Invoice settlements
-- Professional service fees
-- Product sales revenue
-- Contract payments
+Respond in JSON format:
+{{
+{CLASSIFICATION_RESULT_FIELDS}
+}}
+        """.strip()
+        
+        return prompt
+    
+    def _build_nigerian_batch_prompt(self,
+                                     requests: List[TransactionClassificationRequest]) -> str:
+        """Build multi-transaction prompt (all requests share one user context)"""
+        
+        transactions = "\n\n".join(
+            f"TRANSACTION {index}:\n{self._build_transaction_details(request)}"
+            for index, request in enumerate(requests)
+        )
+        
+        learning = ""
+        previous = requests[0].user_context.previous_classifications
+        if previous:
+            learning = f"\nPREVIOUS CLASSIFICATIONS: {self._format_learning_examples(previous)}\n"
+        
+        prompt = f"""
+Analyze these {len(requests)} Nigerian bank transactions for TAX COMPLIANCE purposes.
+Classify each transaction independently.
 
-❌ NOT BUSINESS INCOME:
-- Salary payments
-- Personal transfers
-- Loan disbursements/repayments
-- Refunds and reversals
-- Internal transfers
-- Family support
-- Investment returns
+{self._build_business_context_section(requests[0])}
+{learning}
+{transactions}
 
-NIGERIAN-SPECIFIC PATTERNS:
-- "Alaba Market" mentions → likely business
-- "Salary" keywords → personal income
-- Repeat senders → likely customers
-- Round amounts → often business transactions
-- Transfer times during business hours → higher business probability
+{NIGERIAN_CLASSIFICATION_GUIDANCE}
 
-Respond in JSON format:
+Respond in JSON format with one entry per transaction, using the transaction number as "index":
 {{
-    "is_business_income": true/false,
-    "confidence": 0.0-1.0,
-    "reasoning": "detailed explanation of decision factors",
-    "customer_name": "extracted customer name or null",
-    "suggested_invoice_description": "proposed invoice line item description",
-    "tax_category": "standard_rate|zero_rate|exempt|unknown",
-    "requires_human_review": true/false,
-    "nigerian_compliance_notes": ["FIRS-specific considerations"],
-    "business_probability_factors": ["list", "of", "supporting", "factors"],
-    "risk_factors": ["list", "of", "concerning", "patterns"],
-    "similar_pattern_confidence": 0.0-1.0,
-    "nigerian_patterns_detected": ["detected", "nigerian", "patterns"]
+"results": [
+{{
+    "index": 0,
+{CLASSIFICATION_RESULT_FIELDS}
+}}
+]
 }}
         """.strip()
         
         return prompt
     
+    def _build_business_context_section(self, request: TransactionClassificationRequest) -> str:
+        """Business context block shared by single and batch prompts"""
+        
+        business_context = request.user_context.business_context
+        
+        return f"""BUSINESS CONTEXT:
+- Nigerian SME: {request.user_context.business_name or 'Unknown'}
+- Industry: {business_context.industry}
+- Location: {business_context.location}, {business_context.state or 'Nigeria'}
+- Business type: {business_context.business_size}
+- Years in operation: {business_context.years_in_operation or 'unknown'}
+- Previous patterns: {len(request.user_context.learned_patterns)} learned patterns"""
+    
+    def _build_transaction_details(self, request: TransactionClassificationRequest) -> str:
+        """Transaction details block shared by single and batch prompts"""
+        
+        return f"""- Amount: ₦{request.amount:,}
+- Narration: "{request.narration}"
+- Sender: {request.sender_name or 'Unknown'}
+- Date: {request.date.strftime('%Y-%m-%d')}
+- Time: {request.time or 'Unknown'}
+- Bank: {request.bank or 'Unknown'}
+- Reference: {request.reference or 'Unknown'}"""
+    
     async def _nigerian_rule_fallback(self, 
                                     request: TransactionClassificationRequest) -> TransactionClassificationResult:
         """Enhanced rule-based fallback with Nigerian business patterns"""
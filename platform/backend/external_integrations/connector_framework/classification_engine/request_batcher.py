@@ -0,0 +1,349 @@
+"""
+Classification Request Batcher
+==============================
+
+Batching front end for API-based transaction classification.
+
+Concurrent classification requests are coalesced over a short window,
+deduplicated by normalized narration, and sent to the provider as
+multi-transaction prompts. Results fan back out to every waiter. Batch size
+adapts to provider latency/errors and in-flight batches are bounded by a
+concurrency limit.
+"""
+
+import json
+import math
+import time
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional
+
+from .classification_models import (
+    TransactionClassificationRequest,
+    PrivacyLevel
+)
+from .cache_manager import normalize_narration
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BatchingConfig:
+    """Tuning knobs for request coalescing"""
+
+    window_ms: float = 20.0             # How long to wait for more requests before flushing
+    initial_batch_size: int = 10
+    min_batch_size: int = 1
+    max_batch_size: int = 25
+    max_concurrency: int = 4            # Provider calls in flight at once
+    target_latency_ms: float = 4000.0   # Shrink batches when a call is slower than this
+    request_timeout_s: float = 60.0
+
+@dataclass
+class ProviderBatchResponse:
+    """Raw provider output for one batch (results aligned with the request order)"""
+
+    results: List[Optional[Dict[str, Any]]]
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    model: str = "unknown"
+
+@dataclass
+class BatchedClassification:
+    """Classification payload delivered to one waiter"""
+
+    data: Dict[str, Any]
+    prompt_tokens: int
+    completion_tokens: int
+    model: str
+    batch_size: int
+    coalesced: bool = False  # Served from another identical in-flight request
+
+@dataclass
+class _PendingItem:
+    dedupe_key: str
+    request: TransactionClassificationRequest
+    future: asyncio.Future
+
+class ClassificationProvider(ABC):
+    """Provider capable of classifying several transactions in one call"""
+
+    @abstractmethod
+    async def classify_batch(self,
+                             requests: List[TransactionClassificationRequest]) -> ProviderBatchResponse:
+        """Classify requests; results must be returned in request order"""
+        pass
+
+class OpenAIBatchProvider(ClassificationProvider):
+    """Multi-transaction chat-completion provider"""
+
+    def __init__(self,
+                 client: Any,
+                 prompt_builder: Callable[[List[TransactionClassificationRequest]], str],
+                 model: str = "gpt-4o-mini",
+                 max_tokens_per_item: int = 350,
+                 timeout: float = 60.0):
+        self.client = client
+        self.prompt_builder = prompt_builder
+        self.model = model
+        self.max_tokens_per_item = max_tokens_per_item
+        self.timeout = timeout
+
+    async def classify_batch(self,
+                             requests: List[TransactionClassificationRequest]) -> ProviderBatchResponse:
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a Nigerian tax compliance expert specializing in SME transaction classification for FIRS e-invoicing requirements. You understand Nigerian business patterns, banking systems, and tax regulations."
+            },
+            {"role": "user", "content": self.prompt_builder(requests)}
+        ]
+
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            temperature=0.1,
+            max_tokens=min(16000, self.max_tokens_per_item * len(requests)),
+            timeout=self.timeout
+        )
+
+        payload = json.loads(response.choices[0].message.content)
+        by_index: Dict[int, Dict[str, Any]] = {}
+        for item in payload.get("results", []):
+            try:
+                by_index[int(item["index"])] = item
+            except (KeyError, TypeError, ValueError):
+                continue
+
+        return ProviderBatchResponse(
+            results=[by_index.get(index) for index in range(len(requests))],
+            prompt_tokens=response.usage.prompt_tokens,
+            completion_tokens=response.usage.completion_tokens,
+            model=self.model
+        )
+
+class LocalStubProvider(ClassificationProvider):
+    """
+    Offline provider for tests and local development.
+
+    Answers with the rule-based fallback's decision, optionally after a fixed
+    latency, and records the size of every batch it receives.
+    """
+
+    def __init__(self, latency_s: float = 0.0, fail_batches: int = 0):
+        from .rule_fallback import NigerianRuleFallback
+
+        self.fallback = NigerianRuleFallback()
+        self.latency_s = latency_s
+        self.fail_batches = fail_batches
+        self.calls: List[int] = []
+
+    async def classify_batch(self,
+                             requests: List[TransactionClassificationRequest]) -> ProviderBatchResponse:
+        self.calls.append(len(requests))
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        if self.fail_batches > 0:
+            self.fail_batches -= 1
+            raise RuntimeError("stub provider failure")
+
+        results = []
+        for request in requests:
+            decision = await self.fallback.classify_transaction(request)
+            results.append({
+                "is_business_income": decision.is_business_income,
+                "confidence": decision.confidence,
+                "reasoning": decision.reasoning,
+                "customer_name": decision.customer_name,
+                "suggested_invoice_description": decision.suggested_invoice_description,
+                "tax_category": decision.tax_category,
+                "requires_human_review": decision.requires_human_review,
+                "business_probability_factors": decision.business_probability_factors,
+                "risk_factors": decision.risk_factors,
+                "similar_pattern_confidence": decision.similar_pattern_confidence,
+                "nigerian_patterns_detected": decision.metadata.nigerian_patterns_detected,
+            })
+
+        return ProviderBatchResponse(
+            results=results,
+            prompt_tokens=120 * len(requests),
+            completion_tokens=80 * len(requests),
+            model="local-stub"
+        )
+
+def _consume_exception(future: asyncio.Future) -> None:
+    """Mark a shared future's exception as retrieved when no waiter is left"""
+    if not future.cancelled():
+        future.exception()
+
+class ClassificationBatcher:
+    """
+    Coalesces concurrent classification requests into provider batches.
+
+    Requests are grouped by user context (the batch prompt carries one
+    business context). Within a group, requests with the same dedupe key
+    share a single in-flight classification.
+    """
+
+    def __init__(self, provider: ClassificationProvider, config: Optional[BatchingConfig] = None):
+        self.provider = provider
+        self.config = config or BatchingConfig()
+        self.batch_size = max(self.config.min_batch_size,
+                              min(self.config.initial_batch_size, self.config.max_batch_size))
+        self.logger = logging.getLogger(f"{__name__}.ClassificationBatcher")
+
+        self._pending: Dict[str, List[_PendingItem]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.stats = {
+            'requests': 0,
+            'coalesced': 0,
+            'batches': 0,
+            'batched_items': 0,
+            'provider_errors': 0,
+            'missing_results': 0,
+            'total_provider_ms': 0.0
+        }
+
+    @staticmethod
+    def context_key(request: TransactionClassificationRequest) -> str:
+        """Requests sharing this key may be sent in the same prompt"""
+        user = request.user_context
+        privacy = request.privacy_level or PrivacyLevel.STANDARD
+        return f"{user.organization_id}:{user.user_id}:{privacy}:{request.classification_tier}"
+
+    @classmethod
+    def dedupe_key(cls, request: TransactionClassificationRequest) -> str:
+        """Requests sharing this key receive the same classification"""
+        amount_band = int(math.log10(float(request.amount))) if request.amount > 0 else 0
+        sender = (request.sender_name or "").strip().lower()
+        return (
+            f"{cls.context_key(request)}|{request.transaction_type}|{amount_band}|"
+            f"{sender}|{normalize_narration(request.narration)}"
+        )
+
+    async def submit(self, request: TransactionClassificationRequest) -> BatchedClassification:
+        """Queue a request and wait for its (possibly shared) classification"""
+
+        self.stats['requests'] += 1
+        key = self.dedupe_key(request)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            result = await asyncio.shield(future)
+            return replace(result, coalesced=True)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        future.add_done_callback(_consume_exception)
+        self._inflight[key] = future
+
+        group = self.context_key(request)
+        queue = self._pending.setdefault(group, [])
+        queue.append(_PendingItem(key, request, future))
+
+        if len(queue) >= self.batch_size:
+            self._flush(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.config.window_ms / 1000.0, self._flush, group)
+
+        return await asyncio.shield(future)
+
+    async def submit_many(self,
+                          requests: List[TransactionClassificationRequest]) -> List[BatchedClassification]:
+        """Submit several requests concurrently; results keep input order"""
+        return await asyncio.gather(*(self.submit(request) for request in requests))
+
+    def _flush(self, group: str) -> None:
+        """Dispatch queued requests of a group in batches of the current size"""
+
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+
+        queue = self._pending.pop(group, [])
+        while queue:
+            items, queue = queue[:self.batch_size], queue[self.batch_size:]
+            task = asyncio.get_running_loop().create_task(self._dispatch(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, items: List[_PendingItem]) -> None:
+        """Send one batch to the provider and fan results back out"""
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+        async with self._semaphore:
+            start_time = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    self.provider.classify_batch([item.request for item in items]),
+                    timeout=self.config.request_timeout_s
+                )
+            except Exception as e:
+                self.stats['provider_errors'] += 1
+                self._adapt_batch_size(success=False, latency_ms=0.0, size=len(items))
+                self.logger.warning(f"Batch classification of {len(items)} requests failed: {e}")
+                for item in items:
+                    self._inflight.pop(item.dedupe_key, None)
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                return
+
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            self.stats['batches'] += 1
+            self.stats['batched_items'] += len(items)
+            self.stats['total_provider_ms'] += latency_ms
+            self._adapt_batch_size(success=True, latency_ms=latency_ms, size=len(items))
+
+        size = len(items)
+        prompt_share = response.prompt_tokens // size
+        completion_share = response.completion_tokens // size
+
+        for index, item in enumerate(items):
+            self._inflight.pop(item.dedupe_key, None)
+            if item.future.done():
+                continue
+            data = response.results[index] if index < len(response.results) else None
+            if data is None:
+                self.stats['missing_results'] += 1
+                item.future.set_exception(
+                    ValueError(f"Provider returned no result for request {item.request.request_id}")
+                )
+                continue
+            item.future.set_result(BatchedClassification(
+                data=data,
+                prompt_tokens=prompt_share,
+                completion_tokens=completion_share,
+                model=response.model,
+                batch_size=size
+            ))
+
+    def _adapt_batch_size(self, success: bool, latency_ms: float, size: int) -> None:
+        """Additive increase while calls are fast and full, multiplicative decrease otherwise"""
+
+        if not success or latency_ms > self.config.target_latency_ms:
+            self.batch_size = max(self.config.min_batch_size, self.batch_size // 2)
+        elif size >= self.batch_size:
+            self.batch_size = min(self.config.max_batch_size, self.batch_size + 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batching and coalescing statistics"""
+
+        batches = self.stats['batches']
+        requests = self.stats['requests']
+        return {
+            **self.stats,
+            'current_batch_size': self.batch_size,
+            'average_batch_size': self.stats['batched_items'] / batches if batches else 0.0,
+            'average_provider_ms': self.stats['total_provider_ms'] / batches if batches else 0.0,
+            'coalesce_rate': self.stats['coalesced'] / requests if requests else 0.0,
+            'provider_calls_saved': max(0, requests - batches - self.stats['provider_errors'])
+        }
@@ -22,6 +22,7 @@ from .classification_models import (
     UserContext,
     BusinessType
 )
+from .keyword_engine import KeywordAutomaton
 
 logger = logging.getLogger(__name__)
 
@@ -160,16 +161,74 @@ class PatternMatcher:
             }
         }
         
+        # Compile keyword families into a single matching engine
+        self.compile_patterns()
+        
         self.logger.info("Pattern matcher initialized with Nigerian business patterns")
     
+    def compile_patterns(self):
+        """
+        Compile keyword and location patterns into one keyword automaton.
+        
+        Call again after modifying the pattern dictionaries at runtime.
+        """
+        
+        # (match_text, confidence, signed weight, reasoning) in evaluation order
+        self._narration_entries: List[Tuple[str, float, float, str]] = []
+        for pattern_data in self.business_patterns.values():
+            for keyword in pattern_data['keywords']:
+                self._narration_entries.append((
+                    keyword, pattern_data['confidence'], pattern_data['weight'],
+                    f"Business keyword '{keyword}' found in narration"
+                ))
+        for pattern_data in self.personal_patterns.values():
+            for keyword in pattern_data['keywords']:
+                self._narration_entries.append((
+                    keyword, pattern_data['confidence'], -pattern_data['weight'],  # Negative weight
+                    f"Personal keyword '{keyword}' found in narration"
+                ))
+        
+        location_rules = [
+            ('major_markets', 0.85, 0.6, "Transaction mentions major market: {}"),
+            ('business_districts', 0.7, 0.4, "Transaction mentions business district: {}"),
+            ('industrial_areas', 0.9, 0.7, "Transaction mentions industrial area: {}"),
+        ]
+        self._location_entries: List[Tuple[str, float, float, str]] = []
+        for group, confidence, weight, reasoning in location_rules:
+            for location in self.nigerian_business_locations[group]:
+                self._location_entries.append((location, confidence, weight, reasoning.format(location)))
+        
+        self._narration_positions = self._index_entries(self._narration_entries)
+        self._location_positions = self._index_entries(self._location_entries)
+        self.keyword_automaton = KeywordAutomaton(
+            [entry[0] for entry in self._narration_entries + self._location_entries]
+        )
+    
+    @staticmethod
+    def _index_entries(entries: List[Tuple[str, float, float, str]]) -> Dict[str, List[int]]:
+        """Map each lowercased keyword to its entry positions."""
+        
+        positions: Dict[str, List[int]] = {}
+        for index, entry in enumerate(entries):
+            positions.setdefault(entry[0].lower(), []).append(index)
+        return positions
+    
+    def find_keywords(self, narration: str) -> Set[str]:
+        """Return every compiled keyword (narration and location) found in narration."""
+        
+        return self.keyword_automaton.find_all(narration)
+    
     def analyze_patterns(self, 
                         request: TransactionClassificationRequest) -> List[PatternMatch]:
         """Analyze transaction for pattern matches"""
         
         matches = []
         
+        # Single pass over the narration for all keyword families
+        keyword_hits = self.find_keywords(request.narration)
+        
         # Analyze narration patterns
-        matches.extend(self._analyze_narration_patterns(request.narration))
+        matches.extend(self._analyze_narration_patterns(request.narration, keyword_hits))
         
         # Analyze amount patterns
         matches.extend(self._analyze_amount_patterns(request.amount))
@@ -178,43 +237,50 @@ class PatternMatcher:
         matches.extend(self._analyze_time_patterns(request.time, request.date))
         
         # Analyze location patterns
-        matches.extend(self._analyze_location_patterns(request.narration, request.user_context))
+        matches.extend(self._analyze_location_patterns(request.narration, request.user_context, keyword_hits))
         
         # Analyze repeat customer patterns
         matches.extend(self._analyze_repeat_patterns(request))
         
         return matches
     
-    def _analyze_narration_patterns(self, narration: str) -> List[PatternMatch]:
+    def _analyze_narration_patterns(self,
+                                    narration: str,
+                                    keyword_hits: Optional[Set[str]] = None) -> List[PatternMatch]:
         """Analyze narration for business/personal patterns"""
         
-        matches = []
-        narration_lower = narration.lower()
-        
-        # Check business patterns
-        for pattern_type, pattern_data in self.business_patterns.items():
-            for keyword in pattern_data['keywords']:
-                if keyword in narration_lower:
-                    matches.append(PatternMatch(
-                        indicator_type=BusinessIndicator.KEYWORD_MATCH,
-                        match_text=keyword,
-                        confidence=pattern_data['confidence'],
-                        weight=pattern_data['weight'],
-                        reasoning=f"Business keyword '{keyword}' found in narration"
-                    ))
-        
-        # Check personal patterns (negative indicators for business)
-        for pattern_type, pattern_data in self.personal_patterns.items():
-            for keyword in pattern_data['keywords']:
-                if keyword in narration_lower:
-                    matches.append(PatternMatch(
-                        indicator_type=BusinessIndicator.KEYWORD_MATCH,
-                        match_text=keyword,
-                        confidence=pattern_data['confidence'],
-                        weight=-pattern_data['weight'],  # Negative weight
-                        reasoning=f"Personal keyword '{keyword}' found in narration"
-                    ))
+        if keyword_hits is None:
+            keyword_hits = self.find_keywords(narration)
         
+        # Business keywords carry positive weight, personal keywords negative
+        return self._build_keyword_matches(
+            keyword_hits, self._narration_entries, self._narration_positions,
+            BusinessIndicator.KEYWORD_MATCH
+        )
+    
+    def _build_keyword_matches(self,
+                               keyword_hits: Set[str],
+                               entries: List[Tuple[str, float, float, str]],
+                               positions: Dict[str, List[int]],
+                               indicator_type: BusinessIndicator) -> List[PatternMatch]:
+        """Turn keyword hits into pattern matches, in pattern definition order."""
+        
+        if not keyword_hits:
+            return []
+        
+        hit_positions = sorted(
+            index for keyword in keyword_hits for index in positions.get(keyword, ())
+        )
+        matches = []
+        for index in hit_positions:
+            match_text, confidence, weight, reasoning = entries[index]
+            matches.append(PatternMatch(
+                indicator_type=indicator_type,
+                match_text=match_text,
+                confidence=confidence,
+                weight=weight,
+                reasoning=reasoning
+            ))
         return matches
     
     def _analyze_amount_patterns(self, amount: Decimal) -> List[PatternMatch]:
@@ -307,46 +373,18 @@ class PatternMatcher:
     
     def _analyze_location_patterns(self, 
                                  narration: str, 
-                                 user_context: UserContext) -> List[PatternMatch]:
+                                 user_context: UserContext,
+                                 keyword_hits: Optional[Set[str]] = None) -> List[PatternMatch]:
         """Analyze location patterns in narration"""
         
-        matches = []
-        narration_lower = narration.lower()
-        
-        # Check for major markets
-        for market in self.nigerian_business_locations['major_markets']:
-            if market in narration_lower:
-                matches.append(PatternMatch(
-                    indicator_type=BusinessIndicator.LOCATION_PATTERN,
-                    match_text=market,
-                    confidence=0.85,
-                    weight=0.6,
-                    reasoning=f"Transaction mentions major market: {market}"
-                ))
-        
-        # Check for business districts
-        for district in self.nigerian_business_locations['business_districts']:
-            if district in narration_lower:
-                matches.append(PatternMatch(
-                    indicator_type=BusinessIndicator.LOCATION_PATTERN,
-                    match_text=district,
-                    confidence=0.7,
-                    weight=0.4,
-                    reasoning=f"Transaction mentions business district: {district}"
-                ))
-        
-        # Check for industrial areas
-        for area in self.nigerian_business_locations['industrial_areas']:
-            if area in narration_lower:
-                matches.append(PatternMatch(
-                    indicator_type=BusinessIndicator.LOCATION_PATTERN,
-                    match_text=area,
-                    confidence=0.9,
-                    weight=0.7,
-                    reasoning=f"Transaction mentions industrial area: {area}"
-                ))
+        if keyword_hits is None:
+            keyword_hits = self.find_keywords(narration)
         
-        return matches
+        # Major markets, business districts and industrial areas
+        return self._build_keyword_matches(
+            keyword_hits, self._location_entries, self._location_positions,
+            BusinessIndicator.LOCATION_PATTERN
+        )
     
     def _analyze_repeat_patterns(self, request: TransactionClassificationRequest) -> List[PatternMatch]:
         """Analyze for repeat customer patterns"""
@@ -457,6 +495,22 @@ class NigerianRuleFallback:
             # Return safe default
             return self._get_safe_default_result(request)
     
+    async def classify_transactions(self,
+                                     requests: List[TransactionClassificationRequest]) -> List[TransactionClassificationResult]:
+        """
+        Classify a list of transactions (e.g. a bank statement import).
+        
+        Results are returned in input order; a failure on one transaction
+        yields its safe default without affecting the others.
+        """
+        
+        results = []
+        for request in requests:
+            results.append(await self.classify_transaction(request))
+        
+        self.logger.debug(f"Rule-based batch classification completed for {len(requests)} transactions")
+        return results
+    
     def _calculate_business_score(self, pattern_matches: List[PatternMatch]) -> float:
         """Calculate overall business probability score"""
         
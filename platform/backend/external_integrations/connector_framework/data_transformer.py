@@ -10,17 +10,20 @@ import json
 import xml.etree.ElementTree as ET
 import csv
 import io
+import time
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Union, Callable, Type
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Union, Callable, Type, Tuple, Iterable, AsyncIterable, AsyncIterator
 from dataclasses import dataclass, field
 from enum import Enum
 import re
 
 from .base_connector import DataFormat
+from .safe_expressions import CompiledExpression, ExpressionError, compile_expression
 
 # Re-export DataFormat for convenience
-__all__ = ['DataTransformer', 'TransformationConfig', 'DataFormat']
+__all__ = ['DataTransformer', 'TransformationConfig', 'DataFormat', 'CompiledProfile']
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +102,72 @@ class TransformationResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
     transformation_time_ms: float = 0.0
 
+@lru_cache(maxsize=4096)
+def _split_path(field_path: str) -> Tuple[str, ...]:
+    return tuple(field_path.split('.'))
+
+def _parse_validation_rule(rule: str) -> Tuple[str, Tuple[Any, ...]]:
+    """Parse e.g. "max_length:100" into ("max_length", (100,))"""
+    if ':' not in rule:
+        return rule, ()
+    rule_name, rule_params = rule.split(':', 1)
+    converted_params = []
+    for param in rule_params.split(','):
+        try:
+            # Try to convert to number
+            if '.' in param:
+                converted_params.append(float(param))
+            else:
+                converted_params.append(int(param))
+        except ValueError:
+            converted_params.append(param)
+    return rule_name, tuple(converted_params)
+
+@dataclass(frozen=True)
+class CompiledValidator:
+    """Validation rule with its function and parameters resolved"""
+    rule: str
+    function: Optional[Callable]  # None for unknown rules, which always pass
+    params: Tuple[Any, ...] = ()
+
+    def check(self, value: Any) -> bool:
+        if self.function is None:
+            return True
+        try:
+            return self.function(value, *self.params)
+        except Exception as e:
+            logger.error(f"Field validation failed: {e}")
+            return False
+
+@dataclass(frozen=True)
+class CompiledFieldMapping:
+    """Field mapping with pre-split paths and pre-bound functions"""
+    mapping: FieldMapping
+    source_path: Tuple[str, ...]
+    target_path: Tuple[str, ...]
+    transform: Optional[Callable]
+    validators: Tuple[CompiledValidator, ...]
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Transformation rule with its handler, condition and parameters resolved"""
+    rule: TransformationRule
+    handler: Callable
+    condition: Optional[Callable[[Any], bool]] = None
+    filter_condition: Optional[Callable[[Any], bool]] = None
+    field_path: Optional[Tuple[str, ...]] = None
+    transform: Optional[Callable] = None
+    expression: Optional[CompiledExpression] = None
+    expression_error: Optional[str] = None
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    """A transformation profile specialized once for repeated use"""
+    profile: TransformationProfile
+    rules: Tuple[CompiledRule, ...]
+    field_mappings: Tuple[CompiledFieldMapping, ...]
+    map_after_rules: bool
+
 class DataTransformer:
     """Universal data transformation system"""
     
@@ -106,6 +175,9 @@ class DataTransformer:
         self.profiles: Dict[str, TransformationProfile] = {}
         self.transformation_functions: Dict[str, Callable] = {}
         self.validation_functions: Dict[str, Callable] = {}
+        self.compiled_profiles: Dict[str, CompiledProfile] = {}
+        self.batch_yield_interval = 500  # records between event loop yields in batches
+        self.stats = {'profile_compilations': 0, 'records_transformed': 0}
         
         # Initialize built-in transformation functions
         self._initialize_builtin_functions()
@@ -242,6 +314,7 @@ class DataTransformer:
         """Add a transformation profile"""
         try:
             self.profiles[profile.profile_id] = profile
+            self.compiled_profiles.pop(profile.profile_id, None)
             logger.info(f"Added transformation profile: {profile.profile_id}")
             return True
         except Exception as e:
@@ -260,6 +333,7 @@ class DataTransformer:
         """Add a custom transformation function"""
         try:
             self.transformation_functions[name] = function
+            self.compiled_profiles.clear()
             logger.info(f"Added transformation function: {name}")
             return True
         except Exception as e:
@@ -270,92 +344,217 @@ class DataTransformer:
         """Add a custom validation function"""
         try:
             self.validation_functions[name] = function
+            self.compiled_profiles.clear()
             logger.info(f"Added validation function: {name}")
             return True
         except Exception as e:
             logger.error(f"Failed to add validation function: {e}")
             return False
     
+    def compile_profile(self, profile_id: str) -> Optional[CompiledProfile]:
+        """
+        Compile a profile into its specialized form (cached until the profile or
+        the function registries change). Returns None if the profile is unknown.
+        """
+        profile = self.profiles.get(profile_id)
+        if not profile:
+            return None
+        
+        compiled = self.compiled_profiles.get(profile_id)
+        if compiled is not None and compiled.profile is profile:
+            return compiled
+        
+        handlers = {
+            TransformationType.FORMAT_CONVERSION: self._apply_format_conversion,
+            TransformationType.FIELD_MAPPING: self._apply_field_mapping,
+            TransformationType.VALUE_TRANSFORMATION: self._apply_value_transformation,
+            TransformationType.DATA_VALIDATION: self._apply_data_validation,
+            TransformationType.DATA_ENRICHMENT: self._apply_data_enrichment,
+            TransformationType.DATA_FILTERING: self._apply_data_filtering,
+            TransformationType.DATA_AGGREGATION: self._apply_data_aggregation,
+        }
+        
+        # Apply transformation rules in priority order
+        rules = sorted(profile.transformation_rules, key=lambda r: r.priority)
+        compiled_rules = []
+        for rule in rules:
+            if not rule.enabled:
+                continue
+            compiled_rules.append(self._compile_rule(rule, handlers[rule.transformation_type]))
+        
+        compiled = CompiledProfile(
+            profile=profile,
+            rules=tuple(compiled_rules),
+            field_mappings=tuple(self._compile_field_mapping(m) for m in profile.field_mappings),
+            # Apply field mappings if not already applied
+            map_after_rules=bool(profile.field_mappings) and not any(
+                r.transformation_type == TransformationType.FIELD_MAPPING for r in rules
+            )
+        )
+        self.compiled_profiles[profile_id] = compiled
+        self.stats['profile_compilations'] += 1
+        return compiled
+    
+    def _compile_rule(self, rule: TransformationRule, handler: Callable) -> CompiledRule:
+        condition = self._compile_condition(rule.condition) if rule.condition else None
+        parameters = rule.parameters
+        filter_condition = None
+        field_path = None
+        transform = None
+        expression = None
+        expression_error = None
+        
+        if rule.transformation_type == TransformationType.VALUE_TRANSFORMATION:
+            transform = self.transformation_functions.get(parameters.get('function'))
+            if parameters.get('field'):
+                field_path = _split_path(parameters['field'])
+        
+        elif rule.transformation_type == TransformationType.DATA_FILTERING and parameters.get('condition'):
+            filter_condition = self._compile_condition(parameters['condition'])
+        
+        elif (rule.transformation_type == TransformationType.DATA_ENRICHMENT
+              and parameters.get('type') == 'calculate_field' and parameters.get('formula')):
+            try:
+                expression = compile_expression(parameters['formula'])
+            except ExpressionError as e:
+                expression_error = str(e)
+        
+        return CompiledRule(
+            rule=rule,
+            handler=handler,
+            condition=condition,
+            filter_condition=filter_condition,
+            field_path=field_path,
+            transform=transform,
+            expression=expression,
+            expression_error=expression_error
+        )
+    
+    def _compile_condition(self, condition: str) -> Callable[[Any], bool]:
+        """Safe predicate over a record; names resolve to dict keys, other data binds to `data`"""
+        try:
+            expression = compile_expression(condition)
+        except ExpressionError as e:
+            logger.warning(f"Condition '{condition}' is not supported and never matches: {e}")
+            return lambda data: False
+        
+        return lambda data: expression.matches(data if isinstance(data, dict) else {"data": data})
+    
+    def _compile_field_mapping(self, mapping: FieldMapping) -> CompiledFieldMapping:
+        return CompiledFieldMapping(
+            mapping=mapping,
+            source_path=_split_path(mapping.source_field),
+            target_path=_split_path(mapping.target_field),
+            transform=self.transformation_functions.get(mapping.transformation_function)
+            if mapping.transformation_function else None,
+            validators=tuple(self._compile_validator(rule) for rule in mapping.validation_rules)
+        )
+    
+    def _compile_validator(self, rule: str) -> CompiledValidator:
+        rule_name, params = _parse_validation_rule(rule)
+        return CompiledValidator(rule=rule, function=self.validation_functions.get(rule_name), params=params)
+    
     async def transform_data(self, data: Any, profile_id: str, 
                            custom_parameters: Optional[Dict[str, Any]] = None) -> TransformationResult:
         """Transform data using the specified profile"""
-        start_time = datetime.utcnow()
+        try:
+            compiled = self.compile_profile(profile_id)
+        except Exception as e:
+            logger.error(f"Data transformation failed: {e}")
+            return TransformationResult(success=False, original_data=data, errors=[str(e)])
+        
+        if compiled is None:
+            return self._profile_not_found(data, profile_id)
+        return self._transform_record(compiled, data)
+    
+    async def transform_batch(self, records: Union[Iterable[Any], AsyncIterable[Any]], profile_id: str,
+                            custom_parameters: Optional[Dict[str, Any]] = None) -> List[TransformationResult]:
+        """Transform many records with one compiled profile; accepts sync or async iterables"""
+        return [result async for result in self.transform_stream(records, profile_id, custom_parameters)]
+    
+    async def transform_stream(self, records: Union[Iterable[Any], AsyncIterable[Any]], profile_id: str,
+                             custom_parameters: Optional[Dict[str, Any]] = None) -> AsyncIterator[TransformationResult]:
+        """Yield one TransformationResult per record, in order, without buffering the input"""
+        try:
+            compiled = self.compile_profile(profile_id)
+        except Exception as e:
+            logger.error(f"Data transformation failed: {e}")
+            compiled = None
+            error = str(e)
+        else:
+            error = None
+        
+        def transform(record: Any) -> TransformationResult:
+            if compiled is None:
+                if error:
+                    return TransformationResult(success=False, original_data=record, errors=[error])
+                return self._profile_not_found(record, profile_id)
+            return self._transform_record(compiled, record)
+        
+        if hasattr(records, '__aiter__'):
+            async for record in records:
+                yield transform(record)
+            return
+        
+        for index, record in enumerate(records, 1):
+            yield transform(record)
+            # Transformations are CPU-bound; let other tasks run during large syncs
+            if index % self.batch_yield_interval == 0:
+                await asyncio.sleep(0)
+    
+    def _profile_not_found(self, data: Any, profile_id: str) -> TransformationResult:
+        return TransformationResult(
+            success=False,
+            original_data=data,
+            errors=[f"Transformation profile not found: {profile_id}"]
+        )
+    
+    def _transform_record(self, compiled: CompiledProfile, data: Any) -> TransformationResult:
+        """Run one record through a compiled profile"""
+        start_time = time.perf_counter()
         
         try:
-            profile = self.profiles.get(profile_id)
-            if not profile:
-                return TransformationResult(
-                    success=False,
-                    original_data=data,
-                    errors=[f"Transformation profile not found: {profile_id}"]
-                )
-            
             result = TransformationResult(
                 success=True,
                 original_data=data,
                 transformed_data=data
             )
             
-            # Apply transformation rules in priority order
-            rules = sorted(profile.transformation_rules, key=lambda r: r.priority)
-            
-            for rule in rules:
-                if not rule.enabled:
-                    continue
-                
+            for compiled_rule in compiled.rules:
                 # Check condition if specified
-                if rule.condition and not self._evaluate_condition(result.transformed_data, rule.condition):
+                if compiled_rule.condition is not None and not compiled_rule.condition(result.transformed_data):
                     continue
                 
-                # Apply transformation based on type
-                if rule.transformation_type == TransformationType.FORMAT_CONVERSION:
-                    result = await self._apply_format_conversion(result, rule, profile)
-                elif rule.transformation_type == TransformationType.FIELD_MAPPING:
-                    result = await self._apply_field_mapping(result, profile.field_mappings)
-                elif rule.transformation_type == TransformationType.VALUE_TRANSFORMATION:
-                    result = await self._apply_value_transformation(result, rule)
-                elif rule.transformation_type == TransformationType.DATA_VALIDATION:
-                    result = await self._apply_data_validation(result, profile)
-                elif rule.transformation_type == TransformationType.DATA_ENRICHMENT:
-                    result = await self._apply_data_enrichment(result, rule)
-                elif rule.transformation_type == TransformationType.DATA_FILTERING:
-                    result = await self._apply_data_filtering(result, rule)
-                elif rule.transformation_type == TransformationType.DATA_AGGREGATION:
-                    result = await self._apply_data_aggregation(result, rule)
+                result = compiled_rule.handler(result, compiled_rule, compiled)
                 
                 if not result.success:
                     break
                 
-                result.applied_rules.append(rule.rule_id)
-            
-            # Apply field mappings if not already applied
-            if profile.field_mappings and not any(r.transformation_type == TransformationType.FIELD_MAPPING for r in rules):
-                result = await self._apply_field_mapping(result, profile.field_mappings)
+                result.applied_rules.append(compiled_rule.rule.rule_id)
             
-            # Calculate transformation time
-            end_time = datetime.utcnow()
-            result.transformation_time_ms = (end_time - start_time).total_seconds() * 1000
+            if compiled.map_after_rules:
+                result = self._apply_field_mapping(result, None, compiled)
             
+            self.stats['records_transformed'] += 1
+            result.transformation_time_ms = (time.perf_counter() - start_time) * 1000
             return result
             
         except Exception as e:
-            end_time = datetime.utcnow()
-            transformation_time = (end_time - start_time).total_seconds() * 1000
-            
             logger.error(f"Data transformation failed: {e}")
             return TransformationResult(
                 success=False,
                 original_data=data,
                 errors=[str(e)],
-                transformation_time_ms=transformation_time
+                transformation_time_ms=(time.perf_counter() - start_time) * 1000
             )
     
-    async def _apply_format_conversion(self, result: TransformationResult, rule: TransformationRule, 
-                                     profile: TransformationProfile) -> TransformationResult:
+    def _apply_format_conversion(self, result: TransformationResult, compiled_rule: CompiledRule,
+                                 compiled: CompiledProfile) -> TransformationResult:
         """Apply format conversion transformation"""
         try:
-            source_format = profile.source_format
-            target_format = profile.target_format
+            rule = compiled_rule.rule
+            source_format = compiled.profile.source_format
+            target_format = compiled.profile.target_format
             data = result.transformed_data
             
             if source_format == target_format:
@@ -411,8 +610,8 @@ class DataTransformer:
             result.success = False
             return result
     
-    async def _apply_field_mapping(self, result: TransformationResult, 
-                                 field_mappings: List[FieldMapping]) -> TransformationResult:
+    def _apply_field_mapping(self, result: TransformationResult, compiled_rule: Optional[CompiledRule],
+                             compiled: CompiledProfile) -> TransformationResult:
         """Apply field mapping transformation"""
         try:
             if not isinstance(result.transformed_data, dict):
@@ -422,15 +621,16 @@ class DataTransformer:
             source_data = result.transformed_data
             mapped_data = {}
             
-            for mapping in field_mappings:
+            for field_mapping in compiled.field_mappings:
+                mapping = field_mapping.mapping
+                
                 # Get source value
-                source_value = self._get_nested_value(source_data, mapping.source_field)
+                source_value = self._get_path(source_data, field_mapping.source_path)
                 
                 # Apply transformation function if specified
-                if mapping.transformation_function and mapping.transformation_function in self.transformation_functions:
-                    transform_func = self.transformation_functions[mapping.transformation_function]
+                if field_mapping.transform is not None:
                     try:
-                        source_value = transform_func(source_value)
+                        source_value = field_mapping.transform(source_value)
                     except Exception as e:
                         result.warnings.append(f"Transformation function '{mapping.transformation_function}' failed for field '{mapping.source_field}': {e}")
                 
@@ -439,16 +639,16 @@ class DataTransformer:
                     source_value = mapping.default_value
                 
                 # Apply validation rules
-                for rule in mapping.validation_rules:
-                    if not self._validate_field_value(source_value, rule):
+                for validator in field_mapping.validators:
+                    if not validator.check(source_value):
                         if mapping.required:
-                            result.errors.append(f"Validation failed for required field '{mapping.target_field}': {rule}")
+                            result.errors.append(f"Validation failed for required field '{mapping.target_field}': {validator.rule}")
                             result.success = False
                         else:
-                            result.warnings.append(f"Validation failed for field '{mapping.target_field}': {rule}")
+                            result.warnings.append(f"Validation failed for field '{mapping.target_field}': {validator.rule}")
                 
                 # Set target value
-                self._set_nested_value(mapped_data, mapping.target_field, source_value)
+                self._set_path(mapped_data, field_mapping.target_path, source_value)
             
             result.transformed_data = mapped_data
             return result
@@ -458,29 +658,29 @@ class DataTransformer:
             result.success = False
             return result
     
-    async def _apply_value_transformation(self, result: TransformationResult, rule: TransformationRule) -> TransformationResult:
+    def _apply_value_transformation(self, result: TransformationResult, compiled_rule: CompiledRule,
+                                    compiled: CompiledProfile) -> TransformationResult:
         """Apply value transformation"""
         try:
+            rule = compiled_rule.rule
             function_name = rule.parameters.get('function')
-            field_path = rule.parameters.get('field')
+            transform_func = compiled_rule.transform
             
-            if not function_name or function_name not in self.transformation_functions:
+            if transform_func is None:
                 result.warnings.append(f"Transformation function not found: {function_name}")
                 return result
             
-            if isinstance(result.transformed_data, dict) and field_path:
+            if isinstance(result.transformed_data, dict) and compiled_rule.field_path:
                 # Transform specific field
-                current_value = self._get_nested_value(result.transformed_data, field_path)
-                transform_func = self.transformation_functions[function_name]
+                current_value = self._get_path(result.transformed_data, compiled_rule.field_path)
                 
                 try:
                     new_value = transform_func(current_value, **rule.parameters.get('function_args', {}))
-                    self._set_nested_value(result.transformed_data, field_path, new_value)
+                    self._set_path(result.transformed_data, compiled_rule.field_path, new_value)
                 except Exception as e:
-                    result.warnings.append(f"Value transformation failed for field '{field_path}': {e}")
+                    result.warnings.append(f"Value transformation failed for field '{rule.parameters.get('field')}': {e}")
             else:
                 # Transform entire data
-                transform_func = self.transformation_functions[function_name]
                 try:
                     result.transformed_data = transform_func(result.transformed_data, **rule.parameters.get('function_args', {}))
                 except Exception as e:
@@ -494,25 +694,28 @@ class DataTransformer:
             result.success = False
             return result
     
-    async def _apply_data_validation(self, result: TransformationResult, profile: TransformationProfile) -> TransformationResult:
+    def _apply_data_validation(self, result: TransformationResult, compiled_rule: CompiledRule,
+                               compiled: CompiledProfile) -> TransformationResult:
         """Apply data validation"""
         try:
-            if profile.validation_level == ValidationLevel.NONE:
+            validation_level = compiled.profile.validation_level
+            if validation_level == ValidationLevel.NONE:
                 return result
             
             validation_errors = []
             validation_warnings = []
             
             # Validate using field mappings
-            for mapping in profile.field_mappings:
-                if isinstance(result.transformed_data, dict):
-                    field_value = self._get_nested_value(result.transformed_data, mapping.target_field)
+            if isinstance(result.transformed_data, dict):
+                for field_mapping in compiled.field_mappings:
+                    mapping = field_mapping.mapping
+                    field_value = self._get_path(result.transformed_data, field_mapping.target_path)
                     
-                    for rule in mapping.validation_rules:
-                        if not self._validate_field_value(field_value, rule):
-                            error_msg = f"Validation failed for field '{mapping.target_field}': {rule}"
+                    for validator in field_mapping.validators:
+                        if not validator.check(field_value):
+                            error_msg = f"Validation failed for field '{mapping.target_field}': {validator.rule}"
                             
-                            if mapping.required or profile.validation_level == ValidationLevel.STRICT:
+                            if mapping.required or validation_level == ValidationLevel.STRICT:
                                 validation_errors.append(error_msg)
                             else:
                                 validation_warnings.append(error_msg)
@@ -520,7 +723,7 @@ class DataTransformer:
             result.errors.extend(validation_errors)
             result.warnings.extend(validation_warnings)
             
-            if validation_errors and profile.validation_level == ValidationLevel.STRICT:
+            if validation_errors and validation_level == ValidationLevel.STRICT:
                 result.success = False
             
             return result
@@ -530,9 +733,11 @@ class DataTransformer:
             result.success = False
             return result
     
-    async def _apply_data_enrichment(self, result: TransformationResult, rule: TransformationRule) -> TransformationResult:
+    def _apply_data_enrichment(self, result: TransformationResult, compiled_rule: CompiledRule,
+                               compiled: CompiledProfile) -> TransformationResult:
         """Apply data enrichment"""
         try:
+            rule = compiled_rule.rule
             enrichment_type = rule.parameters.get('type')
             
             if enrichment_type == 'add_timestamp':
@@ -548,13 +753,14 @@ class DataTransformer:
             
             elif enrichment_type == 'calculate_field':
                 # Calculate field based on other fields
-                formula = rule.parameters.get('formula')
                 target_field = rule.parameters.get('target_field')
                 
-                if formula and target_field and isinstance(result.transformed_data, dict):
+                if (compiled_rule.expression or compiled_rule.expression_error) and target_field \
+                        and isinstance(result.transformed_data, dict):
                     try:
-                        # Simple formula evaluation (security risk in production - use safer method)
-                        calculated_value = eval(formula, {"__builtins__": {}}, result.transformed_data)
+                        if compiled_rule.expression_error:
+                            raise ExpressionError(compiled_rule.expression_error)
+                        calculated_value = compiled_rule.expression.evaluate(result.transformed_data)
                         result.transformed_data[target_field] = calculated_value
                     except Exception as e:
                         result.warnings.append(f"Formula calculation failed: {e}")
@@ -565,19 +771,17 @@ class DataTransformer:
             result.warnings.append(f"Data enrichment failed: {e}")
             return result
     
-    async def _apply_data_filtering(self, result: TransformationResult, rule: TransformationRule) -> TransformationResult:
+    def _apply_data_filtering(self, result: TransformationResult, compiled_rule: CompiledRule,
+                              compiled: CompiledProfile) -> TransformationResult:
         """Apply data filtering"""
         try:
-            filter_condition = rule.parameters.get('condition')
+            rule = compiled_rule.rule
+            filter_condition = compiled_rule.filter_condition
             
             if isinstance(result.transformed_data, list):
                 # Filter list items
-                if filter_condition:
-                    filtered_data = []
-                    for item in result.transformed_data:
-                        if self._evaluate_condition(item, filter_condition):
-                            filtered_data.append(item)
-                    result.transformed_data = filtered_data
+                if filter_condition is not None:
+                    result.transformed_data = [item for item in result.transformed_data if filter_condition(item)]
             
             elif isinstance(result.transformed_data, dict):
                 # Filter dictionary fields
@@ -592,9 +796,11 @@ class DataTransformer:
             result.warnings.append(f"Data filtering failed: {e}")
             return result
     
-    async def _apply_data_aggregation(self, result: TransformationResult, rule: TransformationRule) -> TransformationResult:
+    def _apply_data_aggregation(self, result: TransformationResult, compiled_rule: CompiledRule,
+                                compiled: CompiledProfile) -> TransformationResult:
         """Apply data aggregation"""
         try:
+            rule = compiled_rule.rule
             if not isinstance(result.transformed_data, list):
                 result.warnings.append("Data aggregation requires list data")
                 return result
@@ -742,29 +948,20 @@ class DataTransformer:
             return f"error,Conversion failed: {e}"
     
     # Helper methods for data manipulation
-    def _get_nested_value(self, data: Dict, field_path: str) -> Any:
-        """Get nested value from dictionary using dot notation"""
-        try:
-            keys = field_path.split('.')
-            value = data
-            
-            for key in keys:
-                if isinstance(value, dict) and key in value:
-                    value = value[key]
-                else:
-                    return None
-            
-            return value
-            
-        except Exception:
-            return None
+    @staticmethod
+    def _get_path(data: Any, keys: Tuple[str, ...]) -> Any:
+        value = data
+        for key in keys:
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                return None
+        return value
     
-    def _set_nested_value(self, data: Dict, field_path: str, value: Any):
-        """Set nested value in dictionary using dot notation"""
+    @staticmethod
+    def _set_path(data: Dict, keys: Tuple[str, ...], value: Any):
         try:
-            keys = field_path.split('.')
             current = data
-            
             for key in keys[:-1]:
                 if key not in current:
                     current[key] = {}
@@ -775,51 +972,28 @@ class DataTransformer:
         except Exception as e:
             logger.error(f"Failed to set nested value: {e}")
     
+    def _get_nested_value(self, data: Dict, field_path: str) -> Any:
+        """Get nested value from dictionary using dot notation"""
+        try:
+            return self._get_path(data, _split_path(field_path))
+        except Exception:
+            return None
+    
+    def _set_nested_value(self, data: Dict, field_path: str, value: Any):
+        """Set nested value in dictionary using dot notation"""
+        self._set_path(data, _split_path(field_path), value)
+    
     def _evaluate_condition(self, data: Any, condition: str) -> bool:
         """Evaluate a simple condition against data"""
         try:
-            # Simple condition evaluation (in production, use safer method)
-            # This is a security risk - implement proper condition parser
-            return eval(condition, {"__builtins__": {}}, data if isinstance(data, dict) else {"data": data})
-        except Exception:
+            expression = compile_expression(condition)
+        except ExpressionError:
             return False
+        return expression.matches(data if isinstance(data, dict) else {"data": data})
     
     def _validate_field_value(self, value: Any, rule: str) -> bool:
         """Validate field value against rule"""
-        try:
-            # Parse rule (e.g., "max_length:100", "required", "email")
-            if ':' in rule:
-                rule_name, rule_params = rule.split(':', 1)
-                params = rule_params.split(',')
-            else:
-                rule_name = rule
-                params = []
-            
-            if rule_name in self.validation_functions:
-                validation_func = self.validation_functions[rule_name]
-                
-                if params:
-                    # Convert string parameters to appropriate types
-                    converted_params = []
-                    for param in params:
-                        try:
-                            # Try to convert to number
-                            if '.' in param:
-                                converted_params.append(float(param))
-                            else:
-                                converted_params.append(int(param))
-                        except ValueError:
-                            converted_params.append(param)
-                    
-                    return validation_func(value, *converted_params)
-                else:
-                    return validation_func(value)
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Field validation failed: {e}")
-            return False
+        return self._compile_validator(rule).check(value)
     
     # Built-in transformation helper functions
     def _format_date(self, value: Any) -> Optional[str]:
@@ -927,6 +1101,9 @@ class DataTransformer:
         try:
             return {
                 'total_profiles': len(self.profiles),
+                'compiled_profiles': len(self.compiled_profiles),
+                'profile_compilations': self.stats['profile_compilations'],
+                'records_transformed': self.stats['records_transformed'],
                 'transformation_functions': len(self.transformation_functions),
                 'validation_functions': len(self.validation_functions),
                 'available_functions': {
@@ -0,0 +1,222 @@
+"""
+Safe Expressions - Universal Connector Framework
+Compiles transformation conditions and formulas into safe predicates.
+
+Expressions use Python syntax (e.g. ``status == 'active' and total > 100``) and
+are parsed once into an AST, checked against a whitelist of node types and
+turned into nested closures. Names resolve against the record being
+transformed; attribute access, comprehensions, lambdas and calls to anything
+but SAFE_FUNCTIONS are rejected at compile time. Nothing is passed to eval().
+"""
+
+import ast
+import operator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, FrozenSet, Mapping
+
+Evaluator = Callable[[Mapping[str, Any]], Any]
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression uses unsupported syntax"""
+
+
+# Guards against e.g. 10 ** 10 ** 10 stalling a sync
+MAX_EXPONENT = 1000
+
+
+def _power(base, exponent):
+    if isinstance(exponent, (int, float)) and abs(exponent) > MAX_EXPONENT:
+        raise ExpressionError(f"Exponent too large: {exponent}")
+    return base ** exponent
+
+
+SAFE_FUNCTIONS: Mapping[str, Callable[..., Any]] = {
+    "len": len,
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+}
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _power,
+}
+
+_UNARY_OPS = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+
+class _Compiler:
+    """Turns a validated AST into nested closures with Python semantics"""
+
+    def __init__(self):
+        self.names: set = set()
+
+    def compile(self, node: ast.AST) -> Evaluator:
+        handler = getattr(self, f"_compile_{type(node).__name__}", None)
+        if handler is None:
+            raise ExpressionError(f"Unsupported expression: {type(node).__name__}")
+        return handler(node)
+
+    def _compile_Expression(self, node: ast.Expression) -> Evaluator:
+        return self.compile(node.body)
+
+    def _compile_Constant(self, node: ast.Constant) -> Evaluator:
+        if not isinstance(node.value, (str, int, float, bool, type(None))):
+            raise ExpressionError(f"Unsupported constant: {node.value!r}")
+        value = node.value
+        return lambda scope: value
+
+    def _compile_Name(self, node: ast.Name) -> Evaluator:
+        name = node.id
+        if name.startswith("__"):
+            raise ExpressionError(f"Unsupported name: {name}")
+        self.names.add(name)
+
+        def evaluate(scope):
+            try:
+                return scope[name]
+            except KeyError:
+                raise NameError(f"name '{name}' is not defined") from None
+        return evaluate
+
+    def _compile_sequence(self, node, build) -> Evaluator:
+        items = [self.compile(item) for item in node.elts]
+        return lambda scope: build(item(scope) for item in items)
+
+    def _compile_Tuple(self, node: ast.Tuple) -> Evaluator:
+        return self._compile_sequence(node, tuple)
+
+    def _compile_List(self, node: ast.List) -> Evaluator:
+        return self._compile_sequence(node, list)
+
+    def _compile_Set(self, node: ast.Set) -> Evaluator:
+        return self._compile_sequence(node, set)
+
+    def _compile_Subscript(self, node: ast.Subscript) -> Evaluator:
+        if isinstance(node.slice, ast.Slice):
+            raise ExpressionError("Slices are not supported")
+        value, index = self.compile(node.value), self.compile(node.slice)
+        return lambda scope: value(scope)[index(scope)]
+
+    def _compile_BinOp(self, node: ast.BinOp) -> Evaluator:
+        op = _BINARY_OPS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        left, right = self.compile(node.left), self.compile(node.right)
+        return lambda scope: op(left(scope), right(scope))
+
+    def _compile_UnaryOp(self, node: ast.UnaryOp) -> Evaluator:
+        op = _UNARY_OPS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = self.compile(node.operand)
+        return lambda scope: op(operand(scope))
+
+    def _compile_BoolOp(self, node: ast.BoolOp) -> Evaluator:
+        values = [self.compile(value) for value in node.values]
+        is_and = isinstance(node.op, ast.And)
+
+        def evaluate(scope):
+            # Short-circuits and returns the deciding operand, like Python
+            result = None
+            for value in values:
+                result = value(scope)
+                if bool(result) != is_and:
+                    return result
+            return result
+        return evaluate
+
+    def _compile_Compare(self, node: ast.Compare) -> Evaluator:
+        operands = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+        ops = []
+        for op in node.ops:
+            compare = _COMPARE_OPS.get(type(op))
+            if compare is None:
+                raise ExpressionError(f"Unsupported comparison: {type(op).__name__}")
+            ops.append(compare)
+
+        def evaluate(scope):
+            left = operands[0](scope)
+            for index, compare in enumerate(ops):
+                right = operands[index + 1](scope)
+                if not compare(left, right):
+                    return False
+                left = right
+            return True
+        return evaluate
+
+    def _compile_IfExp(self, node: ast.IfExp) -> Evaluator:
+        test, body, orelse = self.compile(node.test), self.compile(node.body), self.compile(node.orelse)
+        return lambda scope: body(scope) if test(scope) else orelse(scope)
+
+    def _compile_Call(self, node: ast.Call) -> Evaluator:
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ExpressionError("Only positional calls to named functions are allowed")
+        function = SAFE_FUNCTIONS.get(node.func.id)
+        if function is None:
+            raise ExpressionError(f"Unknown function: {node.func.id}")
+        args = [self.compile(arg) for arg in node.args]
+        return lambda scope: function(*(arg(scope) for arg in args))
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """A parsed expression evaluable against a mapping of names to values"""
+    source: str
+    names: FrozenSet[str]
+    _evaluator: Evaluator = field(repr=False, compare=False)
+
+    def evaluate(self, scope: Mapping[str, Any]) -> Any:
+        """Evaluate against scope; raises like the equivalent Python expression"""
+        return self._evaluator(scope)
+
+    def matches(self, scope: Mapping[str, Any]) -> bool:
+        """Truthiness of the expression, False if evaluation fails"""
+        try:
+            return bool(self._evaluator(scope))
+        except Exception:
+            return False
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str) -> CompiledExpression:
+    """Compile an expression; raises ExpressionError on unsupported syntax"""
+    if not source or not source.strip():
+        raise ExpressionError("Empty expression")
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression '{source}': {e.msg}") from e
+
+    compiler = _Compiler()
+    evaluator = compiler.compile(tree)
+    return CompiledExpression(source=source, names=frozenset(compiler.names), _evaluator=evaluator)
@@ -40,8 +40,10 @@ from .token_provider import SecretBackedMonoTokenProvider, MonoTokenBundle
 from .transaction_sync import (
     MonoTransactionSyncService,
     MonoSyncResult,
+    MonoMultiSyncResult,
     InMemorySyncStateStore,
 )
+from .sync_state import SqlSyncStateStore, RedisSyncStateStore
 from .transformer import MonoTransactionTransformer, MonoTransformationError
 from .pipeline import MonoTransactionPipeline
 
@@ -159,7 +161,10 @@ __all__ = [
     "MonoTokenBundle",
     "MonoTransactionSyncService",
     "MonoSyncResult",
+    "MonoMultiSyncResult",
     "InMemorySyncStateStore",
+    "SqlSyncStateStore",
+    "RedisSyncStateStore",
     "MonoTransactionTransformer",
     "MonoTransformationError",
     "MonoTransactionPipeline",
@@ -0,0 +1,482 @@
+"""Durable ``SyncStateStore`` implementations backed by SQL and Redis.
+
+Dedupe keys are checked in two tiers per account. Keys registered within
+``retention_days`` are held exactly (a primary-key row or a sorted-set
+member). Once they age out, ``prune`` folds them into a per-account Bloom
+filter and deletes them, so storage stays bounded while replays of old
+transactions are still caught. A new key that hits the filter is treated as
+a duplicate; at the default ``filter_error_rate`` that misclassifies about
+one genuine transaction per million checked against a populated filter.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from core_platform.data_management.models.banking_sync_state import BankingSyncCursor, BankingSyncDedupeKey
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_FILTER_CAPACITY = 50_000
+DEFAULT_FILTER_ERROR_RATE = 1e-6
+DEFAULT_PRUNE_BATCH_SIZE = 1000
+DEFAULT_PRUNE_MAX_BATCHES = 10
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over dedupe keys.
+
+    Bits are laid out most-significant first within each byte, matching Redis
+    ``SETBIT``/``GETBIT`` offsets, so a filter can move between the stores.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_FILTER_CAPACITY,
+        error_rate: float = DEFAULT_FILTER_ERROR_RATE,
+        *,
+        data: Optional[bytes] = None,
+        items: int = 0,
+    ) -> None:
+        if capacity <= 0 or not 0.0 < error_rate < 1.0:
+            raise ValueError("capacity must be positive and error_rate within (0, 1)")
+        num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_bits = -(-num_bits // 8) * 8
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.capacity = capacity
+        self.items = items
+        if data is None:
+            self._bits = bytearray(self.num_bits // 8)
+        elif len(data) == self.num_bits // 8:
+            self._bits = bytearray(data)
+        else:
+            raise ValueError("filter data does not match capacity and error_rate")
+
+    @property
+    def saturated(self) -> bool:
+        return self.items >= self.capacity
+
+    def positions(self, key: str) -> List[int]:
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        first = int.from_bytes(digest[:8], "big")
+        step = int.from_bytes(digest[8:16], "big") | 1
+        return [(first + index * step) % self.num_bits for index in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self.positions(key):
+            self._bits[position >> 3] |= 0x80 >> (position & 7)
+        self.items += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (0x80 >> (position & 7)) for position in self.positions(key))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+
+class _TieredSyncStateStore:
+    """Shared configuration and accounting for the exact + Bloom dedupe tiers."""
+
+    def __init__(
+        self,
+        *,
+        provider: str,
+        retention_days: float,
+        filter_capacity: int,
+        filter_error_rate: float,
+        prune_batch_size: int,
+        prune_max_batches: Optional[int],
+    ) -> None:
+        if retention_days <= 0 or prune_batch_size <= 0:
+            raise ValueError("retention_days and prune_batch_size must be positive")
+        self._provider = provider
+        self._retention = timedelta(days=retention_days)
+        self._filter_capacity = filter_capacity
+        self._filter_error_rate = filter_error_rate
+        self._prune_batch_size = prune_batch_size
+        self._prune_max_batches = prune_max_batches
+        self.stats: Dict[str, int] = {
+            "registered": 0,
+            "duplicates": 0,
+            "probable_duplicates": 0,
+            "keys_folded": 0,
+            "filter_resets": 0,
+        }
+
+    async def register_transaction(self, account_id: str, dedupe_key: str) -> bool:
+        return (await self.register_transactions(account_id, [dedupe_key]))[0]  # type: ignore[attr-defined]
+
+    def _new_filter(self) -> BloomFilter:
+        return BloomFilter(self._filter_capacity, self._filter_error_rate)
+
+    def _decode_filter(self, account_id: str, data: Optional[bytes], items: int) -> BloomFilter:
+        if data:
+            try:
+                return BloomFilter(self._filter_capacity, self._filter_error_rate, data=data, items=items)
+            except ValueError:
+                logger.warning(
+                    "Discarding sync dedupe filter sized for a different capacity/error rate",
+                    extra={"provider": self._provider, "account_id": account_id},
+                )
+        return self._new_filter()
+
+    def _reset_filter(self, account_id: str) -> BloomFilter:
+        self.stats["filter_resets"] += 1
+        logger.warning(
+            "Sync dedupe filter reached capacity; starting a new one",
+            extra={"provider": self._provider, "account_id": account_id, "capacity": self._filter_capacity},
+        )
+        return self._new_filter()
+
+    def _results(
+        self,
+        account_id: str,
+        dedupe_keys: Sequence[str],
+        inserted: Set[str],
+        probable: Set[str],
+    ) -> List[bool]:
+        results: List[bool] = []
+        emitted: Set[str] = set()
+        for key in dedupe_keys:
+            results.append(key in inserted and key not in emitted)
+            emitted.add(key)
+        registered = sum(results)
+        self.stats["registered"] += registered
+        self.stats["duplicates"] += len(results) - registered
+        if probable:
+            self.stats["probable_duplicates"] += len(probable)
+            logger.info(
+                "Sync dedupe filter matched transactions outside the retention window",
+                extra={"provider": self._provider, "account_id": account_id, "count": len(probable)},
+            )
+        return results
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SqlSyncStateStore(_TieredSyncStateStore):
+    """``SyncStateStore`` persisted in ``banking_sync_cursors``/``banking_sync_dedupe_keys``.
+
+    Each call runs in its own session from ``session_factory`` and commits
+    before returning. A page of keys is registered with a single
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` on PostgreSQL and SQLite.
+    """
+
+    def __init__(
+        self,
+        session_factory: Any,
+        *,
+        provider: str = "mono",
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+        filter_capacity: int = DEFAULT_FILTER_CAPACITY,
+        filter_error_rate: float = DEFAULT_FILTER_ERROR_RATE,
+        prune_batch_size: int = DEFAULT_PRUNE_BATCH_SIZE,
+        prune_max_batches: Optional[int] = DEFAULT_PRUNE_MAX_BATCHES,
+    ) -> None:
+        super().__init__(
+            provider=provider,
+            retention_days=retention_days,
+            filter_capacity=filter_capacity,
+            filter_error_rate=filter_error_rate,
+            prune_batch_size=prune_batch_size,
+            prune_max_batches=prune_max_batches,
+        )
+        self._session_factory = session_factory
+        # Decoded filters, revalidated against seen_filter_items on every batch
+        self._filters: Dict[str, BloomFilter] = {}
+
+    def _cursor_key(self, account_id: str):
+        return (BankingSyncCursor.provider == self._provider) & (BankingSyncCursor.account_id == account_id)
+
+    def _dedupe_key(self, account_id: str):
+        return (BankingSyncDedupeKey.provider == self._provider) & (BankingSyncDedupeKey.account_id == account_id)
+
+    async def get_cursor(self, account_id: str) -> Optional[str]:
+        async with self._session_factory() as session:
+            result = await session.execute(select(BankingSyncCursor.cursor).where(self._cursor_key(account_id)))
+            return result.scalar_one_or_none()
+
+    async def set_cursor(self, account_id: str, cursor: Optional[str]) -> None:
+        async with self._session_factory() as session:
+            dialect_insert = _UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+            if dialect_insert is not None:
+                stmt = dialect_insert(BankingSyncCursor).values(
+                    provider=self._provider, account_id=account_id, cursor=cursor, seen_filter_items=0
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[BankingSyncCursor.provider, BankingSyncCursor.account_id],
+                    set_={"cursor": cursor, "updated_at": _utcnow()},
+                )
+                await session.execute(stmt)
+            else:
+                row = await session.get(BankingSyncCursor, (self._provider, account_id))
+                if row is None:
+                    session.add(BankingSyncCursor(
+                        provider=self._provider, account_id=account_id, cursor=cursor, seen_filter_items=0
+                    ))
+                else:
+                    row.cursor = cursor
+            await session.commit()
+        await self.prune(account_id, max_batches=self._prune_max_batches)
+
+    async def register_transactions(self, account_id: str, dedupe_keys: Sequence[str]) -> List[bool]:
+        if not dedupe_keys:
+            return []
+        unique = list(dict.fromkeys(dedupe_keys))
+        async with self._session_factory() as session:
+            seen_filter = await self._load_filter(session, account_id)
+            probable = {key for key in unique if key in seen_filter} if seen_filter is not None else set()
+            candidates = [key for key in unique if key not in probable]
+            inserted = await self._insert_keys(session, account_id, candidates) if candidates else set()
+            await session.commit()
+        return self._results(account_id, dedupe_keys, inserted, probable)
+
+    async def _load_filter(self, session: Any, account_id: str) -> Optional[BloomFilter]:
+        result = await session.execute(
+            select(BankingSyncCursor.seen_filter_items).where(self._cursor_key(account_id))
+        )
+        items = result.scalar_one_or_none()
+        if not items:
+            self._filters.pop(account_id, None)
+            return None
+        cached = self._filters.get(account_id)
+        if cached is not None and cached.items == items:
+            return cached
+        result = await session.execute(select(BankingSyncCursor.seen_filter).where(self._cursor_key(account_id)))
+        seen_filter = self._decode_filter(account_id, result.scalar_one_or_none(), items)
+        self._filters[account_id] = seen_filter
+        return seen_filter
+
+    async def _insert_keys(self, session: Any, account_id: str, keys: List[str]) -> Set[str]:
+        now = _utcnow()
+        rows = [
+            {"provider": self._provider, "account_id": account_id, "dedupe_key": key, "seen_at": now}
+            for key in keys
+        ]
+        dialect_insert = _UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+        if dialect_insert is not None:
+            stmt = (
+                dialect_insert(BankingSyncDedupeKey)
+                .values(rows)
+                .on_conflict_do_nothing(
+                    index_elements=[
+                        BankingSyncDedupeKey.provider,
+                        BankingSyncDedupeKey.account_id,
+                        BankingSyncDedupeKey.dedupe_key,
+                    ]
+                )
+                .returning(BankingSyncDedupeKey.dedupe_key)
+            )
+            return set((await session.execute(stmt)).scalars().all())
+
+        existing = await session.execute(
+            select(BankingSyncDedupeKey.dedupe_key).where(
+                self._dedupe_key(account_id) & BankingSyncDedupeKey.dedupe_key.in_(keys)
+            )
+        )
+        seen = set(existing.scalars().all())
+        fresh = [row for row in rows if row["dedupe_key"] not in seen]
+        if fresh:
+            await session.execute(insert(BankingSyncDedupeKey), fresh)
+        return {row["dedupe_key"] for row in fresh}
+
+    async def prune(self, account_id: str, *, now: Optional[datetime] = None, max_batches: Optional[int] = None) -> int:
+        """Fold keys older than the retention window into the filter, in bounded chunks."""
+        cutoff = (now or _utcnow()) - self._retention
+        folded = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    select(BankingSyncDedupeKey.dedupe_key)
+                    .where(self._dedupe_key(account_id) & (BankingSyncDedupeKey.seen_at < cutoff))
+                    .order_by(BankingSyncDedupeKey.seen_at)
+                    .limit(self._prune_batch_size)
+                )
+                keys = list(result.scalars().all())
+                if not keys:
+                    break
+
+                result = await session.execute(
+                    select(BankingSyncCursor).where(self._cursor_key(account_id)).with_for_update()
+                )
+                row = result.scalar_one_or_none()
+                if row is None:
+                    row = BankingSyncCursor(provider=self._provider, account_id=account_id, seen_filter_items=0)
+                    session.add(row)
+                seen_filter = self._decode_filter(account_id, row.seen_filter, row.seen_filter_items or 0)
+                for key in keys:
+                    if seen_filter.saturated:
+                        seen_filter = self._reset_filter(account_id)
+                    seen_filter.add(key)
+                row.seen_filter = seen_filter.to_bytes()
+                row.seen_filter_items = seen_filter.items
+
+                await session.execute(
+                    delete(BankingSyncDedupeKey).where(
+                        self._dedupe_key(account_id) & BankingSyncDedupeKey.dedupe_key.in_(keys)
+                    )
+                )
+                await session.commit()
+
+            self._filters[account_id] = seen_filter
+            self.stats["keys_folded"] += len(keys)
+            folded += len(keys)
+            batches += 1
+            if len(keys) < self._prune_batch_size:
+                break
+        return folded
+
+    async def prune_expired(self, *, now: Optional[datetime] = None, max_batches: Optional[int] = None) -> int:
+        """Run ``prune`` for every account holding keys past the retention window."""
+        cutoff = (now or _utcnow()) - self._retention
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(BankingSyncDedupeKey.account_id)
+                .where((BankingSyncDedupeKey.provider == self._provider) & (BankingSyncDedupeKey.seen_at < cutoff))
+                .distinct()
+            )
+            accounts = list(result.scalars().all())
+        folded = 0
+        for account_id in accounts:
+            folded += await self.prune(account_id, now=now, max_batches=max_batches)
+        return folded
+
+
+def _decode(value: Any) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+class RedisSyncStateStore(_TieredSyncStateStore):
+    """``SyncStateStore`` on a ``redis.asyncio`` client.
+
+    Per account it keeps a hash (``cursor``, ``filter_items``), a sorted set
+    of dedupe keys scored by registration time and a bitmap for the filter.
+    A page is registered with one pipelined round trip of ``ZADD NX`` calls,
+    plus one of ``GETBIT`` calls once the account has a populated filter.
+    """
+
+    def __init__(
+        self,
+        redis: Any,
+        *,
+        provider: str = "mono",
+        key_prefix: str = "banking_sync",
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+        filter_capacity: int = DEFAULT_FILTER_CAPACITY,
+        filter_error_rate: float = DEFAULT_FILTER_ERROR_RATE,
+        prune_batch_size: int = DEFAULT_PRUNE_BATCH_SIZE,
+        prune_max_batches: Optional[int] = DEFAULT_PRUNE_MAX_BATCHES,
+    ) -> None:
+        super().__init__(
+            provider=provider,
+            retention_days=retention_days,
+            filter_capacity=filter_capacity,
+            filter_error_rate=filter_error_rate,
+            prune_batch_size=prune_batch_size,
+            prune_max_batches=prune_max_batches,
+        )
+        self._redis = redis
+        self._key_prefix = key_prefix
+        self._hasher = self._new_filter()
+
+    def _key(self, account_id: str, suffix: str) -> str:
+        return f"{self._key_prefix}:{self._provider}:{account_id}:{suffix}"
+
+    async def get_cursor(self, account_id: str) -> Optional[str]:
+        return _decode(await self._redis.hget(self._key(account_id, "state"), "cursor"))
+
+    async def set_cursor(self, account_id: str, cursor: Optional[str]) -> None:
+        state_key = self._key(account_id, "state")
+        if cursor is None:
+            await self._redis.hdel(state_key, "cursor")
+        else:
+            await self._redis.hset(state_key, "cursor", cursor)
+        await self.prune(account_id, max_batches=self._prune_max_batches)
+
+    async def register_transactions(self, account_id: str, dedupe_keys: Sequence[str]) -> List[bool]:
+        if not dedupe_keys:
+            return []
+        unique = list(dict.fromkeys(dedupe_keys))
+        probable: Set[str] = set()
+        if int(await self._redis.hget(self._key(account_id, "state"), "filter_items") or 0):
+            probable = await self._filter_matches(account_id, unique)
+
+        candidates = [key for key in unique if key not in probable]
+        inserted: Set[str] = set()
+        if candidates:
+            seen_key = self._key(account_id, "seen")
+            now = time.time()
+            pipe = self._redis.pipeline(transaction=False)
+            for key in candidates:
+                pipe.zadd(seen_key, {key: now}, nx=True)
+            added = await pipe.execute()
+            inserted = {key for key, count in zip(candidates, added) if count}
+        return self._results(account_id, dedupe_keys, inserted, probable)
+
+    async def _filter_matches(self, account_id: str, keys: List[str]) -> Set[str]:
+        filter_key = self._key(account_id, "filter")
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            for position in self._hasher.positions(key):
+                pipe.getbit(filter_key, position)
+        bits = await pipe.execute()
+        width = self._hasher.num_hashes
+        return {key for index, key in enumerate(keys) if all(bits[index * width:(index + 1) * width])}
+
+    async def prune(self, account_id: str, *, now: Optional[datetime] = None, max_batches: Optional[int] = None) -> int:
+        """Fold keys older than the retention window into the filter bitmap, in bounded chunks."""
+        cutoff = (now or _utcnow()) - self._retention
+        seen_key = self._key(account_id, "seen")
+        state_key = self._key(account_id, "state")
+        filter_key = self._key(account_id, "filter")
+        folded = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            raw = await self._redis.zrangebyscore(
+                seen_key, "-inf", f"({cutoff.timestamp()}", start=0, num=self._prune_batch_size
+            )
+            keys = [_decode(key) for key in raw]
+            if not keys:
+                break
+            items = int(await self._redis.hget(state_key, "filter_items") or 0)
+            pipe = self._redis.pipeline(transaction=False)
+            if items + len(keys) > self._filter_capacity:
+                self._reset_filter(account_id)
+                pipe.delete(filter_key)
+                items = 0
+            for key in keys:
+                for position in self._hasher.positions(key):
+                    pipe.setbit(filter_key, position, 1)
+            pipe.hset(state_key, "filter_items", items + len(keys))
+            pipe.zrem(seen_key, *keys)
+            await pipe.execute()
+
+            self.stats["keys_folded"] += len(keys)
+            folded += len(keys)
+            batches += 1
+            if len(keys) < self._prune_batch_size:
+                break
+        return folded
+
+
+__all__ = [
+    "BloomFilter",
+    "SqlSyncStateStore",
+    "RedisSyncStateStore",
+]
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 from time import perf_counter
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Protocol
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Protocol, Sequence
 from uuid import uuid4
 
 try:
@@ -51,6 +52,14 @@ class SyncStateStore(Protocol):
         """Return True if the key is new, False if transaction already processed."""
         ...
 
+    async def register_transactions(self, account_id: str, dedupe_keys: Sequence[str]) -> List[bool]:
+        """Batched ``register_transaction`` for a page, flags in input order.
+
+        Optional: the sync service falls back to per-key calls for stores
+        without it.
+        """
+        return [await self.register_transaction(account_id, key) for key in dedupe_keys]
+
 
 @dataclass
 class MonoSyncResult:
@@ -60,6 +69,17 @@ class MonoSyncResult:
     total_pages: int
 
 
+@dataclass
+class MonoMultiSyncResult:
+    results: Dict[str, MonoSyncResult]
+    errors: Dict[str, Exception]
+    duration: float
+
+    @property
+    def transactions_fetched(self) -> int:
+        return sum(len(result.transactions) for result in self.results.values())
+
+
 class InMemorySyncStateStore:
     """Simple in-memory implementation for testing and local runs."""
 
@@ -80,6 +100,14 @@ class InMemorySyncStateStore:
         bucket.add(dedupe_key)
         return True
 
+    async def register_transactions(self, account_id: str, dedupe_keys: Sequence[str]) -> List[bool]:
+        bucket = self._dedupe.setdefault(account_id, set())
+        results = []
+        for dedupe_key in dedupe_keys:
+            results.append(dedupe_key not in bucket)
+            bucket.add(dedupe_key)
+        return results
+
 
 class MonoTransactionSyncService:
     """Coordinates fetching paginated Mono transactions with retry + idempotency."""
@@ -92,11 +120,13 @@ class MonoTransactionSyncService:
         *,
         retry_manager: Optional[RetryManager] = None,
         page_size: int = 100,
+        concurrency: int = 4,
     ) -> None:
         self._client = mono_client
         self._state_store = state_store
         self._event_emitter = event_emitter
         self._page_size = page_size
+        self._concurrency = max(1, concurrency)
         self._retry_manager = retry_manager or RetryManager(
             RetryConfig(
                 max_attempts=3,
@@ -143,11 +173,12 @@ class MonoTransactionSyncService:
                 )
                 page += 1
 
-                for transaction in response.data:
-                    dedupe_key = self._make_dedupe_key(transaction)
-                    if not await self._state_store.register_transaction(account_id, dedupe_key):
-                        continue
-                    aggregated.append(transaction)
+                if response.data:
+                    dedupe_keys = [self._make_dedupe_key(transaction) for transaction in response.data]
+                    is_new = await self._register_page(account_id, dedupe_keys)
+                    aggregated.extend(
+                        transaction for transaction, new in zip(response.data, is_new) if new
+                    )
 
                 next_cursor = self._extract_next_cursor(response.paging)
                 if not next_cursor:
@@ -246,6 +277,61 @@ class MonoTransactionSyncService:
 
         return MonoSyncResult(account_id=account_id, transactions=aggregated, cursor=next_cursor, total_pages=page)
 
+    async def sync_accounts(
+        self,
+        account_ids: Iterable[str],
+        *,
+        concurrency: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        correlation_id: Optional[str] = None,
+    ) -> MonoMultiSyncResult:
+        """Sync several accounts with at most ``concurrency`` in flight.
+
+        A failing account is recorded in ``errors`` and does not stop the rest.
+        """
+        accounts = list(dict.fromkeys(account_ids))
+        limit = max(1, concurrency or self._concurrency)
+        correlation = correlation_id or f"mono-sync-{uuid4().hex}"
+        results: Dict[str, MonoSyncResult] = {}
+        errors: Dict[str, Exception] = {}
+        pending = iter(accounts)
+        started_at = perf_counter()
+
+        async def _worker() -> None:
+            for account_id in pending:
+                try:
+                    results[account_id] = await self.sync_account(
+                        account_id,
+                        start_date=start_date,
+                        end_date=end_date,
+                        correlation_id=f"{correlation}:{account_id}",
+                    )
+                except Exception as exc:  # sync_account already recorded and emitted the failure
+                    errors[account_id] = exc
+
+        await asyncio.gather(*(_worker() for _ in range(min(limit, len(accounts)))))
+        duration = perf_counter() - started_at
+
+        await self._emit(
+            "mono.fetch.batch_completed",
+            {
+                "accounts": len(accounts),
+                "succeeded": len(results),
+                "failed": len(errors),
+                "concurrency": limit,
+                "duration": duration,
+                "correlation_id": correlation,
+            },
+        )
+        return MonoMultiSyncResult(results=results, errors=errors, duration=duration)
+
+    async def _register_page(self, account_id: str, dedupe_keys: List[str]) -> List[bool]:
+        register_many = getattr(self._state_store, "register_transactions", None)
+        if register_many is not None:
+            return list(await register_many(account_id, dedupe_keys))
+        return [await self._state_store.register_transaction(account_id, key) for key in dedupe_keys]
+
     async def _fetch_transactions(self, account_id: str, params: Dict[str, object]) -> MonoTransactionsResponse:
         response = await self._client.get(f"/v2/accounts/{account_id}/transactions", params=params)
         return MonoTransactionsResponse(**response)
@@ -306,6 +392,7 @@ class MonoTransactionSyncService:
 __all__ = [
     "MonoTransactionSyncService",
     "MonoSyncResult",
+    "MonoMultiSyncResult",
     "SyncStateStore",
     "InMemorySyncStateStore",
 ]
@@ -21,6 +21,7 @@ from .load_balancer import LoadBalancer, LoadBalancingAlgorithm, RequestContext
 from .models import (
     # Core unified models
     UnifiedAccount, UnifiedTransaction, UnifiedBalance, UnifiedTransactionResponse,
+    UnifiedAccountsResponse, ProviderFanOutReport,
     
     # Provider and system models
     BankingProviderType, ProviderStatus, ProviderMetrics, ProviderLoad,
@@ -85,6 +86,8 @@ __all__ = [
     'UnifiedTransaction',
     'UnifiedBalance',
     'UnifiedTransactionResponse',
+    'UnifiedAccountsResponse',
+    'ProviderFanOutReport',
     
     # Provider and system models
     'BankingProviderType',
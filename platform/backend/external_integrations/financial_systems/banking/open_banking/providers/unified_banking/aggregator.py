@@ -10,14 +10,16 @@ Key Features:
 - Intelligent provider selection and routing
 - Automatic failover and redundancy
 - Load balancing across providers
+- Concurrent provider fan-out with deadlines and partial results
 - Unified data models and responses
 - Enterprise compliance and audit
 """
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union, Type
+from typing import Dict, List, Optional, Any, Union, Type, Callable, Awaitable, Tuple
 from decimal import Decimal
 from enum import Enum
 from dataclasses import dataclass, field
@@ -28,7 +30,8 @@ from ..providers.stitch.connector import StitchBankingConnector
 from .models import (
     UnifiedAccount, UnifiedTransaction, UnifiedBalance,
     BankingProviderType, AggregatorConfig, ProviderStatus,
-    UnifiedTransactionResponse, AggregatorMetrics
+    UnifiedTransactionResponse, AggregatorMetrics,
+    UnifiedAccountsResponse, ProviderFanOutReport
 )
 from .exceptions import (
     BankingAggregatorError, ProviderUnavailableError,
@@ -142,19 +145,60 @@ class UnifiedBankingAggregator:
         customer_id: Optional[str] = None,
         bank_codes: Optional[List[str]] = None,
         account_types: Optional[List[str]] = None,
-        include_inactive: bool = False
+        include_inactive: bool = False,
+        deadline_seconds: Optional[float] = None,
+        min_providers: Optional[int] = None
     ) -> List[UnifiedAccount]:
         """
         Retrieve banking accounts from all available providers.
         
+        Providers are queried concurrently; see get_accounts_detailed for the
+        deadline and early-return semantics and for the per-provider outcome.
+        
+        Returns:
+            List of unified accounts from the providers that answered
+            
+        Raises:
+            BankingAggregatorError: If operation fails
+        """
+        response = await self.get_accounts_detailed(
+            customer_id=customer_id,
+            bank_codes=bank_codes,
+            account_types=account_types,
+            include_inactive=include_inactive,
+            deadline_seconds=deadline_seconds,
+            min_providers=min_providers
+        )
+        return response.accounts
+    
+    async def get_accounts_detailed(
+        self,
+        customer_id: Optional[str] = None,
+        bank_codes: Optional[List[str]] = None,
+        account_types: Optional[List[str]] = None,
+        include_inactive: bool = False,
+        deadline_seconds: Optional[float] = None,
+        min_providers: Optional[int] = None
+    ) -> UnifiedAccountsResponse:
+        """
+        Retrieve accounts from all healthy providers concurrently.
+        
+        Each provider call is bounded by its own timeout and the whole request
+        by ``deadline_seconds``; accounts from providers that answered in time
+        are returned and the rest are listed in the report as failed, timed
+        out or skipped.
+        
         Args:
             customer_id: Optional customer identifier filter
             bank_codes: Optional bank code filters
             account_types: Optional account type filters
             include_inactive: Whether to include inactive accounts
+            deadline_seconds: Overall budget (default: config.request_deadline_seconds)
+            min_providers: Return as soon as this many providers have answered
+                (default: config.fan_out_min_responses, None waits for all)
             
         Returns:
-            List of unified accounts from all providers
+            Unified accounts plus the fan-out report
             
         Raises:
             BankingAggregatorError: If operation fails
@@ -166,46 +210,38 @@ class UnifiedBankingAggregator:
                 f"Fetching accounts across providers for customer: {customer_id or 'all'}"
             )
             
-            # Get accounts from all available providers
-            all_accounts = []
-            provider_results = {}
+            async def fetch(provider_type: BankingProviderType, provider: BaseBankingConnector):
+                # Route request to specific provider
+                return await self._get_accounts_from_provider(
+                    provider=provider,
+                    provider_type=provider_type,
+                    customer_id=customer_id,
+                    bank_codes=bank_codes,
+                    account_types=account_types,
+                    include_inactive=include_inactive
+                )
             
-            for provider_type, provider in self.providers.items():
-                if not await self._is_provider_healthy(provider_type):
-                    continue
-                
-                try:
-                    # Route request to specific provider
-                    accounts = await self._get_accounts_from_provider(
-                        provider=provider,
-                        provider_type=provider_type,
-                        customer_id=customer_id,
-                        bank_codes=bank_codes,
-                        account_types=account_types,
-                        include_inactive=include_inactive
-                    )
-                    
-                    provider_results[provider_type] = accounts
-                    all_accounts.extend(accounts)
-                    
-                    self.metrics.successful_requests += 1
-                    
-                except Exception as e:
-                    self.logger.error(
-                        f"Failed to fetch accounts from {provider_type}: {str(e)}"
-                    )
-                    self.metrics.failed_requests += 1
-                    continue
+            provider_results, report = await self._fan_out(
+                "get_accounts",
+                fetch,
+                deadline_seconds=deadline_seconds,
+                min_responses=min_providers if min_providers is not None else self.config.fan_out_min_responses
+            )
+            
+            # Keep provider order so deduplication prefers the same source each time
+            all_accounts = []
+            for provider_type in self.providers:
+                all_accounts.extend(provider_results.get(provider_type, []))
             
             # Deduplicate accounts across providers
             unified_accounts = await self._deduplicate_accounts(all_accounts)
             
             self.logger.info(
                 f"Retrieved {len(unified_accounts)} unified accounts "
-                f"from {len(provider_results)} providers"
+                f"from {len(provider_results)} providers in {report.elapsed_ms:.0f}ms"
             )
             
-            return unified_accounts
+            return UnifiedAccountsResponse(accounts=unified_accounts, report=report)
             
         except Exception as e:
             self.logger.error(f"Failed to fetch accounts: {str(e)}")
@@ -217,17 +253,28 @@ class UnifiedBankingAggregator:
         start_date: datetime,
         end_date: datetime,
         limit: Optional[int] = None,
-        provider_preference: Optional[BankingProviderType] = None
+        provider_preference: Optional[BankingProviderType] = None,
+        deadline_seconds: Optional[float] = None,
+        race_providers: bool = False
     ) -> UnifiedTransactionResponse:
         """
         Retrieve transactions for a specific account with intelligent routing.
         
+        The selected provider is called with its own timeout; if it fails or
+        times out, the remaining healthy providers are tried concurrently and
+        the first answer wins. With ``race_providers`` all healthy providers
+        are queried at once from the start. Either way the whole request is
+        bounded by ``deadline_seconds`` and the fan-out report is attached as
+        ``query_metadata['fan_out']``.
+        
         Args:
             account_id: Account identifier
             start_date: Start date for transaction search
             end_date: End date for transaction search
             limit: Maximum number of transactions
             provider_preference: Preferred provider for this request
+            deadline_seconds: Overall budget (default: config.request_deadline_seconds)
+            race_providers: Query every healthy provider concurrently
             
         Returns:
             Unified transaction response
@@ -237,6 +284,9 @@ class UnifiedBankingAggregator:
         """
         await self._ensure_initialized()
         
+        deadline = deadline_seconds if deadline_seconds is not None else self.config.request_deadline_seconds
+        started = time.monotonic()
+        
         try:
             self.logger.info(
                 f"Fetching transactions for account {account_id} "
@@ -255,42 +305,40 @@ class UnifiedBankingAggregator:
                 )
             
             provider_type, provider = selected_provider
+            candidates = [provider_type]
+            if race_providers:
+                candidates += [p for p in self.providers if p != provider_type]
             
-            try:
-                # Fetch transactions from selected provider
-                response = await self._get_transactions_from_provider(
-                    provider=provider,
-                    provider_type=provider_type,
-                    account_id=account_id,
-                    start_date=start_date,
-                    end_date=end_date,
-                    limit=limit
-                )
-                
-                self.metrics.successful_requests += 1
-                self._update_provider_metrics(provider_type, success=True)
-                
-                self.logger.info(
-                    f"Retrieved {len(response.transactions)} transactions "
-                    f"from {provider_type} for account {account_id}"
-                )
-                
-                return response
-                
-            except Exception as e:
-                self.metrics.failed_requests += 1
-                self._update_provider_metrics(provider_type, success=False)
-                
-                # Try failover to alternative provider
+            results, report = await self._fan_out(
+                "get_transactions",
+                self._transactions_call(account_id, start_date, end_date, limit),
+                provider_types=candidates,
+                deadline_seconds=deadline,
+                min_responses=1
+            )
+            
+            if not results:
+                # Try failover to alternative providers within the remaining budget
                 return await self._failover_transaction_request(
                     account_id=account_id,
                     start_date=start_date,
                     end_date=end_date,
                     limit=limit,
-                    failed_provider=provider_type,
-                    original_error=e
+                    failed_providers=candidates,
+                    original_report=report,
+                    deadline_seconds=deadline - (time.monotonic() - started)
                 )
-                
+            
+            response_provider, response = next(iter(results.items()))
+            response.query_metadata['fan_out'] = report.to_dict()
+            
+            self.logger.info(
+                f"Retrieved {len(response.transactions)} transactions "
+                f"from {response_provider} for account {account_id}"
+            )
+            
+            return response
+            
         except Exception as e:
             self.logger.error(f"Failed to fetch transactions: {str(e)}")
             raise BankingAggregatorError(f"Transaction retrieval failed: {str(e)}")
@@ -342,6 +390,172 @@ class UnifiedBankingAggregator:
                 'timestamp': datetime.utcnow().isoformat()
             }
     
+    async def _failover_transaction_request(
+        self,
+        account_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int],
+        failed_providers: List[BankingProviderType],
+        original_report: ProviderFanOutReport,
+        deadline_seconds: float
+    ) -> UnifiedTransactionResponse:
+        """Race the providers not yet tried; the first to answer wins."""
+        alternatives = [p for p in self.providers if p not in failed_providers]
+        if not self.config.enable_failover or not alternatives or deadline_seconds <= 0:
+            raise NoProvidersAvailableError(
+                f"Transaction retrieval failed for account {account_id} and no failover provider could be tried",
+                details={'fan_out': original_report.to_dict()}
+            )
+        
+        self.logger.warning(
+            f"Failing over transaction request for {account_id} from "
+            f"{[p.value for p in failed_providers]} to {[p.value for p in alternatives]}"
+        )
+        
+        results, report = await self._fan_out(
+            "get_transactions_failover",
+            self._transactions_call(account_id, start_date, end_date, limit),
+            provider_types=alternatives,
+            deadline_seconds=deadline_seconds,
+            min_responses=1
+        )
+        
+        if not results:
+            raise NoProvidersAvailableError(
+                f"No provider returned transactions for account {account_id}",
+                details={'fan_out': original_report.to_dict(), 'failover': report.to_dict()}
+            )
+        
+        _, response = next(iter(results.items()))
+        response.query_metadata['fan_out'] = original_report.to_dict()
+        response.query_metadata['failover'] = report.to_dict()
+        return response
+    
+    def _transactions_call(
+        self,
+        account_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int]
+    ) -> Callable[[BankingProviderType, BaseBankingConnector], Awaitable[UnifiedTransactionResponse]]:
+        async def fetch(provider_type: BankingProviderType, provider: BaseBankingConnector):
+            return await self._get_transactions_from_provider(
+                provider=provider,
+                provider_type=provider_type,
+                account_id=account_id,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit
+            )
+        return fetch
+    
+    async def _fan_out(
+        self,
+        operation: str,
+        call: Callable[[BankingProviderType, BaseBankingConnector], Awaitable[Any]],
+        provider_types: Optional[List[BankingProviderType]] = None,
+        deadline_seconds: Optional[float] = None,
+        min_responses: Optional[int] = None
+    ) -> Tuple[Dict[BankingProviderType, Any], ProviderFanOutReport]:
+        """
+        Call several providers concurrently.
+        
+        Each call is bounded by the provider's timeout, the whole fan-out by
+        ``deadline_seconds``. Returns once every provider has finished, the
+        deadline passes, or ``min_responses`` providers have answered; calls
+        still running at that point are cancelled.
+        
+        Returns:
+            Results keyed by provider in completion order, and the report
+        """
+        deadline = deadline_seconds if deadline_seconds is not None else self.config.request_deadline_seconds
+        report = ProviderFanOutReport(operation=operation, deadline_seconds=deadline)
+        started = time.monotonic()
+        
+        tasks: Dict[asyncio.Task, BankingProviderType] = {}
+        results: Dict[BankingProviderType, Any] = {}
+        pending: set = set()
+        try:
+            for provider_type in (provider_types if provider_types is not None else list(self.providers)):
+                if not await self._is_provider_healthy(provider_type):
+                    report.skipped.append(provider_type)
+                    continue
+                timeout = min(self._provider_timeout(provider_type), deadline)
+                task = asyncio.create_task(self._call_provider(provider_type, call, timeout, report))
+                tasks[task] = provider_type
+                pending.add(task)
+            
+            while pending:
+                remaining = deadline - (time.monotonic() - started)
+                if remaining <= 0:
+                    report.deadline_exceeded = True
+                    break
+                
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: report.latencies_ms.get(tasks[t], 0.0)):
+                    provider_type = tasks[task]
+                    error = task.exception()
+                    if error is None:
+                        results[provider_type] = task.result()
+                        report.responded.append(provider_type)
+                        self.metrics.successful_requests += 1
+                    elif isinstance(error, asyncio.TimeoutError):
+                        report.timed_out.append(provider_type)
+                        self.metrics.failed_requests += 1
+                    else:
+                        report.failed[provider_type] = str(error)
+                        self.metrics.failed_requests += 1
+                        self.logger.error(f"{operation} failed on {provider_type}: {str(error)}")
+                    self._update_provider_metrics(provider_type, success=error is None)
+                
+                if min_responses and len(results) >= min_responses:
+                    break
+        finally:
+            # Also reached when the caller is cancelled: no provider call may
+            # outlive the fan-out
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        for task in pending:
+            if report.deadline_exceeded:
+                report.timed_out.append(tasks[task])
+                self.metrics.failed_requests += 1
+                self._update_provider_metrics(tasks[task], success=False)
+            else:
+                report.cancelled.append(tasks[task])
+        
+        report.elapsed_ms = (time.monotonic() - started) * 1000
+        if report.partial:
+            self.logger.warning(
+                f"{operation} returned partial results: "
+                f"failed={[p.value for p in report.failed]} timed_out={[p.value for p in report.timed_out]}"
+            )
+        return results, report
+    
+    async def _call_provider(
+        self,
+        provider_type: BankingProviderType,
+        call: Callable[[BankingProviderType, BaseBankingConnector], Awaitable[Any]],
+        timeout: float,
+        report: ProviderFanOutReport
+    ) -> Any:
+        """Run one provider call under its timeout and record its latency."""
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(call(provider_type, self.providers[provider_type]), timeout)
+        finally:
+            report.latencies_ms[provider_type] = (time.monotonic() - started) * 1000
+    
+    def _provider_timeout(self, provider_type: BankingProviderType) -> float:
+        """Per-call timeout for a provider."""
+        provider_config = self.provider_configs.get(provider_type)
+        if provider_config is not None:
+            return float(provider_config.timeout_seconds)
+        return float(self.config.default_timeout)
+    
     async def _initialize_providers(self) -> None:
         """Initialize all configured banking providers."""
         for provider_config in self.config.providers:
@@ -149,6 +149,48 @@ class UnifiedTransactionResponse:
     query_metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class ProviderFanOutReport:
+    """Outcome of one request fanned out to several providers."""
+    operation: str
+    deadline_seconds: float
+    responded: List[BankingProviderType] = field(default_factory=list)
+    failed: Dict[BankingProviderType, str] = field(default_factory=dict)
+    timed_out: List[BankingProviderType] = field(default_factory=list)  # provider timeout or overall deadline
+    cancelled: List[BankingProviderType] = field(default_factory=list)  # not needed after an early return
+    skipped: List[BankingProviderType] = field(default_factory=list)  # unhealthy, never called
+    latencies_ms: Dict[BankingProviderType, float] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+    deadline_exceeded: bool = False
+
+    @property
+    def partial(self) -> bool:
+        """Whether any called provider failed or did not answer in time."""
+        return bool(self.failed or self.timed_out)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'operation': self.operation,
+            'deadline_seconds': round(self.deadline_seconds, 3),
+            'partial': self.partial,
+            'deadline_exceeded': self.deadline_exceeded,
+            'responded': [p.value for p in self.responded],
+            'failed': {p.value: error for p, error in self.failed.items()},
+            'timed_out': [p.value for p in self.timed_out],
+            'cancelled': [p.value for p in self.cancelled],
+            'skipped': [p.value for p in self.skipped],
+            'latencies_ms': {p.value: round(ms, 1) for p, ms in self.latencies_ms.items()},
+            'elapsed_ms': round(self.elapsed_ms, 1)
+        }
+
+
+@dataclass
+class UnifiedAccountsResponse:
+    """Accounts gathered across providers with the per-provider outcome."""
+    accounts: List[UnifiedAccount]
+    report: ProviderFanOutReport
+
+
 @dataclass
 class ProviderMetrics:
     """Metrics for a specific provider."""
@@ -190,6 +232,8 @@ class AggregatorConfig:
     enable_failover: bool = True
     enable_load_balancing: bool = True
     default_timeout: float = 30.0
+    request_deadline_seconds: float = 20.0  # overall budget for a fanned-out request
+    fan_out_min_responses: Optional[int] = None  # return once this many providers answered
     max_retries: int = 3
     health_check_interval: int = 60
     compliance_mode: bool = True
@@ -299,11 +343,11 @@ class FailoverPolicy:
 @dataclass
 class FailoverEvent:
     """Event record for failover operations."""
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     from_provider: BankingProviderType
     to_provider: BankingProviderType
     reason: str
     timestamp: datetime
+    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     operation_id: Optional[str] = None
     success: bool = True
     error_message: Optional[str] = None
@@ -314,10 +358,10 @@ class FailoverEvent:
 @dataclass
 class RecoveryAttempt:
     """Record of provider recovery attempts."""
-    attempt_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     provider_type: BankingProviderType
     timestamp: datetime
     successful: bool
+    attempt_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     attempt_count: int = 1
     error: Optional[str] = None
     recovery_time: Optional[float] = None
@@ -326,11 +370,11 @@ class RecoveryAttempt:
 @dataclass
 class ComplianceReport:
     """Compliance reporting structure."""
-    report_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     report_type: str
     provider_type: BankingProviderType
     start_date: datetime
     end_date: datetime
+    report_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     generated_at: datetime = field(default_factory=datetime.utcnow)
     summary: Dict[str, Any] = field(default_factory=dict)
     details: List[Dict[str, Any]] = field(default_factory=list)
@@ -342,15 +386,15 @@ class ComplianceReport:
 @dataclass
 class AuditEntry:
     """Audit log entry for compliance."""
-    entry_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: datetime = field(default_factory=datetime.utcnow)
     provider_type: BankingProviderType
     operation_type: str
+    action: str
+    result: str
+    entry_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    timestamp: datetime = field(default_factory=datetime.utcnow)
     user_id: Optional[str] = None
     account_id: Optional[str] = None
     transaction_id: Optional[str] = None
-    action: str
-    result: str
     details: Dict[str, Any] = field(default_factory=dict)
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
@@ -393,10 +437,10 @@ class TransactionFilter:
 @dataclass
 class BulkOperationRequest:
     """Request for bulk operations."""
-    operation_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     operation_type: str
     provider_type: BankingProviderType
     account_ids: List[str]
+    operation_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     parameters: Dict[str, Any] = field(default_factory=dict)
     priority: str = "normal"
     timeout: Optional[float] = None
@@ -412,9 +456,9 @@ class BulkOperationResult:
     total_items: int
     successful_items: int
     failed_items: int
+    started_at: datetime
     results: List[Dict[str, Any]] = field(default_factory=list)
     errors: List[Dict[str, Any]] = field(default_factory=list)
-    started_at: datetime
     completed_at: Optional[datetime] = None
     duration: Optional[float] = None
     status: str = "pending"
\ No newline at end of file
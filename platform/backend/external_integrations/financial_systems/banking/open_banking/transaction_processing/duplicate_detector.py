@@ -9,6 +9,7 @@ Features:
 - Multiple detection strategies (hash-based, field-based, time-window)
 - Configurable duplicate resolution
 - Performance optimized with caching
+- Indexed batch mode: one range query per batch, bucketed comparisons
 - Nigerian banking compliance
 - Audit trail for duplicate handling
 """
@@ -16,7 +17,9 @@ Features:
 from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from contextvars import ContextVar
 import hashlib
 import json
 import logging
@@ -28,6 +31,11 @@ from core_platform.data_management import CacheManager
 
 logger = logging.getLogger(__name__)
 
+# Best time-window similarity reachable when account numbers differ: amount,
+# description and date factors at 1.0, account at 0.0
+_MAX_SCORE_WITHOUT_ACCOUNT = 0.75
+_SLOT_EPOCH = datetime(1970, 1, 1)
+
 
 class DuplicateStrategy(Enum):
     """Duplicate detection strategies."""
@@ -91,6 +99,62 @@ class DuplicateResult:
     processing_notes: List[str] = None
 
 
+class _TimeWindowIndex:
+    """
+    Rows of ``transactions`` a batch's time-window rule can match, bucketed by
+    normalized amount, account and time slot.
+
+    Slots are one window wide, so a transaction only meets rows in its own
+    slot and the two neighbours. Account is part of the bucket key only when
+    the rule threshold cannot be met without an account match. Candidates are
+    returned in the order the range query produced them.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], window: timedelta, by_account: bool):
+        self.window = window
+        self.by_account = by_account
+        self._buckets: Dict[Tuple, List[Tuple[int, Dict[str, Any]]]] = defaultdict(list)
+        for ordinal, row in enumerate(rows):
+            key = self._key(row.get('amount'), row.get('account_number'), self._slot(row['date']))
+            self._buckets[key].append((ordinal, row))
+
+    def candidates(self, transaction: BankTransaction) -> List[Dict[str, Any]]:
+        window_start = transaction.date - self.window
+        window_end = transaction.date + self.window
+        slot = self._slot(transaction.date)
+
+        found = []
+        for neighbour in (slot - 1, slot, slot + 1):
+            key = self._key(transaction.amount, transaction.account_number, neighbour)
+            for ordinal, row in self._buckets.get(key, ()):
+                if row['id'] != transaction.id and window_start <= row['date'] <= window_end:
+                    found.append((ordinal, row))
+        found.sort(key=lambda item: item[0])
+        return [row for _, row in found]
+
+    def _key(self, amount: Any, account_number: Any, slot: int) -> Tuple:
+        return (_normalize_amount(amount), account_number if self.by_account else None, slot)
+
+    def _slot(self, value: datetime) -> int:
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return (value - _SLOT_EPOCH) // self.window
+
+
+def _normalize_amount(amount: Any) -> Any:
+    """Bucket key for an amount: equal values from int/float/str/Decimal collide."""
+    try:
+        return Decimal(str(amount))
+    except (InvalidOperation, ValueError):
+        return amount
+
+
+# Time-window indexes for the batch being checked in the current task, keyed by id(rule)
+_BATCH_WINDOW_INDEXES: ContextVar[Optional[Dict[int, _TimeWindowIndex]]] = ContextVar(
+    "duplicate_detector_batch_window_indexes", default=None
+)
+
+
 class DuplicateDetector:
     """
     Advanced duplicate detector for banking transactions.
@@ -104,7 +168,8 @@ class DuplicateDetector:
         database: DatabaseAbstractionLayer,
         cache_manager: CacheManager,
         detection_rules: Optional[List[DetectionRule]] = None,
-        strategy: DuplicateStrategy = DuplicateStrategy.HASH_BASED
+        strategy: DuplicateStrategy = DuplicateStrategy.HASH_BASED,
+        indexed_batches: bool = True
     ):
         self.database = database
         self.cache_manager = cache_manager
@@ -115,6 +180,7 @@ class DuplicateDetector:
         self.cache_ttl = 3600  # 1 hour cache
         self.max_matches_to_return = 10
         self.hash_algorithm = 'sha256'
+        self.indexed_batches = indexed_batches
         
         # In-memory caches for performance
         self.transaction_hashes: Set[str] = set()
@@ -231,6 +297,10 @@ class DuplicateDetector:
         """
         Check multiple transactions for duplicates in batch.
         
+        With ``indexed_batches`` the time-window history is fetched once for
+        the whole batch and in-batch duplicates are found by grouping on the
+        identity fields; findings match the per-transaction path.
+        
         Args:
             transactions: List of transactions to check
             custom_rules: Additional detection rules
@@ -242,13 +312,23 @@ class DuplicateDetector:
         
         results = []
         
-        # First pass: check against existing data
-        for transaction in transactions:
-            result = await self.check_duplicate(transaction, custom_rules)
-            results.append(result)
+        window_indexes = None
+        if self.indexed_batches:
+            window_indexes = await self._build_time_window_indexes(transactions, custom_rules)
+        token = _BATCH_WINDOW_INDEXES.set(window_indexes)
+        try:
+            # First pass: check against existing data
+            for transaction in transactions:
+                result = await self.check_duplicate(transaction, custom_rules)
+                results.append(result)
+        finally:
+            _BATCH_WINDOW_INDEXES.reset(token)
         
         # Second pass: check within batch for internal duplicates
-        await self._check_internal_batch_duplicates(transactions, results)
+        if self.indexed_batches:
+            await self._check_internal_batch_duplicates_indexed(transactions, results)
+        else:
+            await self._check_internal_batch_duplicates(transactions, results)
         
         # Log batch summary
         duplicate_count = sum(1 for r in results if r.is_duplicate)
@@ -397,19 +477,25 @@ class DuplicateDetector:
         window_start = transaction.date - timedelta(minutes=rule.time_window_minutes)
         window_end = transaction.date + timedelta(minutes=rule.time_window_minutes)
         
-        # Query transactions in time window
-        query = """
-            SELECT id, date, amount, account_number, description
-            FROM transactions 
-            WHERE date BETWEEN ? AND ? 
-            AND id != ?
-            AND amount = ?
-        """
+        batch_indexes = _BATCH_WINDOW_INDEXES.get()
+        window_index = batch_indexes.get(id(rule)) if batch_indexes else None
         
-        existing_transactions = await self.database.fetch_all(
-            query,
-            (window_start, window_end, transaction.id, transaction.amount)
-        )
+        if window_index is not None:
+            existing_transactions = window_index.candidates(transaction)
+        else:
+            # Query transactions in time window
+            query = """
+                SELECT id, date, amount, account_number, description
+                FROM transactions 
+                WHERE date BETWEEN ? AND ? 
+                AND id != ?
+                AND amount = ?
+            """
+            
+            existing_transactions = await self.database.fetch_all(
+                query,
+                (window_start, window_end, transaction.id, transaction.amount)
+            )
         
         matches = []
         for row in existing_transactions:
@@ -733,6 +819,100 @@ class DuplicateDetector:
                         match_details={'batch_position': j}
                     ))
     
+    async def _check_internal_batch_duplicates_indexed(
+        self,
+        transactions: List[BankTransaction],
+        results: List[DuplicateResult]
+    ):
+        """Same findings as ``_check_internal_batch_duplicates`` by grouping on identity fields."""
+        
+        groups: Dict[Tuple, List[int]] = defaultdict(list)
+        try:
+            for position, transaction in enumerate(transactions):
+                groups[self._transaction_identity(transaction)].append(position)
+        except TypeError:
+            # Unhashable field values; compare pairwise instead
+            await self._check_internal_batch_duplicates(transactions, results)
+            return
+        
+        for positions in groups.values():
+            # The first not-yet-duplicate member claims every later one
+            original = next((p for p in positions if not results[p].is_duplicate), None)
+            if original is None:
+                continue
+            
+            for j in positions:
+                if j <= original:
+                    continue
+                results[j].is_duplicate = True
+                results[j].matches.append(DuplicateMatch(
+                    original_transaction_id=transactions[original].id,
+                    duplicate_transaction_id=transactions[j].id,
+                    confidence=DuplicateConfidence.EXACT,
+                    confidence_score=1.0,
+                    matching_fields=['all'],
+                    detection_rule='batch_internal',
+                    match_details={'batch_position': j}
+                ))
+    
+    async def _build_time_window_indexes(
+        self,
+        transactions: List[BankTransaction],
+        custom_rules: Optional[List[DetectionRule]]
+    ) -> Optional[Dict[int, _TimeWindowIndex]]:
+        """Fetch the time-window history for a whole batch in one range query."""
+        
+        rules = [
+            rule for rule in self.detection_rules + (custom_rules or [])
+            if rule.enabled and rule.strategy == DuplicateStrategy.TIME_WINDOW and rule.time_window_minutes
+        ]
+        dates = [getattr(transaction, 'date', None) for transaction in transactions]
+        dates = [value for value in dates if value]
+        if not rules or not dates:
+            return None
+        
+        aware = getattr(dates[0], 'tzinfo', None) is not None
+        if not all(isinstance(value, datetime) and (value.tzinfo is not None) == aware for value in dates):
+            return None
+        
+        widest = timedelta(minutes=max(rule.time_window_minutes for rule in rules))
+        try:
+            rows = await self.database.fetch_all(
+                """
+                SELECT id, date, amount, account_number, description
+                FROM transactions 
+                WHERE date BETWEEN ? AND ?
+                """,
+                (min(dates) - widest, max(dates) + widest)
+            )
+        except Exception as e:
+            logger.warning(f"Batch time-window prefetch failed, using per-transaction queries: {e}")
+            return None
+        
+        rows = [dict(row) for row in rows]
+        if not all(isinstance(row.get('date'), datetime) and (row['date'].tzinfo is not None) == aware for row in rows):
+            # Row dates not comparable in Python; leave the window test to the database
+            return None
+        
+        return {
+            id(rule): _TimeWindowIndex(
+                rows,
+                timedelta(minutes=rule.time_window_minutes),
+                by_account=rule.confidence_threshold > _MAX_SCORE_WITHOUT_ACCOUNT
+            )
+            for rule in rules
+        }
+    
+    def _transaction_identity(self, transaction: BankTransaction) -> Tuple:
+        """Fields compared by ``_transactions_are_identical``, as a hashable key."""
+        return (
+            transaction.amount,
+            transaction.account_number,
+            transaction.description,
+            transaction.date,
+            transaction.reference
+        )
+    
     def _transactions_are_identical(self, tx1: BankTransaction, tx2: BankTransaction) -> bool:
         """Check if two transactions are identical."""
         
@@ -819,7 +999,8 @@ def create_duplicate_detector(
     database: DatabaseAbstractionLayer,
     cache_manager: CacheManager,
     strategy: DuplicateStrategy = DuplicateStrategy.HASH_BASED,
-    detection_rules: Optional[List[DetectionRule]] = None
+    detection_rules: Optional[List[DetectionRule]] = None,
+    indexed_batches: bool = True
 ) -> DuplicateDetector:
     """Factory function to create duplicate detector."""
-    return DuplicateDetector(database, cache_manager, detection_rules, strategy)
\ No newline at end of file
+    return DuplicateDetector(database, cache_manager, detection_rules, strategy, indexed_batches)
\ No newline at end of file
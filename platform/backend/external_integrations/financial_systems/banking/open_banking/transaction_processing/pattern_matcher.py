@@ -15,7 +15,7 @@ Features:
 - Seasonal pattern analysis
 """
 
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Dict, List, Optional, Any, Tuple, Set, Pattern
 from dataclasses import dataclass
 from enum import Enum
 import re
@@ -149,6 +149,10 @@ class PatternMatcher:
         # Nigerian-specific patterns
         self._initialize_nigerian_patterns()
         
+        # Compiled regex sets, keyed by the rule's pattern list
+        self._compiled_pattern_sets: Dict[Tuple[str, ...], Tuple[Optional[Pattern], List[Tuple[str, Pattern]]]] = {}
+        self.compile_rules()
+        
         # Learning and adaptation
         self.pattern_frequency = defaultdict(int)
         self.merchant_database = {}
@@ -294,6 +298,49 @@ class PatternMatcher:
         
         return results
     
+    def compile_rules(self):
+        """
+        Precompile description and merchant patterns of every rule.
+        
+        Each pattern list gets a combined alternation regex used as a
+        single-pass prefilter, plus the individually compiled patterns used
+        to report which patterns matched. Call again after editing rules.
+        """
+        
+        self._compiled_pattern_sets.clear()
+        for rule in self.pattern_rules:
+            for patterns in (rule.description_patterns, rule.merchant_patterns):
+                if patterns:
+                    self._get_compiled_patterns(patterns)
+    
+    def _get_compiled_patterns(
+        self,
+        patterns: List[str]
+    ) -> Tuple[Optional[Pattern], List[Tuple[str, Pattern]]]:
+        """Return (combined prefilter, [(pattern, compiled)]) for a pattern list."""
+        
+        key = tuple(patterns)
+        compiled = self._compiled_pattern_sets.get(key)
+        if compiled is None:
+            individual = [(pattern, re.compile(pattern, re.IGNORECASE)) for pattern in patterns]
+            try:
+                combined = re.compile(
+                    '|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE
+                )
+            except re.error:
+                combined = None  # Patterns that cannot be combined are checked individually
+            compiled = (combined, individual)
+            self._compiled_pattern_sets[key] = compiled
+        return compiled
+    
+    def _search_compiled_patterns(self, text: str, patterns: List[str]) -> List[str]:
+        """Return the patterns matching text, skipping the per-pattern scan when none can match."""
+        
+        combined, individual = self._get_compiled_patterns(patterns)
+        if combined is not None and not combined.search(text):
+            return []
+        return [pattern for pattern, compiled in individual if compiled.search(text)]
+    
     async def _apply_pattern_rule(
         self,
         transaction: BankTransaction,
@@ -366,14 +413,10 @@ class PatternMatcher:
             return 0.0, []
         
         desc_lower = description.lower().strip()
-        matches = []
-        total_score = 0.0
+        matches = self._search_compiled_patterns(desc_lower, patterns)
         
-        for pattern in patterns:
-            if re.search(pattern, desc_lower, re.IGNORECASE):
-                matches.append(pattern)
-                # Score based on pattern specificity
-                total_score += min(len(pattern) / 20, 1.0)
+        # Score based on pattern specificity
+        total_score = sum((min(len(pattern) / 20, 1.0) for pattern in matches), 0.0)
         
         return min(total_score, 1.0), matches
     
@@ -406,13 +449,8 @@ class PatternMatcher:
         if not text_to_search:
             return 0.0, []
         
-        matches = []
-        total_score = 0.0
-        
-        for pattern in merchant_patterns:
-            if re.search(pattern, text_to_search, re.IGNORECASE):
-                matches.append(pattern)
-                total_score += 0.5
+        matches = self._search_compiled_patterns(text_to_search, merchant_patterns)
+        total_score = 0.5 * len(matches)
         
         return min(total_score, 1.0), matches
     
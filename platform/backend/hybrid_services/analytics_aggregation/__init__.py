@@ -45,6 +45,22 @@ from .kpi_calculator import (
     create_kpi_calculator
 )
 
+from .kpi_graph import KPIDependencyGraph
+
+from .kpi_formula import (
+    CompiledFormula,
+    FormulaError,
+    compile_formula
+)
+
+from .trend_online import (
+    CoMoments,
+    EWMAStats,
+    OnlineSeriesStats,
+    RegressionFit,
+    SeasonalBuckets
+)
+
 from .trend_analyzer import (
     TrendAnalyzer,
     TrendDirection,
@@ -123,6 +139,10 @@ __all__ = [
     "KPIInsight",
     "KPIDashboard",
     "create_kpi_calculator",
+    "CompiledFormula",
+    "FormulaError",
+    "compile_formula",
+    "KPIDependencyGraph",
     
     # Trend Analyzer
     "TrendAnalyzer",
@@ -138,6 +158,11 @@ __all__ = [
     "TrendAlert",
     "TrendComparison",
     "create_trend_analyzer",
+    "CoMoments",
+    "EWMAStats",
+    "OnlineSeriesStats",
+    "RegressionFit",
+    "SeasonalBuckets",
     
     # Insight Generator
     "InsightGenerator",
@@ -10,9 +10,12 @@ from typing import Dict, Any, Optional, List, Union, Tuple, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
+import time
 import statistics
 import math
 
+import numpy as np
+
 from core_platform.data_management.database_init import get_db_session
 from core_platform.models.kpi import KPIDefinition, KPICalculation, KPITarget, KPIHistory
 from core_platform.data_management.cache_manager import CacheManager, CacheConfig
@@ -21,6 +24,8 @@ from si_services.integration_management.metrics_collector import MetricsCollecto
 from core_platform.notifications import NotificationService
 
 from .unified_metrics import UnifiedMetrics, MetricScope, MetricType, AggregatedMetric
+from .kpi_formula import CompiledFormula, FormulaError, compile_formula
+from .kpi_graph import KPIDependencyGraph
 
 logger = logging.getLogger(__name__)
 
@@ -172,6 +177,23 @@ class KPIDashboard:
         return asdict(self)
 
 
+# Calculation methods whose calculators only restate the definition's formula;
+# KPIs using them (or an unregistered method) are evaluated from the compiled formula
+FORMULA_METHODS = frozenset({
+    "formula",
+    "division",
+    "composite",
+    "compliance_rate",
+    "availability",
+    "churn_rate",
+    "addition",
+    "si_contribution_percentage",
+    "app_contribution_percentage",
+    "cac_calculation",
+    "unified_rpu_calculation",
+})
+
+
 class KPICalculator:
     """
     KPI Calculator service
@@ -191,6 +213,19 @@ class KPICalculator:
         self.kpi_definitions: Dict[str, KPIDefinition] = {}
         self.kpi_targets: Dict[str, List[KPITarget]] = {}
         self.kpi_calculators: Dict[str, Callable] = {}
+        self.compiled_formulas: Dict[str, CompiledFormula] = {}
+        self.kpi_graph = KPIDependencyGraph()
+        # (kpi_id, period, window start, window end) -> (graph version, input data time, calculation)
+        self.kpi_memo: Dict[Tuple[str, str, datetime, datetime], Tuple[int, Optional[datetime], KPICalculation]] = {}
+        # Latest data timestamp reported per metric by metrics.updated events
+        self.metric_data_times: Dict[str, datetime] = {}
+        self.incremental_stats = {
+            "recomputes": 0,
+            "memo_hits": 0,
+            "metric_events": 0,
+            "kpis_invalidated": 0,
+            "recompute_time_ms": 0.0
+        }
         self.calculation_history: Dict[str, List[KPICalculation]] = {}
         self.is_initialized = False
         
@@ -198,10 +233,14 @@ class KPICalculator:
         self.cache_ttl = 300  # 5 minutes
         self.max_history_size = 1000
         self.calculation_interval = 60  # 1 minute
+        self.max_memo_entries = 4096
         
         # Initialize default KPIs
         self._initialize_default_kpis()
         self._initialize_kpi_calculators()
+        for kpi_def in self.kpi_definitions.values():
+            self._compile_kpi(kpi_def)
+            self.kpi_graph.set_kpi(kpi_def.kpi_id, kpi_def.source_metrics)
     
     def _initialize_default_kpis(self):
         """Initialize default KPI definitions"""
@@ -686,10 +725,13 @@ class KPICalculator:
     async def register_kpi_definition(self, kpi_definition: KPIDefinition):
         """Register a new KPI definition"""
         try:
+            # Compile and validate the formula before accepting the definition
+            self._compile_kpi(kpi_definition)
+            self.kpi_graph.set_kpi(kpi_definition.kpi_id, kpi_definition.source_metrics)
             self.kpi_definitions[kpi_definition.kpi_id] = kpi_definition
             
             # Cache the definition
-            await self.cache.set(
+            await self.cache.aset(
                 f"kpi_def:{kpi_definition.kpi_id}",
                 kpi_definition.to_dict(),
                 ttl=self.cache_ttl
@@ -710,7 +752,7 @@ class KPICalculator:
             self.kpi_targets[kpi_target.kpi_id].append(kpi_target)
             
             # Cache the target
-            await self.cache.set(
+            await self.cache.aset(
                 f"kpi_target:{kpi_target.target_id}",
                 kpi_target.to_dict(),
                 ttl=self.cache_ttl
@@ -734,99 +776,172 @@ class KPICalculator:
                 raise ValueError(f"KPI definition not found: {kpi_id}")
             
             kpi_def = self.kpi_definitions[kpi_id]
+            version = self.kpi_graph.version(kpi_id)
+            data_time = self._input_data_time(kpi_id)
+            
+            # Composite KPIs consume other KPIs' values
+            kpi_inputs = {}
+            upstream = self.kpi_graph.upstream_kpis([kpi_id]) - {kpi_id}
+            if upstream:
+                for calculation in await self.calculate_multiple_kpis(
+                    list(upstream), time_range, calculation_period
+                ):
+                    kpi_inputs[calculation.kpi_id] = calculation.calculated_value
             
             # Get source metrics
             source_metrics = await self.unified_metrics.aggregate_metrics(
-                kpi_def.source_metrics,
+                self.kpi_graph.metric_inputs(kpi_id),
                 time_range
             )
             
-            # Prepare source data
-            source_data = {}
-            for metric in source_metrics:
-                source_data[metric.metric_id] = metric.aggregated_value
-            
-            # Calculate KPI value
-            calculated_value = await self._execute_calculation(
-                kpi_def.calculation_method,
-                source_data,
-                kpi_def.calculation_formula
-            )
-            
-            # Determine status
-            status = self._determine_kpi_status(calculated_value, kpi_def)
-            
-            # Calculate trend
-            trend = await self._calculate_kpi_trend(kpi_id, calculated_value, time_range)
-            
-            # Compare to target
-            target_comparison = await self._compare_to_target(kpi_id, calculated_value)
-            
-            # Calculate confidence level
-            confidence_level = self._calculate_confidence_level(source_metrics)
-            
-            # Create KPI calculation
-            kpi_calculation = KPICalculation(
-                calculation_id=str(uuid.uuid4()),
-                kpi_id=kpi_id,
-                calculated_value=calculated_value,
-                calculation_time=datetime.now(timezone.utc),
-                calculation_period=calculation_period,
-                source_data=source_data,
-                status=status,
-                trend=trend,
-                target_comparison=target_comparison,
-                confidence_level=confidence_level,
-                metadata={
-                    "time_range": {
-                        "start": time_range[0].isoformat(),
-                        "end": time_range[1].isoformat()
-                    },
-                    "source_metrics": [m.metric_id for m in source_metrics]
-                }
-            )
-            
-            # Store in history
-            if kpi_id not in self.calculation_history:
-                self.calculation_history[kpi_id] = []
-            
-            self.calculation_history[kpi_id].append(kpi_calculation)
-            
-            # Limit history size
-            if len(self.calculation_history[kpi_id]) > self.max_history_size:
-                self.calculation_history[kpi_id] = self.calculation_history[kpi_id][-self.max_history_size:]
-            
-            # Cache the calculation
-            await self.cache.set(
-                f"kpi_calc:{kpi_id}",
-                kpi_calculation.to_dict(),
-                ttl=self.cache_ttl
+            start = time.perf_counter()
+            calculation = await self._build_kpi_calculation(
+                kpi_def, source_metrics, time_range, calculation_period, kpi_inputs
             )
-            
-            return kpi_calculation
+            self._record_recompute(start)
+            self._memo_store(kpi_id, time_range, calculation_period, version, data_time, calculation)
+            return calculation
             
         except Exception as e:
             self.logger.error(f"Error calculating KPI: {str(e)}")
             raise
     
+    async def _build_kpi_calculation(
+        self,
+        kpi_def: KPIDefinition,
+        source_metrics: List[AggregatedMetric],
+        time_range: Tuple[datetime, datetime],
+        calculation_period: str,
+        kpi_inputs: Optional[Dict[str, float]] = None
+    ) -> KPICalculation:
+        """Evaluate a KPI from aggregated source metrics (and upstream KPI values) and record it"""
+        kpi_id = kpi_def.kpi_id
+        
+        # Prepare source data
+        source_data = {}
+        for metric in source_metrics:
+            source_data[metric.metric_id] = metric.aggregated_value
+        source_data.update(kpi_inputs or {})
+        
+        # Calculate KPI value
+        calculated_value = await self._compute_kpi_value(kpi_def, source_data)
+        
+        # Determine status
+        status = self._determine_kpi_status(calculated_value, kpi_def)
+        
+        # Calculate trend
+        trend = await self._calculate_kpi_trend(kpi_id, calculated_value, time_range)
+        
+        # Compare to target
+        target_comparison = await self._compare_to_target(kpi_id, calculated_value)
+        
+        # Calculate confidence level
+        confidence_level = self._calculate_confidence_level(source_metrics)
+        
+        # Create KPI calculation
+        kpi_calculation = KPICalculation(
+            calculation_id=str(uuid.uuid4()),
+            kpi_id=kpi_id,
+            calculated_value=calculated_value,
+            calculation_time=datetime.now(timezone.utc),
+            calculation_period=calculation_period,
+            source_data=source_data,
+            status=status,
+            trend=trend,
+            target_comparison=target_comparison,
+            confidence_level=confidence_level,
+            metadata={
+                "time_range": {
+                    "start": time_range[0].isoformat(),
+                    "end": time_range[1].isoformat()
+                },
+                "source_metrics": [m.metric_id for m in source_metrics]
+            }
+        )
+        
+        # Store in history
+        if kpi_id not in self.calculation_history:
+            self.calculation_history[kpi_id] = []
+        
+        self.calculation_history[kpi_id].append(kpi_calculation)
+        
+        # Limit history size
+        if len(self.calculation_history[kpi_id]) > self.max_history_size:
+            self.calculation_history[kpi_id] = self.calculation_history[kpi_id][-self.max_history_size:]
+        
+        # Cache the calculation
+        await self.cache.aset(
+            f"kpi_calc:{kpi_id}",
+            kpi_calculation.to_dict(),
+            ttl=self.cache_ttl
+        )
+        
+        return kpi_calculation
+    
     async def calculate_multiple_kpis(
         self,
         kpi_ids: List[str],
         time_range: Tuple[datetime, datetime],
-        calculation_period: str = "current"
+        calculation_period: str = "current",
+        use_memo: bool = True
     ) -> List[KPICalculation]:
-        """Calculate multiple KPIs"""
+        """
+        Calculate multiple KPIs.
+        
+        KPIs with a memoized result for the same period and time range whose
+        inputs have no newer data are served from the memo; the rest are
+        recomputed in dependency order with their source metrics aggregated once.
+        """
         try:
-            calculations = []
-            
+            requested = []
             for kpi_id in kpi_ids:
-                try:
-                    calculation = await self.calculate_kpi(kpi_id, time_range, calculation_period)
-                    calculations.append(calculation)
-                except Exception as e:
-                    self.logger.error(f"Error calculating KPI {kpi_id}: {str(e)}")
-                    continue
+                if kpi_id in self.kpi_definitions:
+                    requested.append(kpi_id)
+                else:
+                    self.logger.error(f"Error calculating KPI {kpi_id}: KPI definition not found")
+            
+            results: Dict[str, KPICalculation] = {}
+            stale = []
+            for kpi_id in self.kpi_graph.topological_order(self.kpi_graph.upstream_kpis(requested)):
+                memoized = self._memo_lookup(kpi_id, time_range, calculation_period) if use_memo else None
+                if memoized is not None:
+                    results[kpi_id] = memoized
+                    self.incremental_stats["memo_hits"] += 1
+                else:
+                    stale.append(kpi_id)
+            
+            if stale:
+                metric_ids = list(dict.fromkeys(
+                    metric_id for kpi_id in stale for metric_id in self.kpi_graph.metric_inputs(kpi_id)
+                ))
+                aggregated = await self.unified_metrics.aggregate_metrics(metric_ids, time_range) if metric_ids else []
+                metrics_by_id = {metric.metric_id: metric for metric in aggregated}
+                
+                for kpi_id in stale:
+                    kpi_def = self.kpi_definitions[kpi_id]
+                    try:
+                        version = self.kpi_graph.version(kpi_id)
+                        data_time = self._input_data_time(kpi_id)
+                        start = time.perf_counter()
+                        source_metrics = [
+                            metrics_by_id[metric_id] for metric_id in kpi_def.source_metrics
+                            if metric_id in metrics_by_id
+                        ]
+                        kpi_inputs = {
+                            node: results[node].calculated_value
+                            for node in self.kpi_graph.inputs(kpi_id) if node in results
+                        }
+                        calculation = await self._build_kpi_calculation(
+                            kpi_def, source_metrics, time_range, calculation_period, kpi_inputs
+                        )
+                        self._record_recompute(start)
+                        self._memo_store(kpi_id, time_range, calculation_period, version, data_time, calculation)
+                        results[kpi_id] = calculation
+                    except Exception as e:
+                        self.logger.error(f"Error calculating KPI {kpi_id}: {str(e)}")
+                        continue
             
+            calculations = [results[kpi_id] for kpi_id in requested if kpi_id in results]
             return calculations
             
         except Exception as e:
@@ -969,6 +1084,189 @@ class KPICalculator:
             self.logger.error(f"Error comparing KPIs: {str(e)}")
             raise
     
+    async def evaluate_kpi_batch(
+        self,
+        kpi_id: str,
+        inputs: Union[Dict[str, List[float]], List[Dict[str, Any]]]
+    ) -> np.ndarray:
+        """
+        Evaluate a KPI for many tenants or time buckets in one call.
+        
+        Args:
+            kpi_id: KPI to evaluate
+            inputs: Metric columns ({metric_id: [values...]}) or one source-data mapping per row
+            
+        Returns:
+            np.ndarray: One KPI value per row
+        """
+        if kpi_id not in self.kpi_definitions:
+            raise ValueError(f"KPI definition not found: {kpi_id}")
+        
+        kpi_def = self.kpi_definitions[kpi_id]
+        compiled = self.compiled_formulas.get(kpi_id)
+        
+        if compiled is not None:
+            if isinstance(inputs, dict):
+                result = compiled.evaluate(inputs)
+                return np.atleast_1d(result)
+            return compiled.evaluate_rows(inputs)
+        
+        # Custom calculators are not vectorized; evaluate row by row
+        if isinstance(inputs, dict):
+            row_count = max((len(values) for values in inputs.values()), default=0)
+            inputs = [
+                {metric_id: values[index] for metric_id, values in inputs.items()}
+                for index in range(row_count)
+            ]
+        return np.array([
+            await self._execute_calculation(kpi_def.calculation_method, row, kpi_def.calculation_formula)
+            for row in inputs
+        ], dtype=float)
+    
+    async def calculate_kpi_for_dimensions(
+        self,
+        kpi_id: str,
+        time_range: Tuple[datetime, datetime],
+        dimension_sets: List[Dict[str, str]]
+    ) -> List[float]:
+        """Calculate a KPI value per dimension set (e.g. one per tenant) with a single evaluation"""
+        if kpi_id not in self.kpi_definitions:
+            raise ValueError(f"KPI definition not found: {kpi_id}")
+        
+        kpi_def = self.kpi_definitions[kpi_id]
+        rows = []
+        for dimensions in dimension_sets:
+            metrics = await self.unified_metrics.aggregate_metrics(
+                kpi_def.source_metrics,
+                time_range,
+                dimensions=dimensions
+            )
+            rows.append({metric.metric_id: metric.aggregated_value for metric in metrics})
+        
+        if not rows:
+            return []
+        return (await self.evaluate_kpi_batch(kpi_id, rows)).tolist()
+    
+    def _memo_key(
+        self,
+        kpi_id: str,
+        time_range: Tuple[datetime, datetime],
+        calculation_period: str
+    ) -> Tuple[str, str, datetime, datetime]:
+        return kpi_id, calculation_period, time_range[0], time_range[1]
+    
+    def _input_data_time(self, kpi_id: str) -> Optional[datetime]:
+        """Latest data timestamp across the metrics a KPI reads, directly or via upstream KPIs"""
+        metric_ids = {
+            metric_id
+            for node in self.kpi_graph.upstream_kpis([kpi_id])
+            for metric_id in self.kpi_graph.metric_inputs(node)
+        }
+        times = [self.metric_data_times[metric_id] for metric_id in metric_ids if metric_id in self.metric_data_times]
+        get_latest_data_time = getattr(self.unified_metrics, "get_latest_data_time", None)
+        if get_latest_data_time is not None:
+            latest = get_latest_data_time(metric_ids)
+            if latest is not None:
+                times.append(latest)
+        return max(times) if times else None
+    
+    def _note_metric_data(self, metric_ids: List[str], data_time: datetime):
+        for metric_id in metric_ids:
+            current = self.metric_data_times.get(metric_id)
+            if current is None or data_time > current:
+                self.metric_data_times[metric_id] = data_time
+    
+    def _memo_lookup(
+        self,
+        kpi_id: str,
+        time_range: Tuple[datetime, datetime],
+        calculation_period: str
+    ) -> Optional[KPICalculation]:
+        """Memoized calculation if no input has newer data than the memoized result saw"""
+        entry = self.kpi_memo.get(self._memo_key(kpi_id, time_range, calculation_period))
+        if entry is None:
+            return None
+        version, data_time, calculation = entry
+        if version != self.kpi_graph.version(kpi_id):
+            return None
+        if self._input_data_time(kpi_id) != data_time:
+            return None
+        return calculation
+    
+    def _memo_store(
+        self,
+        kpi_id: str,
+        time_range: Tuple[datetime, datetime],
+        calculation_period: str,
+        version: int,
+        data_time: Optional[datetime],
+        calculation: KPICalculation
+    ):
+        key = self._memo_key(kpi_id, time_range, calculation_period)
+        self.kpi_memo.pop(key, None)
+        self.kpi_memo[key] = (version, data_time, calculation)
+        while len(self.kpi_memo) > self.max_memo_entries:
+            self.kpi_memo.pop(next(iter(self.kpi_memo)))
+    
+    def _record_recompute(self, start: float):
+        self.incremental_stats["recomputes"] += 1
+        self.incremental_stats["recompute_time_ms"] += (time.perf_counter() - start) * 1000
+    
+    def invalidate_metrics(self, metric_ids: List[str]) -> List[str]:
+        """Mark KPIs depending on changed metrics (directly or via composites) dirty"""
+        affected = self.kpi_graph.mark_dirty(metric_ids)
+        self.incremental_stats["kpis_invalidated"] += len(affected)
+        return self.kpi_graph.topological_order(affected)
+    
+    def get_incremental_stats(self) -> Dict[str, Any]:
+        """Recompute / memo counters for incremental KPI calculation"""
+        stats = dict(self.incremental_stats)
+        recomputes = stats["recomputes"]
+        lookups = recomputes + stats["memo_hits"]
+        stats["avg_recompute_ms"] = stats["recompute_time_ms"] / recomputes if recomputes else 0.0
+        stats["memo_hit_rate"] = stats["memo_hits"] / lookups if lookups else 0.0
+        stats["memo_entries"] = len(self.kpi_memo)
+        return stats
+    
+    def _uses_compiled_formula(self, kpi_def: KPIDefinition) -> bool:
+        """Whether the KPI is evaluated from its formula rather than a custom calculator"""
+        return (
+            kpi_def.calculation_method in FORMULA_METHODS
+            or kpi_def.calculation_method not in self.kpi_calculators
+        )
+    
+    def _compile_kpi(self, kpi_def: KPIDefinition) -> Optional[CompiledFormula]:
+        """Compile a formula-evaluated KPI; raises FormulaError on invalid syntax or undeclared metrics"""
+        if not self._uses_compiled_formula(kpi_def):
+            self.compiled_formulas.pop(kpi_def.kpi_id, None)
+            return None
+        
+        compiled = compile_formula(kpi_def.calculation_formula)
+        missing = compiled.missing_metrics(kpi_def.source_metrics)
+        if missing:
+            raise FormulaError(
+                f"KPI {kpi_def.kpi_id} formula references undeclared metrics: {', '.join(missing)}"
+            )
+        
+        self.compiled_formulas[kpi_def.kpi_id] = compiled
+        return compiled
+    
+    async def _compute_kpi_value(self, kpi_def: KPIDefinition, source_data: Dict[str, Any]) -> float:
+        """Compute a KPI value via its compiled formula or custom calculator"""
+        compiled = self.compiled_formulas.get(kpi_def.kpi_id)
+        if compiled is None:
+            return await self._execute_calculation(
+                kpi_def.calculation_method,
+                source_data,
+                kpi_def.calculation_formula
+            )
+        
+        try:
+            return compiled.evaluate_scalar(source_data)
+        except Exception as e:
+            self.logger.error(f"Error evaluating formula for {kpi_def.kpi_id}: {str(e)}")
+            return 0.0
+    
     async def _execute_calculation(
         self,
         calculation_method: str,
@@ -1433,19 +1731,9 @@ class KPICalculator:
             return 0.0
     
     def _evaluate_formula(self, source_data: Dict[str, Any], formula: str) -> float:
-        """Evaluate simple formula"""
+        """Evaluate a formula with the safe compiler (compiled forms are cached)"""
         try:
-            # Simple formula evaluation (security risk - use with caution)
-            # Replace metric names with values
-            evaluated_formula = formula
-            for metric_name, value in source_data.items():
-                evaluated_formula = evaluated_formula.replace(metric_name, str(value))
-            
-            # Basic mathematical evaluation
-            try:
-                return float(eval(evaluated_formula))
-            except:
-                return 0.0
+            return compile_formula(formula).evaluate_scalar(source_data)
                 
         except Exception as e:
             self.logger.error(f"Error evaluating formula: {str(e)}")
@@ -1741,16 +2029,15 @@ class KPICalculator:
             try:
                 await asyncio.sleep(self.calculation_interval)
                 
-                # Calculate all KPIs
+                # Refresh KPIs; unchanged ones with a recent result are served from the memo
                 end_time = datetime.now(timezone.utc)
                 start_time = end_time - timedelta(hours=1)
                 
-                for kpi_id in self.kpi_definitions.keys():
-                    try:
-                        await self.calculate_kpi(kpi_id, (start_time, end_time), "periodic")
-                    except Exception as e:
-                        self.logger.error(f"Error in periodic calculation for {kpi_id}: {str(e)}")
-                        continue
+                await self.calculate_multiple_kpis(
+                    list(self.kpi_definitions.keys()),
+                    (start_time, end_time),
+                    "periodic"
+                )
                 
             except Exception as e:
                 self.logger.error(f"Error in periodic calculation: {str(e)}")
@@ -1793,24 +2080,30 @@ class KPICalculator:
     async def _handle_metrics_updated(self, event_data: Dict[str, Any]):
         """Handle metrics updated event"""
         try:
-            # Trigger relevant KPI calculations
-            metric_id = event_data.get("metric_id")
+            metric_ids = list(event_data.get("metric_ids") or [])
+            if event_data.get("metric_id"):
+                metric_ids.append(event_data["metric_id"])
+            self.incremental_stats["metric_events"] += 1
             
-            # Find KPIs that use this metric
-            relevant_kpis = [
-                kpi_id for kpi_id, kpi_def in self.kpi_definitions.items()
-                if metric_id in kpi_def.source_metrics
-            ]
+            data_time = event_data.get("timestamp") or datetime.now(timezone.utc)
+            if isinstance(data_time, str):
+                data_time = datetime.fromisoformat(data_time)
+            self._note_metric_data(metric_ids, data_time)
+            
+            # Invalidate only KPIs reachable from the changed metrics
+            affected_kpis = self.invalidate_metrics(metric_ids)
+            if not affected_kpis:
+                return
             
-            # Trigger calculation for relevant KPIs
+            # Recompute them (composites after their inputs); the rest stay memoized
             end_time = datetime.now(timezone.utc)
             start_time = end_time - timedelta(hours=1)
             
-            for kpi_id in relevant_kpis:
-                try:
-                    await self.calculate_kpi(kpi_id, (start_time, end_time), "metric_updated")
-                except Exception as e:
-                    self.logger.error(f"Error calculating KPI {kpi_id} after metric update: {str(e)}")
+            await self.calculate_multiple_kpis(
+                affected_kpis,
+                (start_time, end_time),
+                "metric_updated"
+            )
             
         except Exception as e:
             self.logger.error(f"Error handling metrics updated event: {str(e)}")
@@ -1867,7 +2160,7 @@ class KPICalculator:
             
             # Cache milestone progress
             cache_key = f"milestone_progress:{tenant_id}:{achievement_details.get('milestone')}"
-            await self.cache.set(cache_key, milestone_data, ttl=86400)  # 24 hours
+            await self.cache.aset(cache_key, milestone_data, ttl=86400)  # 24 hours
             
             # Store in calculation history for trend analysis
             milestone_key = f"milestone_progress_{achievement_details.get('milestone')}"
@@ -1918,7 +2211,7 @@ class KPICalculator:
             
             # Cache eligibility data
             cache_key = f"grant_eligibility:{tenant_id}:{milestone}"
-            await self.cache.set(cache_key, eligibility_data, ttl=3600)  # 1 hour
+            await self.cache.aset(cache_key, eligibility_data, ttl=3600)  # 1 hour
             
             # Emit grant eligibility event for downstream processing
             await self.event_bus.emit("grant_eligibility_updated", {
@@ -2395,7 +2688,7 @@ class KPICalculator:
             for kpi_id in milestone_kpis:
                 # Get latest calculation from cache
                 cache_key = f"kpi_calc:{kpi_id}"
-                kpi_data = await self.cache.get(cache_key)
+                kpi_data = await self.cache.aget(cache_key)
                 
                 if kpi_data:
                     milestone_key = kpi_id.replace("firs_", "").replace("_progress", "")
@@ -3156,6 +3449,7 @@ class KPICalculator:
                     "event_bus": {"status": "healthy"}
                 },
                 "metrics": {
+                    "incremental": self.get_incremental_stats(),
                     "total_kpis": len(self.kpi_definitions),
                     "total_targets": sum(len(targets) for targets in self.kpi_targets.values()),
                     "calculation_history": len(self.calculation_history)
@@ -3179,6 +3473,7 @@ class KPICalculator:
         try:
             # Clear caches
             self.calculation_history.clear()
+            self.kpi_memo.clear()
             self.kpi_targets.clear()
             
             # Cleanup dependencies
@@ -0,0 +1,355 @@
+"""
+Hybrid Service: KPI Formula Compiler
+Compiles KPI calculation formulas into safe, vectorized evaluators
+
+Formulas are parsed once into a Python AST, checked against a whitelist of
+node types and functions, and turned into a tree of NumPy operations over
+named inputs. Inputs may be scalars or equal-length arrays, so a single call
+evaluates a KPI for every tenant or time bucket at once. Nothing is passed to
+eval() and metric names are resolved as identifiers, never substituted as text.
+
+Supported syntax (the KPI definition dialect):
+- arithmetic: + - * / % ** and parentheses
+- comparisons: < <= > >= == != and `=` as equality
+- logic: AND / OR / NOT (or and / or / not), true / false
+- conditionals: `cond ? a : b`
+- functions: see FORMULA_FUNCTIONS
+
+Division by zero yields 0 (like the hand-written calculators) and metrics
+missing from the inputs evaluate as 0.
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+
+class FormulaError(ValueError):
+    """Raised when a KPI formula cannot be compiled or references unknown metrics"""
+
+
+def _safe_divide(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    nonzero = denominator != 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(nonzero, numerator / np.where(nonzero, denominator, 1.0), 0.0)
+
+
+def _safe_mod(left, right):
+    left = np.asarray(left, dtype=float)
+    right = np.asarray(right, dtype=float)
+    nonzero = right != 0
+    return np.where(nonzero, np.mod(left, np.where(nonzero, right, 1.0)), 0.0)
+
+
+def _mean(*values):
+    return np.mean(np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in values)), axis=0)
+
+
+def _satisfaction_index(ratings, response_times, error_rates):
+    # Same weighting as KPICalculator._calculate_satisfaction_index
+    response_factor = np.maximum(0.0, 1 - np.asarray(response_times, dtype=float) / 1000)
+    error_factor = np.maximum(0.0, 1 - np.asarray(error_rates, dtype=float) / 100)
+    index = np.asarray(ratings, dtype=float) * 0.6 + response_factor * 0.2 + error_factor * 0.2
+    return np.clip(index, 0.0, 5.0)
+
+
+FORMULA_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "abs": np.abs,
+    "min": lambda *values: np.minimum.reduce(np.broadcast_arrays(*values)),
+    "max": lambda *values: np.maximum.reduce(np.broadcast_arrays(*values)),
+    "round": lambda value, digits=0: np.round(value, int(digits)),
+    "sqrt": lambda value: np.sqrt(np.maximum(value, 0.0)),
+    "clamp": lambda value, low, high: np.clip(value, low, high),
+    "avg": _mean,
+    "weighted_average": _mean,
+    "satisfaction_index": _satisfaction_index,
+}
+
+_BINARY_OPS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: _safe_divide,
+    ast.Mod: _safe_mod,
+    ast.Pow: np.power,
+}
+
+_UNARY_OPS: Dict[type, Callable[[Any], Any]] = {
+    ast.USub: np.negative,
+    ast.UAdd: np.positive,
+    ast.Not: np.logical_not,
+}
+
+_COMPARE_OPS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+_KEYWORDS = [
+    (re.compile(r"\bAND\b"), "and"),
+    (re.compile(r"\bOR\b"), "or"),
+    (re.compile(r"\bNOT\b"), "not"),
+    (re.compile(r"\btrue\b", re.IGNORECASE), "True"),
+    (re.compile(r"\bfalse\b", re.IGNORECASE), "False"),
+    (re.compile(r"(?<![<>=!])=(?!=)"), "=="),
+]
+
+Evaluator = Callable[[Mapping[str, Any]], Any]
+
+
+def _split_top_level(text: str, separator: str) -> List[str]:
+    parts, depth, start = [], 0, 0
+    for index, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _convert_ternary(text: str) -> str:
+    """Rewrite `cond ? a : b` (right-associative, at any nesting) as `(a) if (cond) else (b)`"""
+
+    # Convert parenthesized groups first (innermost out)
+    out, index = [], 0
+    while index < len(text):
+        char = text[index]
+        if char != "(":
+            out.append(char)
+            index += 1
+            continue
+        depth, end = 0, index
+        while end < len(text):
+            if text[end] == "(":
+                depth += 1
+            elif text[end] == ")":
+                depth -= 1
+                if depth == 0:
+                    break
+            end += 1
+        if depth != 0:
+            raise FormulaError(f"Unbalanced parentheses in formula: {text}")
+        inner = ", ".join(_convert_ternary(part) for part in _split_top_level(text[index + 1:end], ","))
+        out.append(f"({inner})")
+        index = end + 1
+    text = "".join(out)
+
+    question = _find_top_level(text, "?")
+    if question < 0:
+        return text
+    # Matching ':' is the first top-level one not claimed by a nested '?'
+    pending, colon = 0, -1
+    depth = 0
+    for index in range(question + 1, len(text)):
+        char = text[index]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and char == "?":
+            pending += 1
+        elif depth == 0 and char == ":":
+            if pending == 0:
+                colon = index
+                break
+            pending -= 1
+    if colon < 0:
+        raise FormulaError(f"Conditional without ':' in formula: {text}")
+
+    condition = text[:question].strip()
+    when_true = _convert_ternary(text[question + 1:colon].strip())
+    when_false = _convert_ternary(text[colon + 1:].strip())
+    return f"({when_true}) if ({condition}) else ({when_false})"
+
+
+def _find_top_level(text: str, target: str) -> int:
+    depth = 0
+    for index, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == target and depth == 0:
+            return index
+    return -1
+
+
+def _to_python_expression(formula: str) -> str:
+    expression = _convert_ternary(formula.strip())
+    for pattern, replacement in _KEYWORDS:
+        expression = pattern.sub(replacement, expression)
+    return expression
+
+
+class _Compiler:
+    """Turns a validated AST into nested closures over NumPy operations"""
+
+    def __init__(self, functions: Mapping[str, Callable[..., Any]]):
+        self.functions = functions
+        self.variables: set = set()
+        self.called: set = set()
+
+    def compile(self, node: ast.AST) -> Evaluator:
+        handler = getattr(self, f"_compile_{type(node).__name__}", None)
+        if handler is None:
+            raise FormulaError(f"Unsupported expression: {type(node).__name__}")
+        return handler(node)
+
+    def _compile_Expression(self, node: ast.Expression) -> Evaluator:
+        return self.compile(node.body)
+
+    def _compile_Constant(self, node: ast.Constant) -> Evaluator:
+        if not isinstance(node.value, (int, float)):  # bool is an int subclass
+            raise FormulaError(f"Unsupported constant: {node.value!r}")
+        value = float(node.value)
+        return lambda env: value
+
+    def _compile_Name(self, node: ast.Name) -> Evaluator:
+        name = node.id
+        self.variables.add(name)
+        return lambda env: env[name]
+
+    def _compile_BinOp(self, node: ast.BinOp) -> Evaluator:
+        op = _BINARY_OPS.get(type(node.op))
+        if op is None:
+            raise FormulaError(f"Unsupported operator: {type(node.op).__name__}")
+        left, right = self.compile(node.left), self.compile(node.right)
+        return lambda env: op(left(env), right(env))
+
+    def _compile_UnaryOp(self, node: ast.UnaryOp) -> Evaluator:
+        op = _UNARY_OPS.get(type(node.op))
+        if op is None:
+            raise FormulaError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = self.compile(node.operand)
+        return lambda env: op(operand(env))
+
+    def _compile_BoolOp(self, node: ast.BoolOp) -> Evaluator:
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        values = [self.compile(value) for value in node.values]
+
+        def evaluate(env):
+            result = values[0](env)
+            for value in values[1:]:
+                result = combine(result, value(env))
+            return result
+        return evaluate
+
+    def _compile_Compare(self, node: ast.Compare) -> Evaluator:
+        operands = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+        ops = []
+        for op in node.ops:
+            compare = _COMPARE_OPS.get(type(op))
+            if compare is None:
+                raise FormulaError(f"Unsupported comparison: {type(op).__name__}")
+            ops.append(compare)
+
+        def evaluate(env):
+            values = [operand(env) for operand in operands]
+            result = ops[0](values[0], values[1])
+            for index in range(1, len(ops)):
+                result = np.logical_and(result, ops[index](values[index], values[index + 1]))
+            return result
+        return evaluate
+
+    def _compile_IfExp(self, node: ast.IfExp) -> Evaluator:
+        test, body, orelse = self.compile(node.test), self.compile(node.body), self.compile(node.orelse)
+        return lambda env: np.where(test(env), body(env), orelse(env))
+
+    def _compile_Call(self, node: ast.Call) -> Evaluator:
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise FormulaError("Only positional calls to named functions are allowed")
+        function = self.functions.get(node.func.id)
+        if function is None:
+            raise FormulaError(f"Unknown formula function: {node.func.id}")
+        self.called.add(node.func.id)
+        args = [self.compile(arg) for arg in node.args]
+        return lambda env: function(*(arg(env) for arg in args))
+
+
+@dataclass(frozen=True)
+class CompiledFormula:
+    """A parsed KPI formula evaluable over scalar or array inputs"""
+    source: str
+    expression: str
+    variables: FrozenSet[str]
+    functions: FrozenSet[str]
+    _evaluator: Evaluator = field(repr=False, compare=False)
+
+    def missing_metrics(self, available: Iterable[str]) -> List[str]:
+        """Referenced metrics not contained in available"""
+        return sorted(self.variables - set(available))
+
+    def evaluate(self, inputs: Mapping[str, Any]) -> np.ndarray:
+        """
+        Evaluate with scalar or equal-length array inputs (broadcast like NumPy).
+
+        Returns a 0-d array for scalar inputs, otherwise one value per row.
+        """
+        env = {}
+        for name in self.variables:
+            value = inputs.get(name, 0.0)
+            env[name] = np.asarray(0.0 if value is None else value, dtype=float)
+        return np.asarray(self._evaluator(env), dtype=float)
+
+    def evaluate_scalar(self, inputs: Mapping[str, Any]) -> float:
+        return float(self.evaluate(inputs))
+
+    def evaluate_rows(self, rows: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """Evaluate once for a sequence of input mappings (e.g. one per tenant)"""
+        columns = {
+            name: np.fromiter(
+                (float(row.get(name) or 0.0) for row in rows), dtype=float, count=len(rows)
+            )
+            for name in self.variables
+        }
+        result = self.evaluate(columns)
+        return np.broadcast_to(result, (len(rows),)).copy() if result.ndim == 0 else result
+
+
+def compile_formula(
+    formula: str,
+    functions: Mapping[str, Callable[..., Any]] = None
+) -> CompiledFormula:
+    """Compile a KPI formula; raises FormulaError on unsupported syntax or functions"""
+    if functions is None:
+        return _compile_cached(formula)
+    return _compile(formula, functions)
+
+
+@lru_cache(maxsize=512)
+def _compile_cached(formula: str) -> CompiledFormula:
+    return _compile(formula, FORMULA_FUNCTIONS)
+
+
+def _compile(formula: str, functions: Mapping[str, Callable[..., Any]]) -> CompiledFormula:
+    if not formula or not formula.strip():
+        raise FormulaError("Empty formula")
+    expression = _to_python_expression(formula)
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise FormulaError(f"Invalid formula '{formula}': {e.msg}") from e
+
+    compiler = _Compiler(functions)
+    evaluator = compiler.compile(tree)
+    return CompiledFormula(
+        source=formula,
+        expression=expression,
+        variables=frozenset(compiler.variables),
+        functions=frozenset(compiler.called),
+        _evaluator=evaluator
+    )
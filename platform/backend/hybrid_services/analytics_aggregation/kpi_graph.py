@@ -0,0 +1,116 @@
+"""
+Hybrid Service: KPI Dependency Graph
+Tracks metric -> KPI -> composite KPI dependencies for incremental recomputation
+
+Each KPI node lists its inputs (source metrics or other KPIs). An input that
+names a registered KPI makes the KPI a composite of it. Every KPI carries a
+version that is bumped whenever one of its transitive inputs changes, so a
+memoized result is current exactly when it was computed at the KPI's current
+version (a dirty flag that works independently for every memoized window).
+"""
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+
+class KPIDependencyGraph:
+    """Dependency DAG between metrics and KPIs with version-based dirty tracking"""
+
+    def __init__(self):
+        self._inputs: Dict[str, FrozenSet[str]] = {}
+        self._dependents: Dict[str, Set[str]] = defaultdict(set)
+        self._versions: Dict[str, int] = {}
+
+    def set_kpi(self, kpi_id: str, inputs: Iterable[str]) -> None:
+        """Add or replace a KPI node; raises ValueError if it would create a cycle"""
+        inputs = frozenset(inputs)
+        downstream = self.downstream([kpi_id]) | {kpi_id}
+        cycle = inputs & downstream
+        if cycle:
+            raise ValueError(f"KPI {kpi_id} would depend on itself via: {', '.join(sorted(cycle))}")
+
+        self._unlink(kpi_id)
+        self._inputs[kpi_id] = inputs
+        for node in inputs:
+            self._dependents[node].add(kpi_id)
+        self.mark_dirty([kpi_id])
+
+    def remove_kpi(self, kpi_id: str) -> None:
+        self.mark_dirty([kpi_id])
+        self._unlink(kpi_id)
+        self._inputs.pop(kpi_id, None)
+        self._versions.pop(kpi_id, None)
+
+    def _unlink(self, kpi_id: str) -> None:
+        for node in self._inputs.get(kpi_id, ()):
+            dependents = self._dependents.get(node)
+            if dependents is not None:
+                dependents.discard(kpi_id)
+                if not dependents:
+                    del self._dependents[node]
+
+    def is_kpi(self, node: str) -> bool:
+        return node in self._inputs
+
+    def inputs(self, kpi_id: str) -> FrozenSet[str]:
+        return self._inputs.get(kpi_id, frozenset())
+
+    def metric_inputs(self, kpi_id: str) -> List[str]:
+        """Inputs that are plain metrics (not other KPIs)"""
+        return [node for node in self._inputs.get(kpi_id, ()) if node not in self._inputs]
+
+    def downstream(self, nodes: Iterable[str]) -> Set[str]:
+        """KPIs that transitively depend on any of nodes (nodes themselves excluded)"""
+        affected: Set[str] = set()
+        stack = list(nodes)
+        while stack:
+            for dependent in self._dependents.get(stack.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    stack.append(dependent)
+        return affected
+
+    def upstream_kpis(self, kpi_ids: Iterable[str]) -> Set[str]:
+        """The given KPIs plus every KPI they transitively consume"""
+        required: Set[str] = set()
+        stack = [kpi_id for kpi_id in kpi_ids if kpi_id in self._inputs]
+        while stack:
+            kpi_id = stack.pop()
+            if kpi_id in required:
+                continue
+            required.add(kpi_id)
+            stack.extend(node for node in self._inputs[kpi_id] if node in self._inputs)
+        return required
+
+    def topological_order(self, kpi_ids: Iterable[str]) -> List[str]:
+        """Order KPIs so that every KPI comes after the KPIs it consumes"""
+        pending = set(kpi_ids)
+        ordered: List[str] = []
+        visited: Set[str] = set()
+
+        def visit(kpi_id: str) -> None:
+            if kpi_id in visited:
+                return
+            visited.add(kpi_id)
+            for node in sorted(self._inputs.get(kpi_id, ())):
+                if node in pending:
+                    visit(node)
+            ordered.append(kpi_id)
+
+        for kpi_id in sorted(pending):
+            visit(kpi_id)
+        return ordered
+
+    def mark_dirty(self, nodes: Iterable[str]) -> Set[str]:
+        """Invalidate KPIs affected by changed metrics or KPIs; returns the affected KPIs"""
+        nodes = list(nodes)
+        affected = self.downstream(nodes) | {node for node in nodes if node in self._inputs}
+        for kpi_id in affected:
+            self._versions[kpi_id] = self._versions.get(kpi_id, 0) + 1
+        return affected
+
+    def version(self, kpi_id: str) -> int:
+        return self._versions.get(kpi_id, 0)
+
+    def __len__(self) -> int:
+        return len(self._inputs)
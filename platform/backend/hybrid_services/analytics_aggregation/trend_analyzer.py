@@ -12,8 +12,8 @@ from enum import Enum
 import uuid
 import statistics
 import math
+from collections import OrderedDict
 import numpy as np
-from scipy import stats
 
 from core_platform.data_management.database_init import get_db_session
 from core_platform.models.trends import TrendAnalysis, TrendPattern, TrendPrediction, TrendAlert
@@ -24,9 +24,17 @@ from core_platform.notifications import NotificationService
 
 from .unified_metrics import UnifiedMetrics, MetricScope, MetricType, AggregatedMetric
 from .kpi_calculator import KPICalculator, KPICalculation
+from .trend_online import OnlineSeriesStats, scipy_stats
 
 logger = logging.getLogger(__name__)
 
+# Bucket width per trend granularity (mirrors UnifiedMetrics time buckets)
+GRANULARITY_DELTAS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
 
 class TrendDirection(str, Enum):
     """Trend direction"""
@@ -219,6 +227,20 @@ class TrendAnalyzer:
         self.correlation_threshold = 0.7
         self.r_squared_threshold = 0.5
         self.volatility_threshold = 0.2
+        
+        # Online series statistics: one sliding window per (metric, granularity,
+        # window length), advanced by the buckets completed since the last request
+        self.series_stats: "OrderedDict[Tuple[str, str, int], OnlineSeriesStats]" = OrderedDict()
+        self.max_series = 256
+        self.ewma_alpha = 0.1
+        self.anomaly_z_threshold = 2.5
+        self.online_stats = {
+            "online_analyses": 0,
+            "refits": 0,
+            "series_builds": 0,
+            "points_ingested": 0,
+            "points_evicted": 0
+        }
     
     async def initialize(self):
         """Initialize the trend analyzer service"""
@@ -250,32 +272,37 @@ class TrendAnalyzer:
         self,
         metric_id: str,
         time_range: Tuple[datetime, datetime],
-        granularity: str = "hour"
+        granularity: str = "hour",
+        refit: bool = False
     ) -> TrendAnalysis:
-        """Analyze trend for a specific metric"""
+        """
+        Analyze trend for a specific metric
+        
+        Served from the metric's online series statistics, which only ingest the
+        buckets completed since the previous request. refit=True fetches the
+        whole window and refits every detector from scratch.
+        """
         try:
-            # Get metric data
-            metric_trends = await self.unified_metrics.get_metric_trends(
-                metric_id,
-                time_range,
-                granularity
-            )
-            
-            if len(metric_trends) < self.min_data_points:
-                raise ValueError(f"Insufficient data points for trend analysis: {len(metric_trends)}")
+            trend_analysis, _ = await self._analyze(metric_id, time_range, granularity, refit)
+            return trend_analysis
             
-            # Convert to trend data points
-            data_points = []
-            for metric in metric_trends:
-                data_point = TrendDataPoint(
-                    timestamp=metric.timestamp,
-                    value=metric.aggregated_value,
-                    metric_id=metric_id,
-                    source_role="unified",
-                    dimensions=metric.dimensions,
-                    metadata={"aggregation_method": metric.aggregation_method}
-                )
-                data_points.append(data_point)
+        except Exception as e:
+            self.logger.error(f"Error analyzing metric trend: {str(e)}")
+            raise
+    
+    async def _analyze(
+        self,
+        metric_id: str,
+        time_range: Tuple[datetime, datetime],
+        granularity: str,
+        refit: bool
+    ) -> Tuple[TrendAnalysis, OnlineSeriesStats]:
+        """Run a trend analysis and return it with the series statistics behind it"""
+        if refit:
+            series = await self._build_series(metric_id, time_range, granularity)
+            data_points = series.payloads()
+            if len(data_points) < self.min_data_points:
+                raise ValueError(f"Insufficient data points for trend analysis: {len(data_points)}")
             
             # Detect patterns
             detected_patterns = await self._detect_patterns(data_points)
@@ -288,85 +315,187 @@ class TrendAnalyzer:
             
             # Analyze seasonality
             seasonality = await self._analyze_seasonality(data_points)
+            self.online_stats["refits"] += 1
+        else:
+            series = await self._sync_series(metric_id, time_range, granularity)
+            data_points = series.payloads()
+            if len(data_points) < self.min_data_points:
+                raise ValueError(f"Insufficient data points for trend analysis: {len(data_points)}")
             
-            # Calculate forecast accuracy
-            forecast_accuracy = await self._calculate_forecast_accuracy(data_points, primary_trend)
-            
-            # Create trend analysis
-            trend_analysis = TrendAnalysis(
-                analysis_id=str(uuid.uuid4()),
-                metric_id=metric_id,
-                analysis_period=time_range,
-                data_points=data_points,
-                detected_patterns=detected_patterns,
-                primary_trend=primary_trend,
-                anomalies=anomalies,
-                seasonality=seasonality,
-                forecast_accuracy=forecast_accuracy,
-                analysis_time=datetime.now(timezone.utc),
-                metadata={
-                    "granularity": granularity,
-                    "data_points_count": len(data_points),
-                    "patterns_detected": len(detected_patterns)
-                }
-            )
-            
-            # Store analysis
-            self.trend_analyses[trend_analysis.analysis_id] = trend_analysis
-            
-            # Cache results
-            await self.cache.set(
-                f"trend_analysis:{metric_id}",
-                trend_analysis.to_dict(),
-                ttl=self.cache_ttl
+            detected_patterns = await self._detect_online_patterns(series)
+            primary_trend = self._find_primary_trend(detected_patterns)
+            anomalies = self._online_anomalies(series, primary_trend)
+            seasonality = self._online_seasonality(series)
+            self.online_stats["online_analyses"] += 1
+        
+        # Calculate forecast accuracy
+        forecast_accuracy = await self._calculate_forecast_accuracy(data_points, primary_trend)
+        
+        # Create trend analysis
+        trend_analysis = TrendAnalysis(
+            analysis_id=str(uuid.uuid4()),
+            metric_id=metric_id,
+            analysis_period=time_range,
+            data_points=data_points,
+            detected_patterns=detected_patterns,
+            primary_trend=primary_trend,
+            anomalies=anomalies,
+            seasonality=seasonality,
+            forecast_accuracy=forecast_accuracy,
+            analysis_time=datetime.now(timezone.utc),
+            metadata={
+                "granularity": granularity,
+                "data_points_count": len(data_points),
+                "patterns_detected": len(detected_patterns),
+                "mode": "refit" if refit else "online"
+            }
+        )
+        
+        # Store analysis
+        self.trend_analyses[trend_analysis.analysis_id] = trend_analysis
+        
+        # Cache results
+        await self.cache.aset(
+            f"trend_analysis:{metric_id}",
+            trend_analysis.to_dict(),
+            ttl=self.cache_ttl
+        )
+        
+        # Check for alerts
+        await self._check_trend_alerts(trend_analysis)
+        
+        return trend_analysis, series
+    
+    def _series_key(self, metric_id: str, time_range: Tuple[datetime, datetime], granularity: str) -> Tuple[str, str, int]:
+        return (metric_id, granularity, int((time_range[1] - time_range[0]).total_seconds()))
+    
+    def _new_series(self, origin: datetime) -> OnlineSeriesStats:
+        return OnlineSeriesStats(
+            origin=origin,
+            ewma_alpha=self.ewma_alpha,
+            anomaly_threshold=self.anomaly_z_threshold,
+            warmup_points=self.min_data_points
+        )
+    
+    async def _sync_series(
+        self,
+        metric_id: str,
+        time_range: Tuple[datetime, datetime],
+        granularity: str
+    ) -> OnlineSeriesStats:
+        """Advance the series window to time_range, fetching only newly completed buckets"""
+        start_time, end_time = time_range
+        key = self._series_key(metric_id, time_range, granularity)
+        series = self.series_stats.get(key)
+        
+        # Historical windows and windows that no longer overlap the retained
+        # one cannot be reached incrementally
+        if series is None or end_time < series.covered_until or start_time >= series.covered_until:
+            return await self._build_series(metric_id, time_range, granularity)
+        
+        self.series_stats.move_to_end(key)
+        await self._ingest_buckets(series, metric_id, end_time, granularity)
+        self.online_stats["points_evicted"] += series.evict_before(start_time)
+        return series
+    
+    async def _build_series(
+        self,
+        metric_id: str,
+        time_range: Tuple[datetime, datetime],
+        granularity: str
+    ) -> OnlineSeriesStats:
+        """Prime a new series from the whole window; live windows are kept for reuse"""
+        start_time, end_time = time_range
+        series = self._new_series(start_time)
+        await self._ingest_buckets(series, metric_id, end_time, granularity)
+        self.online_stats["series_builds"] += 1
+        
+        key = self._series_key(metric_id, time_range, granularity)
+        current = self.series_stats.get(key)
+        if current is None or series.covered_until >= current.covered_until:
+            self.series_stats[key] = series
+            self.series_stats.move_to_end(key)
+            while len(self.series_stats) > self.max_series:
+                self.series_stats.popitem(last=False)
+        return series
+    
+    async def _ingest_buckets(
+        self,
+        series: OnlineSeriesStats,
+        metric_id: str,
+        end_time: datetime,
+        granularity: str
+    ):
+        """Aggregate every complete bucket between series.covered_until and end_time"""
+        if metric_id not in self.unified_metrics.metric_definitions:
+            raise ValueError(f"Metric definition not found: {metric_id}")
+        
+        delta = GRANULARITY_DELTAS.get(granularity, timedelta(hours=1))
+        while series.covered_until + delta <= end_time:
+            bucket_start = series.covered_until
+            bucket_end = bucket_start + delta
+            bucket_metrics = await self.unified_metrics.aggregate_metrics(
+                [metric_id],
+                (bucket_start, bucket_end)
             )
             
-            # Check for alerts
-            await self._check_trend_alerts(trend_analysis)
-            
-            return trend_analysis
+            if bucket_metrics:
+                metric = bucket_metrics[0]
+                data_point = TrendDataPoint(
+                    timestamp=bucket_start,
+                    value=metric.aggregated_value,
+                    metric_id=metric_id,
+                    source_role="unified",
+                    dimensions=metric.dimensions,
+                    metadata={"aggregation_method": metric.aggregation_method}
+                )
+                series.append(bucket_start, metric.aggregated_value, data_point)
+                self.online_stats["points_ingested"] += 1
             
-        except Exception as e:
-            self.logger.error(f"Error analyzing metric trend: {str(e)}")
-            raise
+            series.covered_until = bucket_end
     
     async def predict_metric_trend(
         self,
         metric_id: str,
         historical_range: Tuple[datetime, datetime],
         prediction_horizon: int = 7,  # days
-        model_type: str = "linear"
+        model_type: str = "linear",
+        refit: bool = False
     ) -> TrendPrediction:
         """Predict future trend for a metric"""
         try:
             # Get historical trend analysis
-            trend_analysis = await self.analyze_metric_trend(
+            trend_analysis, series = await self._analyze(
                 metric_id,
                 historical_range,
-                "hour"
+                "hour",
+                refit
             )
             
             if not trend_analysis.primary_trend:
                 raise ValueError("No primary trend found for prediction")
             
-            # Prepare data for prediction
-            x_values = []
-            y_values = []
-            
-            for i, data_point in enumerate(trend_analysis.data_points):
-                x_values.append(i)
-                y_values.append(data_point.value)
-            
-            # Create prediction model
-            model = await self._create_prediction_model(
-                x_values,
-                y_values,
-                model_type,
-                trend_analysis.primary_trend
-            )
+            if refit:
+                # Prepare data for prediction
+                x_values = []
+                y_values = []
+                
+                for i, data_point in enumerate(trend_analysis.data_points):
+                    x_values.append(i)
+                    y_values.append(data_point.value)
+                
+                # Create prediction model
+                model = await self._create_prediction_model(
+                    x_values,
+                    y_values,
+                    model_type,
+                    trend_analysis.primary_trend
+                )
+            else:
+                model = self._online_prediction_model(series, model_type)
             
             # Generate predictions
-            prediction_start = len(x_values)
+            prediction_start = len(trend_analysis.data_points)
             prediction_end = prediction_start + (prediction_horizon * 24)  # hourly predictions
             
             predicted_values = []
@@ -422,7 +551,7 @@ class TrendAnalyzer:
             self.trend_predictions[prediction.prediction_id] = prediction
             
             # Cache results
-            await self.cache.set(
+            await self.cache.aset(
                 f"trend_prediction:{metric_id}",
                 prediction.to_dict(),
                 ttl=self.cache_ttl
@@ -519,25 +648,23 @@ class TrendAnalyzer:
         self,
         metric_id: str,
         time_range: Tuple[datetime, datetime],
-        sensitivity: float = 2.0
+        sensitivity: float = 2.0,
+        refit: bool = False
     ) -> List[Dict[str, Any]]:
         """Detect anomalies in trend data"""
         try:
             # Get trend analysis
-            trend_analysis = await self.analyze_metric_trend(metric_id, time_range)
+            trend_analysis, series = await self._analyze(metric_id, time_range, "hour", refit)
             
             # Use existing anomaly detection
             anomalies = trend_analysis.anomalies
             
-            # Additional statistical anomaly detection
-            values = [dp.value for dp in trend_analysis.data_points]
-            
-            if len(values) < 3:
+            if len(series) < 3:
                 return anomalies
             
-            # Calculate statistical thresholds
-            mean_value = statistics.mean(values)
-            std_value = statistics.stdev(values)
+            # Calculate statistical thresholds from the window's running moments
+            mean_value = series.mean()
+            std_value = series.stdev()
             
             lower_threshold = mean_value - (sensitivity * std_value)
             upper_threshold = mean_value + (sensitivity * std_value)
@@ -642,6 +769,126 @@ class TrendAnalyzer:
             self.logger.error(f"Error getting trend insights: {str(e)}")
             return []
     
+    async def _detect_online_patterns(self, series: OnlineSeriesStats) -> List[TrendPattern]:
+        """Detect patterns from the series' running statistics"""
+        try:
+            patterns = []
+            start_time = series.first_timestamp
+            end_time = series.points[-1][1]
+            window_origin = series.hours(start_time)
+            
+            # Linear and exponential fits come straight from the running co-moments;
+            # intercepts are shifted so x counts hours from the first point in the window
+            linear_fit = series.linear.fit()
+            if linear_fit:
+                linear_pattern = self._build_linear_pattern(
+                    linear_fit.slope, linear_fit.intercept_at(window_origin), linear_fit.r_value,
+                    linear_fit.p_value, linear_fit.std_err, start_time, end_time, len(series)
+                )
+                if linear_pattern:
+                    patterns.append(linear_pattern)
+            
+            log_fit = series.log_linear.fit()
+            if log_fit and abs(log_fit.slope) >= 0.01:
+                exponential_pattern = self._build_exponential_pattern(
+                    log_fit.slope, log_fit.intercept_at(window_origin), log_fit.r_value,
+                    log_fit.p_value, log_fit.std_err, start_time, end_time
+                )
+                if exponential_pattern:
+                    patterns.append(exponential_pattern)
+            
+            if len(series) >= 24:  # Need at least 24 data points for seasonality
+                seasonal_pattern = self._build_seasonal_pattern(series.autocorrelations(), start_time, end_time)
+                if seasonal_pattern:
+                    patterns.append(seasonal_pattern)
+            
+            # Cyclical detection walks local extrema of the retained window
+            values = series.values()
+            timestamps = [point[1] for point in series.points]
+            x_values = [series.hours(ts) - window_origin for ts in timestamps]
+            cyclical_pattern = await self._detect_cyclical_pattern(x_values, values, timestamps)
+            if cyclical_pattern:
+                patterns.append(cyclical_pattern)
+            
+            return patterns
+            
+        except Exception as e:
+            self.logger.error(f"Error detecting online patterns: {str(e)}")
+            return []
+    
+    def _online_anomalies(
+        self,
+        series: OnlineSeriesStats,
+        primary_trend: Optional[TrendPattern]
+    ) -> List[Dict[str, Any]]:
+        """EWMA z-score anomalies recorded at ingest plus trend-based anomalies"""
+        try:
+            anomalies = []
+            
+            if len(series) < 3:
+                return anomalies
+            
+            for record in series.anomalies:
+                anomalies.append({
+                    "anomaly_id": str(uuid.uuid4()),
+                    "timestamp": record["timestamp"].isoformat(),
+                    "value": record["value"],
+                    "z_score": record["z_score"],
+                    "anomaly_type": "statistical",
+                    "severity": "high" if record["z_score"] > 3 else "medium",
+                    "expected_value": record["expected_value"],
+                    "deviation": record["deviation"],
+                    "detector": "ewma"
+                })
+            
+            self._add_trend_anomalies(
+                anomalies,
+                series.payloads(),
+                series.points[0][2],
+                series.stdev(),
+                primary_trend
+            )
+            
+            return anomalies
+            
+        except Exception as e:
+            self.logger.error(f"Error detecting online anomalies: {str(e)}")
+            return []
+    
+    def _online_seasonality(self, series: OnlineSeriesStats) -> Dict[str, Any]:
+        """Seasonality from the series' hour-of-day and weekday buckets"""
+        try:
+            if len(series) < 24:
+                return {"has_seasonality": False, "reason": "insufficient_data"}
+            
+            return self._summarize_seasonality(series.hourly.averages(), series.weekday.averages())
+            
+        except Exception as e:
+            self.logger.error(f"Error analyzing online seasonality: {str(e)}")
+            return {"has_seasonality": False, "error": str(e)}
+    
+    def _online_prediction_model(self, series: OnlineSeriesStats, model_type: str) -> Dict[str, Any]:
+        """Prediction model over point indices from the series' running co-moments"""
+        try:
+            moments = series.index_log_linear if model_type == "exponential" else series.index_linear
+            fit = moments.fit()
+            if fit is None:
+                return {"type": "linear", "slope": 0, "intercept": 0}
+            
+            return {
+                "type": "exponential" if model_type == "exponential" else "linear",
+                "slope": fit.slope,
+                # Index 0 is the first point still in the window
+                "intercept": fit.intercept_at(series.first_sequence),
+                "r_value": fit.r_value,
+                "p_value": fit.p_value,
+                "std_err": fit.std_err
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error creating online prediction model: {str(e)}")
+            return {"type": "linear", "slope": 0, "intercept": 0}
+    
     async def _detect_patterns(self, data_points: List[TrendDataPoint]) -> List[TrendPattern]:
         """Detect patterns in trend data"""
         try:
@@ -696,68 +943,11 @@ class TrendAnalyzer:
                 return None
             
             # Calculate linear regression
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x_values, y_values)
-            
-            # Check significance
-            if p_value > self.significance_threshold:
-                return None
-            
-            # Determine direction
-            if slope > 0.01:
-                direction = TrendDirection.UPWARD
-            elif slope < -0.01:
-                direction = TrendDirection.DOWNWARD
-            else:
-                direction = TrendDirection.STABLE
-            
-            # Determine strength based on R-squared
-            r_squared = r_value ** 2
-            if r_squared >= 0.8:
-                strength = TrendStrength.VERY_STRONG
-            elif r_squared >= 0.6:
-                strength = TrendStrength.STRONG
-            elif r_squared >= 0.4:
-                strength = TrendStrength.MODERATE
-            elif r_squared >= 0.2:
-                strength = TrendStrength.WEAK
-            else:
-                strength = TrendStrength.VERY_WEAK
-            
-            # Determine significance
-            if p_value < 0.01:
-                significance = TrendSignificance.HIGHLY_SIGNIFICANT
-            elif p_value < 0.05:
-                significance = TrendSignificance.SIGNIFICANT
-            elif p_value < 0.1:
-                significance = TrendSignificance.MODERATELY_SIGNIFICANT
-            else:
-                significance = TrendSignificance.NOT_SIGNIFICANT
+            slope, intercept, r_value, p_value, std_err = scipy_stats().linregress(x_values, y_values)
             
-            # Calculate confidence interval
-            confidence_interval = (
-                intercept - 1.96 * std_err,
-                intercept + 1.96 * std_err
-            )
-            
-            return TrendPattern(
-                pattern_id=str(uuid.uuid4()),
-                pattern_type=TrendType.LINEAR,
-                direction=direction,
-                strength=strength,
-                significance=significance,
-                start_time=timestamps[0],
-                end_time=timestamps[-1],
-                duration=timestamps[-1] - timestamps[0],
-                slope=slope,
-                r_squared=r_squared,
-                confidence_interval=confidence_interval,
-                seasonal_components={},
-                metadata={
-                    "intercept": intercept,
-                    "p_value": p_value,
-                    "std_err": std_err,
-                    "data_points": len(x_values)
-                }
+            return self._build_linear_pattern(
+                slope, intercept, r_value, p_value, std_err,
+                timestamps[0], timestamps[-1], len(x_values)
             )
             
         except Exception as e:
@@ -784,48 +974,11 @@ class TrendAnalyzer:
                     log_y_values.append(0)
             
             # Linear regression in log space
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x_values, log_y_values)
-            
-            # Check significance and exponential nature
-            if p_value > self.significance_threshold or abs(slope) < 0.01:
-                return None
-            
-            r_squared = r_value ** 2
-            if r_squared < 0.3:  # Higher threshold for exponential
-                return None
+            slope, intercept, r_value, p_value, std_err = scipy_stats().linregress(x_values, log_y_values)
             
-            # Determine direction
-            if slope > 0:
-                direction = TrendDirection.UPWARD
-            else:
-                direction = TrendDirection.DOWNWARD
-            
-            # Determine strength
-            if r_squared >= 0.8:
-                strength = TrendStrength.VERY_STRONG
-            elif r_squared >= 0.6:
-                strength = TrendStrength.STRONG
-            else:
-                strength = TrendStrength.MODERATE
-            
-            return TrendPattern(
-                pattern_id=str(uuid.uuid4()),
-                pattern_type=TrendType.EXPONENTIAL,
-                direction=direction,
-                strength=strength,
-                significance=TrendSignificance.SIGNIFICANT,
-                start_time=timestamps[0],
-                end_time=timestamps[-1],
-                duration=timestamps[-1] - timestamps[0],
-                slope=slope,
-                r_squared=r_squared,
-                confidence_interval=(intercept - 1.96 * std_err, intercept + 1.96 * std_err),
-                seasonal_components={},
-                metadata={
-                    "exponential_base": math.exp(intercept),
-                    "growth_rate": slope,
-                    "p_value": p_value
-                }
+            return self._build_exponential_pattern(
+                slope, intercept, r_value, p_value, std_err,
+                timestamps[0], timestamps[-1]
             )
             
         except Exception as e:
@@ -856,48 +1009,184 @@ class TrendAnalyzer:
                     if not np.isnan(corr):
                         autocorrelations.append((lag, corr))
             
-            # Find strongest autocorrelation
-            if not autocorrelations:
-                return None
-            
-            strongest_lag, strongest_corr = max(autocorrelations, key=lambda x: abs(x[1]))
-            
-            # Check if correlation is significant
-            if abs(strongest_corr) < 0.3:
-                return None
-            
-            # Determine seasonal characteristics
-            period = strongest_lag
-            seasonal_strength = abs(strongest_corr)
-            
-            return TrendPattern(
-                pattern_id=str(uuid.uuid4()),
-                pattern_type=TrendType.SEASONAL,
-                direction=TrendDirection.SEASONAL,
-                strength=TrendStrength.MODERATE if seasonal_strength > 0.5 else TrendStrength.WEAK,
-                significance=TrendSignificance.SIGNIFICANT if seasonal_strength > 0.5 else TrendSignificance.MODERATELY_SIGNIFICANT,
-                start_time=timestamps[0],
-                end_time=timestamps[-1],
-                duration=timestamps[-1] - timestamps[0],
-                slope=0,
-                r_squared=seasonal_strength,
-                confidence_interval=(0, 0),
-                seasonal_components={
-                    "period": period,
-                    "strength": seasonal_strength,
-                    "autocorrelation": strongest_corr
-                },
-                metadata={
-                    "detected_period": period,
-                    "seasonal_strength": seasonal_strength,
-                    "autocorrelations": autocorrelations[:5]  # Top 5
-                }
-            )
+            return self._build_seasonal_pattern(autocorrelations, timestamps[0], timestamps[-1])
             
         except Exception as e:
             self.logger.error(f"Error detecting seasonal pattern: {str(e)}")
             return None
     
+    def _build_linear_pattern(
+        self,
+        slope: float,
+        intercept: float,
+        r_value: float,
+        p_value: float,
+        std_err: float,
+        start_time: datetime,
+        end_time: datetime,
+        data_points: int
+    ) -> Optional[TrendPattern]:
+        """Classify a linear fit into a trend pattern"""
+        # Check significance
+        if p_value > self.significance_threshold:
+            return None
+        
+        # Determine direction
+        if slope > 0.01:
+            direction = TrendDirection.UPWARD
+        elif slope < -0.01:
+            direction = TrendDirection.DOWNWARD
+        else:
+            direction = TrendDirection.STABLE
+        
+        # Determine strength based on R-squared
+        r_squared = r_value ** 2
+        if r_squared >= 0.8:
+            strength = TrendStrength.VERY_STRONG
+        elif r_squared >= 0.6:
+            strength = TrendStrength.STRONG
+        elif r_squared >= 0.4:
+            strength = TrendStrength.MODERATE
+        elif r_squared >= 0.2:
+            strength = TrendStrength.WEAK
+        else:
+            strength = TrendStrength.VERY_WEAK
+        
+        # Determine significance
+        if p_value < 0.01:
+            significance = TrendSignificance.HIGHLY_SIGNIFICANT
+        elif p_value < 0.05:
+            significance = TrendSignificance.SIGNIFICANT
+        elif p_value < 0.1:
+            significance = TrendSignificance.MODERATELY_SIGNIFICANT
+        else:
+            significance = TrendSignificance.NOT_SIGNIFICANT
+        
+        # Calculate confidence interval
+        confidence_interval = (
+            intercept - 1.96 * std_err,
+            intercept + 1.96 * std_err
+        )
+        
+        return TrendPattern(
+            pattern_id=str(uuid.uuid4()),
+            pattern_type=TrendType.LINEAR,
+            direction=direction,
+            strength=strength,
+            significance=significance,
+            start_time=start_time,
+            end_time=end_time,
+            duration=end_time - start_time,
+            slope=slope,
+            r_squared=r_squared,
+            confidence_interval=confidence_interval,
+            seasonal_components={},
+            metadata={
+                "intercept": intercept,
+                "p_value": p_value,
+                "std_err": std_err,
+                "data_points": data_points
+            }
+        )
+    
+    def _build_exponential_pattern(
+        self,
+        slope: float,
+        intercept: float,
+        r_value: float,
+        p_value: float,
+        std_err: float,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Optional[TrendPattern]:
+        """Classify a log-space linear fit into an exponential trend pattern"""
+        # Check significance and exponential nature
+        if p_value > self.significance_threshold or abs(slope) < 0.01:
+            return None
+        
+        r_squared = r_value ** 2
+        if r_squared < 0.3:  # Higher threshold for exponential
+            return None
+        
+        # Determine direction
+        if slope > 0:
+            direction = TrendDirection.UPWARD
+        else:
+            direction = TrendDirection.DOWNWARD
+        
+        # Determine strength
+        if r_squared >= 0.8:
+            strength = TrendStrength.VERY_STRONG
+        elif r_squared >= 0.6:
+            strength = TrendStrength.STRONG
+        else:
+            strength = TrendStrength.MODERATE
+        
+        return TrendPattern(
+            pattern_id=str(uuid.uuid4()),
+            pattern_type=TrendType.EXPONENTIAL,
+            direction=direction,
+            strength=strength,
+            significance=TrendSignificance.SIGNIFICANT,
+            start_time=start_time,
+            end_time=end_time,
+            duration=end_time - start_time,
+            slope=slope,
+            r_squared=r_squared,
+            confidence_interval=(intercept - 1.96 * std_err, intercept + 1.96 * std_err),
+            seasonal_components={},
+            metadata={
+                "exponential_base": math.exp(intercept),
+                "growth_rate": slope,
+                "p_value": p_value
+            }
+        )
+    
+    def _build_seasonal_pattern(
+        self,
+        autocorrelations: List[Tuple[int, float]],
+        start_time: datetime,
+        end_time: datetime
+    ) -> Optional[TrendPattern]:
+        """Turn (lag, autocorrelation) pairs into a seasonal trend pattern"""
+        # Find strongest autocorrelation
+        if not autocorrelations:
+            return None
+        
+        strongest_lag, strongest_corr = max(autocorrelations, key=lambda x: abs(x[1]))
+        
+        # Check if correlation is significant
+        if abs(strongest_corr) < 0.3:
+            return None
+        
+        # Determine seasonal characteristics
+        period = strongest_lag
+        seasonal_strength = abs(strongest_corr)
+        
+        return TrendPattern(
+            pattern_id=str(uuid.uuid4()),
+            pattern_type=TrendType.SEASONAL,
+            direction=TrendDirection.SEASONAL,
+            strength=TrendStrength.MODERATE if seasonal_strength > 0.5 else TrendStrength.WEAK,
+            significance=TrendSignificance.SIGNIFICANT if seasonal_strength > 0.5 else TrendSignificance.MODERATELY_SIGNIFICANT,
+            start_time=start_time,
+            end_time=end_time,
+            duration=end_time - start_time,
+            slope=0,
+            r_squared=seasonal_strength,
+            confidence_interval=(0, 0),
+            seasonal_components={
+                "period": period,
+                "strength": seasonal_strength,
+                "autocorrelation": strongest_corr
+            },
+            metadata={
+                "detected_period": period,
+                "seasonal_strength": seasonal_strength,
+                "autocorrelations": autocorrelations[:5]  # Top 5
+            }
+        )
+    
     async def _detect_cyclical_pattern(
         self,
         x_values: List[float],
@@ -1049,33 +1338,7 @@ class TrendAnalyzer:
                         anomalies.append(anomaly)
             
             # Trend-based anomaly detection
-            if primary_trend and primary_trend.pattern_type == TrendType.LINEAR:
-                slope = primary_trend.slope
-                
-                # Calculate expected values based on trend
-                start_time = data_points[0].timestamp
-                
-                for i, data_point in enumerate(data_points):
-                    hours_from_start = (data_point.timestamp - start_time).total_seconds() / 3600
-                    expected_value = values[0] + (slope * hours_from_start)
-                    
-                    deviation = abs(data_point.value - expected_value)
-                    threshold = std_value * 2  # Threshold for trend-based anomaly
-                    
-                    if deviation > threshold and std_value > 0:
-                        anomaly = {
-                            "anomaly_id": str(uuid.uuid4()),
-                            "timestamp": data_point.timestamp.isoformat(),
-                            "value": data_point.value,
-                            "expected_value": expected_value,
-                            "deviation": deviation,
-                            "anomaly_type": "trend_based",
-                            "severity": "high" if deviation > threshold * 1.5 else "medium"
-                        }
-                        
-                        # Check if not duplicate
-                        if not any(a.get("timestamp") == anomaly["timestamp"] for a in anomalies):
-                            anomalies.append(anomaly)
+            self._add_trend_anomalies(anomalies, data_points, values[0], std_value, primary_trend)
             
             return anomalies
             
@@ -1083,6 +1346,43 @@ class TrendAnalyzer:
             self.logger.error(f"Error detecting anomalies: {str(e)}")
             return []
     
+    def _add_trend_anomalies(
+        self,
+        anomalies: List[Dict[str, Any]],
+        data_points: List[TrendDataPoint],
+        first_value: float,
+        std_value: float,
+        primary_trend: Optional[TrendPattern]
+    ):
+        """Append points deviating from the linear primary trend to anomalies"""
+        if primary_trend and primary_trend.pattern_type == TrendType.LINEAR:
+            slope = primary_trend.slope
+            
+            # Calculate expected values based on trend
+            start_time = data_points[0].timestamp
+            
+            for i, data_point in enumerate(data_points):
+                hours_from_start = (data_point.timestamp - start_time).total_seconds() / 3600
+                expected_value = first_value + (slope * hours_from_start)
+                
+                deviation = abs(data_point.value - expected_value)
+                threshold = std_value * 2  # Threshold for trend-based anomaly
+                
+                if deviation > threshold and std_value > 0:
+                    anomaly = {
+                        "anomaly_id": str(uuid.uuid4()),
+                        "timestamp": data_point.timestamp.isoformat(),
+                        "value": data_point.value,
+                        "expected_value": expected_value,
+                        "deviation": deviation,
+                        "anomaly_type": "trend_based",
+                        "severity": "high" if deviation > threshold * 1.5 else "medium"
+                    }
+                    
+                    # Check if not duplicate
+                    if not any(a.get("timestamp") == anomaly["timestamp"] for a in anomalies):
+                        anomalies.append(anomaly)
+    
     async def _analyze_seasonality(self, data_points: List[TrendDataPoint]) -> Dict[str, Any]:
         """Analyze seasonality in trend data"""
         try:
@@ -1109,17 +1409,6 @@ class TrendAnalyzer:
                 if hourly_counts[hour] > 0:
                     hourly_averages[hour] /= hourly_counts[hour]
             
-            # Check for significant hourly variation
-            if len(hourly_averages) < 2:
-                return {"has_seasonality": False, "reason": "insufficient_hourly_data"}
-            
-            hour_values = list(hourly_averages.values())
-            overall_mean = statistics.mean(hour_values)
-            hour_std = statistics.stdev(hour_values) if len(hour_values) > 1 else 0
-            
-            # Seasonality strength
-            seasonality_strength = hour_std / overall_mean if overall_mean > 0 else 0
-            
             # Day of week seasonality
             daily_averages = {}
             daily_counts = {}
@@ -1138,19 +1427,38 @@ class TrendAnalyzer:
                 if daily_counts[day] > 0:
                     daily_averages[day] /= daily_counts[day]
             
-            return {
-                "has_seasonality": seasonality_strength > 0.1,
-                "strength": seasonality_strength,
-                "hourly_pattern": hourly_averages,
-                "daily_pattern": daily_averages,
-                "period": "daily" if seasonality_strength > 0.1 else "none",
-                "analysis_type": "simple_statistical"
-            }
+            return self._summarize_seasonality(hourly_averages, daily_averages)
             
         except Exception as e:
             self.logger.error(f"Error analyzing seasonality: {str(e)}")
             return {"has_seasonality": False, "error": str(e)}
     
+    def _summarize_seasonality(
+        self,
+        hourly_averages: Dict[int, float],
+        daily_averages: Dict[int, float]
+    ) -> Dict[str, Any]:
+        """Score hour-of-day variation of the bucket averages"""
+        # Check for significant hourly variation
+        if len(hourly_averages) < 2:
+            return {"has_seasonality": False, "reason": "insufficient_hourly_data"}
+        
+        hour_values = list(hourly_averages.values())
+        overall_mean = statistics.mean(hour_values)
+        hour_std = statistics.stdev(hour_values) if len(hour_values) > 1 else 0
+        
+        # Seasonality strength
+        seasonality_strength = hour_std / overall_mean if overall_mean > 0 else 0
+        
+        return {
+            "has_seasonality": seasonality_strength > 0.1,
+            "strength": seasonality_strength,
+            "hourly_pattern": hourly_averages,
+            "daily_pattern": daily_averages,
+            "period": "daily" if seasonality_strength > 0.1 else "none",
+            "analysis_type": "simple_statistical"
+        }
+    
     async def _calculate_forecast_accuracy(
         self,
         data_points: List[TrendDataPoint],
@@ -1212,7 +1520,7 @@ class TrendAnalyzer:
         """Create prediction model"""
         try:
             if model_type == "linear":
-                slope, intercept, r_value, p_value, std_err = stats.linregress(x_values, y_values)
+                slope, intercept, r_value, p_value, std_err = scipy_stats().linregress(x_values, y_values)
                 
                 return {
                     "type": "linear",
@@ -1226,7 +1534,7 @@ class TrendAnalyzer:
             elif model_type == "exponential":
                 # Transform to log space
                 log_y_values = [math.log(max(y, 0.001)) for y in y_values]
-                slope, intercept, r_value, p_value, std_err = stats.linregress(x_values, log_y_values)
+                slope, intercept, r_value, p_value, std_err = scipy_stats().linregress(x_values, log_y_values)
                 
                 return {
                     "type": "exponential",
@@ -1239,7 +1547,7 @@ class TrendAnalyzer:
             
             else:
                 # Default to linear
-                slope, intercept, r_value, p_value, std_err = stats.linregress(x_values, y_values)
+                slope, intercept, r_value, p_value, std_err = scipy_stats().linregress(x_values, y_values)
                 
                 return {
                     "type": "linear",
@@ -1690,6 +1998,14 @@ class TrendAnalyzer:
             self.logger.error(f"Error getting trend summary: {str(e)}")
             return {}
     
+    def get_online_stats(self) -> Dict[str, Any]:
+        """Online series statistics counters"""
+        return {
+            **self.online_stats,
+            "tracked_series": len(self.series_stats),
+            "retained_points": sum(len(series) for series in self.series_stats.values())
+        }
+    
     async def health_check(self) -> Dict[str, Any]:
         """Get service health status"""
         try:
@@ -1711,6 +2027,7 @@ class TrendAnalyzer:
                     "total_predictions": len(self.trend_predictions),
                     "total_alerts": len(self.trend_alerts)
                 },
+                "online": self.get_online_stats(),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
@@ -1733,6 +2050,7 @@ class TrendAnalyzer:
             self.trend_predictions.clear()
             self.trend_alerts.clear()
             self.trend_models.clear()
+            self.series_stats.clear()
             
             # Cleanup dependencies
             await self.unified_metrics.cleanup()
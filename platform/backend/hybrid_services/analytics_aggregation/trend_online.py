@@ -0,0 +1,358 @@
+"""
+Hybrid Service: Online Trend Statistics
+Streaming estimators backing the trend analyzer
+
+Every estimator updates in O(1) per point and supports removing the oldest
+point, so a metric series can be kept as a sliding window that only ingests
+newly completed buckets instead of refitting the whole window per request:
+
+- CoMoments: Welford-style running means and co-moments for incremental
+  least-squares regression and Pearson correlation
+- EWMAStats: exponentially weighted mean/variance for streaming z-scores
+- SeasonalBuckets: running sums per hour-of-day / weekday bucket
+- OnlineSeriesStats: per-series container wiring the above together
+
+scipy is only needed for regression p-values and full refits and is imported
+on first use so it stays off the service startup path.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def scipy_stats():
+    """Import scipy.stats on first use"""
+    from scipy import stats
+    return stats
+
+
+# Guards r == +/-1 the same way scipy.stats.linregress does
+_TINY = 1.0e-20
+
+
+@dataclass(frozen=True)
+class RegressionFit:
+    """Least-squares fit equivalent to scipy.stats.linregress"""
+    slope: float
+    intercept: float
+    r_value: float
+    std_err: float
+    n: int
+
+    @property
+    def r_squared(self) -> float:
+        return self.r_value ** 2
+
+    @property
+    def p_value(self) -> float:
+        """Two-sided p-value for a non-zero slope (Wald test, t-distribution)"""
+        df = self.n - 2
+        if df <= 0:
+            return 1.0
+        if abs(self.r_value) >= 1.0:
+            return 0.0
+        t = self.r_value * math.sqrt(df / ((1.0 - self.r_value) * (1.0 + self.r_value) + _TINY))
+        return float(2 * scipy_stats().t.sf(abs(t), df))
+
+    def intercept_at(self, x_origin: float) -> float:
+        """Intercept of the same line with x measured from x_origin"""
+        return self.intercept + self.slope * x_origin
+
+    def predict(self, x: float) -> float:
+        return self.slope * x + self.intercept
+
+
+class CoMoments:
+    """Running means and co-moments of (x, y) pairs with O(1) add and remove"""
+
+    __slots__ = ("n", "mean_x", "mean_y", "c_xx", "c_xy", "c_yy")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.c_xx = 0.0
+        self.c_xy = 0.0
+        self.c_yy = 0.0
+
+    def add(self, x: float, y: float) -> None:
+        self.n += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.n
+        self.mean_y += dy / self.n
+        self.c_xx += dx * (x - self.mean_x)
+        self.c_yy += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def remove(self, x: float, y: float) -> None:
+        """Exact inverse of add for a pair that was previously added"""
+        if self.n <= 1:
+            self.reset()
+            return
+        n = self.n - 1
+        mean_x = (self.n * self.mean_x - x) / n
+        mean_y = (self.n * self.mean_y - y) / n
+        self.c_xx = max(0.0, self.c_xx - (x - mean_x) * (x - self.mean_x))
+        self.c_yy = max(0.0, self.c_yy - (y - mean_y) * (y - self.mean_y))
+        self.c_xy -= (x - mean_x) * (y - self.mean_y)
+        self.n, self.mean_x, self.mean_y = n, mean_x, mean_y
+
+    def variance_y(self) -> float:
+        """Sample variance of y"""
+        return self.c_yy / (self.n - 1) if self.n > 1 else 0.0
+
+    def pearson(self) -> Optional[float]:
+        """Pearson correlation, None when either side is constant (numpy yields nan)"""
+        if self.n < 2 or self.c_xx <= 0 or self.c_yy <= 0:
+            return None
+        return max(-1.0, min(1.0, self.c_xy / math.sqrt(self.c_xx * self.c_yy)))
+
+    def fit(self) -> Optional[RegressionFit]:
+        if self.n < 2 or self.c_xx <= 0:
+            return None
+        slope = self.c_xy / self.c_xx
+        intercept = self.mean_y - slope * self.mean_x
+        r_value = self.pearson() or 0.0
+        df = self.n - 2
+        if df > 0:
+            std_err = math.sqrt(max(0.0, (1 - r_value ** 2) * self.c_yy / self.c_xx / df))
+        else:
+            std_err = 0.0
+        return RegressionFit(slope=slope, intercept=intercept, r_value=r_value, std_err=std_err, n=self.n)
+
+
+class EWMAStats:
+    """Exponentially weighted moving mean and variance"""
+
+    __slots__ = ("alpha", "mean", "var", "count")
+
+    def __init__(self, alpha: float = 0.1):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+
+    def zscore(self, value: float) -> Optional[float]:
+        """z-score of value against the current estimate (before it is absorbed)"""
+        if self.count < 2 or self.var <= 0:
+            return None
+        return (value - self.mean) / math.sqrt(self.var)
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return
+        diff = value - self.mean
+        increment = self.alpha * diff
+        self.mean += increment
+        self.var = (1 - self.alpha) * (self.var + diff * increment)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+
+class SeasonalBuckets:
+    """Running sum and count per seasonal bucket (e.g. hour of day)"""
+
+    __slots__ = ("sums", "counts")
+
+    def __init__(self, size: int):
+        self.sums = [0.0] * size
+        self.counts = [0] * size
+
+    def add(self, bucket: int, value: float) -> None:
+        self.sums[bucket] += value
+        self.counts[bucket] += 1
+
+    def remove(self, bucket: int, value: float) -> None:
+        self.counts[bucket] -= 1
+        self.sums[bucket] = self.sums[bucket] - value if self.counts[bucket] else 0.0
+
+    def averages(self) -> Dict[int, float]:
+        return {
+            bucket: self.sums[bucket] / count
+            for bucket, count in enumerate(self.counts) if count
+        }
+
+
+class OnlineSeriesStats:
+    """
+    Sliding-window statistics for one metric series.
+
+    Points are appended in time order and evicted from the front; every
+    estimator is kept in sync in O(max_lag) time per point. Regressions are
+    kept against hours since the series origin (for pattern detection) and
+    against the point sequence number (for index-based prediction models).
+    """
+
+    def __init__(
+        self,
+        origin: datetime,
+        max_lag: int = 24,
+        ewma_alpha: float = 0.1,
+        anomaly_threshold: float = 2.5,
+        warmup_points: int = 10
+    ):
+        self.origin = origin
+        # Data up to this instant has been ingested (maintained by the owner)
+        self.covered_until = origin
+        self.max_lag = max_lag
+        self.anomaly_threshold = anomaly_threshold
+        self.warmup_points = warmup_points
+
+        # (sequence, timestamp, value, payload)
+        self.points: Deque[Tuple[int, datetime, float, Any]] = deque()
+        self.next_sequence = 0
+        self.evictions_since_recompute = 0
+
+        self.ewma = EWMAStats(ewma_alpha)
+        self.anomalies: Deque[Dict[str, Any]] = deque()
+        self._reset_moments()
+
+    def _reset_moments(self) -> None:
+        self.linear = CoMoments()
+        self.log_linear = CoMoments()
+        self.index_linear = CoMoments()
+        self.index_log_linear = CoMoments()
+        self.lags: Dict[int, CoMoments] = {lag: CoMoments() for lag in range(1, self.max_lag + 1)}
+        self.hourly = SeasonalBuckets(24)
+        self.weekday = SeasonalBuckets(7)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def hours(self, timestamp: datetime) -> float:
+        return (timestamp - self.origin).total_seconds() / 3600
+
+    @staticmethod
+    def _log_value(value: float) -> float:
+        # Pattern detection treats non-positive values as log(1)
+        return math.log(value) if value > 0 else 0.0
+
+    @staticmethod
+    def _log_value_floor(value: float) -> float:
+        # Prediction models floor values at 0.001 before taking logs
+        return math.log(max(value, 0.001))
+
+    def _add_moments(self, sequence: int, timestamp: datetime, value: float, history, index: int) -> None:
+        """Add one point to the windowed accumulators; history[:index] precede it"""
+        x = self.hours(timestamp)
+        self.linear.add(x, value)
+        self.log_linear.add(x, self._log_value(value))
+        self.index_linear.add(sequence, value)
+        self.index_log_linear.add(sequence, self._log_value_floor(value))
+        for lag, moments in self.lags.items():
+            if lag > index:
+                break
+            moments.add(history[index - lag][2], value)
+        self.hourly.add(timestamp.hour, value)
+        self.weekday.add(timestamp.weekday(), value)
+
+    def append(self, timestamp: datetime, value: float, payload: Any = None) -> Optional[Dict[str, Any]]:
+        """Ingest one point; returns the anomaly record if the point is an EWMA outlier"""
+        value = float(value)
+        sequence = self.next_sequence
+        self.next_sequence += 1
+        self._add_moments(sequence, timestamp, value, self.points, len(self.points))
+
+        anomaly = None
+        z_score = self.ewma.zscore(value)
+        if (
+            z_score is not None
+            and self.ewma.count >= self.warmup_points
+            and abs(z_score) > self.anomaly_threshold
+        ):
+            anomaly = {
+                "timestamp": timestamp,
+                "value": value,
+                "z_score": abs(z_score),
+                "expected_value": self.ewma.mean,
+                "deviation": abs(value - self.ewma.mean),
+            }
+            self.anomalies.append(anomaly)
+        self.ewma.update(value)
+
+        self.points.append((sequence, timestamp, value, payload))
+        return anomaly
+
+    def evict_before(self, cutoff: datetime) -> int:
+        """Drop points older than cutoff; the EWMA keeps its decayed memory"""
+        evicted = 0
+        while self.points and self.points[0][1] < cutoff:
+            self._pop_front()
+            evicted += 1
+        while self.anomalies and self.anomalies[0]["timestamp"] < cutoff:
+            self.anomalies.popleft()
+
+        # Add/remove cycles accumulate rounding error; periodically re-sum the
+        # retained window (amortised O(1) per evicted point)
+        self.evictions_since_recompute += evicted
+        if self.evictions_since_recompute >= max(1024, 8 * len(self.points)):
+            self.recompute()
+        return evicted
+
+    def _pop_front(self) -> None:
+        sequence, timestamp, value, _ = self.points[0]
+        x = self.hours(timestamp)
+        self.linear.remove(x, value)
+        self.log_linear.remove(x, self._log_value(value))
+        self.index_linear.remove(sequence, value)
+        self.index_log_linear.remove(sequence, self._log_value_floor(value))
+        for lag, moments in self.lags.items():
+            if lag >= len(self.points):
+                break
+            moments.remove(value, self.points[lag][2])
+        self.hourly.remove(timestamp.hour, value)
+        self.weekday.remove(timestamp.weekday(), value)
+        self.points.popleft()
+
+    def recompute(self) -> None:
+        """Rebuild the windowed accumulators from the retained points"""
+        points = list(self.points)
+        self._reset_moments()
+        for index, (sequence, timestamp, value, _) in enumerate(points):
+            self._add_moments(sequence, timestamp, value, points, index)
+        self.evictions_since_recompute = 0
+
+    @property
+    def first_timestamp(self) -> Optional[datetime]:
+        return self.points[0][1] if self.points else None
+
+    @property
+    def first_sequence(self) -> int:
+        return self.points[0][0] if self.points else self.next_sequence
+
+    def values(self) -> List[float]:
+        return [point[2] for point in self.points]
+
+    def payloads(self) -> List[Any]:
+        return [point[3] for point in self.points]
+
+    def autocorrelations(self) -> List[Tuple[int, float]]:
+        """(lag, correlation) for lags 1..min(n // 2, max_lag), matching np.corrcoef per lag"""
+        max_lag = min(len(self.points) // 2, self.max_lag)
+        result = []
+        for lag in range(1, max_lag + 1):
+            corr = self.lags[lag].pearson()
+            if corr is not None:
+                result.append((lag, corr))
+        return result
+
+    def mean(self) -> float:
+        return self.linear.mean_y
+
+    def stdev(self) -> float:
+        return math.sqrt(self.linear.variance_y())
@@ -6,7 +6,7 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional, List, Union, Tuple
+from typing import Dict, Any, Iterable, Optional, List, Union, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
@@ -152,6 +152,7 @@ class UnifiedMetrics:
         self.metric_definitions: Dict[str, MetricDefinition] = {}
         self.active_aggregations: Dict[str, Dict[str, Any]] = {}
         self.metric_cache: Dict[str, List[MetricValue]] = {}
+        self.latest_value_times: Dict[str, datetime] = {}
         self.is_initialized = False
         
         # Configuration
@@ -281,6 +282,9 @@ class UnifiedMetrics:
                 self.metric_cache[cache_key] = []
             
             self.metric_cache[cache_key].append(metric_value)
+            latest = self.latest_value_times.get(metric_value.metric_id)
+            if latest is None or metric_value.timestamp > latest:
+                self.latest_value_times[metric_value.metric_id] = metric_value.timestamp
             
             # Limit cache size
             if len(self.metric_cache[cache_key]) > self.max_cache_size:
@@ -296,6 +300,11 @@ class UnifiedMetrics:
             self.logger.error(f"Error recording metric value: {str(e)}")
             raise
     
+    def get_latest_data_time(self, metric_ids: Iterable[str]) -> Optional[datetime]:
+        """Newest recorded value timestamp across the given metrics"""
+        times = [self.latest_value_times[metric_id] for metric_id in metric_ids if metric_id in self.latest_value_times]
+        return max(times) if times else None
+    
     async def aggregate_metrics(
         self,
         metric_ids: List[str],
@@ -22,6 +22,7 @@ from .access_middleware import AccessMiddleware, AccessRequest, AccessResponse
 from .feature_gating import FeatureGate, FeatureGateConfig, FeatureAccessResult
 from .quota_manager import QuotaManager, QuotaConfig, QuotaEnforcement
 from .rate_limiter import ServiceRateLimiter, RateLimitConfig, RateLimitResult
+from .token_lease import TwoTierTokenLimiter, TwoTierConfig, RedisTokenStore, InMemoryTokenStore
 from .subscription_guard import SubscriptionGuard, SubscriptionValidation, AccessDecision
 from .unified_rbac import UnifiedRBAC
 
@@ -45,6 +46,10 @@ __all__ = [
     "ServiceRateLimiter",
     "RateLimitConfig",
     "RateLimitResult",
+    "TwoTierTokenLimiter",
+    "TwoTierConfig",
+    "RedisTokenStore",
+    "InMemoryTokenStore",
     
     # Subscription Guard
     "SubscriptionGuard",
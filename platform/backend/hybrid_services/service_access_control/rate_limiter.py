@@ -11,6 +11,10 @@ Integrates with:
 - backend/app/utils/rate_limiter.py for token bucket algorithm
 - billing_orchestration/tier_manager.py for tier-based rate limits
 - Platform monitoring and metrics collection
+
+Token-bucket limits are answered from process-local token leases taken from a
+shared bucket (see token_lease.py): checks only reach Redis when a lease is
+exhausted, at the cost of a bounded number of tokens stranded in other workers.
 """
 
 import asyncio
@@ -29,6 +33,14 @@ from hybrid_services.billing_orchestration.tier_manager import TierManager
 from core_platform.monitoring import MetricsCollector
 from core_platform.data_management.cache_manager import CacheManager
 
+from .token_lease import (
+    InMemoryTokenStore,
+    RedisTokenStore,
+    SharedTokenStore,
+    TwoTierConfig,
+    TwoTierTokenLimiter,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -250,7 +262,8 @@ class ServiceRateLimiter:
         tier_manager: TierManager,
         metrics_collector: MetricsCollector,
         cache_manager: CacheManager,
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        token_store: Optional[SharedTokenStore] = None
     ):
         self.tier_manager = tier_manager
         self.metrics_collector = metrics_collector
@@ -267,9 +280,31 @@ class ServiceRateLimiter:
         self.enable_persistence = self.config.get("enable_persistence", True)
         self.default_throttle_factor = self.config.get("default_throttle_factor", 0.5)
         
+        # Two-tier token buckets: local leases over a shared (Redis) bucket
+        self.token_limiter: Optional[TwoTierTokenLimiter] = None
+        if self.config.get("enable_two_tier", True):
+            self.token_limiter = TwoTierTokenLimiter(
+                token_store or self._default_token_store(),
+                TwoTierConfig(**self.config.get("two_tier", {}))
+            )
+        
         # Load default rate limits
         self._load_default_rate_limits()
     
+    def _default_token_store(self) -> SharedTokenStore:
+        """Redis-backed shared bucket when the cache manager has Redis, else in-process"""
+        get_client = getattr(self.cache_manager, "get_async_redis_client", None)
+        client = get_client() if get_client else None
+        if client is not None:
+            return RedisTokenStore(client)
+        logger.info("No async Redis client available; token buckets are process-local")
+        return InMemoryTokenStore()
+    
+    async def shutdown(self):
+        """Return leased tokens to the shared bucket"""
+        if self.token_limiter:
+            await self.token_limiter.close()
+    
     def _load_default_rate_limits(self):
         """Load default rate limit configurations"""
         default_limits = [
@@ -515,21 +550,26 @@ class ServiceRateLimiter:
         
         bucket_key = f"{config.limit_id}:{scope_id}"
         
-        # Get or create token bucket
-        bucket = await self._get_or_create_bucket(
-            bucket_key, burst_capacity, limit / config.window_seconds
-        )
+        refill_rate = limit / config.window_seconds
+        bucket = None
         
-        # Check if we can consume tokens
-        can_consume = bucket.consume(request_count)
-        current_tokens = bucket.peek()
+        if self.token_limiter is not None:
+            # Answered from the local lease; only an exhausted lease hits the shared store
+            can_consume = await self.token_limiter.consume(
+                bucket_key, burst_capacity, refill_rate, request_count
+            )
+            current_tokens = min(burst_capacity, self.token_limiter.estimated_available(bucket_key))
+        else:
+            bucket = await self._get_or_create_bucket(bucket_key, burst_capacity, refill_rate)
+            can_consume = bucket.consume(request_count)
+            current_tokens = bucket.peek()
         
         # Calculate usage and remaining
         current_usage = burst_capacity - int(current_tokens)
         remaining = max(0, int(current_tokens))
         
         # Calculate reset time (when bucket will be full again)
-        seconds_to_full = (burst_capacity - current_tokens) / bucket.refill_rate
+        seconds_to_full = (burst_capacity - current_tokens) / refill_rate
         reset_time = datetime.now(timezone.utc) + timedelta(seconds=seconds_to_full)
         
         if can_consume:
@@ -554,10 +594,10 @@ class ServiceRateLimiter:
             throttle_delay = None
             
             # Calculate retry after
-            retry_after = max(1, int(request_count / bucket.refill_rate))
+            retry_after = max(1, int(request_count / refill_rate))
         
-        # Persist bucket state if enabled
-        if self.enable_persistence:
+        # Persist bucket state if enabled (leased buckets already live in the shared store)
+        if bucket is not None and self.enable_persistence:
             await self._persist_bucket(bucket_key, bucket)
         
         return RateLimitResult(
@@ -665,7 +705,7 @@ class ServiceRateLimiter:
         window_key = f"{config.limit_id}:{scope_id}:{window_start.isoformat()}"
         
         # Get current usage from cache
-        current_usage = await self.cache_manager.get(window_key) or 0
+        current_usage = await self._cache_get(window_key) or 0
         current_usage = int(current_usage)
         
         # Check if request can be allowed
@@ -676,7 +716,7 @@ class ServiceRateLimiter:
             # Update usage count
             window_end = window_start + timedelta(seconds=config.window_seconds)
             ttl = int((window_end - now).total_seconds())
-            await self.cache_manager.set(window_key, projected_usage, ttl=ttl)
+            await self._cache_set(window_key, projected_usage, ttl=ttl)
             
             decision = RateLimitDecision.ALLOWED
             allowed = True
@@ -759,7 +799,7 @@ class ServiceRateLimiter:
         
         # Try to load from persistence
         if self.enable_persistence:
-            bucket_data = await self.cache_manager.get(f"bucket:{bucket_key}")
+            bucket_data = await self._cache_get(f"bucket:{bucket_key}")
             if bucket_data:
                 bucket = TokenBucket.from_dict(bucket_data)
                 self.bucket_cache[bucket_key] = bucket
@@ -788,12 +828,26 @@ class ServiceRateLimiter:
     
     async def _persist_bucket(self, bucket_key: str, bucket: TokenBucket):
         """Persist token bucket state"""
-        await self.cache_manager.set(
+        await self._cache_set(
             f"bucket:{bucket_key}",
             bucket.to_dict(),
             ttl=self.cache_ttl
         )
     
+    async def _cache_get(self, key: str) -> Any:
+        """Read from the cache manager (async API when available)"""
+        if hasattr(self.cache_manager, "aget"):
+            return await self.cache_manager.aget(key)
+        value = self.cache_manager.get(key)
+        return await value if asyncio.iscoroutine(value) else value
+    
+    async def _cache_set(self, key: str, value: Any, ttl: Optional[int] = None) -> Any:
+        """Write to the cache manager (async API when available)"""
+        if hasattr(self.cache_manager, "aset"):
+            return await self.cache_manager.aset(key, value, ttl=ttl)
+        result = self.cache_manager.set(key, value, ttl=ttl)
+        return await result if asyncio.iscoroutine(result) else result
+    
     def _calculate_throttle_delay(self, usage_percentage: float) -> float:
         """Calculate throttle delay based on usage percentage"""
         if usage_percentage >= 0.95:
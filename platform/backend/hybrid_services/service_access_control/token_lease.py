@@ -0,0 +1,361 @@
+"""
+Two-Tier Token Leasing - process-local token slices over a shared bucket
+
+The authoritative token bucket for a rate limit lives in a shared store
+(Redis in production). Instead of touching the store on every check, each
+worker leases a slice of tokens from the shared bucket and answers checks from
+that slice in-process. A background reconciler tops up slices that run low and
+returns tokens held by idle slices.
+
+Accuracy / latency trade-off:
+- The hot path (local slice has tokens) does no I/O; only an exhausted slice
+  awaits a store round trip, so store traffic is roughly
+  requests / lease_size instead of one or more round trips per request.
+- Tokens are taken from the shared bucket before they are spent and the
+  shared bucket alone refills, so the global limit is never exceeded.
+- The error is on the conservative side: tokens leased by one worker cannot
+  be spent by another. At most (workers - 1) * lease_size tokens can be
+  stranded, for at most idle_return_seconds, while another worker is denied.
+  A larger lease_fraction means fewer round trips but more stranding.
+- Denials caused by stranding are bounded by that amount; a worker is only
+  denied after the shared bucket itself reported no tokens. After such an
+  empty borrow the worker denies locally until the shared bucket could have
+  refilled (capped at the reconcile interval), so a saturated limit does not
+  turn every rejected request into a store round trip either.
+- If the shared store cannot be reached, checks fall back to a process-local
+  bucket with the same capacity and refill rate, so each worker enforces the
+  limit on its own until the store answers again instead of denying
+  everything.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SharedTokenStore(ABC):
+    """Shared token bucket store used as the global tier"""
+
+    @abstractmethod
+    async def take(
+        self,
+        key: str,
+        requested: int,
+        capacity: int,
+        refill_rate: float
+    ) -> Tuple[int, float]:
+        """Take up to `requested` tokens; returns (granted, tokens left in the shared bucket)"""
+
+    @abstractmethod
+    async def give_back(self, key: str, tokens: int, capacity: int, refill_rate: float) -> float:
+        """Return unused tokens; returns tokens now in the shared bucket"""
+
+
+class InMemoryTokenStore(SharedTokenStore):
+    """
+    Process-local shared store.
+
+    Used when no Redis is configured (single worker) and as the object served
+    to several processes through a multiprocessing manager in tests.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, last_refill)
+        self._lock = threading.Lock()
+
+    def _refilled(self, key: str, capacity: int, refill_rate: float, now: float) -> float:
+        tokens, last_refill = self._buckets.get(key, (float(capacity), now))
+        return min(float(capacity), tokens + max(0.0, now - last_refill) * refill_rate)
+
+    def take_now(self, key: str, requested: int, capacity: int, refill_rate: float) -> Tuple[int, float]:
+        with self._lock:
+            now = time.time()
+            tokens = self._refilled(key, capacity, refill_rate, now)
+            granted = min(requested, int(math.floor(tokens)))
+            tokens -= granted
+            self._buckets[key] = (tokens, now)
+            return granted, tokens
+
+    def give_back_now(self, key: str, tokens: int, capacity: int, refill_rate: float) -> float:
+        with self._lock:
+            now = time.time()
+            current = min(float(capacity), self._refilled(key, capacity, refill_rate, now) + tokens)
+            self._buckets[key] = (current, now)
+            return current
+
+    async def take(self, key: str, requested: int, capacity: int, refill_rate: float) -> Tuple[int, float]:
+        return self.take_now(key, requested, capacity, refill_rate)
+
+    async def give_back(self, key: str, tokens: int, capacity: int, refill_rate: float) -> float:
+        return self.give_back_now(key, tokens, capacity, refill_rate)
+
+
+# Atomic refill + take/return on a hash {tokens, ts}.
+# KEYS[1]: bucket key. ARGV: mode ("take"/"give"), amount, capacity, refill_rate, now, ttl
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[3])
+local rate = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local amount = tonumber(ARGV[2])
+local granted = 0
+if ARGV[1] == 'take' then
+    granted = math.min(amount, math.floor(tokens))
+    tokens = tokens - granted
+else
+    tokens = math.min(capacity, tokens + amount)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[6]))
+return {granted, tostring(tokens)}
+"""
+
+
+class RedisTokenStore(SharedTokenStore):
+    """Shared store backed by a redis.asyncio client (one Lua call per borrow/return)"""
+
+    def __init__(self, redis_client: Any, key_prefix: str = "taxpoynt:token_bucket:"):
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self._script = redis_client.register_script(TOKEN_BUCKET_LUA)
+
+    def _ttl(self, capacity: int, refill_rate: float) -> int:
+        # Keep state at least as long as a full refill takes
+        return int(capacity / refill_rate) + 60 if refill_rate > 0 else 86400
+
+    async def _call(self, mode: str, key: str, amount: int, capacity: int, refill_rate: float) -> Tuple[int, float]:
+        granted, tokens = await self._script(
+            keys=[f"{self.key_prefix}{key}"],
+            args=[mode, amount, capacity, refill_rate, time.time(), self._ttl(capacity, refill_rate)]
+        )
+        return int(granted), float(tokens)
+
+    async def take(self, key: str, requested: int, capacity: int, refill_rate: float) -> Tuple[int, float]:
+        return await self._call("take", key, requested, capacity, refill_rate)
+
+    async def give_back(self, key: str, tokens: int, capacity: int, refill_rate: float) -> float:
+        _, remaining = await self._call("give", key, tokens, capacity, refill_rate)
+        return remaining
+
+
+@dataclass
+class TwoTierConfig:
+    """Leasing parameters (see module docstring for the trade-off)"""
+    lease_fraction: float = 0.1            # Fraction of bucket capacity borrowed per lease
+    low_water_fraction: float = 0.25       # Top up in background below this fraction of a lease
+    reconcile_interval_seconds: float = 1.0
+    idle_return_seconds: float = 5.0       # Return tokens of slices unused for this long
+
+
+class LocalTokenSlice:
+    """Tokens leased by this worker for one bucket"""
+
+    def __init__(self, key: str, capacity: int, refill_rate: float, lease_size: int):
+        self.key = key
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.lease_size = lease_size
+        self.tokens = 0
+        self.global_available = float(capacity)  # Last value reported by the store
+        self.last_used = time.monotonic()
+        self.retry_at = 0.0  # Skip the store until then after an empty borrow
+        self.store_unavailable = False  # Last borrow failed; use the local fallback bucket
+        self.borrow_lock = asyncio.Lock()
+
+    def try_consume(self, tokens: int) -> bool:
+        """Spend leased tokens (no I/O)"""
+        self.last_used = time.monotonic()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    @property
+    def estimated_available(self) -> float:
+        return self.tokens + self.global_available
+
+
+class TwoTierTokenLimiter:
+    """Answers token-bucket checks from local slices leased from a shared store"""
+
+    def __init__(self, store: SharedTokenStore, config: Optional[TwoTierConfig] = None):
+        self.store = store
+        self.config = config or TwoTierConfig()
+        self._slices: Dict[str, LocalTokenSlice] = {}
+        self._fallback = InMemoryTokenStore()
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self._background: set = set()
+        self.stats = {
+            "checks": 0,
+            "local_hits": 0,
+            "borrows": 0,
+            "tokens_borrowed": 0,
+            "returns": 0,
+            "tokens_returned": 0,
+            "store_errors": 0,
+            "fallback_allowed": 0,
+            "denied": 0,
+        }
+
+    def _slice(self, key: str, capacity: int, refill_rate: float) -> LocalTokenSlice:
+        token_slice = self._slices.get(key)
+        if token_slice is None or token_slice.capacity != capacity or token_slice.refill_rate != refill_rate:
+            if token_slice is not None:
+                # Limit changed: hand the old lease back rather than stranding it
+                token_slice.capacity, token_slice.refill_rate = capacity, refill_rate
+                self._spawn(self._return(token_slice))
+            lease_size = max(1, int(capacity * self.config.lease_fraction))
+            token_slice = LocalTokenSlice(key, capacity, refill_rate, lease_size)
+            self._slices[key] = token_slice
+        return token_slice
+
+    async def consume(self, key: str, capacity: int, refill_rate: float, tokens: int = 1) -> bool:
+        """Consume tokens for key; only awaits the store when the local slice is exhausted"""
+        self.stats["checks"] += 1
+        self._ensure_reconciler()
+        token_slice = self._slice(key, capacity, refill_rate)
+
+        if token_slice.try_consume(tokens):
+            self.stats["local_hits"] += 1
+            if token_slice.tokens < token_slice.lease_size * self.config.low_water_fraction:
+                self._spawn(self._borrow(token_slice, token_slice.lease_size))
+            return True
+
+        if time.monotonic() >= token_slice.retry_at:
+            await self._borrow(token_slice, max(token_slice.lease_size, tokens))
+            if token_slice.try_consume(tokens):
+                return True
+
+        if token_slice.store_unavailable:
+            return self._consume_fallback(token_slice, tokens)
+
+        self.stats["denied"] += 1
+        return False
+
+    def _consume_fallback(self, token_slice: LocalTokenSlice, tokens: int) -> bool:
+        """Per-worker bucket used while the shared store is unreachable"""
+        granted, _ = self._fallback.take_now(token_slice.key, tokens, token_slice.capacity, token_slice.refill_rate)
+        if granted >= tokens:
+            self.stats["fallback_allowed"] += 1
+            return True
+        if granted:
+            self._fallback.give_back_now(token_slice.key, granted, token_slice.capacity, token_slice.refill_rate)
+        self.stats["denied"] += 1
+        return False
+
+    def estimated_available(self, key: str) -> float:
+        """Local tokens plus the last known shared-bucket level"""
+        token_slice = self._slices.get(key)
+        return token_slice.estimated_available if token_slice else 0.0
+
+    async def _borrow(self, token_slice: LocalTokenSlice, amount: int) -> int:
+        async with token_slice.borrow_lock:
+            # Another borrower may have refilled the slice meanwhile
+            if token_slice.tokens >= amount:
+                return 0
+            try:
+                granted, available = await self.store.take(
+                    token_slice.key, amount, token_slice.capacity, token_slice.refill_rate
+                )
+            except Exception as e:
+                self.stats["store_errors"] += 1
+                logger.warning(f"Token borrow failed for {token_slice.key}: {e}")
+                token_slice.store_unavailable = True
+                token_slice.retry_at = time.monotonic() + self.config.reconcile_interval_seconds
+                return 0
+            token_slice.store_unavailable = False
+            token_slice.tokens += granted
+            token_slice.global_available = available
+            if granted:
+                token_slice.retry_at = 0.0
+            else:
+                wait = self.config.reconcile_interval_seconds
+                if token_slice.refill_rate > 0:
+                    wait = min(wait, max(0.0, 1.0 - available) / token_slice.refill_rate)
+                token_slice.retry_at = time.monotonic() + wait
+            self.stats["borrows"] += 1
+            self.stats["tokens_borrowed"] += granted
+            return granted
+
+    async def _return(self, token_slice: LocalTokenSlice) -> int:
+        async with token_slice.borrow_lock:
+            tokens, token_slice.tokens = token_slice.tokens, 0
+            if tokens <= 0:
+                return 0
+            try:
+                token_slice.global_available = await self.store.give_back(
+                    token_slice.key, tokens, token_slice.capacity, token_slice.refill_rate
+                )
+            except Exception as e:
+                token_slice.tokens += tokens
+                self.stats["store_errors"] += 1
+                logger.warning(f"Token return failed for {token_slice.key}: {e}")
+                return 0
+            self.stats["returns"] += 1
+            self.stats["tokens_returned"] += tokens
+            return tokens
+
+    async def reconcile(self) -> None:
+        """Return tokens from idle slices and top up slices running low"""
+        now = time.monotonic()
+        for key, token_slice in list(self._slices.items()):
+            if now - token_slice.last_used >= self.config.idle_return_seconds:
+                await self._return(token_slice)
+                if token_slice.tokens == 0:
+                    self._slices.pop(key, None)
+            elif token_slice.tokens < token_slice.lease_size * self.config.low_water_fraction:
+                await self._borrow(token_slice, token_slice.lease_size)
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.reconcile_interval_seconds)
+            try:
+                await self.reconcile()
+            except Exception as e:  # keep reconciling on transient errors
+                logger.warning(f"Token reconciliation failed: {e}")
+
+    def _ensure_reconciler(self) -> None:
+        if self._reconcile_task is None or self._reconcile_task.done():
+            self._reconcile_task = asyncio.get_running_loop().create_task(self._reconcile_loop())
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def close(self) -> None:
+        """Stop reconciling and hand every leased token back to the shared store"""
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            self._reconcile_task = None
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        for token_slice in list(self._slices.values()):
+            await self._return(token_slice)
+        self._slices.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        checks = self.stats["checks"]
+        return {
+            **self.stats,
+            "slices": len(self._slices),
+            "leased_tokens": sum(s.tokens for s in self._slices.values()),
+            "local_hit_rate": self.stats["local_hits"] / checks if checks else 0.0,
+            "store_calls_per_check": (self.stats["borrows"] + self.stats["returns"]) / checks if checks else 0.0,
+        }
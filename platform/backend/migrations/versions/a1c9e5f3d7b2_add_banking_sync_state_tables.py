@@ -0,0 +1,56 @@
+"""Add banking sync cursor and dedupe key tables
+
+Revision ID: a1c9e5f3d7b2
+Revises: e4a8c1f2b3d5
+Create Date: 2026-10-18 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a1c9e5f3d7b2"
+down_revision: Union[str, Sequence[str], None] = "e4a8c1f2b3d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "banking_sync_cursors",
+        sa.Column("provider", sa.String(length=50), nullable=False),
+        sa.Column("account_id", sa.String(length=255), nullable=False),
+        sa.Column("cursor", sa.String(length=512), nullable=True),
+        sa.Column("seen_filter", sa.LargeBinary(), nullable=True),
+        sa.Column("seen_filter_items", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            server_default=sa.func.now(),
+        ),
+        sa.PrimaryKeyConstraint("provider", "account_id", name=op.f("pk_banking_sync_cursors")),
+    )
+    op.create_table(
+        "banking_sync_dedupe_keys",
+        sa.Column("provider", sa.String(length=50), nullable=False),
+        sa.Column("account_id", sa.String(length=255), nullable=False),
+        sa.Column("dedupe_key", sa.String(length=64), nullable=False),
+        sa.Column("seen_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "provider", "account_id", "dedupe_key", name=op.f("pk_banking_sync_dedupe_keys")
+        ),
+    )
+    op.create_index(
+        "ix_banking_sync_dedupe_keys_account_seen_at",
+        "banking_sync_dedupe_keys",
+        ["provider", "account_id", "seen_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_banking_sync_dedupe_keys_account_seen_at", table_name="banking_sync_dedupe_keys")
+    op.drop_table("banking_sync_dedupe_keys")
+    op.drop_table("banking_sync_cursors")
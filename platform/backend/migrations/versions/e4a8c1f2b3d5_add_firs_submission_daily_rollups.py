@@ -0,0 +1,96 @@
+"""Add FIRS submission daily rollups table
+
+Revision ID: e4a8c1f2b3d5
+Revises: b2f4c6d7e8a9
+Create Date: 2026-10-18 12:00:00.000000
+
+Existing submissions are aggregated into the new table in the same
+transaction, so dashboard reads and the flush hook start from correct
+counters. ``repositories.firs_submission_rollups_async.check_submission_rollups``
+can verify or repair the rows later.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "e4a8c1f2b3d5"
+down_revision: Union[str, Sequence[str], None] = "b2f4c6d7e8a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Expressions matching submission_contribution(): UTC created_at day, status
+# value (lower-cased; SQLAlchemy enums may store member names) and
+# submitted->accepted seconds when positive
+_BACKFILL_EXPRESSIONS = {
+    "postgresql": {
+        "day": "CAST(created_at AS DATE)",
+        "seconds": "EXTRACT(EPOCH FROM (accepted_at - submitted_at))",
+    },
+    "sqlite": {
+        "day": "DATE(created_at)",
+        "seconds": "(JULIANDAY(accepted_at) - JULIANDAY(submitted_at)) * 86400.0",
+    },
+}
+
+_BACKFILL_SQL = """
+    INSERT INTO firs_submission_daily_rollups (
+        organization_id, day, status, submission_count, processing_seconds_total, processing_samples
+    )
+    SELECT
+        organization_id,
+        {day} AS rollup_day,
+        LOWER(CAST(status AS VARCHAR(20))) AS rollup_status,
+        COUNT(*),
+        COALESCE(SUM(CASE WHEN {seconds} > 0 THEN {seconds} END), 0),
+        SUM(CASE WHEN {seconds} > 0 THEN 1 ELSE 0 END)
+    FROM firs_submissions
+    WHERE organization_id IS NOT NULL AND status IS NOT NULL AND created_at IS NOT NULL
+    GROUP BY organization_id, {day}, LOWER(CAST(status AS VARCHAR(20)))
+"""
+
+
+def _backfill_rollups() -> None:
+    dialect = op.get_bind().dialect.name
+    expressions = _BACKFILL_EXPRESSIONS.get(dialect)
+    if expressions is None:
+        raise RuntimeError(f"No rollup backfill for dialect {dialect!r}")
+    if dialect == "postgresql":
+        # Day boundaries are UTC regardless of the server's timezone
+        op.execute("SET LOCAL TIME ZONE 'UTC'")
+    op.execute(_BACKFILL_SQL.format(**expressions))
+
+
+def upgrade() -> None:
+    op.create_table(
+        "firs_submission_daily_rollups",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("submission_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("processing_seconds_total", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("processing_samples", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            server_default=sa.func.now(),
+        ),
+        sa.ForeignKeyConstraint(
+            ["organization_id"],
+            ["organizations.id"],
+            name=op.f("fk_firs_submission_daily_rollups_organization_id_organizations"),
+        ),
+        sa.PrimaryKeyConstraint(
+            "organization_id", "day", "status", name=op.f("pk_firs_submission_daily_rollups")
+        ),
+    )
+    _backfill_rollups()
+
+
+def downgrade() -> None:
+    op.drop_table("firs_submission_daily_rollups")
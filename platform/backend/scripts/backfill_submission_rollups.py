@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Backfill FIRS Submission Rollups
+================================
+
+Rebuilds firs_submission_daily_rollups from firs_submissions, or verifies the
+rollups against the source table.
+
+Usage:
+  python platform/backend/scripts/backfill_submission_rollups.py
+  python platform/backend/scripts/backfill_submission_rollups.py --organization-id <uuid>
+  python platform/backend/scripts/backfill_submission_rollups.py --check [--repair]
+
+Requires DATABASE_URL to be set.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def run(organization_id: str | None, check: bool, repair: bool, batch_size: int) -> int:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from core_platform.data_management.db_async import init_async_engine
+    from core_platform.data_management.repositories.firs_submission_rollups_async import (
+        backfill_submission_rollups,
+        check_submission_rollups,
+    )
+
+    engine = init_async_engine()
+    SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async with SessionLocal() as db:
+        if check:
+            report = await check_submission_rollups(
+                db, organization_id=organization_id, repair=repair, batch_size=batch_size
+            )
+            print(json.dumps(report, indent=2))
+            return 0 if report["consistent"] or report["repaired"] else 2
+
+        result = await backfill_submission_rollups(db, organization_id=organization_id, batch_size=batch_size)
+
+    print(f"✅ Rebuilt {result['rows']} rollup rows from {result['submissions']} submissions")
+    return 0
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill or verify FIRS submission rollups")
+    parser.add_argument("--organization-id", default=None, help="Limit to one organization (UUID)")
+    parser.add_argument("--check", action="store_true", help="Compare rollups with firs_submissions instead")
+    parser.add_argument("--repair", action="store_true", help="With --check, rebuild organizations that drifted")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Source rows fetched per round trip")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        print("ERROR: DATABASE_URL is not set.")
+        sys.exit(1)
+
+    sys.exit(await run(args.organization_id, args.check, args.repair, args.batch_size))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
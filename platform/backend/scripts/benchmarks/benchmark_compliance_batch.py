@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Batch Compliance Benchmark
+==========================
+Validates the same workload (distinct invoices with a share of duplicates)
+three ways, with the report cache disabled:
+
+- single: one check_full_compliance call per invoice on the event loop
+- batch: check_batch_compliance_async with in-process validation
+- workers: check_batch_compliance_async fanned out over worker processes
+
+While each mode runs, a ticker measures the worst event-loop delay.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_compliance_batch.py --invoices 5000 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from si_services.schema_compliance import configure_schema_compliance  # noqa: E402
+from si_services.schema_compliance.compliance_checker import ComplianceLevel, compliance_checker  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from benchmark_compliance_cache import make_invoice  # noqa: E402
+
+
+async def measure(mode: str, workload: List[Dict[str, Any]], workers: int, chunk_size: int) -> Dict[str, float]:
+    lag = {"max": 0.0}
+    stop = asyncio.Event()
+
+    async def ticker() -> None:
+        while not stop.is_set():
+            expected = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            lag["max"] = max(lag["max"], time.perf_counter() - expected)
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    if mode == "single":
+        for document in workload:
+            compliance_checker.check_full_compliance(document, ComplianceLevel.STRICT, use_cache=False)
+    else:
+        await compliance_checker.check_batch_compliance_async(
+            workload,
+            compliance_level=ComplianceLevel.STRICT,
+            use_cache=False,
+            max_workers=workers if mode == "workers" else 1,
+            chunk_size=chunk_size,
+        )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick_task
+    return {"seconds": elapsed, "rate": len(workload) / elapsed, "max_lag_ms": lag["max"] * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invoices", type=int, default=5000)
+    parser.add_argument("--duplicates", type=float, default=0.2, help="fraction of invoices that repeat another")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    configure_schema_compliance()
+    distinct = max(1, int(args.invoices * (1 - args.duplicates)))
+    workload = [make_invoice(index % distinct) for index in range(args.invoices)]
+
+    print(f"{'mode':<8} {'seconds':>9} {'inv/s':>9} {'max loop lag ms':>16}")
+    for mode in ("single", "batch", "workers"):
+        result = asyncio.run(measure(mode, workload, args.workers, args.chunk_size))
+        print(f"{mode:<8} {result['seconds']:>9.2f} {result['rate']:>9.0f} {result['max_lag_ms']:>16.1f}")
+    compliance_checker.shutdown_batch_pool()
+    print(f"workers={args.workers} cpus={os.cpu_count()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compliance Report Cache Benchmark
+=================================
+Runs full STRICT compliance checks with the configured UBL validator, schema
+transformer, business rules and custom validator over a workload in which
+each distinct invoice is validated ``--repeats`` times (retries,
+resubmissions, re-validation), with and without the report cache.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_compliance_cache.py --invoices 500 --repeats 5
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from si_services.schema_compliance import configure_schema_compliance  # noqa: E402
+from si_services.schema_compliance.compliance_checker import ComplianceLevel, compliance_checker  # noqa: E402
+
+
+def make_invoice(index: int) -> Dict[str, Any]:
+    lines = [
+        {"product_name": f"Item {n}", "quantity": n + 1, "price_unit": 1000.0, "tax_rate": 7.5}
+        for n in range(5)
+    ]
+    subtotal = sum(line["quantity"] * line["price_unit"] for line in lines)
+    return {
+        "invoice_number": f"INV-{index:06d}",
+        "invoice_date": "2026-10-01",
+        "currency": "NGN",
+        "partner_id": {"name": f"Customer {index}", "vat": "12345678-0001"},
+        "company_id": {"name": "Supplier Ltd", "vat": "87654321-0001"},
+        "invoice_line_ids": lines,
+        "amount_untaxed": subtotal,
+        "amount_tax": subtotal * 0.075,
+        "amount_total": subtotal * 1.075,
+    }
+
+
+def run(workload: List[Dict[str, Any]], use_cache: bool) -> Dict[str, float]:
+    compliance_checker.invalidate_report_cache()
+    latencies = []
+    start = time.perf_counter()
+    for document in workload:
+        began = time.perf_counter()
+        compliance_checker.check_full_compliance(
+            document,
+            compliance_level=ComplianceLevel.STRICT,
+            context={"organization_id": "org-bench", "source": "benchmark"},
+            use_cache=use_cache,
+        )
+        latencies.append((time.perf_counter() - began) * 1000)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "seconds": elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "rate": len(workload) / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invoices", type=int, default=500, help="distinct invoices")
+    parser.add_argument("--repeats", type=int, default=5, help="validations per invoice")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    configure_schema_compliance()
+    workload = [make_invoice(index) for index in range(args.invoices) for _ in range(args.repeats)]
+    random.Random(args.seed).shuffle(workload)
+
+    print(f"{'mode':<10} {'seconds':>9} {'p50 ms':>8} {'p95 ms':>8} {'checks/s':>9}")
+    for mode, use_cache in (("uncached", False), ("cached", True)):
+        result = run(workload, use_cache)
+        print(f"{mode:<10} {result['seconds']:>9.2f} {result['p50_ms']:>8.3f} "
+              f"{result['p95_ms']:>8.3f} {result['rate']:>9.0f}")
+
+    stats = compliance_checker.report_cache.get_stats()
+    print(f"cache hits {stats['hits']} misses {stats['misses']} hit rate {stats['hit_rate']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Open Banking Duplicate Detector Benchmark
+=========================================
+Runs DuplicateDetector.check_batch_duplicates over seeded batches of
+increasing size against an in-memory SQLite ``transactions`` table of
+``--history`` rows, with pairwise batch checks and per-transaction window
+queries (``indexed_batches=False``) and in indexed mode. Reports throughput,
+the number of time-window range queries and whether findings agree.
+
+Only the hash and time-window default rules run: the field-based and strict
+rules issue the same per-transaction lookups in both modes.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_duplicate_detector.py --sizes 1000,2000,4000,8000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from external_integrations.financial_systems.banking.open_banking.transaction_processing.duplicate_detector import (  # noqa: E402
+    DuplicateDetector,
+    DuplicateStrategy,
+)
+
+_COLUMNS = ("id", "amount", "account_number", "description", "date", "reference")
+
+
+class SqliteDatabase:
+    def __init__(self, history: List[SimpleNamespace]) -> None:
+        self.conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(
+            """
+            CREATE TABLE transactions (id TEXT, amount REAL, account_number TEXT, description TEXT,
+                                       date TIMESTAMP, reference TEXT);
+            CREATE INDEX ix_transactions_date ON transactions (date);
+            CREATE TABLE transaction_hashes (id TEXT PRIMARY KEY, hash TEXT);
+            CREATE INDEX ix_transaction_hashes_hash ON transaction_hashes (hash);
+            CREATE TABLE duplicate_detections (transaction_id TEXT, is_duplicate INTEGER, matches_count INTEGER,
+                                               detection_timestamp TIMESTAMP, details TEXT);
+            """
+        )
+        self.conn.executemany(
+            "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)",
+            [tuple(getattr(tx, column) for column in _COLUMNS) for tx in history],
+        )
+        self.window_queries = 0
+
+    async def fetch_all(self, query, params=()):
+        if "date BETWEEN" in query:
+            self.window_queries += 1
+        return self.conn.execute(query, tuple(params)).fetchall()
+
+    async def execute(self, query, params=()):
+        self.conn.execute(query, tuple(params))
+
+
+class DictCache:
+    def __init__(self) -> None:
+        self.values: Dict[str, str] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.values[key] = value
+
+
+def corpus(size: int, args: argparse.Namespace) -> Tuple[List[SimpleNamespace], List[SimpleNamespace]]:
+    rng = random.Random(args.seed)
+    start = datetime(2024, 5, 1)
+
+    def transaction(tx_id: str) -> SimpleNamespace:
+        return SimpleNamespace(
+            id=tx_id,
+            amount=rng.randrange(1, 400) * 250.5,
+            account_number=f"{rng.randrange(args.accounts):010d}",
+            description=rng.choice(["POS purchase", "Transfer to GTB", "ATM withdrawal", "Airtime", None]),
+            date=start + timedelta(minutes=rng.randrange(0, 7 * 24 * 60)),
+            reference=f"REF-{rng.randrange(1000)}",
+        )
+
+    history = [transaction(f"hist-{index}") for index in range(args.history)]
+    batch: List[SimpleNamespace] = []
+    for index in range(size):
+        if batch and rng.random() < args.duplicate_fraction:
+            batch.append(SimpleNamespace(**{**vars(rng.choice(batch)), "id": f"copy-{index}"}))
+        else:
+            batch.append(transaction(f"tx-{index}"))
+    return history, batch
+
+
+async def run(indexed: bool, history, batch) -> Tuple[float, int, list]:
+    database = SqliteDatabase(history)
+    detector = DuplicateDetector(database, DictCache(), indexed_batches=indexed)
+    detector.detection_rules = [
+        rule for rule in detector.detection_rules
+        if rule.strategy in (DuplicateStrategy.HASH_BASED, DuplicateStrategy.TIME_WINDOW)
+    ]
+    start = time.perf_counter()
+    results = await detector.check_batch_duplicates(batch)
+    elapsed = time.perf_counter() - start
+    findings = [
+        (r.transaction_id, r.is_duplicate, [(m.original_transaction_id, m.detection_rule) for m in r.matches or []])
+        for r in results
+    ]
+    return len(batch) / elapsed, database.window_queries, findings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,2000,4000,8000", help="comma-separated batch sizes")
+    parser.add_argument("--history", type=int, default=5000)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--duplicate-fraction", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'batch':>6} {'mode':<9} {'tx/s':>9} {'window queries':>15} {'findings match':>15}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        history, batch = corpus(size, args)
+        pairwise = asyncio.run(run(False, history, batch))
+        indexed = asyncio.run(run(True, history, batch))
+        for mode, (rate, queries, _) in (("pairwise", pairwise), ("indexed", indexed)):
+            print(f"{size:>6} {mode:<9} {rate:>9.0f} {queries:>15} {str(indexed[2] == pairwise[2]):>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+FIRS HTTP Client Benchmark
+==========================
+Drives FIRSHttpClient.lookup_transmit_by_irn against a local aiohttp stub
+that answers in ``--latency-ms`` except for a ``--slow-fraction`` of requests
+that take ``--slow-ms``. The certificate provider blocks for
+``--cert-lookup-ms`` per call, like a store read.
+
+Modes:
+- defaults: aiohttp connector defaults, certificate resolved per request
+- tuned: FIRSHttpPoolSettings defaults (pooling, keep-alive, DNS cache, header cache)
+- hedged: tuned plus a hedge after ``--hedge-after-ms``
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_firs_http_client.py --requests 2000 --concurrency 32
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+from aiohttp import web
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app_services.firs_communication.firs_http_client import (  # noqa: E402
+    FIRSHttpClient,
+    FIRSHttpPoolSettings,
+)
+
+
+class SlowStoreProvider:
+    """Certificate provider whose lookup blocks like a store read."""
+
+    generation = 0
+
+    def __init__(self, lookup_ms: float):
+        self.lookup_seconds = lookup_ms / 1000.0
+        self.calls = 0
+
+    def get_active_certificate(self):
+        self.calls += 1
+        time.sleep(self.lookup_seconds)
+        return "Y2VydGlmaWNhdGU="
+
+
+async def start_stub(latency_ms: float, slow_ms: float, slow_fraction: float, seed: int):
+    rng = random.Random(seed)
+    peers = set()
+
+    async def lookup(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        delay = slow_ms if rng.random() < slow_fraction else latency_ms
+        await asyncio.sleep(delay / 1000.0)
+        return web.json_response({"irn": request.match_info["irn"], "status": "TRANSMITTED"})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/invoice/transmit/lookup/{irn}", lookup)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", peers
+
+
+async def run(mode: str, args: argparse.Namespace) -> Dict[str, float]:
+    runner, base_url, peers = await start_stub(args.latency_ms, args.slow_ms, args.slow_fraction, args.seed)
+    if mode == "defaults":
+        # aiohttp's own connector defaults, nothing cached
+        settings = FIRSHttpPoolSettings(
+            limit=100, limit_per_host=0, keepalive_timeout=15.0, dns_ttl_seconds=10,
+            total_timeout=30.0, connect_timeout=30.0, header_cache_seconds=0.0,
+        )
+    else:
+        settings = FIRSHttpPoolSettings(hedge_after_ms=args.hedge_after_ms if mode == "hedged" else 0.0)
+    provider = SlowStoreProvider(args.cert_lookup_ms)
+    client = FIRSHttpClient(base_url, certificate_provider=provider, pool_settings=settings)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            began = time.perf_counter()
+            result = await client.lookup_transmit_by_irn(f"IRN-{index}")
+            latencies.append((time.perf_counter() - began) * 1000)
+            assert result["success"], result
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    metrics = client.get_metrics()
+    await client.stop()
+    await runner.cleanup()
+
+    latencies.sort()
+    return {
+        "rate": args.requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "cert_calls": provider.calls,
+        "connections": len(peers),
+        "hedged": metrics["hedged_requests"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--slow-ms", type=float, default=250.0)
+    parser.add_argument("--slow-fraction", type=float, default=0.03)
+    parser.add_argument("--cert-lookup-ms", type=float, default=0.5)
+    parser.add_argument("--hedge-after-ms", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'mode':<9} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'cert calls':>11} {'conns':>6} {'hedged':>7}")
+    for mode in ("defaults", "tuned", "hedged"):
+        r = asyncio.run(run(mode, args))
+        print(f"{mode:<9} {r['rate']:>8.0f} {r['p50']:>8.1f} {r['p99']:>8.1f} "
+              f"{r['cert_calls']:>11} {r['connections']:>6} {r['hedged']:>7}")
+
+
+if __name__ == "__main__":
+    main()
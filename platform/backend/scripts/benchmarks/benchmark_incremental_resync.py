@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Incremental Sync Resync Benchmark
+=================================
+Runs an initial sync of a simulated ERP, then restarts the service and runs a
+forced full resync in which a small fraction of invoices changed:
+
+- cold: the change index starts empty on restart (the old in-memory hashes),
+  so every record goes through downstream processing again
+- durable: the change index persists on disk, so only changed records do
+
+The adapter pages invoices lazily, so peak memory reflects the sync pipeline
+rather than the fixture.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_incremental_resync.py --invoices 500000 --changed 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from si_services.data_extraction.erp_data_extractor import (  # noqa: E402
+    ERPAdapter,
+    ERPDataExtractor,
+    ERPType,
+    InvoiceData,
+)
+from si_services.data_extraction.incremental_sync import (  # noqa: E402
+    IncrementalSyncService,
+    SyncConfig,
+    SyncResult,
+    SyncStatus,
+)
+
+BASE = datetime(2026, 1, 1)
+
+
+class SimulatedERP(ERPAdapter):
+    """Generates invoices page by page; every ``changed_every``-th is edited after ``revision`` 0."""
+
+    def __init__(self, total: int, changed_every: int):
+        super().__init__({})
+        self.total = total
+        self.changed_every = changed_every
+        self.revision = 0
+
+    def _invoice(self, index: int) -> InvoiceData:
+        edited = self.revision and self.changed_every and index % self.changed_every == 0
+        updated = BASE + timedelta(seconds=index + (86400 * 30 if edited else 0))
+        return InvoiceData(
+            invoice_id=f"inv_{index}", invoice_number=f"INV-{index:07d}", invoice_date=BASE, due_date=None,
+            customer_id="c1", customer_name="Customer", customer_tin=None, currency="NGN",
+            subtotal=100.0, tax_amount=7.5, total_amount=107.5 + (1 if edited else 0), line_items=[],
+            payment_terms=None, notes=None, status="posted", created_at=BASE, updated_at=updated,
+        )
+
+    async def iter_invoice_pages(self, filters):
+        for start in range(0, self.total, filters.batch_size):
+            yield [self._invoice(i) for i in range(start, min(start + filters.batch_size, self.total))]
+
+    async def extract_invoices(self, filters):
+        return [self._invoice(i) for i in range(self.total)]
+
+    async def connect(self):
+        return True
+
+    async def disconnect(self):
+        pass
+
+    async def test_connection(self):
+        return True
+
+    async def get_invoice_count(self, filters):
+        return self.total
+
+    async def validate_credentials(self):
+        return True
+
+
+class CountingSyncService(IncrementalSyncService):
+    """Counts records that reach downstream handlers."""
+
+    downstream = 0
+
+    async def _handle_create(self, change, sync_result):
+        CountingSyncService.downstream += 1
+
+    async def _handle_update(self, change, sync_result):
+        CountingSyncService.downstream += 1
+
+
+async def sync_once(adapter: SimulatedERP, config: SyncConfig) -> SyncResult:
+    extractor = ERPDataExtractor()
+    extractor.register_adapter(ERPType.ODOO, adapter)
+    service = CountingSyncService(config, extractor)
+    result = SyncResult(sync_id="bench", erp_type=ERPType.ODOO, status=SyncStatus.PENDING,
+                        start_time=datetime.now(), end_time=None)
+    await service._perform_sync(result, force_full_sync=True)
+    await service.close()
+    return result
+
+
+async def run(mode: str, invoices: int, changed: float, batch_size: int) -> Dict[str, float]:
+    changed_every = max(1, round(1 / changed)) if changed > 0 else 0
+    adapter = SimulatedERP(invoices, changed_every)
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        def config(index_name: str) -> SyncConfig:
+            return SyncConfig(
+                sync_state_storage_path=state_dir,
+                max_sync_batch_size=batch_size,
+                change_index_path=str(Path(state_dir) / index_name),
+            )
+
+        await sync_once(adapter, config("index.db"))
+
+        # Restart: cold mode loses all hashes, durable mode reopens the same index
+        adapter.revision = 1
+        CountingSyncService.downstream = 0
+        start = time.perf_counter()
+        result = await sync_once(adapter, config("fresh.db" if mode == "cold" else "index.db"))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "seconds": elapsed,
+        "downstream": CountingSyncService.downstream,
+        "skipped": result.records_skipped,
+        "rate": invoices / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invoices", type=int, default=500_000)
+    parser.add_argument("--changed", type=float, default=0.01, help="fraction of invoices edited before resync")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'mode':<8} {'seconds':>9} {'downstream':>11} {'skipped':>9} {'inv/s':>9}")
+    for mode in ("cold", "durable"):
+        result = asyncio.run(run(mode, args.invoices, args.changed, args.batch_size))
+        print(f"{mode:<8} {result['seconds']:>9.2f} {result['downstream']:>11} "
+              f"{result['skipped']:>9} {result['rate']:>9.0f}")
+    print(f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
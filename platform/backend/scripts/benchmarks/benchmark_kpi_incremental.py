@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+KPI Incremental Recompute Benchmark
+===================================
+Replays a stream of ``metrics.updated`` events, each followed by a dashboard
+request over every default KPI, and compares:
+
+- wholesale: every event recomputes the KPIs using the metric and every
+  dashboard request recomputes all KPIs (previous behaviour)
+- incremental: events invalidate affected KPIs through the dependency graph
+  and dashboards are served from the memo except for dirty KPIs
+
+Metric aggregation is simulated with a fixed latency per call.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_kpi_incremental.py --events 200 --aggregate-latency-ms 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from hybrid_services.analytics_aggregation.kpi_calculator import KPICalculator  # noqa: E402
+from hybrid_services.analytics_aggregation.unified_metrics import (  # noqa: E402
+    AggregatedMetric,
+    AggregationMethod,
+)
+
+
+class SimulatedMetrics:
+    """UnifiedMetrics stand-in returning fixed values after a simulated delay."""
+
+    def __init__(self, metric_ids: List[str], latency_ms: float):
+        self.values = {metric_id: random.uniform(1, 1000) for metric_id in metric_ids}
+        self.latency_s = latency_ms / 1000.0
+        self.calls = 0
+
+    async def aggregate_metrics(self, metric_ids, time_range, aggregation_method=None, dimensions=None):
+        self.calls += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return [
+            AggregatedMetric(
+                metric_id=metric_id,
+                aggregated_value=self.values[metric_id],
+                aggregation_method=AggregationMethod.SUM,
+                aggregation_period="benchmark",
+                source_count=1,
+                confidence_level=1.0,
+                timestamp=time_range[1],
+                dimensions={},
+                breakdown={},
+            )
+            for metric_id in metric_ids if metric_id in self.values
+        ]
+
+
+def _metric_ids(calculator: KPICalculator) -> List[str]:
+    return sorted({
+        metric_id
+        for kpi_def in calculator.kpi_definitions.values()
+        for metric_id in kpi_def.source_metrics
+        if metric_id not in calculator.kpi_definitions
+    })
+
+
+async def _wholesale_event(calculator: KPICalculator, metric_id: str) -> int:
+    """Previous handler: recompute every KPI listing the metric, one by one."""
+    end_time = datetime.now(timezone.utc)
+    relevant = [k for k, d in calculator.kpi_definitions.items() if metric_id in d.source_metrics]
+    for kpi_id in relevant:
+        await calculator.calculate_kpi(kpi_id, (end_time - timedelta(hours=1), end_time), "metric_updated")
+    return len(relevant)
+
+
+async def run(mode: str, events: int, latency_ms: float, seed: int) -> Dict[str, float]:
+    random.seed(seed)
+    calculator = KPICalculator(unified_metrics=None)
+    metrics = SimulatedMetrics(_metric_ids(calculator), latency_ms)
+    calculator.unified_metrics = metrics
+    kpi_ids = list(calculator.kpi_definitions)
+    updates = [random.choice(list(metrics.values)) for _ in range(events)]
+
+    # Dashboards refresh a fixed reporting window; memo entries are keyed by it
+    end_time = datetime.now(timezone.utc)
+    dashboard_window = (end_time - timedelta(days=30), end_time)
+
+    dashboard_ms: List[float] = []
+    for metric_id in updates:
+        metrics.values[metric_id] = random.uniform(1, 1000)
+        if mode == "wholesale":
+            await _wholesale_event(calculator, metric_id)
+        else:
+            await calculator._handle_metrics_updated({"metric_id": metric_id})
+
+        start = time.perf_counter()
+        await calculator.calculate_multiple_kpis(
+            kpi_ids,
+            dashboard_window,
+            "dashboard",
+            use_memo=(mode == "incremental")
+        )
+        dashboard_ms.append((time.perf_counter() - start) * 1000)
+
+    stats = calculator.get_incremental_stats()
+    dashboard_ms.sort()
+    return {
+        "recomputes": stats["recomputes"],
+        "recomputes_per_event": stats["recomputes"] / events,
+        "aggregate_calls": metrics.calls,
+        "dashboard_p50_ms": dashboard_ms[len(dashboard_ms) // 2],
+        "dashboard_p99_ms": dashboard_ms[min(len(dashboard_ms) - 1, int(len(dashboard_ms) * 0.99))],
+        "memo_hit_rate": stats["memo_hit_rate"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--aggregate-latency-ms", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'mode':<12} {'recomputes':>10} {'per event':>10} {'agg calls':>10} "
+          f"{'dash p50 ms':>12} {'dash p99 ms':>12} {'memo hit':>9}")
+    for mode in ("wholesale", "incremental"):
+        result = asyncio.run(run(mode, args.events, args.aggregate_latency_ms, args.seed))
+        print(f"{mode:<12} {result['recomputes']:>10} {result['recomputes_per_event']:>10.1f} "
+              f"{result['aggregate_calls']:>10} {result['dashboard_p50_ms']:>12.2f} "
+              f"{result['dashboard_p99_ms']:>12.2f} {result['memo_hit_rate']:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Memory Cache Benchmark
+======================
+Measures get/set throughput of the core L1 ``MemoryCache`` (OrderedDict LRU)
+against the list-based access-order cache it replaced, at several cache sizes.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_memory_cache.py --sizes 1000 10000 100000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from core_platform.data_management.cache_manager import MemoryCache, tenant_partition_key  # noqa: E402
+
+
+class ListLRUCache:
+    """List-tracked LRU used before the OrderedDict rewrite (O(n) touch/evict)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._cache: Dict[str, Tuple[Any, float]] = {}
+        self._access_order: List[str] = []
+
+    def get(self, key: str) -> Optional[Any]:
+        if key in self._cache:
+            value, expiry = self._cache[key]
+            if expiry > 0 and time.time() > expiry:
+                del self._cache[key]
+                self._access_order.remove(key)
+                return None
+            self._access_order.remove(key)
+            self._access_order.append(key)
+            return value
+        return None
+
+    def set(self, key: str, value: Any, ttl: int = 0):
+        expiry = time.time() + ttl if ttl > 0 else 0
+        if key in self._cache:
+            self._access_order.remove(key)
+        self._cache[key] = (value, expiry)
+        self._access_order.append(key)
+        while len(self._cache) > self.max_size:
+            del self._cache[self._access_order.pop(0)]
+
+
+def _ops_per_second(cache: Any, keys: List[str], operations: int, ttl: int) -> Tuple[float, float]:
+    rng = random.Random(7)
+    sample = [rng.choice(keys) for _ in range(operations)]
+
+    start = time.perf_counter()
+    for key in sample:
+        cache.set(key, key, ttl)
+    set_rate = operations / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key in sample:
+        cache.get(key)
+    get_rate = operations / (time.perf_counter() - start)
+    return get_rate, set_rate
+
+
+def main(sizes: List[int], operations: int, ttl: int, skip_legacy_above: int) -> None:
+    print(f"{'entries':>8}  {'impl':<12}{'get ops/s':>14}{'set ops/s':>14}")
+    for size in sizes:
+        keys = [f"tenant:{i % 50}:invoice:{i}" for i in range(size)]
+        candidates = [("ordereddict", MemoryCache(size, partition_key=tenant_partition_key))]
+        if size <= skip_legacy_above:
+            candidates.append(("list", ListLRUCache(size)))
+
+        for name, cache in candidates:
+            for key in keys:
+                cache.set(key, key, ttl)
+            get_rate, set_rate = _ops_per_second(cache, keys, operations, ttl)
+            print(f"{size:>8}  {name:<12}{get_rate:>14,.0f}{set_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the core in-memory LRU cache")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--operations", type=int, default=20000, help="get and set calls per size")
+    parser.add_argument("--ttl", type=int, default=3600, help="TTL seconds for entries")
+    parser.add_argument("--skip-legacy-above", type=int, default=100000,
+                        help="Skip the list-based cache above this size (it is very slow)")
+    args = parser.parse_args()
+    main(args.sizes, args.operations, args.ttl, args.skip_legacy_above)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Mono Sync State Benchmark
+=========================
+Registers ``--pages`` pages of ``--page-size`` dedupe keys (with
+``--duplicate-fraction`` replays) against SqlSyncStateStore on SQLite, once
+key by key and once a page at a time, then syncs ``--accounts`` accounts
+through MonoTransactionSyncService against a client with ``--latency-ms`` of
+simulated API latency, sequentially and with ``--concurrency`` workers.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_mono_sync_state.py --pages 50 --accounts 40
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from core_platform.data_management.models import BankingSyncCursor, BankingSyncDedupeKey  # noqa: E402
+from external_integrations.connector_framework.shared_utilities.retry_manager import (  # noqa: E402
+    RetryConfig,
+    RetryManager,
+)
+from external_integrations.financial_systems.banking.open_banking.providers.mono.sync_state import (  # noqa: E402
+    SqlSyncStateStore,
+)
+from external_integrations.financial_systems.banking.open_banking.providers.mono.transaction_sync import (  # noqa: E402
+    InMemorySyncStateStore,
+    MonoTransactionSyncService,
+)
+
+
+async def register(batched: bool, args: argparse.Namespace) -> float:
+    rng = random.Random(args.seed)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{args.db}")
+    async with engine.begin() as conn:
+        for table in (BankingSyncCursor.__table__, BankingSyncDedupeKey.__table__):
+            await conn.run_sync(table.drop, checkfirst=True)
+            await conn.run_sync(table.create)
+    store = SqlSyncStateStore(async_sessionmaker(bind=engine, expire_on_commit=False))
+
+    issued = []
+    start = time.perf_counter()
+    for _ in range(args.pages):
+        page = []
+        for _ in range(args.page_size):
+            if issued and rng.random() < args.duplicate_fraction:
+                page.append(rng.choice(issued))
+            else:
+                issued.append(f"{rng.getrandbits(128):032x}")
+                page.append(issued[-1])
+        if batched:
+            await store.register_transactions("acct-1", page)
+        else:
+            for key in page:
+                await store.register_transaction("acct-1", key)
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return args.pages * args.page_size / elapsed
+
+
+class _LatencyClient:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def get(self, path, params=None):
+        await asyncio.sleep(self.latency)
+        account_id = path.split("/")[3]
+        return {
+            "paging": {},
+            "data": [
+                {"id": f"{account_id}-{index}", "amount": 100 + index, "date": "2024-05-01",
+                 "narration": "POS", "type": "debit", "category": "pos", "balance": 1000}
+                for index in range(10)
+            ],
+        }
+
+
+async def sync(concurrency: int, args: argparse.Namespace) -> float:
+    async def emit(name, payload):
+        return None
+
+    service = MonoTransactionSyncService(
+        _LatencyClient(args.latency_ms / 1000),
+        InMemorySyncStateStore(),
+        emit,
+        retry_manager=RetryManager(RetryConfig(max_attempts=1)),
+    )
+    start = time.perf_counter()
+    await service.sync_accounts([f"acct-{index}" for index in range(args.accounts)], concurrency=concurrency)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--duplicate-fraction", type=float, default=0.1)
+    parser.add_argument("--accounts", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--db", default="/tmp/benchmark_mono_sync_state.db")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'registration':<14} {'keys/s':>10}")
+    for batched in (False, True):
+        rate = asyncio.run(register(batched, args))
+        print(f"{'per page' if batched else 'per key':<14} {rate:>10.0f}")
+    print()
+    print(f"{'concurrency':<14} {'seconds':>10}")
+    for concurrency in (1, args.concurrency):
+        print(f"{concurrency:<14} {asyncio.run(sync(concurrency, args)):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
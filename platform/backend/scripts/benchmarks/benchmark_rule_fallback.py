@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Rule Fallback Benchmark
+=======================
+Measures narrations/second for the rule-based fallback classifier keyword scan
+(compiled keyword automaton vs. the per-keyword substring loop it replaced) and
+for end-to-end batch classification.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_rule_fallback.py --count 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from external_integrations.connector_framework.classification_engine.classification_models import (  # noqa: E402
+    TransactionClassificationRequest,
+    UserContext,
+)
+from external_integrations.connector_framework.classification_engine.rule_fallback import (  # noqa: E402
+    NigerianRuleFallback,
+    PatternMatcher,
+)
+
+SAMPLE_NARRATIONS = [
+    "POS PURCHASE SHOPRITE LEKKI 2345 REF 88271",
+    "TRF/ payment for goods from Alaba market",
+    "NIP TRANSFER TO JOHN DOE salary may",
+    "AIRTIME RECHARGE MTN 08031234567",
+    "USSD transfer 000123 family upkeep",
+    "Consultation professional fee Q2 invoice 0045",
+    "WEB TRANSFER 8812 IKEJA COMPUTER VILLAGE",
+    "REVERSAL OF FAILED TXN 77120",
+]
+
+
+def _legacy_scan(matcher: PatternMatcher, narration: str) -> int:
+    """Per-keyword substring loop used before the compiled engine."""
+    narration_lower = narration.lower()
+    hits = 0
+    for families in (matcher.business_patterns, matcher.personal_patterns):
+        for pattern_data in families.values():
+            for keyword in pattern_data['keywords']:
+                if keyword in narration_lower:
+                    hits += 1
+    for locations in matcher.nigerian_business_locations.values():
+        for location in locations:
+            if location in narration_lower:
+                hits += 1
+    return hits
+
+
+def _rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:,.0f} narrations/s ({seconds * 1000:.1f} ms)"
+
+
+async def main(count: int) -> None:
+    rng = random.Random(42)
+    narrations = [
+        f"{rng.choice(SAMPLE_NARRATIONS)} {rng.randint(100000, 999999)}" for _ in range(count)
+    ]
+    matcher = PatternMatcher()
+
+    start = time.perf_counter()
+    for narration in narrations:
+        _legacy_scan(matcher, narration)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for narration in narrations:
+        matcher.find_keywords(narration)
+    compiled = time.perf_counter() - start
+
+    print(f"Keyword scan ({len(matcher.keyword_automaton)} keywords, {count} narrations)")
+    print(f"  per-keyword loop : {_rate(count, legacy)}")
+    print(f"  compiled engine  : {_rate(count, compiled)}")
+
+    context = UserContext(user_id="bench", organization_id="bench-org")
+    requests = [
+        TransactionClassificationRequest(
+            transaction_id=f"tx-{i}",
+            amount=Decimal(rng.choice([1500, 25000, 100000, 2750000])),
+            narration=narration,
+            date=datetime(2024, 5, 6, 10, 30),
+            time="10:30",
+            user_context=context,
+        )
+        for i, narration in enumerate(narrations)
+    ]
+    fallback = NigerianRuleFallback()
+
+    start = time.perf_counter()
+    await fallback.classify_transactions(requests)
+    batch = time.perf_counter() - start
+    print(f"  batch classification : {_rate(count, batch)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark rule-based fallback classification")
+    parser.add_argument("--count", type=int, default=20000, help="Number of narrations")
+    args = parser.parse_args()
+    asyncio.run(main(args.count))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Trace Analytics Benchmark
+=========================
+Loads ``--traces`` traces across ``--operations`` operations into a
+TraceCollector (every trace kept), then times get_operation_performance,
+get_service_dependencies and get_error_analysis against an exact baseline
+that scans and sorts the retained spans, as those calls used to. Repeat
+with larger ``--traces`` to see the analytics cost stay flat while the
+baseline grows with span volume.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_trace_analytics.py --traces 20000 --operations 40
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from core_platform.monitoring.trace_collector import (  # noqa: E402
+    SpanStatus,
+    TailSamplingConfig,
+    TraceCollector,
+)
+
+
+def exact_operation_performance(collector: TraceCollector):
+    """Scan-and-sort baseline over every retained span"""
+    by_operation = defaultdict(list)
+    for span in collector.completed_spans:
+        by_operation[f"{span.service_name}.{span.operation_name}"].append(span.duration_ms)
+    result = {}
+    for operation, durations in by_operation.items():
+        ordered = sorted(durations)
+        result[operation] = {
+            "p95_duration_ms": ordered[int(0.95 * (len(ordered) - 1))],
+            "avg_duration_ms": sum(ordered) / len(ordered),
+        }
+    return result
+
+
+def timed(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+async def load(args: argparse.Namespace) -> TraceCollector:
+    rng = random.Random(args.seed)
+    collector = TraceCollector(
+        max_spans=args.traces * 2,
+        tail_sampling=TailSamplingConfig(max_buffered_spans=args.traces * 2, default_latency_threshold_ms=1e9),
+    )
+    collector.default_sample_rate = 1.0
+    for index in range(args.traces):
+        operation = index % args.operations
+        root = collector.start_span(f"op_{operation}", f"service_{operation % 8}", "core")
+        child = collector.start_span("query", "database", "core")
+        collector.active_spans[child].start_time -= timedelta(milliseconds=rng.lognormvariate(3, 1))
+        collector.finish_span(child, status=SpanStatus.ERROR if rng.random() < 0.02 else SpanStatus.OK)
+        collector.finish_span(root)
+        if index % 1000 == 0:
+            await asyncio.sleep(0)
+    for _ in range(3):
+        await asyncio.sleep(0)
+    return collector
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", type=int, default=20000)
+    parser.add_argument("--operations", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=9)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    collector = asyncio.run(load(args))
+
+    exact = exact_operation_performance(collector)["database.query"]["p95_duration_ms"]
+    sketched = collector.get_operation_performance()["database.query"]["p95_duration_ms"]
+    print(f"spans retained: {len(collector.completed_spans)}  "
+          f"database.query p95 exact {exact:.1f} ms, sketch {sketched:.1f} ms")
+    print(f"{'call':<28} {'ms/call':>9}")
+    rows = [
+        ("scan+sort baseline", lambda: exact_operation_performance(collector)),
+        ("get_operation_performance", collector.get_operation_performance),
+        ("get_service_dependencies", collector.get_service_dependencies),
+        ("get_error_analysis", collector.get_error_analysis),
+    ]
+    for name, func in rows:
+        print(f"{name:<28} {timed(func, args.repeats):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Trace Sampling Benchmark
+========================
+Feeds ``--traces`` synthetic traces (a root span plus ``--spans`` children)
+through TraceCollector with head sampling and with tail sampling, at the
+same ``--sample-rate`` for healthy traces. ``--error-fraction`` of traces
+carry an errored span and ``--slow-fraction`` a span above the latency
+threshold; the report shows how many of those each mode retains, the span
+throughput and the peak number of spans held in memory.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_trace_sampling.py --traces 20000 --spans 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from core_platform.monitoring.trace_collector import (  # noqa: E402
+    SpanStatus,
+    TailSamplingConfig,
+    TraceCollector,
+)
+
+
+async def run(mode: str, args: argparse.Namespace) -> Dict[str, float]:
+    rng = random.Random(args.seed)
+    collector = TraceCollector(
+        max_spans=args.traces * (args.spans + 1),
+        tail_sampling=TailSamplingConfig(
+            enabled=mode == "tail",
+            max_buffered_spans=args.buffer_spans,
+            default_latency_threshold_ms=args.threshold_ms,
+        ),
+    )
+    collector.default_sample_rate = args.sample_rate
+
+    interesting = set()
+    peak_held = 0
+    start = time.perf_counter()
+    for index in range(args.traces):
+        trace_id = f"trace-{index}"
+        failing = rng.random() < args.error_fraction
+        slow = rng.random() < args.slow_fraction
+        if failing or slow:
+            interesting.add(trace_id)
+
+        root = collector.start_span("handle_request", "api_gateway", "core", trace_id=trace_id)
+        for child in range(args.spans):
+            span_id = collector.start_span("step", "worker", "core", trace_id=trace_id, parent_span_id=root)
+            last = child == args.spans - 1
+            if slow and last and not span_id.startswith("noop_"):
+                collector.active_spans[span_id].start_time -= timedelta(milliseconds=args.threshold_ms * 2)
+            collector.finish_span(span_id, status=SpanStatus.ERROR if failing and last else SpanStatus.OK)
+
+        if mode == "head":
+            # Head mode holds spans until the processor assembles them
+            held = len(collector.completed_spans)
+        else:
+            held = collector._tail_buffered_spans
+        peak_held = max(peak_held, held)
+        collector.finish_span(root)
+        if index % 500 == 0:
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0)
+
+    kept = {trace_id for trace_id, kept in collector._tail_decisions.items() if kept} if mode == "tail" else {
+        span.trace_id for span in collector.completed_spans
+    }
+    return {
+        "spans_per_s": args.traces * (args.spans + 1) / elapsed,
+        "kept": len(kept),
+        "interesting_kept": len(kept & interesting) / len(interesting) if interesting else 1.0,
+        "peak_held": peak_held,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", type=int, default=20000)
+    parser.add_argument("--spans", type=int, default=8, help="child spans per trace")
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--error-fraction", type=float, default=0.01)
+    parser.add_argument("--slow-fraction", type=float, default=0.01)
+    parser.add_argument("--threshold-ms", type=float, default=500.0)
+    parser.add_argument("--buffer-spans", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'mode':<6} {'spans/s':>9} {'traces kept':>12} {'error+slow kept':>16} {'peak spans held':>16}")
+    for mode in ("head", "tail"):
+        r = asyncio.run(run(mode, args))
+        print(f"{mode:<6} {r['spans_per_s']:>9.0f} {r['kept']:>12} "
+              f"{r['interesting_kept']:>16.1%} {r['peak_held']:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Batch Transmission Benchmark
+============================
+Measures the two stages of TransmissionService batch submission that scale
+with batch size, against a local SQLite file:
+
+- load: one get_invoice_record call per reference (the old loop) versus a
+  single get_invoice_records_bulk call
+- prepare: awaiting _prepare_invoice_for_submission for each invoice in
+  turn versus _prepare_invoices_for_submission, with real synchronous STRICT
+  validation and a synchronous RSA-2048 signer (plus ``--sign-latency-ms`` of
+  blocking wait standing in for a remote key store). The batch path
+  validates across at most ``--concurrency`` worker processes (capped by the
+  CPU count), so its gain on validation depends on the cores available
+
+The supplier TIN rule is disabled: the FIRS payloads lose the TIN when the
+checker transforms them back to UBL, and failed invoices are never signed.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_transmission_batch.py --invoices 5000 --concurrency 16
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from cryptography.hazmat.primitives import hashes  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import padding, rsa  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app_services.firs_communication.firs_payload_mapper import build_firs_invoice  # noqa: E402
+from app_services.transmission.transmission_service import TransmissionService  # noqa: E402
+from core_platform.messaging.message_router import MessageRouter  # noqa: E402
+from core_platform.data_management.models.firs_submission import FIRSSubmission  # noqa: E402
+from core_platform.data_management.models.organization import Organization  # noqa: E402
+from core_platform.data_management.models.si_app_correlation import SIAPPCorrelation  # noqa: E402
+from core_platform.data_management.repositories import invoice_repo_async as invoice_repo  # noqa: E402
+from si_services.schema_compliance import configure_schema_compliance  # noqa: E402
+from si_services.schema_compliance.compliance_checker import compliance_checker  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from benchmark_compliance_cache import make_invoice  # noqa: E402
+
+
+class RSASigner:
+    """Synchronous stand-in for DigitalCertificateService.sign_invoice_document."""
+
+    def __init__(self, latency: float) -> None:
+        self.key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.latency = latency
+
+    def sign_invoice_document(self, document: Dict[str, Any], certificate_id: str) -> Dict[str, Any]:
+        canonical_payload = json.dumps(document, sort_keys=True, separators=(",", ":"))
+        signature = self.key.sign(canonical_payload.encode(), padding.PKCS1v15(), hashes.SHA256())
+        if self.latency:
+            time.sleep(self.latency)
+        return {"signature": signature.hex(), "certificate_id": certificate_id}
+
+
+def firs_invoice(index: int) -> Dict[str, Any]:
+    invoice = build_firs_invoice(make_invoice(index))
+    invoice["supplierInformation"]["tin"] = "12345678-0001"
+    return invoice
+
+
+async def seed(session_factory, org_id: uuid.UUID, invoices: int) -> List[str]:
+    numbers = [f"INV-{index:07d}" for index in range(invoices)]
+    async with session_factory() as db:
+        db.add(Organization(id=org_id, name="Benchmark Org"))
+        await db.flush()
+        await db.execute(
+            FIRSSubmission.__table__.insert(),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "organization_id": org_id,
+                    "invoice_number": number,
+                    "invoice_data": {"invoiceNumber": number, "totalAmount": "107.50"},
+                    "total_amount": 107.5,
+                    "irn": f"IRN-{number}",
+                }
+                for number in numbers
+            ],
+        )
+        await db.commit()
+    return numbers
+
+
+async def run_load(invoices: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as db_dir:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(db_dir) / 'bench.db'}")
+        async with engine.begin() as conn:
+            for model in (Organization, FIRSSubmission, SIAPPCorrelation):
+                await conn.run_sync(model.__table__.create, checkfirst=True)
+
+        queries = {"count": 0}
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _count(*_args):
+            queries["count"] += 1
+
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+        org_id = uuid.uuid4()
+        numbers = await seed(session_factory, org_id, invoices)
+
+        for mode in ("per-ref", "bulk"):
+            queries["count"] = 0
+            start = time.perf_counter()
+            async with session_factory() as db:
+                if mode == "bulk":
+                    records = await invoice_repo.get_invoice_records_bulk(
+                        db,
+                        organization_id=org_id,
+                        references=[invoice_repo.InvoiceReference(invoice_number=number) for number in numbers],
+                    )
+                else:
+                    records = [
+                        await invoice_repo.get_invoice_record(db, organization_id=org_id, invoice_number=number)
+                        for number in numbers
+                    ]
+            elapsed = time.perf_counter() - start
+            assert all(records), "every reference should resolve"
+            results[mode] = {"seconds": elapsed, "queries": queries["count"], "rate": invoices / elapsed}
+
+        await engine.dispose()
+    return results
+
+
+async def run_prepare(invoices: int, sign_latency_ms: float, concurrency: int) -> Dict[str, Dict[str, float]]:
+    service = TransmissionService(message_router=MessageRouter())
+    service._digital_certificate_service = RSASigner(sign_latency_ms / 1000)
+
+    async def certificate_id(organization_id):
+        return "cert-bench"
+
+    service._get_signing_certificate_id = certificate_id
+    batch = [firs_invoice(index) for index in range(invoices)]
+    options = {"sign_before_transmit": True}
+
+    results: Dict[str, Dict[str, float]] = {}
+    for mode in ("serial", "batch"):
+        compliance_checker.invalidate_report_cache()
+        start = time.perf_counter()
+        if mode == "serial":
+            outcomes = []
+            for invoice in batch:
+                try:
+                    outcomes.append(await service._prepare_invoice_for_submission(
+                        invoice, organization_id="org-bench", invoice_number=None, options=options
+                    ))
+                except Exception as exc:
+                    outcomes.append(exc)
+        else:
+            outcomes = await service._prepare_invoices_for_submission(
+                batch, organization_id="org-bench", options=options, concurrency=concurrency
+            )
+        elapsed = time.perf_counter() - start
+        failed = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+        assert not failed, f"{len(failed)} invoices failed, first: {failed[0]!r}"
+        assert all(outcome[1]["signature"] for outcome in outcomes)
+        results[mode] = {"seconds": elapsed, "queries": 0, "rate": invoices / elapsed}
+    compliance_checker.shutdown_batch_pool()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invoices", type=int, default=5000)
+    parser.add_argument("--sign-latency-ms", type=float, default=0.0, help="blocking wait added to each signature")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    configure_schema_compliance()
+    compliance_checker.business_rule_engine.disable_rule("NG_SUPPLIER_TIN")
+    print(f"{'stage':<8} {'mode':<8} {'seconds':>9} {'queries':>8} {'inv/s':>9}")
+    stages = (
+        ("load", run_load(args.invoices)),
+        ("prepare", run_prepare(args.invoices, args.sign_latency_ms, args.concurrency)),
+    )
+    for stage, coroutine in stages:
+        for mode, result in asyncio.run(coroutine).items():
+            print(f"{stage:<8} {mode:<8} {result['seconds']:>9.2f} {result['queries']:>8} {result['rate']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Trend Analyzer Online Statistics Benchmark
+==========================================
+Slides a trend window forward one bucket at a time, as the periodic analysis
+and ``metrics.updated`` handler do, and compares:
+
+- refit: every request aggregates the whole window and refits with scipy
+- online: the series statistics ingest only newly completed buckets
+
+Metric aggregation is simulated with a fixed latency per bucket.
+
+Usage:
+  python platform/backend/scripts/benchmarks/benchmark_trend_online.py --steps 100 --window-hours 168
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+# Ensure backend modules are importable
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from hybrid_services.analytics_aggregation.trend_analyzer import TrendAnalyzer  # noqa: E402
+from hybrid_services.analytics_aggregation.unified_metrics import (  # noqa: E402
+    AggregatedMetric,
+    AggregationMethod,
+)
+
+ORIGIN = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+
+class SimulatedMetrics:
+    """UnifiedMetrics stand-in returning a noisy seasonal series per hourly bucket."""
+
+    metric_definitions = {"invoices_submitted": None}
+
+    def __init__(self, latency_ms: float):
+        self.latency_s = latency_ms / 1000.0
+        self.calls = 0
+
+    async def aggregate_metrics(self, metric_ids, time_range, aggregation_method=None, dimensions=None):
+        self.calls += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        hour = (time_range[0] - ORIGIN).total_seconds() / 3600
+        rng = random.Random(int(hour))
+        value = 500 + 0.4 * hour + 60 * math.sin(2 * math.pi * hour / 24) + rng.gauss(0, 10)
+        return [
+            AggregatedMetric(
+                metric_id=metric_ids[0],
+                aggregated_value=value,
+                aggregation_method=AggregationMethod.SUM,
+                aggregation_period="hour",
+                source_count=1,
+                confidence_level=1.0,
+                timestamp=time_range[1],
+                dimensions={},
+                breakdown={},
+            )
+        ]
+
+
+async def run(mode: str, steps: int, window_hours: int, latency_ms: float) -> Dict[str, float]:
+    metrics = SimulatedMetrics(latency_ms)
+    analyzer = TrendAnalyzer(unified_metrics=metrics, kpi_calculator=object())
+    window = timedelta(hours=window_hours)
+
+    latencies: List[float] = []
+    for step in range(steps):
+        end_time = ORIGIN + window + timedelta(hours=step)
+        start = time.perf_counter()
+        await analyzer.analyze_metric_trend(
+            "invoices_submitted",
+            (end_time - window, end_time),
+            refit=(mode == "refit")
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "aggregate_calls": metrics.calls,
+        "calls_per_request": metrics.calls / steps,
+        "p50_ms": latencies[len(latencies) // 2],
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--window-hours", type=int, default=168)
+    parser.add_argument("--aggregate-latency-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'mode':<8} {'agg calls':>10} {'per request':>12} {'p50 ms':>10} {'p99 ms':>10}")
+    for mode in ("refit", "online"):
+        result = asyncio.run(run(mode, args.steps, args.window_hours, args.aggregate_latency_ms))
+        print(f"{mode:<8} {result['aggregate_calls']:>10} {result['calls_per_request']:>12.1f} "
+              f"{result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
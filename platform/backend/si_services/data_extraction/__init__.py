@@ -9,6 +9,7 @@ Components:
 - erp_data_extractor: Core ERP data extraction with pluggable adapters
 - batch_processor: Large-scale batch processing with parallel execution
 - incremental_sync: Incremental data updates and delta synchronization
+- change_index: Durable record hash index backing incremental sync
 - data_reconciler: Data consistency checks and automated reconciliation
 - extraction_scheduler: Automated scheduling and job management
 """
@@ -53,6 +54,8 @@ from .incremental_sync import (
     create_incremental_sync_service
 )
 
+from .change_index import ChangeIndex, ChangeWatermark
+
 from .data_reconciler import (
     DataReconciler,
     ReconciliationConfig,
@@ -135,6 +138,8 @@ __all__ = [
     "ChangeType",
     "ConflictResolver",
     "create_incremental_sync_service",
+    "ChangeIndex",
+    "ChangeWatermark",
     
     # Data Reconciler
     "DataReconciler",
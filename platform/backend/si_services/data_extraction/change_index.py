@@ -0,0 +1,203 @@
+"""
+Change Index
+
+Durable per-(tenant, ERP) index of record hashes used by incremental sync to
+skip records that have not changed since they were last processed. Hashes and
+the sync watermark for a page are written in a single SQLite transaction, so
+an interrupted sync resumes from the last committed page instead of treating
+every record as new.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+# Stays well under SQLITE_MAX_VARIABLE_NUMBER on older builds
+LOOKUP_CHUNK_SIZE = 500
+
+
+@dataclass
+class ChangeWatermark:
+    """Last committed checkpoint for a (tenant, ERP) pair"""
+    tenant_id: str
+    erp_type: str
+    watermark: Optional[datetime]
+    records_checkpointed: int
+    updated_at: datetime
+
+
+class ChangeIndex:
+    """SQLite-backed record hash index with per-page atomic checkpoints"""
+
+    def __init__(self, database_path: str = ":memory:"):
+        self.database_path = database_path
+        self.db_connection: Optional[aiosqlite.Connection] = None
+        # One connection is shared by concurrent syncs; SQLite transactions on
+        # it must not interleave
+        self._transaction_lock = asyncio.Lock()
+
+    async def initialize(self) -> None:
+        """Open the database and create tables"""
+        if self.db_connection is not None:
+            return
+
+        if self.database_path != ":memory:":
+            Path(self.database_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_connection = await aiosqlite.connect(self.database_path)
+        await self.db_connection.execute("PRAGMA journal_mode=WAL")
+        await self.db_connection.execute("PRAGMA synchronous=NORMAL")
+
+        await self.db_connection.execute('''
+            CREATE TABLE IF NOT EXISTS record_hashes (
+                tenant_id TEXT NOT NULL,
+                erp_type TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                record_hash TEXT NOT NULL,
+                source_updated_at TEXT,
+                PRIMARY KEY (tenant_id, erp_type, record_id)
+            ) WITHOUT ROWID
+        ''')
+        await self.db_connection.execute('''
+            CREATE TABLE IF NOT EXISTS sync_watermarks (
+                tenant_id TEXT NOT NULL,
+                erp_type TEXT NOT NULL,
+                watermark TEXT,
+                records_checkpointed INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (tenant_id, erp_type)
+            )
+        ''')
+        await self.db_connection.commit()
+
+    async def close(self) -> None:
+        """Close the database connection"""
+        if self.db_connection is not None:
+            await self.db_connection.close()
+            self.db_connection = None
+
+    async def get_hashes(
+        self,
+        tenant_id: str,
+        erp_type: str,
+        record_ids: Sequence[str]
+    ) -> Dict[str, str]:
+        """Return stored hashes for the given record ids"""
+        await self.initialize()
+        hashes: Dict[str, str] = {}
+
+        for start in range(0, len(record_ids), LOOKUP_CHUNK_SIZE):
+            chunk = record_ids[start:start + LOOKUP_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            async with self.db_connection.execute(
+                f"SELECT record_id, record_hash FROM record_hashes "
+                f"WHERE tenant_id = ? AND erp_type = ? AND record_id IN ({placeholders})",
+                (tenant_id, erp_type, *chunk)
+            ) as cursor:
+                for record_id, record_hash in await cursor.fetchall():
+                    hashes[record_id] = record_hash
+
+        return hashes
+
+    async def commit_page(
+        self,
+        tenant_id: str,
+        erp_type: str,
+        records: Iterable[Tuple[str, str, Optional[datetime]]],
+        watermark: Optional[datetime]
+    ) -> None:
+        """
+        Upsert (record_id, hash, source_updated_at) rows and advance the
+        watermark in one transaction. The watermark never moves backwards.
+        """
+        await self.initialize()
+        rows = [
+            (tenant_id, erp_type, record_id, record_hash, updated_at.isoformat() if updated_at else None)
+            for record_id, record_hash, updated_at in records
+        ]
+        now = datetime.now().isoformat()
+
+        async with self._transaction_lock:
+            try:
+                await self.db_connection.execute("BEGIN")
+                if rows:
+                    await self.db_connection.executemany('''
+                        INSERT INTO record_hashes (tenant_id, erp_type, record_id, record_hash, source_updated_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT (tenant_id, erp_type, record_id) DO UPDATE SET
+                            record_hash = excluded.record_hash,
+                            source_updated_at = excluded.source_updated_at
+                    ''', rows)
+                await self.db_connection.execute('''
+                    INSERT INTO sync_watermarks (tenant_id, erp_type, watermark, records_checkpointed, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (tenant_id, erp_type) DO UPDATE SET
+                        watermark = CASE
+                            WHEN sync_watermarks.watermark IS NULL THEN excluded.watermark
+                            WHEN excluded.watermark IS NULL THEN sync_watermarks.watermark
+                            ELSE MAX(sync_watermarks.watermark, excluded.watermark)
+                        END,
+                        records_checkpointed = sync_watermarks.records_checkpointed + excluded.records_checkpointed,
+                        updated_at = excluded.updated_at
+                ''', (tenant_id, erp_type, watermark.isoformat() if watermark else None, len(rows), now))
+                await self.db_connection.commit()
+            except Exception:
+                await self.db_connection.rollback()
+                raise
+
+    async def get_watermark(self, tenant_id: str, erp_type: str) -> Optional[ChangeWatermark]:
+        """Return the last committed checkpoint, if any"""
+        await self.initialize()
+        async with self.db_connection.execute(
+            "SELECT watermark, records_checkpointed, updated_at FROM sync_watermarks "
+            "WHERE tenant_id = ? AND erp_type = ?",
+            (tenant_id, erp_type)
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if row is None:
+            return None
+
+        watermark, records_checkpointed, updated_at = row
+        return ChangeWatermark(
+            tenant_id=tenant_id,
+            erp_type=erp_type,
+            watermark=datetime.fromisoformat(watermark) if watermark else None,
+            records_checkpointed=records_checkpointed,
+            updated_at=datetime.fromisoformat(updated_at)
+        )
+
+    async def count_records(self, tenant_id: str, erp_type: str) -> int:
+        """Number of indexed records for a (tenant, ERP) pair"""
+        await self.initialize()
+        async with self.db_connection.execute(
+            "SELECT COUNT(*) FROM record_hashes WHERE tenant_id = ? AND erp_type = ?",
+            (tenant_id, erp_type)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return row[0]
+
+    async def reset(self, tenant_id: str, erp_type: str) -> None:
+        """Drop all hashes and the watermark for a (tenant, ERP) pair"""
+        await self.initialize()
+        async with self._transaction_lock:
+            try:
+                await self.db_connection.execute("BEGIN")
+                await self.db_connection.execute(
+                    "DELETE FROM record_hashes WHERE tenant_id = ? AND erp_type = ?", (tenant_id, erp_type)
+                )
+                await self.db_connection.execute(
+                    "DELETE FROM sync_watermarks WHERE tenant_id = ? AND erp_type = ?", (tenant_id, erp_type)
+                )
+                await self.db_connection.commit()
+            except Exception:
+                await self.db_connection.rollback()
+                raise
+
@@ -6,7 +6,7 @@ Supports multiple ERP platforms with pluggable adapter architecture.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Union
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
@@ -112,6 +112,42 @@ class ERPAdapter(ABC):
         """Extract invoice data from ERP system"""
         pass
     
+    async def iter_invoice_pages(self, filters: ExtractionFilter) -> AsyncIterator[List[InvoiceData]]:
+        """
+        Yield invoices in pages of at most filters.batch_size, ordered by
+        updated_at. Adapters that implement fetch_invoice_page() are paged
+        server-side; the default slices a single extract_invoices() call.
+        """
+        page_size = max(1, filters.batch_size)
+        if type(self).fetch_invoice_page is not ERPAdapter.fetch_invoice_page:
+            after: Optional[Tuple[datetime, str]] = None
+            while True:
+                page = await self.fetch_invoice_page(filters, after, page_size)
+                if page:
+                    yield page
+                if len(page) < page_size:
+                    return
+                last = page[-1]
+                after = (last.updated_at, last.invoice_id)
+        
+        invoices = await self.extract_invoices(filters)
+        invoices.sort(key=lambda invoice: invoice.updated_at or datetime.min)
+        for start in range(0, len(invoices), page_size):
+            yield invoices[start:start + page_size]
+    
+    async def fetch_invoice_page(
+        self,
+        filters: ExtractionFilter,
+        after: Optional[Tuple[datetime, str]],
+        limit: int
+    ) -> List[InvoiceData]:
+        """
+        Fetch up to limit invoices ordered by (updated_at, invoice_id) that
+        sort strictly after the ``after`` key. Keyset paging keeps pages
+        stable while records are edited mid-sync, unlike offset paging.
+        """
+        raise NotImplementedError
+    
     @abstractmethod
     async def get_invoice_count(self, filters: ExtractionFilter) -> int:
         """Get count of invoices matching filters"""
@@ -147,11 +183,35 @@ class OdooAdapter(ERPAdapter):
         return True
     
     async def extract_invoices(self, filters: ExtractionFilter) -> List[InvoiceData]:
+        invoices = []
+        async for page in self.iter_invoice_pages(filters):
+            invoices.extend(page)
+        return invoices
+    
+    async def fetch_invoice_page(
+        self,
+        filters: ExtractionFilter,
+        after: Optional[Tuple[datetime, str]],
+        limit: int
+    ) -> List[InvoiceData]:
         invoices = []
         try:
             # Implementation for Odoo invoice extraction
-            # This would query Odoo's account.move model
-            logger.info(f"Extracting invoices from Odoo with filters: {filters}")
+            # This would call account.move search_read with the domain below,
+            # order="write_date asc, id asc" and limit=limit
+            domain: List[Any] = []
+            if filters.start_date:
+                domain.append(("write_date", ">=", filters.start_date))
+            if filters.end_date:
+                domain.append(("write_date", "<=", filters.end_date))
+            if after:
+                updated_at, invoice_id = after
+                domain += ["|", ("write_date", ">", updated_at),
+                           "&", ("write_date", "=", updated_at), ("id", ">", invoice_id)]
+            logger.info(f"Extracting invoice page from Odoo: domain={domain} limit={limit}")
+            
+            if after:
+                return invoices
             
             # Mock implementation - replace with actual Odoo API calls
             sample_invoice = InvoiceData(
@@ -167,6 +227,8 @@ class OdooAdapter(ERPAdapter):
                 tax_amount=7500.0,
                 total_amount=107500.0,
                 line_items=[],
+                payment_terms=None,
+                notes=None,
                 status="posted",
                 created_at=datetime.now(),
                 updated_at=datetime.now()
@@ -218,7 +280,21 @@ class SAPAdapter(ERPAdapter):
         return True
     
     async def extract_invoices(self, filters: ExtractionFilter) -> List[InvoiceData]:
+        invoices = []
+        async for page in self.iter_invoice_pages(filters):
+            invoices.extend(page)
+        return invoices
+    
+    async def fetch_invoice_page(
+        self,
+        filters: ExtractionFilter,
+        after: Optional[Tuple[datetime, str]],
+        limit: int
+    ) -> List[InvoiceData]:
         # Implementation for SAP invoice extraction
+        # This would issue an OData query with $filter on LastChangeDateTime
+        # (plus the after key), $orderby=LastChangeDateTime,BillingDocument
+        # and $top=limit
         return []
     
     async def get_invoice_count(self, filters: ExtractionFilter) -> int:
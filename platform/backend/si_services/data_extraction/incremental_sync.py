@@ -7,7 +7,9 @@ and delta sync operations between ERP systems and the platform.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Set, Any, Tuple
+import os
+import tempfile
+from typing import AsyncIterator, Dict, List, Optional, Set, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -15,6 +17,7 @@ import json
 import hashlib
 from pathlib import Path
 
+from .change_index import ChangeIndex
 from .erp_data_extractor import (
     InvoiceData, ExtractionFilter, ERPType, ERPDataExtractor, ExtractionResult
 )
@@ -46,6 +49,7 @@ class ChangeType(Enum):
     UPDATED = "updated"
     DELETED = "deleted"
     MOVED = "moved"
+    UNCHANGED = "unchanged"
 
 
 @dataclass
@@ -62,6 +66,9 @@ class SyncConfig:
     sync_state_storage_path: Optional[str] = None
     enable_deduplication: bool = True
     hash_algorithm: str = "sha256"
+    tenant_id: str = "default"
+    # Defaults to change_index.db under sync_state_storage_path, else in-memory
+    change_index_path: Optional[str] = None
 
 
 @dataclass
@@ -93,6 +100,15 @@ class ChangeRecord:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class ChangePage:
+    """One extracted page after unchanged records have been dropped"""
+    changes: List[ChangeRecord]
+    records_seen: int
+    records_unchanged: int
+    watermark: Optional[datetime] = None
+
+
 @dataclass
 class SyncResult:
     """Result of a synchronization operation"""
@@ -106,6 +122,7 @@ class SyncResult:
     records_updated: int = 0
     records_deleted: int = 0
     records_failed: int = 0
+    records_skipped: int = 0
     conflicts_detected: int = 0
     conflicts_resolved: int = 0
     sync_duration: float = 0.0
@@ -182,7 +199,6 @@ class IncrementalSyncService:
         self.conflict_resolver = ConflictResolver(config)
         self.sync_states: Dict[ERPType, SyncState] = {}
         self.active_syncs: Dict[str, SyncResult] = {}
-        self.record_hashes: Dict[str, str] = {}
         
         # Setup state storage
         if config.sync_state_storage_path:
@@ -191,8 +207,17 @@ class IncrementalSyncService:
         else:
             self.state_storage = None
         
-        # Load existing sync states
-        asyncio.create_task(self._load_sync_states())
+        # Durable record hashes, survive restarts unlike the sync state alone
+        if config.change_index_path:
+            index_path = config.change_index_path
+        elif self.state_storage:
+            index_path = str(self.state_storage / "change_index.db")
+        else:
+            index_path = ":memory:"
+        self.change_index = ChangeIndex(index_path)
+        
+        # Load existing sync states; syncs wait for this before choosing a strategy
+        self._state_load_task = asyncio.create_task(self._load_sync_states())
     
     async def start_incremental_sync(
         self,
@@ -225,18 +250,34 @@ class IncrementalSyncService:
         """Perform the actual synchronization"""
         try:
             sync_result.status = SyncStatus.RUNNING
+            await self._state_load_task
             
             # Get or create sync state
             sync_state = self._get_sync_state(sync_result.erp_type)
             
+            # Fall back to the index checkpoint if the state file was lost
+            if not force_full_sync and not sync_state.last_sync_timestamp:
+                checkpoint = await self.change_index.get_watermark(
+                    self.config.tenant_id, sync_result.erp_type.value
+                )
+                if checkpoint and checkpoint.watermark:
+                    sync_state.last_sync_timestamp = checkpoint.watermark
+            
             # Determine sync strategy
             if force_full_sync or not sync_state.last_sync_timestamp:
-                await self._perform_full_sync(sync_result, sync_state)
+                retry_from = await self._perform_full_sync(sync_result, sync_state)
             else:
-                await self._perform_incremental_sync(sync_result, sync_state)
+                retry_from = await self._perform_incremental_sync(sync_result, sync_state)
             
-            # Update sync state
-            sync_state.last_sync_timestamp = sync_result.start_time
+            # Update sync state. After a failure the per-page checkpoint stays
+            # at or before the earliest failed record so the next window
+            # retries it; only a clean run may jump to the start time.
+            if sync_result.records_failed == 0:
+                sync_state.last_sync_timestamp = sync_result.start_time
+            elif retry_from and (
+                not sync_state.last_sync_timestamp or retry_from < sync_state.last_sync_timestamp
+            ):
+                sync_state.last_sync_timestamp = retry_from
             sync_state.total_synced_records += sync_result.records_processed
             sync_state.last_sync_duration = sync_result.sync_duration
             
@@ -265,35 +306,24 @@ class IncrementalSyncService:
         self,
         sync_result: SyncResult,
         sync_state: SyncState
-    ) -> None:
+    ) -> Optional[datetime]:
         """Perform a full synchronization"""
         logger.info(f"Performing full sync for {sync_result.erp_type.value}")
         
-        # Create filter for full extraction
-        extraction_filter = ExtractionFilter(
-            batch_size=self.config.max_sync_batch_size,
-            include_draft=False,
-            include_cancelled=False
-        )
-        
-        # Extract all data
-        extraction_result = await self.data_extractor.extract_data(
-            sync_result.erp_type,
-            extraction_filter
-        )
-        
-        sync_result.records_processed = extraction_result.extracted_records
-        sync_result.records_created = extraction_result.extracted_records
+        # A full sync re-reads everything, but the change index still skips
+        # records that were already processed unchanged
+        retry_from = await self._sync_pages(sync_result, sync_state, since_timestamp=None)
         
         # Update watermarks
         sync_state.sync_watermarks["full_sync_completed"] = True
         sync_state.sync_watermarks["last_full_sync"] = datetime.now()
+        return retry_from
     
     async def _perform_incremental_sync(
         self,
         sync_result: SyncResult,
         sync_state: SyncState
-    ) -> None:
+    ) -> Optional[datetime]:
         """Perform an incremental synchronization"""
         logger.info(f"Performing incremental sync for {sync_result.erp_type.value}")
         
@@ -302,31 +332,65 @@ class IncrementalSyncService:
         if since_timestamp and self.config.overlap_window_minutes > 0:
             since_timestamp -= timedelta(minutes=self.config.overlap_window_minutes)
         
-        # Detect changes
-        changes = await self._detect_changes(sync_result.erp_type, since_timestamp)
+        return await self._sync_pages(sync_result, sync_state, since_timestamp)
+    
+    async def _sync_pages(
+        self,
+        sync_result: SyncResult,
+        sync_state: SyncState,
+        since_timestamp: Optional[datetime]
+    ) -> Optional[datetime]:
+        """
+        Process changed records page by page, checkpointing after each page.
         
-        # Process changes
-        for change in changes:
-            try:
-                await self._process_change(change, sync_result)
-            except Exception as e:
-                logger.error(f"Failed to process change {change.record_id}: {e}")
-                sync_result.records_failed += 1
-                sync_result.error_details.append({
-                    "change_id": change.record_id,
-                    "error": str(e),
-                    "timestamp": datetime.now()
-                })
+        Returns the earliest updated_at among records that failed, if any.
+        """
+        erp_key = sync_result.erp_type.value
+        advance_watermark = True
+        retry_from: Optional[datetime] = None
         
-        sync_result.records_processed = len(changes)
+        async for page in self._detect_changes(sync_result.erp_type, since_timestamp):
+            sync_result.records_processed += page.records_seen
+            sync_result.records_skipped += page.records_unchanged
+            
+            committed: List[Tuple[str, str, Optional[datetime]]] = []
+            for change in page.changes:
+                try:
+                    await self._process_change(change, sync_result)
+                    committed.append((change.record_id, change.current_hash, change.timestamp))
+                except Exception as e:
+                    logger.error(f"Failed to process change {change.record_id}: {e}")
+                    sync_result.records_failed += 1
+                    sync_result.error_details.append({
+                        "change_id": change.record_id,
+                        "error": str(e),
+                        "timestamp": datetime.now()
+                    })
+                    # Failed records keep their old hash; stop advancing the
+                    # watermark so the next sync window still covers them
+                    advance_watermark = False
+                    if change.timestamp and (retry_from is None or change.timestamp < retry_from):
+                        retry_from = change.timestamp
+            
+            watermark = page.watermark if advance_watermark else None
+            await self.change_index.commit_page(self.config.tenant_id, erp_key, committed, watermark)
+            if watermark:
+                # Pages arrive in updated_at order, so a sync interrupted
+                # after this point can resume from here
+                sync_state.sync_watermarks["last_checkpoint"] = watermark.isoformat()
+                if not sync_state.last_sync_timestamp or watermark > sync_state.last_sync_timestamp:
+                    sync_state.last_sync_timestamp = watermark
+            await self._save_sync_state(sync_result.erp_type, sync_state)
+        
+        return retry_from
     
     async def _detect_changes(
         self,
         erp_type: ERPType,
         since_timestamp: Optional[datetime]
-    ) -> List[ChangeRecord]:
-        """Detect changes in the ERP system since the last sync"""
-        changes = []
+    ) -> AsyncIterator[ChangePage]:
+        """Stream pages of records changed since the last sync"""
+        erp_key = erp_type.value
         
         try:
             # Build filter for change detection
@@ -336,46 +400,51 @@ class IncrementalSyncService:
             )
             
             async with self.data_extractor.get_connection(erp_type) as adapter:
-                # Extract modified records
-                invoices = await adapter.extract_invoices(extraction_filter)
-                
-                for invoice in invoices:
-                    change_type = await self._determine_change_type(invoice)
+                async for invoices in adapter.iter_invoice_pages(extraction_filter):
+                    if self.config.enable_deduplication:
+                        # Later occurrences in a page supersede earlier ones
+                        invoices = list({invoice.invoice_id: invoice for invoice in invoices}.values())
                     
-                    change = ChangeRecord(
-                        record_id=invoice.invoice_id,
-                        change_type=change_type,
-                        timestamp=invoice.updated_at,
-                        current_hash=self._calculate_record_hash(invoice),
-                        data=self._invoice_to_dict(invoice)
+                    hashes = [self._calculate_record_hash(invoice) for invoice in invoices]
+                    previous_hashes = await self.change_index.get_hashes(
+                        self.config.tenant_id, erp_key, [invoice.invoice_id for invoice in invoices]
                     )
                     
-                    changes.append(change)
+                    changes = []
+                    for invoice, current_hash in zip(invoices, hashes):
+                        previous_hash = previous_hashes.get(invoice.invoice_id)
+                        change_type = self._determine_change_type(current_hash, previous_hash)
+                        if change_type == ChangeType.UNCHANGED:
+                            continue
+                        
+                        changes.append(ChangeRecord(
+                            record_id=invoice.invoice_id,
+                            change_type=change_type,
+                            timestamp=invoice.updated_at,
+                            current_hash=current_hash,
+                            previous_hash=previous_hash,
+                            data=self._invoice_to_dict(invoice)
+                        ))
+                    
+                    timestamps = [invoice.updated_at for invoice in invoices if invoice.updated_at]
+                    yield ChangePage(
+                        changes=changes,
+                        records_seen=len(invoices),
+                        records_unchanged=len(invoices) - len(changes),
+                        watermark=max(timestamps) if timestamps else None
+                    )
         
         except Exception as e:
             logger.error(f"Change detection failed for {erp_type.value}: {e}")
             raise
-        
-        return changes
     
-    async def _determine_change_type(self, invoice: InvoiceData) -> ChangeType:
-        """Determine the type of change for a record"""
-        record_id = invoice.invoice_id
-        current_hash = self._calculate_record_hash(invoice)
-        
-        if record_id not in self.record_hashes:
-            # New record
-            self.record_hashes[record_id] = current_hash
+    def _determine_change_type(self, current_hash: str, previous_hash: Optional[str]) -> ChangeType:
+        """Determine the type of change for a record from its indexed hash"""
+        if previous_hash is None:
             return ChangeType.CREATED
-        
-        previous_hash = self.record_hashes[record_id]
         if previous_hash != current_hash:
-            # Updated record
-            self.record_hashes[record_id] = current_hash
             return ChangeType.UPDATED
-        
-        # No change detected
-        return ChangeType.UPDATED  # Default to updated for safety
+        return ChangeType.UNCHANGED
     
     async def _process_change(
         self,
@@ -498,32 +567,52 @@ class IncrementalSyncService:
             return
         
         try:
-            for erp_type in ERPType:
-                state_file = self.state_storage / f"{erp_type.value}_sync_state.json"
-                if state_file.exists():
-                    with open(state_file, 'r') as f:
-                        state_data = json.load(f)
-                        sync_state = self._dict_to_sync_state(state_data)
-                        self.sync_states[erp_type] = sync_state
+            loaded = await asyncio.to_thread(self._read_state_files)
+            for erp_type, state_data in loaded.items():
+                self.sync_states[erp_type] = self._dict_to_sync_state(state_data)
                         
         except Exception as e:
             logger.error(f"Failed to load sync states: {e}")
     
+    def _read_state_files(self) -> Dict[ERPType, Dict[str, Any]]:
+        """Read all state files (runs in a worker thread)"""
+        loaded = {}
+        for erp_type in ERPType:
+            state_file = self.state_storage / f"{erp_type.value}_sync_state.json"
+            if state_file.exists():
+                with open(state_file, 'r') as f:
+                    loaded[erp_type] = json.load(f)
+        return loaded
+    
     async def _save_sync_state(self, erp_type: ERPType, sync_state: SyncState) -> None:
         """Save sync state to storage"""
         if not self.state_storage:
             return
         
         try:
-            state_data = self._sync_state_to_dict(sync_state)
+            state_data = json.dumps(
+                self._sync_state_to_dict(sync_state), separators=(",", ":"), default=str
+            )
             state_file = self.state_storage / f"{erp_type.value}_sync_state.json"
-            
-            with open(state_file, 'w') as f:
-                json.dump(state_data, f, indent=2, default=str)
+            await asyncio.to_thread(self._write_state_file, state_file, state_data)
                 
         except Exception as e:
             logger.error(f"Failed to save sync state for {erp_type.value}: {e}")
     
+    @staticmethod
+    def _write_state_file(state_file: Path, state_data: str) -> None:
+        """Write via a temp file and rename so readers never see a partial file"""
+        fd, temp_path = tempfile.mkstemp(dir=state_file.parent, prefix=f".{state_file.name}.")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(state_data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, state_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    
     def _dict_to_sync_state(self, data: Dict[str, Any]) -> SyncState:
         """Convert dictionary to SyncState object"""
         sync_state = SyncState(erp_type=ERPType(data["erp_type"]))
@@ -571,6 +660,8 @@ class IncrementalSyncService:
             if erp_type in self.sync_states:
                 del self.sync_states[erp_type]
             
+            await self.change_index.reset(self.config.tenant_id, erp_type.value)
+            
             # Remove state file
             if self.state_storage:
                 state_file = self.state_storage / f"{erp_type.value}_sync_state.json"
@@ -601,6 +692,10 @@ class IncrementalSyncService:
         
         logger.info(f"Cleaned up {cleaned_count} old sync results")
         return cleaned_count
+    
+    async def close(self) -> None:
+        """Close the change index"""
+        await self.change_index.close()
 
 
 # Factory function for creating incremental sync service
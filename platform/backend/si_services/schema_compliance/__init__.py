@@ -27,6 +27,10 @@ from .custom_validator import (
     custom_validator
 )
 
+from .compliance_report_cache import (
+    ComplianceReportCache
+)
+
 from .compliance_checker import (
     ComplianceLevel,
     ComplianceStatus,
@@ -57,7 +61,10 @@ __all__ = [
     "ComplianceLevel",
     "ComplianceStatus", 
     "ComplianceChecker",
-    "compliance_checker"
+    "compliance_checker",
+    
+    # Compliance Report Cache
+    "ComplianceReportCache"
 ]
 
 
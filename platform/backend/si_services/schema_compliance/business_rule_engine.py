@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 import re
 
+from .compliance_report_cache import canonical_hash
+
 logger = logging.getLogger(__name__)
 
 
@@ -202,6 +204,13 @@ class BusinessRuleEngine:
             return True
         return False
     
+    def get_ruleset_version(self) -> str:
+        """Fingerprint of the rule definitions; changes whenever a rule is added, replaced or toggled"""
+        return canonical_hash([
+            (rule_id, rule.enabled, rule.severity, rule.category, id(rule.validator))
+            for rule_id, rule in sorted(self.rules.items())
+        ])
+    
     def get_rule_summary(self) -> Dict[str, Any]:
         """Get summary of all rules"""
         summary = {
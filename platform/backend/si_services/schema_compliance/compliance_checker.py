@@ -5,13 +5,31 @@ Overall compliance verification orchestrating all validation components.
 Provides comprehensive document compliance checking against UBL, FIRS, and custom rules.
 """
 
+import asyncio
+import copy
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Union
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 from enum import Enum
 
+from core_platform.authentication.tenant_context import get_current_tenant
+
+from .business_rule_engine import BusinessRule, BusinessRuleEngine
+from .compliance_report_cache import ComplianceReportCache, canonical_hash
+from .custom_validator import CustomValidator
+from .schema_transformer import SchemaTransformer
+from .ubl_validator import UBLValidator
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_CHUNK_SIZE = 200
+
 
 class ComplianceLevel(Enum):
     """Compliance verification levels"""
@@ -35,7 +53,7 @@ class ComplianceChecker:
     Coordinates UBL validation, business rules, and custom validation.
     """
     
-    def __init__(self):
+    def __init__(self, report_cache: Optional[ComplianceReportCache] = None):
         # Dependencies will be injected
         self.ubl_validator = None
         self.schema_transformer = None
@@ -46,6 +64,17 @@ class ComplianceChecker:
         self.compliance_levels = self._load_compliance_levels()
         self.validation_sequence = ["ubl", "business_rules", "custom"]
         self.stop_on_error = False
+        
+        # Memo of full reports for repeated payloads
+        self.report_cache = report_cache or ComplianceReportCache(
+            max_entries=int(os.getenv("COMPLIANCE_REPORT_CACHE_MAX_ENTRIES", "5000")),
+            ttl_seconds=float(os.getenv("COMPLIANCE_REPORT_CACHE_TTL_SECONDS", "3600")),
+        )
+        
+        # Worker processes for batch validation, created on first use
+        self._batch_pool: Optional[ProcessPoolExecutor] = None
+        self._batch_pool_key: Optional[Tuple[int, str]] = None
+        self._batch_pool_lock = threading.Lock()
     
     def set_dependencies(self, ubl_validator, schema_transformer, business_rule_engine, custom_validator):
         """Inject validation component dependencies"""
@@ -59,20 +88,279 @@ class ComplianceChecker:
         document: Dict[str, Any],
         compliance_level: ComplianceLevel = ComplianceLevel.STANDARD,
         transform_if_needed: bool = True,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Perform comprehensive compliance check on a document.
         
+        Identical documents checked with the same level, context and ruleset
+        are answered from the tenant's report cache.
+        
         Args:
             document: Document to validate
             compliance_level: Level of compliance checking
             transform_if_needed: Whether to transform document to UBL if needed
             context: Additional validation context
+            use_cache: Whether to read and populate the report cache
             
         Returns:
             Comprehensive compliance report
         """
+        if not use_cache or not self.report_cache.enabled:
+            return self._run_full_compliance(document, compliance_level, transform_if_needed, context)
+        
+        tenant_id = self._resolve_cache_tenant(context)
+        ruleset_version = self.get_ruleset_version()
+        report_key = self._report_key(document, compliance_level, transform_if_needed, context)
+        
+        cached_report = self.report_cache.get(tenant_id, report_key, ruleset_version)
+        if cached_report is not None:
+            cached_report["timestamp"] = datetime.utcnow().isoformat()
+            cached_report["metadata"]["cache_hit"] = True
+            return cached_report
+        
+        report = self._run_full_compliance(document, compliance_level, transform_if_needed, context)
+        report["metadata"]["cache_hit"] = False
+        # Errors come from exceptions that may be transient; always re-run those
+        if report.get("overall_status") != ComplianceStatus.ERROR.value:
+            self.report_cache.put(tenant_id, report_key, ruleset_version, report)
+        return report
+    
+    def check_batch_compliance(
+        self,
+        documents: Sequence[Dict[str, Any]],
+        compliance_level: ComplianceLevel = ComplianceLevel.STANDARD,
+        transform_if_needed: bool = True,
+        context: Optional[Dict[str, Any]] = None,
+        contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+        use_cache: bool = True,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        Check many documents and return one report per document, in order.
+        
+        Each report matches what check_full_compliance returns for the same
+        document. Cache lookups, the ruleset fingerprint and the date key are
+        resolved once per batch, identical documents are validated once, and
+        the remaining work is split into chunks across worker processes when
+        the rules can be rebuilt in a worker (custom Python callables cannot)
+        and more than one worker is available.
+        
+        Args:
+            documents: Documents to validate
+            compliance_level: Level of compliance checking
+            transform_if_needed: Whether to transform documents to UBL if needed
+            context: Validation context shared by every document
+            contexts: Per-document contexts (overrides ``context``)
+            use_cache: Whether to read and populate the report cache
+            max_workers: Worker processes (default COMPLIANCE_BATCH_MAX_WORKERS or the CPU count; 1 = in-process)
+            chunk_size: Documents sent to a worker per task
+            
+        Returns:
+            Compliance reports in document order
+        """
+        if contexts is not None and len(contexts) != len(documents):
+            raise ValueError("contexts must have one entry per document")
+        if not documents:
+            return []
+        
+        logger.info(f"Starting batch compliance check for {len(documents)} documents")
+        caching = use_cache and self.report_cache.enabled
+        ruleset_version = self.get_ruleset_version()
+        date_key = datetime.utcnow().date().isoformat()
+        
+        reports: List[Optional[Dict[str, Any]]] = [None] * len(documents)
+        # Identical documents of the same tenant are validated once
+        pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for index, document in enumerate(documents):
+            document_context = contexts[index] if contexts is not None else context
+            tenant_id = self._resolve_cache_tenant(document_context)
+            report_key = self._report_key(
+                document, compliance_level, transform_if_needed, document_context, date_key
+            )
+            entry = pending.get((tenant_id, report_key))
+            if entry is not None:
+                entry["indexes"].append(index)
+                continue
+            if caching:
+                cached_report = self.report_cache.get(tenant_id, report_key, ruleset_version)
+                if cached_report is not None:
+                    cached_report["timestamp"] = datetime.utcnow().isoformat()
+                    cached_report["metadata"]["cache_hit"] = True
+                    reports[index] = cached_report
+                    continue
+            pending[(tenant_id, report_key)] = {
+                "document": document,
+                "context": document_context,
+                "indexes": [index],
+            }
+        
+        work = list(pending.values())
+        results = self._run_batch_work(
+            [(entry["document"], entry["context"]) for entry in work],
+            compliance_level,
+            transform_if_needed,
+            max_workers,
+            chunk_size,
+        )
+        
+        for (tenant_id, report_key), report in zip(pending, results):
+            entry = pending[(tenant_id, report_key)]
+            if caching:
+                report["metadata"]["cache_hit"] = False
+                if report.get("overall_status") != ComplianceStatus.ERROR.value:
+                    self.report_cache.put(tenant_id, report_key, ruleset_version, report)
+            first, *duplicates = entry["indexes"]
+            reports[first] = report
+            for index in duplicates:
+                duplicate = copy.deepcopy(report)
+                if caching:
+                    duplicate["metadata"]["cache_hit"] = True
+                reports[index] = duplicate
+        
+        logger.info(
+            f"Batch compliance check completed: {len(documents)} documents, {len(work)} validated"
+        )
+        return reports
+    
+    async def check_batch_compliance_async(
+        self,
+        documents: Sequence[Dict[str, Any]],
+        **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """Run check_batch_compliance off the event loop (same arguments and result)"""
+        return await asyncio.to_thread(self.check_batch_compliance, documents, **kwargs)
+    
+    def shutdown_batch_pool(self) -> None:
+        """Stop batch worker processes (they are restarted on the next batch)"""
+        with self._batch_pool_lock:
+            if self._batch_pool is not None:
+                self._batch_pool.shutdown(wait=True, cancel_futures=True)
+            self._batch_pool = None
+            self._batch_pool_key = None
+    
+    def _run_batch_work(
+        self,
+        items: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]],
+        compliance_level: ComplianceLevel,
+        transform_if_needed: bool,
+        max_workers: Optional[int],
+        chunk_size: int
+    ) -> List[Dict[str, Any]]:
+        """Validate unique documents in worker processes when possible, else in-process"""
+        workers = max_workers or int(os.getenv("COMPLIANCE_BATCH_MAX_WORKERS", "0")) or os.cpu_count() or 1
+        chunk_size = max(1, chunk_size)
+        worker_config = self._portable_worker_config() if workers > 1 and len(items) > chunk_size else None
+        
+        if worker_config is not None:
+            chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+            try:
+                # Pickled here so unpicklable documents fail before anything is
+                # submitted; a pickling error in the executor's feeder thread
+                # can leave the pool unable to shut down
+                tasks = [
+                    pickle.dumps((compliance_level.value, transform_if_needed, chunk), pickle.HIGHEST_PROTOCOL)
+                    for chunk in chunks
+                ]
+                pool = self._get_batch_pool(workers, worker_config)
+                results: List[Dict[str, Any]] = []
+                for chunk_reports in pool.map(_check_compliance_chunk, tasks):
+                    results.extend(chunk_reports)
+                return results
+            except BrokenProcessPool as e:
+                logger.error(f"Batch worker pool failed, validating in-process: {e}")
+                self.shutdown_batch_pool()
+            except Exception as e:
+                # Unpicklable documents/reports, pool start-up failures and
+                # worker-side errors: validate the batch here instead
+                logger.error(f"Batch worker validation failed, validating in-process: {e}")
+        
+        return [
+            self._run_full_compliance(document, compliance_level, transform_if_needed, document_context)
+            for document, document_context in items
+        ]
+    
+    def _get_batch_pool(self, workers: int, worker_config: Dict[str, Any]) -> ProcessPoolExecutor:
+        pool_key = (workers, canonical_hash(worker_config))
+        with self._batch_pool_lock:
+            if self._batch_pool is None or self._batch_pool_key != pool_key:
+                if self._batch_pool is not None:
+                    self._batch_pool.shutdown(wait=False)
+                # Batches run from worker threads (check_batch_compliance_async),
+                # where forking a multi-threaded process is unsafe; workers are
+                # started clean and build their checker once in the initializer
+                start_methods = multiprocessing.get_all_start_methods()
+                mp_context = multiprocessing.get_context("forkserver" if "forkserver" in start_methods else "spawn")
+                self._batch_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=mp_context,
+                    initializer=_init_batch_worker,
+                    initargs=(worker_config,),
+                )
+                self._batch_pool_key = pool_key
+            return self._batch_pool
+    
+    def _portable_worker_config(self) -> Optional[Dict[str, Any]]:
+        """Checker configuration a worker can rebuild, or None if it uses process-local rules"""
+        if (
+            type(self.ubl_validator) is not UBLValidator
+            or type(self.schema_transformer) is not SchemaTransformer
+            or type(self.business_rule_engine) is not BusinessRuleEngine
+            or type(self.custom_validator) is not CustomValidator
+            or self.custom_validator.custom_rules
+        ):
+            return None
+        
+        default_rules = _default_business_rules()
+        rules = []
+        for rule_id, rule in self.business_rule_engine.rules.items():
+            default_rule = default_rules.get(rule_id)
+            validator_func = getattr(rule.validator, "__func__", None)
+            if (
+                default_rule is None
+                or getattr(rule.validator, "__self__", None) is not self.business_rule_engine
+                or validator_func is not default_rule.validator.__func__
+            ):
+                return None
+            rules.append((rule_id, rule.name, rule.description, rule.category, rule.severity, rule.enabled))
+        
+        return {
+            "compliance_levels": {
+                level.value: list(config.get("stages", [])) for level, config in self.compliance_levels.items()
+            },
+            "validation_sequence": list(self.validation_sequence),
+            "stop_on_error": self.stop_on_error,
+            "rules": rules,
+        }
+    
+    def _report_key(
+        self,
+        document: Dict[str, Any],
+        compliance_level: ComplianceLevel,
+        transform_if_needed: bool,
+        context: Optional[Dict[str, Any]],
+        date_key: Optional[str] = None
+    ) -> str:
+        """Report cache key for a document check"""
+        # The UTC date is part of the key because date rules compare against "today"
+        return canonical_hash(
+            document,
+            compliance_level.value,
+            transform_if_needed,
+            context,
+            date_key or datetime.utcnow().date().isoformat(),
+        )
+    
+    def _run_full_compliance(
+        self,
+        document: Dict[str, Any],
+        compliance_level: ComplianceLevel,
+        transform_if_needed: bool,
+        context: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Run transformation and every validation stage for a document"""
         logger.info("Starting full compliance check")
         
         validation_report = {
@@ -320,6 +608,26 @@ class ComplianceChecker:
                 "message": f"Validation and transformation failed: {str(e)}"
             }, None
     
+    def get_ruleset_version(self) -> str:
+        """Fingerprint of everything besides the document that decides a report"""
+        def component_version(component: Any) -> Any:
+            get_version = getattr(component, "get_ruleset_version", None)
+            return get_version() if callable(get_version) else id(component)
+        
+        return canonical_hash(
+            {level.value: config.get("stages") for level, config in self.compliance_levels.items()},
+            self.validation_sequence,
+            self.stop_on_error,
+            id(self.ubl_validator),
+            id(self.schema_transformer),
+            component_version(self.business_rule_engine),
+            component_version(self.custom_validator),
+        )
+    
+    def invalidate_report_cache(self, tenant_id: Optional[str] = None) -> int:
+        """Drop cached reports for one tenant, or for all tenants"""
+        return self.report_cache.invalidate(tenant_id)
+    
     def get_compliance_summary(self) -> Dict[str, Any]:
         """Get summary of compliance checking capabilities"""
         return {
@@ -331,7 +639,8 @@ class ComplianceChecker:
             },
             "compliance_levels": [level.value for level in ComplianceLevel],
             "validation_sequence": self.validation_sequence,
-            "stop_on_error": self.stop_on_error
+            "stop_on_error": self.stop_on_error,
+            "report_cache": self.report_cache.get_stats()
         }
     
     def configure_validation(
@@ -438,6 +747,13 @@ class ComplianceChecker:
         # Remove duplicates and return
         return list(set(recommendations))
     
+    def _resolve_cache_tenant(self, context: Optional[Dict[str, Any]]) -> str:
+        """Tenant whose cache partition a report belongs to"""
+        tenant_id = None
+        if context:
+            tenant_id = context.get("organization_id") or context.get("tenant_id")
+        return str(tenant_id or get_current_tenant() or "global")
+    
     def _is_ubl_format(self, document: Dict[str, Any]) -> bool:
         """Check if document is already in UBL format"""
         ubl_indicators = [
@@ -490,4 +806,50 @@ class ComplianceChecker:
 
 
 # Global instance for easy access
-compliance_checker = ComplianceChecker()
\ No newline at end of file
+compliance_checker = ComplianceChecker()
+
+
+_DEFAULT_BUSINESS_RULES: Optional[Dict[str, BusinessRule]] = None
+_worker_checker: Optional[ComplianceChecker] = None
+
+
+def _default_business_rules() -> Dict[str, BusinessRule]:
+    global _DEFAULT_BUSINESS_RULES
+    if _DEFAULT_BUSINESS_RULES is None:
+        _DEFAULT_BUSINESS_RULES = BusinessRuleEngine().rules
+    return _DEFAULT_BUSINESS_RULES
+
+
+def _build_worker_checker(worker_config: Dict[str, Any]) -> ComplianceChecker:
+    """Rebuild a parent checker's configuration inside a worker process"""
+    rule_engine = BusinessRuleEngine()
+    default_rules = rule_engine.rules
+    rule_engine.rules = {}
+    for rule_id, name, description, category, severity, enabled in worker_config["rules"]:
+        rule = default_rules[rule_id]
+        rule.name, rule.description, rule.category = name, description, category
+        rule.severity, rule.enabled = severity, enabled
+        rule_engine.rules[rule_id] = rule
+    
+    checker = ComplianceChecker(report_cache=ComplianceReportCache(max_entries=0))
+    checker.set_dependencies(UBLValidator(), SchemaTransformer(), rule_engine, CustomValidator())
+    for level, stages in worker_config["compliance_levels"].items():
+        checker.compliance_levels.setdefault(ComplianceLevel(level), {})["stages"] = stages
+    checker.validation_sequence = worker_config["validation_sequence"]
+    checker.stop_on_error = worker_config["stop_on_error"]
+    return checker
+
+
+def _init_batch_worker(worker_config: Dict[str, Any]) -> None:
+    """Worker initializer: build the checker once per worker process"""
+    global _worker_checker
+    _worker_checker = _build_worker_checker(worker_config)
+
+
+def _check_compliance_chunk(task: bytes) -> List[Dict[str, Any]]:
+    """Worker entry point: validate one pickled (level, transform, chunk) task"""
+    level, transform_if_needed, items = pickle.loads(task)
+    return [
+        _worker_checker._run_full_compliance(document, ComplianceLevel(level), transform_if_needed, document_context)
+        for document, document_context in items
+    ]
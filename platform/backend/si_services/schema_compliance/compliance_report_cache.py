@@ -0,0 +1,147 @@
+"""
+Compliance Report Cache
+
+Bounded, tenant-scoped memo of full compliance reports. Reports are keyed by a
+canonical hash of the document and validation context, the compliance level
+and the ruleset version, so retries, resubmissions and re-validation of an
+identical payload skip transformation and every validation stage.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+
+def canonical_hash(*parts: Any) -> str:
+    """SHA-256 of the parts serialized as canonical JSON (sorted keys, no whitespace)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _record_cache_metric(result: str) -> None:
+    try:
+        from core_platform.monitoring.prometheus_integration import get_prometheus_integration
+
+        prom = get_prometheus_integration()
+        if prom:
+            prom.record_metric("taxpoynt_compliance_report_cache_total", 1, {"result": result})
+    except Exception:
+        pass
+
+
+class ComplianceReportCache:
+    """
+    LRU cache of compliance reports scoped by tenant.
+
+    Entries are stored under ``(tenant_id, report_key)``. When the ruleset
+    version passed to ``get``/``put`` changes, every entry built under the old
+    version is dropped, so rule edits never serve stale verdicts.
+
+    Args:
+        max_entries: LRU bound across all tenants (0 disables the cache)
+        ttl_seconds: Entry lifetime (None = until evicted or invalidated)
+    """
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: Optional[float] = 3600.0):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._ruleset_version: Optional[str] = None
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, tenant_id: str, report_key: str, ruleset_version: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached report, or None on a miss."""
+        with self._lock:
+            self._sync_ruleset_version(ruleset_version)
+            key = (tenant_id, report_key)
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and time.monotonic() >= entry[0]:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                result = None
+            else:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                result = copy.deepcopy(entry[1])
+
+        _record_cache_metric("hit" if result is not None else "miss")
+        return result
+
+    def put(self, tenant_id: str, report_key: str, ruleset_version: str, report: Dict[str, Any]) -> None:
+        """Store a copy of a report built under ``ruleset_version``."""
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        evicted = 0
+        with self._lock:
+            self._sync_ruleset_version(ruleset_version)
+            key = (tenant_id, report_key)
+            self._entries[key] = (expires_at, copy.deepcopy(report))
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self._stats["evictions"] += evicted
+
+        if evicted:
+            _record_cache_metric("eviction")
+
+    def invalidate(self, tenant_id: Optional[str] = None) -> int:
+        """Drop every entry (or every entry of one tenant); returns the number removed."""
+        with self._lock:
+            if tenant_id is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [key for key in self._entries if key[0] == tenant_id]
+                for key in keys:
+                    del self._entries[key]
+                removed = len(keys)
+            self._stats["invalidations"] += removed
+
+        if removed:
+            _record_cache_metric("invalidation")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit rate and current size."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "lookups": lookups,
+                "hit_rate": (self._stats["hits"] / lookups) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "tenants": len({key[0] for key in self._entries}),
+                "ruleset_version": self._ruleset_version,
+            }
+
+    def _sync_ruleset_version(self, ruleset_version: str) -> None:
+        # Caller holds the lock
+        if ruleset_version == self._ruleset_version:
+            return
+        if self._ruleset_version is not None and self._entries:
+            logger.info(
+                "Compliance ruleset changed; dropping %d cached reports", len(self._entries)
+            )
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+        self._ruleset_version = ruleset_version
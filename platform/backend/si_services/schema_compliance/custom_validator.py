@@ -13,6 +13,8 @@ import json
 import re
 import importlib.util
 
+from .compliance_report_cache import canonical_hash
+
 logger = logging.getLogger(__name__)
 
 
@@ -354,6 +356,17 @@ class CustomValidator:
             logger.error(f"Error setting execution order: {e}")
             return False
     
+    def get_ruleset_version(self) -> str:
+        """Fingerprint of the custom rules, groups and execution order"""
+        return canonical_hash(
+            [
+                (rule_id, rule.enabled, rule.conditions, rule.metadata, id(rule.validator_function))
+                for rule_id, rule in sorted(self.custom_rules.items())
+            ],
+            self.rule_groups,
+            self.execution_order,
+        )
+    
     def get_rule_summary(self) -> Dict[str, Any]:
         """Get summary of custom rules"""
         return {
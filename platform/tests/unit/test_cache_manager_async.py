@@ -0,0 +1,74 @@
+import uuid
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from core_platform.cache import CacheService
+from core_platform.data_management.cache_manager import CacheConfig, CacheManager
+
+
+def _manager(**overrides):
+    config = CacheConfig(compression_threshold=64, **overrides)
+    return CacheManager(config, async_redis_client=fakeredis.aioredis.FakeRedis())
+
+
+@pytest.mark.asyncio
+async def test_async_pipelined_round_trip_and_codecs():
+    manager = _manager(compression_codec="zlib")
+    org = uuid.uuid4()
+    manager.set_tenant_context(uuid.uuid4(), org)
+    big = {"lines": ["item"] * 100}
+
+    assert await manager.aset_many({"a": 1, "b": big}, ttl=60)
+    stored = await manager._async_redis_client.get(f"tenant:{org}:b")
+    assert stored.startswith(b"\xffC\x01")
+
+    manager._memory_cache.clear()
+    assert await manager.aget_many(["a", "b", "missing"]) == {"a": 1, "b": big}
+    assert manager._memory_cache.size() == 2
+
+    # gzip payloads written before codecs were pluggable still decode
+    gzip_manager = _manager()
+    assert gzip_manager._decompress(gzip_manager._compress(b"{}" * 100)) == b"{}" * 100
+    assert manager._deserialize_value(gzip_manager._serialize_value(big)) == big
+
+    assert await manager.aincrement("counter", 5) == 5
+    assert await manager._async_redis_client.ttl(f"tenant:{org}:counter") > 0
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_tenant_invalidation_scan_unlink_and_namespace_version():
+    org, other = uuid.uuid4(), uuid.uuid4()
+
+    manager = _manager()
+    service = CacheService(manager)
+    for tenant in (org, other):
+        manager.set_tenant_context(uuid.uuid4(), tenant)
+        await service.set("invoice:1", {"n": 1})
+    await service.clear_tenant_cache(str(org))
+    keys = {key.decode() for key in await manager._async_redis_client.keys("*")}
+    assert keys == {f"tenant:{other}:invoice:1"}
+
+    versioned = _manager(tenant_namespace_versioning=True)
+    versioned.set_tenant_context(uuid.uuid4(), org)
+    await versioned.aset("invoice:1", {"n": 1})
+    assert await versioned.aget("invoice:1") == {"n": 1}
+
+    await versioned.aclear_tenant_cache(org)
+    assert await versioned.aget("invoice:1") is None
+    assert await versioned._async_redis_client.get(f"cache_ns:tenant:{org}") == b"1"
+
+
+def test_sync_clear_tenant_cache_uses_scan_not_keys():
+    manager = CacheManager(CacheConfig())
+    manager._redis_client = fakeredis.FakeRedis()
+    org = uuid.uuid4()
+    manager.set_tenant_context(uuid.uuid4(), org)
+    manager.set("a", 1)
+    manager._redis_client.keys = None  # KEYS must not be used
+
+    manager.clear_tenant_cache(org)
+    assert manager._redis_client.get(f"tenant:{org}:a") is None
+    assert manager.get("a") is None
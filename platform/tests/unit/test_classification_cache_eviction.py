@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import fakeredis.aioredis
+import pytest
+
+from external_integrations.connector_framework.classification_engine import (
+    AdmissionPolicy,
+    CacheEntry,
+    ClassificationCacheManager,
+    NigerianRuleFallback,
+)
+from external_integrations.connector_framework.classification_engine.classification_models import (
+    TransactionClassificationRequest,
+    UserContext,
+)
+
+
+async def _result():
+    request = TransactionClassificationRequest(
+        transaction_id="tx-1",
+        amount=Decimal("25000"),
+        narration="Payment for goods invoice 12",
+        date=datetime(2024, 5, 6),
+        user_context=UserContext(user_id="user-1", organization_id="org-1"),
+    )
+    return await NigerianRuleFallback().classify_transaction(request)
+
+
+def _entry(key, result):
+    now = datetime.utcnow()
+    return CacheEntry(
+        cache_key=key,
+        result=result,
+        created_at=now,
+        last_accessed=now,
+        access_count=1,
+        confidence_score=result.confidence,
+        user_confirmations=0,
+        user_corrections=0,
+        expires_at=now + timedelta(hours=1),
+    )
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used_within_count_and_byte_budget():
+    result = await _result()
+    manager = ClassificationCacheManager(max_cache_size=3)
+
+    for key in ("a", "b", "c"):
+        assert await manager._set_cache_entry(_entry(key, result))
+    assert await manager._get_cache_entry("a") is not None  # "b" becomes the LRU victim
+    await manager._set_cache_entry(_entry("d", result))
+
+    assert list(manager.memory_cache) == ["c", "a", "d"]
+    assert manager.stats["evictions"] == 1
+
+    entry_bytes = manager.memory_cache_bytes // 3
+    manager.max_cache_bytes = entry_bytes * 2
+    await manager._set_cache_entry(_entry("e", result))
+    assert list(manager.memory_cache) == ["d", "e"]
+    assert manager.memory_cache_bytes == sum(manager._entry_sizes.values())
+
+    assert await manager.clear_cache() == 2
+    assert manager.memory_cache_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_tinylfu_rejects_one_hit_wonders():
+    result = await _result()
+    manager = ClassificationCacheManager(max_cache_size=2, admission_policy=AdmissionPolicy.TINY_LFU)
+
+    for key in ("hot-1", "hot-2"):
+        await manager._set_cache_entry(_entry(key, result))
+        for _ in range(3):
+            await manager._get_cache_entry(key)
+
+    await manager._set_cache_entry(_entry("scan-1", result))
+
+    assert set(manager.memory_cache) == {"hot-1", "hot-2"}
+    assert manager.stats["admission_rejections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_writes_are_batched_behind_and_promoted_on_read():
+    result = await _result()
+    redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    manager = ClassificationCacheManager(write_behind_batch_size=2)
+    manager.async_redis_client = redis_client
+    manager.redis_available = True
+
+    for key in ("k1", "k2", "k3"):
+        await manager._set_cache_entry(_entry(key, result))
+    assert len(manager._write_behind) == 3
+
+    assert await manager.flush_write_behind() == 3
+    assert manager.stats["write_behind_flushes"] == 2
+    assert await redis_client.ttl("k1") > 0
+
+    manager._memory_pop("k2")
+    promoted = await manager._get_cache_entry("k2")
+    assert promoted is not None and promoted.cache_key == "k2"
+    assert "k2" in manager.memory_cache
+
+    await manager._remove_cache_entry("k3")
+    assert await redis_client.get("k3") is None
+
+
+class _GatedPipeline:
+    """Pipeline wrapper whose execute() waits for a gate and can be told to fail."""
+
+    def __init__(self, pipeline, gate, fail):
+        self._pipeline = pipeline
+        self._gate = gate
+        self._fail = fail
+
+    def setex(self, *args):
+        self._pipeline.setex(*args)
+
+    async def execute(self):
+        await self._gate.wait()
+        if self._fail:
+            raise ConnectionError("redis down")
+        return await self._pipeline.execute()
+
+
+def _gated_redis_manager(fail=False):
+    import asyncio
+
+    redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    gate = asyncio.Event()
+    pipeline = redis_client.pipeline
+    state = {"fail": fail}
+    redis_client.pipeline = lambda transaction=False: _GatedPipeline(pipeline(transaction=transaction), gate, state["fail"])
+    manager = ClassificationCacheManager(write_behind_batch_size=10)
+    manager.async_redis_client = redis_client
+    manager.redis_available = True
+    return manager, redis_client, gate, state
+
+
+@pytest.mark.asyncio
+async def test_failed_write_behind_flush_keeps_entries_queued():
+    result = await _result()
+    manager, redis_client, gate, state = _gated_redis_manager(fail=True)
+    gate.set()
+    for key in ("k1", "k2"):
+        await manager._set_cache_entry(_entry(key, result))
+    manager._write_behind_task.cancel()
+
+    assert await manager.flush_write_behind() == 0
+    assert list(manager._write_behind) == ["k1", "k2"]
+    assert manager.stats["write_behind_errors"] == 1
+
+    state["fail"] = False
+    assert await manager.flush_write_behind() == 2
+    assert not manager._write_behind
+    assert await redis_client.get("k2") is not None
+
+
+@pytest.mark.asyncio
+async def test_entry_removed_during_flush_is_not_resurrected():
+    import asyncio
+
+    result = await _result()
+    manager, redis_client, gate, _ = _gated_redis_manager()
+    for key in ("k1", "k2"):
+        await manager._set_cache_entry(_entry(key, result))
+    manager._write_behind_task.cancel()
+
+    flush = asyncio.create_task(manager.flush_write_behind())
+    await asyncio.sleep(0)  # batch is in flight
+    await manager._remove_cache_entry("k1")
+    gate.set()
+    assert await flush == 2
+
+    assert await redis_client.get("k1") is None
+    assert await redis_client.get("k2") is not None
+    assert not manager._flushing_keys and not manager._removed_while_flushing
+
+
+@pytest.mark.asyncio
+async def test_oversized_entry_is_rejected_without_evicting_others():
+    result = await _result()
+    manager = ClassificationCacheManager(max_cache_size=10)
+    await manager._set_cache_entry(_entry("small", result))
+    manager.max_cache_bytes = manager.memory_cache_bytes * 2
+
+    assert not manager._memory_put(_entry("huge", result), manager.max_cache_bytes + 1)
+    assert list(manager.memory_cache) == ["small"]
+    assert manager.stats["evictions"] == 0
+    assert manager.stats["admission_rejections"] == 1
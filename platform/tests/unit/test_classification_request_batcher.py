@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from external_integrations.connector_framework.classification_engine import (
+    BatchingConfig,
+    ClassificationBatcher,
+    ClassificationTier,
+    LocalStubProvider,
+    NigerianTransactionClassifier,
+)
+from external_integrations.connector_framework.classification_engine.classification_models import (
+    TransactionClassificationRequest,
+    UserContext,
+)
+
+
+def _request(index, narration, amount="25000", org="org-1"):
+    return TransactionClassificationRequest(
+        transaction_id=f"tx-{index}",
+        amount=Decimal(amount),
+        narration=narration,
+        date=datetime(2024, 5, 6),
+        time="10:15",
+        user_context=UserContext(user_id="user-1", organization_id=org),
+        classification_tier=ClassificationTier.API_PREMIUM,
+        request_id=f"req-{index}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced_and_deduplicated():
+    provider = LocalStubProvider(latency_s=0.01)
+    classifier = NigerianTransactionClassifier(
+        provider=provider, batching=BatchingConfig(window_ms=5, initial_batch_size=50)
+    )
+    requests = [_request(i, f"POS PURCHASE SHOPRITE TERMINAL {1000 + i}") for i in range(30)]
+    requests += [_request(100 + i, f"Payment for goods invoice {i}", amount="150000") for i in range(10)]
+
+    results = await classifier.classify_transactions(requests)
+
+    assert [r.request_id for r in results] == [r.request_id for r in requests]
+    assert all(r.metadata.classification_method == "api_batched" for r in results)
+    # Two distinct normalized narrations -> one provider call carrying two items
+    assert provider.calls == [2]
+    stats = classifier.batcher.get_stats()
+    assert stats["coalesced"] == 38
+    assert stats["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_size_adapts_and_failures_fall_back_to_rules():
+    provider = LocalStubProvider(fail_batches=1)
+    classifier = NigerianTransactionClassifier(
+        provider=provider, batching=BatchingConfig(window_ms=1, initial_batch_size=4, max_batch_size=5)
+    )
+
+    failed = await classifier.classify_transactions([_request(i, f"narration variant {chr(97 + i)}") for i in range(4)])
+    assert all(r.metadata.fallback_used for r in failed)
+    assert classifier.batcher.batch_size == 2
+
+    ok = await classifier.classify_transactions([_request(10 + i, f"another text {chr(97 + i)}") for i in range(6)])
+    assert not any(r.metadata.fallback_used for r in ok)
+    assert provider.calls[1:] == [2, 2, 2]
+    assert classifier.batcher.batch_size == 3
+
+
+@pytest.mark.asyncio
+async def test_requests_from_different_organizations_are_not_merged():
+    provider = LocalStubProvider()
+    batcher = ClassificationBatcher(provider, BatchingConfig(window_ms=1))
+
+    await asyncio.gather(
+        batcher.submit(_request(1, "Payment for goods", org="org-a")),
+        batcher.submit(_request(2, "Payment for goods", org="org-b")),
+    )
+
+    assert sorted(provider.calls) == [1, 1]
+    assert batcher.get_stats()["coalesced"] == 0
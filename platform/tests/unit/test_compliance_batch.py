@@ -0,0 +1,101 @@
+import pytest
+
+from si_services.schema_compliance.business_rule_engine import BusinessRuleEngine
+from si_services.schema_compliance.compliance_checker import ComplianceChecker, ComplianceLevel
+from si_services.schema_compliance.compliance_report_cache import ComplianceReportCache
+from si_services.schema_compliance.custom_validator import CustomValidator
+from si_services.schema_compliance.schema_transformer import SchemaTransformer
+from si_services.schema_compliance.ubl_validator import UBLValidator
+
+
+def _checker():
+    checker = ComplianceChecker(report_cache=ComplianceReportCache(max_entries=0))
+    checker.set_dependencies(UBLValidator(), SchemaTransformer(), BusinessRuleEngine(), CustomValidator())
+    checker.business_rule_engine.disable_rule("NG_VAT_THRESHOLD")
+    return checker
+
+
+def _invoice(index):
+    return {
+        "invoice_number": f"INV-{index:04d}",
+        "invoice_date": "2026-10-01",
+        "currency": "NGN" if index % 3 else "USD",
+        "partner_id": {"name": f"Customer {index}"},
+        "company_id": {"name": "Supplier Ltd", "vat": "12345678-0001"},
+        "invoice_line_ids": [{"product_name": "Item", "quantity": index % 4 + 1, "price_unit": 100.0}],
+    }
+
+
+def _comparable(report):
+    report = dict(report, timestamp=None)
+    report["metadata"] = dict(report["metadata"], validation_duration_ms=None)
+    report["recommendations"] = sorted(report["recommendations"])
+    return report
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_batch_reports_match_single_document_checks(max_workers):
+    checker = _checker()
+    documents = [_invoice(index % 7) for index in range(12)]
+    try:
+        batch = checker.check_batch_compliance(
+            documents, ComplianceLevel.STRICT, max_workers=max_workers, chunk_size=2, use_cache=False
+        )
+        assert (checker._batch_pool is not None) == (max_workers > 1)
+    finally:
+        checker.shutdown_batch_pool()
+
+    expected = [
+        checker.check_full_compliance(document, ComplianceLevel.STRICT, use_cache=False) for document in documents
+    ]
+    assert [_comparable(report) for report in batch] == [_comparable(report) for report in expected]
+    assert "NG_VAT_THRESHOLD" not in str(batch)
+
+
+def test_batch_dedupes_and_uses_report_cache():
+    checker = _checker()
+    checker.report_cache = ComplianceReportCache(max_entries=100)
+    calls = []
+    run_full_compliance = checker._run_full_compliance
+    checker._run_full_compliance = lambda document, *args: calls.append(document) or run_full_compliance(document, *args)
+    # Process-local custom rules keep the batch in-process
+    checker.custom_validator.add_custom_rule("ALWAYS_OK", "ok", "", lambda data: (True, ""))
+
+    documents = [_invoice(1), _invoice(2), _invoice(1)]
+    first = checker.check_batch_compliance(documents, max_workers=4, chunk_size=1, context={"organization_id": "org-a"})
+    assert len(calls) == 2
+    assert [report["metadata"]["cache_hit"] for report in first] == [False, False, True]
+
+    second = checker.check_batch_compliance(documents, context={"organization_id": "org-a"})
+    other_tenant = checker.check_batch_compliance(documents[:1], context={"organization_id": "org-b"})
+    assert len(calls) == 3
+    assert all(report["metadata"]["cache_hit"] for report in second)
+    assert not other_tenant[0]["metadata"]["cache_hit"]
+
+
+@pytest.mark.asyncio
+async def test_batch_async_matches_sync():
+    checker = _checker()
+    documents = [_invoice(index) for index in range(3)]
+    reports = await checker.check_batch_compliance_async(documents, max_workers=1, use_cache=False)
+    assert [report["document_id"] for report in reports] == [document["invoice_number"] for document in documents]
+    with pytest.raises(ValueError):
+        checker.check_batch_compliance(documents, contexts=[None])
+
+
+def test_batch_falls_back_in_process_when_work_cannot_reach_workers():
+    import threading
+
+    checker = _checker()
+    # A lock in the context survives the cache key (str()) but cannot be pickled
+    contexts = [{"organization_id": "org-a", "trace": threading.Lock()} for _ in range(4)]
+    documents = [_invoice(index) for index in range(4)]
+    try:
+        batch = checker.check_batch_compliance(
+            documents, contexts=contexts, max_workers=2, chunk_size=1, use_cache=False
+        )
+    finally:
+        checker.shutdown_batch_pool()
+
+    assert [report["document_id"] for report in batch] == [document["invoice_number"] for document in documents]
+    assert all(report["overall_status"] != "error" for report in batch)
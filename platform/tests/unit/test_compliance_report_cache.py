@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock
+
+from si_services.schema_compliance.business_rule_engine import BusinessRule, BusinessRuleEngine
+from si_services.schema_compliance.compliance_checker import ComplianceChecker, ComplianceLevel
+from si_services.schema_compliance.compliance_report_cache import ComplianceReportCache
+
+
+def _checker():
+    checker = ComplianceChecker(report_cache=ComplianceReportCache(max_entries=2))
+    ubl_validator = MagicMock()
+    ubl_validator.validate_ubl_document.return_value = (True, [])
+    rules = BusinessRuleEngine()
+    rules.rules = {}
+    checker.set_dependencies(ubl_validator, None, rules, None)
+    return checker, ubl_validator, rules
+
+
+def test_identical_payloads_hit_tenant_scoped_cache():
+    checker, ubl_validator, _ = _checker()
+    document = {"invoice_number": "INV-1", "lines": [1, 2]}
+
+    first = checker.check_full_compliance(document, transform_if_needed=False, context={"organization_id": "org-a"})
+    # Key order does not matter; the cached copy is independent of the caller's
+    first["summary"]["total_errors"] = 99
+    second = checker.check_full_compliance(
+        {"lines": [1, 2], "invoice_number": "INV-1"}, transform_if_needed=False, context={"organization_id": "org-a"}
+    )
+    assert (first["metadata"]["cache_hit"], second["metadata"]["cache_hit"]) == (False, True)
+    assert second["summary"]["total_errors"] == 0
+    assert ubl_validator.validate_ubl_document.call_count == 1
+
+    # Other tenants, levels and bypassed lookups run the stages again
+    checker.check_full_compliance(document, transform_if_needed=False, context={"organization_id": "org-b"})
+    checker.check_full_compliance(document, ComplianceLevel.BASIC, transform_if_needed=False,
+                                  context={"organization_id": "org-a"})
+    checker.check_full_compliance(document, transform_if_needed=False, context={"organization_id": "org-a"},
+                                  use_cache=False)
+    assert ubl_validator.validate_ubl_document.call_count == 4
+
+    stats = checker.get_compliance_summary()["report_cache"]
+    assert (stats["hits"], stats["misses"], stats["size"], stats["evictions"]) == (1, 3, 2, 1)
+
+
+def test_rule_changes_invalidate_cached_reports():
+    checker, ubl_validator, rules = _checker()
+    document = {"invoice_number": "INV-2"}
+
+    assert checker.check_full_compliance(document, transform_if_needed=False)["overall_status"] == "compliant"
+    rules.add_custom_rule(BusinessRule(
+        "NO_INV_2", "Reject INV-2", "", "business_logic", "error",
+        lambda data: (data.get("invoice_number") != "INV-2", "INV-2 is blocked"),
+    ))
+    report = checker.check_full_compliance(document, transform_if_needed=False)
+    assert report["overall_status"] == "non_compliant"
+    assert not report["metadata"]["cache_hit"]
+
+    rules.disable_rule("NO_INV_2")
+    assert checker.check_full_compliance(document, transform_if_needed=False)["overall_status"] == "compliant"
+    assert ubl_validator.validate_ubl_document.call_count == 3
+    assert checker.report_cache.get_stats()["invalidations"] == 2
@@ -0,0 +1,103 @@
+import pytest
+
+from external_integrations.connector_framework.base_connector import DataFormat
+from external_integrations.connector_framework.data_transformer import (
+    DataTransformer,
+    FieldMapping,
+    TransformationProfile,
+    TransformationRule,
+    TransformationType,
+    ValidationLevel,
+)
+from external_integrations.connector_framework.safe_expressions import ExpressionError, compile_expression
+
+
+def test_conditions_compile_to_safe_predicates():
+    expression = compile_expression("status in ('paid', 'settled') and total >= 100 or len(lines) > 2")
+    assert expression.matches({"status": "paid", "total": 150, "lines": []})
+    assert expression.matches({"status": "open", "total": 0, "lines": [1, 2, 3]})
+    assert not expression.matches({"status": "open", "total": 500, "lines": []})
+    # Missing names fail the predicate instead of raising, like the old eval path
+    assert not expression.matches({})
+
+    for unsafe in ("__import__('os')", "total.__class__", "open('x')", "[x for x in lines]", "lambda: 1"):
+        with pytest.raises(ExpressionError):
+            compile_expression(unsafe)
+
+
+def _order_profile():
+    return TransformationProfile(
+        profile_id="orders",
+        name="Orders",
+        description="",
+        source_format=DataFormat.JSON,
+        target_format=DataFormat.JSON,
+        field_mappings=[
+            FieldMapping(source_field="customer.email", target_field="buyer.email",
+                         transformation_function="normalize_email", validation_rules=["required", "email"],
+                         required=True),
+            FieldMapping(source_field="amount", target_field="totals.amount",
+                         transformation_function="to_float", validation_rules=["range:0,10000.5"]),
+            FieldMapping(source_field="channel", target_field="channel", default_value="web"),
+        ],
+        transformation_rules=[
+            TransformationRule(
+                rule_id="tax", name="tax", transformation_type=TransformationType.DATA_ENRICHMENT,
+                parameters={"type": "calculate_field", "formula": "amount * 0.075", "target_field": "vat"},
+                priority=10,
+            ),
+            TransformationRule(
+                rule_id="upper_ref", name="ref", transformation_type=TransformationType.VALUE_TRANSFORMATION,
+                condition="amount > 0", parameters={"function": "uppercase", "field": "meta.ref"}, priority=20,
+            ),
+            TransformationRule(
+                rule_id="disabled", name="off", transformation_type=TransformationType.DATA_AGGREGATION,
+                enabled=False, parameters={"type": "count"}, priority=1,
+            ),
+        ],
+        validation_level=ValidationLevel.MODERATE,
+    )
+
+
+@pytest.mark.asyncio
+async def test_compiled_profile_is_reused_and_matches_single_record_api():
+    transformer = DataTransformer()
+    transformer.add_transformation_profile(_order_profile())
+    records = [
+        {"customer": {"email": " A@B.CO "}, "amount": 200, "meta": {"ref": "ab1"}},
+        {"customer": {"email": "bad"}, "amount": 0, "meta": {"ref": "cd2"}},
+    ]
+
+    single = [await transformer.transform_data(dict(r, meta=dict(r["meta"])), "orders") for r in records]
+    batch = await transformer.transform_batch([dict(r, meta=dict(r["meta"])) for r in records], "orders")
+    assert transformer.stats["profile_compilations"] == 1
+
+    assert [r.transformed_data for r in batch] == [r.transformed_data for r in single]
+    assert batch[0].transformed_data == {"buyer": {"email": "a@b.co"}, "totals": {"amount": 200.0}, "channel": "web"}
+    assert batch[0].applied_rules == ["tax", "upper_ref"]
+    assert batch[0].original_data["meta"]["ref"] == "AB1"
+    assert batch[0].original_data["vat"] == 15.0
+    assert batch[1].applied_rules == ["tax"]
+    assert not batch[1].success
+    assert "Validation failed for required field 'buyer.email': email" in batch[1].errors
+
+    # Registering a function invalidates compiled profiles
+    transformer.add_transformation_function("uppercase", lambda x: f"<{x}>")
+    streamed = await transformer.transform_batch([{"amount": 1, "meta": {"ref": "x"}}], "orders")
+    assert streamed[0].original_data["meta"]["ref"] == "<x>"
+    assert transformer.stats["profile_compilations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_transform_stream_over_async_iterator():
+    transformer = DataTransformer()
+
+    async def records():
+        for index in range(3):
+            yield {"name": f" user{index} ", "email": f"U{index}@EXAMPLE.COM"}
+
+    names = [r.transformed_data["name"] async for r in transformer.transform_stream(records(), "data_normalization")]
+    assert names == ["user0", "user1", "user2"]
+
+    missing = await transformer.transform_batch([{}, {}], "unknown")
+    assert [r.errors for r in missing] == [["Transformation profile not found: unknown"]] * 2
@@ -11,10 +11,26 @@ from app_services.firs_communication.firs_api_client import (
 from app_services.firs_communication.party_cache import PartyCache, TINCache
 
 
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+async def _drain_refreshes(cache):
+    await asyncio.gather(*list(cache._refresh_tasks))
+
+
 @pytest.mark.asyncio
 async def test_party_cache_reuses_response_and_triggers_refresh():
     config = FIRSConfig()
-    cache = PartyCache(ttl_minutes=0.0005)  # roughly 0.03 seconds
+    clock = FakeClock()
+    cache = PartyCache(ttl_minutes=1, clock=clock)
     client = FIRSAPIClient(config, party_cache=cache)
 
     call_count = {'count': 0}
@@ -41,14 +57,14 @@ async def test_party_cache_reuses_response_and_triggers_refresh():
     assert response2 is response1
     assert call_count['count'] == 1
 
-    # Allow entry to expire
-    await asyncio.sleep(0.05)
+    # Let the entry expire
+    clock.advance(61)
 
-    # Third call should return stale value immediately and schedule background refresh
+    # Third call returns the stale value immediately and schedules a background refresh
     response3 = await client.get_party('P123')
     assert response3 is response1
-    await asyncio.sleep(0.05)
-    assert call_count['count'] >= 2
+    await _drain_refreshes(cache)
+    assert call_count['count'] == 2
 
     await client.stop()
 
@@ -56,7 +72,8 @@ async def test_party_cache_reuses_response_and_triggers_refresh():
 @pytest.mark.asyncio
 async def test_tin_cache_reuses_verification():
     config = FIRSConfig()
-    tin_cache = TINCache(ttl_minutes=0.0005)
+    clock = FakeClock()
+    tin_cache = TINCache(ttl_minutes=1, clock=clock)
     client = FIRSAPIClient(config, tin_cache=tin_cache)
 
     call_count = {'count': 0}
@@ -81,9 +98,163 @@ async def test_tin_cache_reuses_verification():
     await client.verify_tin(payload)
     assert call_count['count'] == 1  # cached
 
-    await asyncio.sleep(0.05)
+    clock.advance(61)
     await client.verify_tin(payload)
-    await asyncio.sleep(0.05)
-    assert call_count['count'] >= 2
+    await _drain_refreshes(tin_cache)
+    assert call_count['count'] == 2
 
     await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_party_cache_single_flight_coalesces_concurrent_misses():
+    client = FIRSAPIClient(FIRSConfig(), party_cache=PartyCache(ttl_minutes=5))
+    call_count = {'count': 0}
+
+    async def fake_make_request(self, endpoint, method="GET", data=None, params=None, headers=None, timeout=None, retry_on_auth_failure=True):
+        call_count['count'] += 1
+        await asyncio.sleep(0.01)
+        return FIRSResponse(status_code=200, headers={}, data={'partyId': 'P9'}, raw_response='{}', success=True)
+
+    client.make_request = fake_make_request.__get__(client, FIRSAPIClient)
+
+    responses = await asyncio.gather(*(client.get_party('P9') for _ in range(20)))
+
+    assert call_count['count'] == 1
+    assert all(response is responses[0] for response in responses)
+    metrics = client.party_cache.get_metrics()
+    assert metrics['coalesced'] == 19
+    assert metrics['loads'] == 1
+
+    await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_party_cache_lru_bound_and_stale_serve_metrics():
+    clock = FakeClock()
+    cache = PartyCache(ttl_minutes=1, max_entries=2, clock=clock)
+    loads = {'count': 0}
+
+    async def loader():
+        loads['count'] += 1
+        return {'n': loads['count']}
+
+    for key in ('a', 'b', 'c'):
+        await cache.get_or_load(key, loader)
+    assert await cache.get('a', allow_stale=True) is None
+    assert cache.get_metrics()['evictions'] == 1
+
+    clock.advance(61)
+    assert await cache.get_or_load('c', loader) == {'n': 3}  # stale, refreshed in background
+    await _drain_refreshes(cache)
+    assert await cache.get('c') == {'n': 4}
+    metrics = cache.get_metrics()
+    assert metrics['stale_serves'] == 1
+    assert metrics['refreshes'] == 1
+    assert 0 < metrics['stale_serve_rate'] < 1
+
+    await cache.get_or_load('b', loader)  # stale, schedule refresh
+    cache.cancel_refreshes()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_loader_caller_does_not_cancel_coalesced_waiters():
+    cache = PartyCache(ttl_minutes=5, clock=FakeClock())
+    release = asyncio.Event()
+    loads = {'count': 0}
+
+    async def loader():
+        loads['count'] += 1
+        await release.wait()
+        return {'partyId': 'P1'}
+
+    owner = asyncio.create_task(cache.get_or_load('P1', loader))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(cache.get_or_load('P1', loader)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    owner.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [{'partyId': 'P1'}] * 3
+    assert owner.cancelled()
+    assert loads['count'] == 1
+    assert await cache.get('P1') == {'partyId': 'P1'}
+
+
+@pytest.mark.asyncio
+async def test_failed_load_raises_in_every_waiter():
+    cache = PartyCache(ttl_minutes=5, clock=FakeClock())
+
+    async def loader():
+        await asyncio.sleep(0)
+        raise RuntimeError('FIRS down')
+
+    results = await asyncio.gather(*(cache.get_or_load('P1', loader) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    metrics = cache.get_metrics()
+    assert (metrics['loads'], metrics['load_errors'], metrics['inflight']) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_resource_cache_single_flight_and_failure_keeps_last_good_payload():
+    from app_services.firs_communication.resource_cache import FIRSResourceCache
+
+    class StubClient:
+        def __init__(self):
+            self.calls = []
+            self.fail = False
+
+        async def get_resource(self, resource):
+            self.calls.append(resource)
+            await asyncio.sleep(0.01)
+            if self.fail:
+                return {'success': False, 'error': 'down', 'status_code': 503}
+            return {'success': True, 'data': [resource]}
+
+    stub = StubClient()
+    cache = FIRSResourceCache(stub, ttl_seconds=3600)
+
+    first, second = await asyncio.gather(cache.get_resources(), cache.refresh_resource('currencies'))
+    assert first['currencies'] == ['currencies']
+    assert second == {'currencies': ['currencies']}
+    assert sorted(stub.calls) == sorted(['currencies', 'invoice-types', 'services-codes', 'vat-exemptions'])
+    assert cache.get_metrics()['coalesced'] == 1
+
+    stub.fail = True
+    await cache.refresh_resource('currencies')
+    assert (await cache.get_resources())['currencies'] == ['currencies']
+    assert cache.get_metrics()['fetch_failures'] >= 1
+
+
+@pytest.mark.asyncio
+async def test_resource_cache_cancelled_caller_keeps_shared_fetch_and_expires_by_clock():
+    from app_services.firs_communication.resource_cache import FIRSResourceCache
+
+    release = asyncio.Event()
+
+    class StubClient:
+        calls = 0
+
+        async def get_resource(self, resource):
+            StubClient.calls += 1
+            await release.wait()
+            return {'success': True, 'data': [resource, StubClient.calls]}
+
+    clock = FakeClock()
+    cache = FIRSResourceCache(StubClient(), ttl_seconds=60, refresh_ahead_ratio=0, refresh_jitter_ratio=0, clock=clock)
+
+    owner = asyncio.create_task(cache.refresh_resource('currencies'))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.refresh_resource('currencies'))
+    await asyncio.sleep(0)
+    owner.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiter == {'currencies': ['currencies', 1]}
+    assert cache._is_fresh('currencies')
+    clock.advance(61)
+    assert not cache._is_fresh('currencies')
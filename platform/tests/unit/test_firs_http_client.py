@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from app_services.firs_communication.firs_http_client import FIRSHttpClient, FIRSHttpPoolSettings
+
+
+class StubProvider:
+    def __init__(self):
+        self.generation = 0
+        self.calls = 0
+        self.certificate = "cert-1"
+
+    def get_active_certificate(self):
+        self.calls += 1
+        return self.certificate
+
+
+@pytest_asyncio.fixture
+async def stub_server():
+    state = {"requests": [], "peers": set(), "slow_first": True}
+
+    async def lookup(request):
+        state["requests"].append(request.headers.copy())
+        state["peers"].add(request.transport.get_extra_info("peername"))
+        if state["slow_first"] and len(state["requests"]) == 1:
+            await asyncio.sleep(1.0)
+        return web.json_response({"irn": request.match_info["irn"]})
+
+    async def transmit(request):
+        state["requests"].append(request.headers.copy())
+        await asyncio.sleep(0.2)
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/invoice/transmit/lookup/{irn}", lookup)
+    app.router.add_post("/api/v1/invoice/transmit/{irn}", transmit)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", state
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_header_cache_refreshes_on_rotation_and_connections_are_reused(stub_server):
+    base_url, state = stub_server
+    state["slow_first"] = False
+    provider = StubProvider()
+    client = FIRSHttpClient(base_url, certificate_provider=provider, pool_settings=FIRSHttpPoolSettings())
+    try:
+        for _ in range(3):
+            assert (await client.lookup_transmit_by_irn("IRN-1"))["success"]
+        provider.certificate, provider.generation = "cert-2", 1
+        assert (await client.lookup_transmit_by_irn("IRN-1"))["data"] == {"irn": "IRN-1"}
+    finally:
+        await client.stop()
+
+    assert provider.calls == 2
+    assert [headers["x-certificate"] for headers in state["requests"]] == ["cert-1"] * 3 + ["cert-2"]
+    assert len({headers["x-request-id"] for headers in state["requests"]}) == 4
+    assert len(state["peers"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_get_returns_first_response_and_posts_are_never_hedged(stub_server):
+    base_url, state = stub_server
+    client = FIRSHttpClient(
+        base_url, certificate_provider=StubProvider(), pool_settings=FIRSHttpPoolSettings(hedge_after_ms=50)
+    )
+    try:
+        started = asyncio.get_running_loop().time()
+        result = await client.lookup_transmit_by_irn("IRN-9")
+        assert asyncio.get_running_loop().time() - started < 0.8
+        assert result == {"success": True, "status_code": 200, "data": {"irn": "IRN-9"}}
+        # Both attempts are one logical request
+        assert state["requests"][0]["x-request-id"] == state["requests"][1]["x-request-id"]
+
+        assert (await client.transmit("IRN-9"))["success"]
+    finally:
+        await client.stop()
+
+    assert len(state["requests"]) == 3
+    metrics = client.get_metrics()
+    assert (metrics["requests"], metrics["hedged_requests"], metrics["hedge_wins"]) == (2, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_hedged_get_during_hedge_delay_cancels_primary():
+    client = FIRSHttpClient(
+        "http://127.0.0.1:9", certificate_provider=StubProvider(), pool_settings=FIRSHttpPoolSettings(hedge_after_ms=5000)
+    )
+    attempts = []
+
+    async def slow_request(method, path, **kwargs):
+        attempts.append("started")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            attempts.append("cancelled")
+            raise
+
+    client._request = slow_request
+    try:
+        caller = asyncio.create_task(client.lookup_transmit_by_irn("IRN-9"))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+    finally:
+        await client.stop()
+
+    assert attempts == ["started", "cancelled"]
@@ -0,0 +1,159 @@
+import importlib.util
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core_platform.data_management.models import firs_submission_rollup
+from core_platform.data_management.models.base import Base
+from core_platform.data_management.models.firs_submission import FIRSSubmission, SubmissionStatus
+from core_platform.data_management.models.firs_submission_rollup import FIRSSubmissionDailyRollup
+from core_platform.data_management.models.organization import Organization
+from core_platform.data_management.repositories.firs_submission_repo_async import (
+    get_status_distribution,
+    get_submission_metrics,
+)
+from core_platform.data_management.repositories.firs_submission_rollups_async import (
+    backfill_submission_rollups,
+    check_submission_rollups,
+    get_rollup_daily_totals,
+)
+
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "backend" / "migrations" / "versions" / "e4a8c1f2b3d5_add_firs_submission_daily_rollups.py"
+)
+
+
+def _run_rollup_migration(connection):
+    spec = importlib.util.spec_from_file_location("rollup_migration", str(MIGRATION_PATH))
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with Operations.context(MigrationContext.configure(connection)):
+        migration.upgrade()
+
+
+def _submission(org_id, number, created_at=None):
+    return FIRSSubmission(
+        id=uuid.uuid4(), organization_id=org_id, invoice_number=number, invoice_data={},
+        total_amount=100, status=SubmissionStatus.PENDING, created_at=created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_rollups_follow_status_transitions_and_backfill():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        org = Organization(id=uuid.uuid4(), name="Rollup Org")
+        db.add(org)
+        await db.flush()
+
+        accepted, failed, dropped = (_submission(org.id, f"INV-{i}") for i in range(3))
+        old = _submission(org.id, "INV-OLD", created_at=now - timedelta(days=3))
+        db.add_all([accepted, failed, dropped, old])
+        await db.commit()
+
+        accepted.status = SubmissionStatus.SUBMITTED
+        accepted.submitted_at = now - timedelta(minutes=10)
+        await db.commit()
+        accepted.status = SubmissionStatus.ACCEPTED
+        accepted.accepted_at = now
+        failed.status = SubmissionStatus.FAILED
+        await db.delete(dropped)
+        await db.commit()
+
+        metrics = await get_submission_metrics(db, organization_id=org.id)
+        assert metrics["totalTransmissions"] == 3
+        assert (metrics["completed"], metrics["failed"], metrics["processing"]) == (1, 1, 1)
+        assert metrics["todayTransmissions"] == 2
+        assert metrics["averageProcessingTime"] == "10.0 minutes"
+        assert await get_status_distribution(db, organization_id=org.id) == {
+            "accepted": 1, "failed": 1, "pending": 1,
+        }
+        daily = await get_rollup_daily_totals(db, organization_id=org.id, since=(now - timedelta(days=6)).date())
+        assert daily[(now - timedelta(days=3)).date().isoformat()] == 1
+        assert (await check_submission_rollups(db, organization_id=org.id))["consistent"]
+
+        # Bulk statements bypass the flush hook; the checker notices and repairs
+        await db.execute(
+            update(FIRSSubmission).where(FIRSSubmission.id == old.id).values(status=SubmissionStatus.REJECTED)
+        )
+        await db.commit()
+        report = await check_submission_rollups(db, organization_id=org.id, repair=True)
+        assert not report["consistent"]
+        assert {m["status"] for m in report["mismatches"]} == {"pending", "rejected"}
+        assert report["repaired"] == [str(org.id)]
+        assert (await check_submission_rollups(db, organization_id=org.id))["consistent"]
+
+        # Backfill rebuilds an emptied table to the same numbers
+        await db.execute(delete(FIRSSubmissionDailyRollup))
+        await db.commit()
+        assert (await backfill_submission_rollups(db))["submissions"] == 3
+        assert await get_submission_metrics(db, organization_id=org.id) == dict(metrics, processing=0, failed=2)
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_readers_fall_back_until_migration_backfills_rollups(monkeypatch, caplog):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    tables = [t for t in Base.metadata.sorted_tables if t.name != FIRSSubmissionDailyRollup.__tablename__]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    now = datetime.now(timezone.utc)
+    caplog.set_level(logging.WARNING, logger=firs_submission_rollup.__name__)
+    async with session_factory() as db:
+        org = Organization(id=uuid.uuid4(), name="Pre-migration Org")
+        db.add(org)
+        await db.flush()
+        accepted, pending = _submission(org.id, "INV-A"), _submission(org.id, "INV-P")
+        old = _submission(org.id, "INV-OLD", created_at=now - timedelta(days=2))
+        db.add_all([accepted, pending, old])
+        await db.commit()
+        accepted.status = SubmissionStatus.ACCEPTED
+        accepted.submitted_at = now - timedelta(minutes=4)
+        accepted.accepted_at = now
+        old.status = SubmissionStatus.FAILED
+        await db.commit()
+
+        # No rollup table yet: readers aggregate firs_submissions, and the
+        # missing table is detected (and warned about) once, not per flush
+        metrics = await get_submission_metrics(db, organization_id=org.id)
+        assert (metrics["totalTransmissions"], metrics["completed"], metrics["failed"]) == (3, 1, 1)
+        assert metrics["todayTransmissions"] == 2
+        assert metrics["averageProcessingTime"] == "4.0 minutes"
+        since = (now - timedelta(days=6)).date()
+        daily = await get_rollup_daily_totals(db, organization_id=org.id, since=since)
+        assert daily[(now - timedelta(days=2)).date().isoformat()] == 1
+        assert len([r for r in caplog.records if "missing" in r.getMessage()]) == 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_run_rollup_migration)
+    monkeypatch.setattr(firs_submission_rollup, "MISSING_TABLE_RECHECK_SECONDS", 0.0)
+
+    async with session_factory() as db:
+        # The migration backfilled the table: same numbers, nothing to repair
+        assert (await check_submission_rollups(db, organization_id=org.id))["consistent"]
+        assert await get_submission_metrics(db, organization_id=org.id) == metrics
+        assert await get_rollup_daily_totals(db, organization_id=org.id, since=since) == daily
+
+        pending.status = SubmissionStatus.SUBMITTED
+        db.add(pending)
+        await db.commit()
+        assert (await check_submission_rollups(db, organization_id=org.id))["consistent"]
+
+    await engine.dispose()
@@ -0,0 +1,124 @@
+from core_platform.regulatory_systems.international_standards.wco_hs_classifier import (
+    HSClassificationMemo,
+    HSClassifier,
+    ProductClassification,
+)
+
+
+def _counting_classifier(memo=None, config=None):
+    classifier = HSClassifier(config=config, memo=memo)
+    calls = []
+    original = classifier.classify_product
+
+    def counting(product):
+        calls.append(product.product_name)
+        return original(product)
+
+    classifier.classify_product = counting
+    return classifier, calls
+
+
+def test_classify_products_deduplicates_normalized_texts():
+    classifier, calls = _counting_classifier()
+    batch = [
+        ProductClassification(product_name="Laptop computer"),
+        ProductClassification(product_name="laptop  COMPUTER!"),
+        ProductClassification(product_name="Portland cement"),
+    ]
+
+    results = classifier.classify_products(batch, tenant_id="tenant-a")
+
+    assert len(results) == 3
+    assert len(calls) == 2
+    assert results[0] is not results[1]
+    assert results[0].to_dict()["classification_method"] == results[1].to_dict()["classification_method"]
+    metrics = classifier.get_memo_metrics()
+    assert metrics["deduplicated"] == 1
+    assert metrics["classified"] == 2
+
+
+def test_confirmed_classifications_are_served_from_tenant_memo(tmp_path):
+    memo_path = tmp_path / "hs_memo.json"
+    classifier, _ = _counting_classifier(memo=HSClassificationMemo(str(memo_path)))
+    product = ProductClassification(product_name="Parboiled rice 50kg", sku="RICE-50")
+
+    assert classifier.confirm_classification("tenant-a", product, "1006.30")
+    assert not classifier.confirm_classification("tenant-a", product, "9999.99")
+
+    # A fresh classifier loads the persisted memo; other tenants are unaffected
+    reloaded, calls = _counting_classifier(memo=HSClassificationMemo(str(memo_path)))
+    batch = [
+        ProductClassification(product_name="Rice (parboiled) 50KG", sku="RICE-50"),
+        ProductClassification(product_name="Parboiled rice 50kg"),
+    ]
+    results = reloaded.classify_products(batch, tenant_id="tenant-a")
+
+    assert calls == []
+    assert all(r.success and r.hs_code.code == "1006.30" for r in results)
+    assert all(r.classification_method == "tenant_memo" for r in results)
+
+    other = reloaded.classify_products(batch[:1], tenant_id="tenant-b")
+    assert other[0].classification_method != "tenant_memo"
+    assert calls == ["Rice (parboiled) 50KG"]
+
+    metrics = reloaded.get_memo_metrics()
+    assert metrics["memo_hits"] == 2
+    assert metrics["memo"]["misses"] == 1
+
+
+def test_memo_hit_rate_counts_lines_and_only_validated_hits():
+    memo = HSClassificationMemo()
+    classifier, calls = _counting_classifier(memo=memo)
+    rice = ProductClassification(product_name="Parboiled rice 50kg", sku="RICE-50")
+    classifier.confirm_classification("tenant-a", rice, "1006.30")
+    # A code that no longer exists in the HS database must not count as a hit
+    stale = ProductClassification(product_name="Discontinued widget", sku="OLD-1")
+    memo.confirm("tenant-a", stale, "9999.99")
+
+    batch = [rice, rice.copy(), rice.copy(), stale]
+    results = classifier.classify_products(batch, tenant_id="tenant-a")
+
+    assert [r.classification_method for r in results[:3]] == ["tenant_memo"] * 3
+    assert calls == ["Discontinued widget"]
+    metrics = classifier.get_memo_metrics()
+    assert metrics["memo_hits"] == 3
+    assert metrics["memo_hit_rate"] == 0.75
+    assert (metrics["memo"]["hits"], metrics["memo"]["misses"], metrics["memo"]["rejected"]) == (1, 1, 1)
+
+
+def test_memo_journal_appends_records_and_compacts(tmp_path, monkeypatch):
+    from core_platform.regulatory_systems.international_standards.wco_hs_classifier import hs_memo
+
+    memo_path = tmp_path / "hs_memo.json"
+    memo = HSClassificationMemo(str(memo_path))
+    products = [ProductClassification(product_name=f"Product {i}", sku=f"SKU-{i}") for i in range(5)]
+    for product in products:
+        memo.confirm("tenant-a", product, "1006.30")
+    memo.forget("tenant-a", products[0])
+    memo.confirm("tenant-b", products[1], "2523.29")
+    memo.clear_tenant("tenant-b")
+
+    # One appended line per change instead of a full rewrite
+    assert len(memo_path.read_text().splitlines()) == 8
+    reloaded = HSClassificationMemo(str(memo_path))
+    assert reloaded.size("tenant-a") == 4 and reloaded.size("tenant-b") == 0
+    assert reloaded.lookup("tenant-a", products[0]) is None
+
+    monkeypatch.setattr(hs_memo, "_COMPACT_MIN_RECORDS", 10)
+    for _ in range(3):
+        reloaded.confirm("tenant-a", products[2], "1006.30")
+    assert len(memo_path.read_text().splitlines()) < 10
+    assert HSClassificationMemo(str(memo_path)).size("tenant-a") == 4
+
+
+def test_memo_loads_legacy_snapshot_file(tmp_path):
+    import json
+
+    memo_path = tmp_path / "hs_memo.json"
+    entry = {"hs_code": "1006.30", "confirmed_at": "2026-01-01T00:00:00"}
+    memo_path.write_text(json.dumps({"tenant-a": {"sku": {"RICE-50": entry}, "text": {"rice": entry}}}))
+
+    memo = HSClassificationMemo(str(memo_path))
+    assert memo.lookup("tenant-a", ProductClassification(product_name="Rice", sku="RICE-50")) == "1006.30"
+    memo.confirm("tenant-a", ProductClassification(product_name="Cement"), "2523.29")
+    assert HSClassificationMemo(str(memo_path)).size("tenant-a") == 2
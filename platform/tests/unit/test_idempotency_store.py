@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core_platform.data_management.models import IdempotencyKey, IdempotencyStatus
+from core_platform.idempotency import store as store_module
+from core_platform.idempotency.store import IdempotencyStore
+
+
+async def _session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(IdempotencyKey.__table__.create)
+    return engine, async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+async def _begin(db, requester, key, body):
+    return await IdempotencyStore.try_begin(
+        db, requester_id=requester, key=key, method="post", endpoint="/webhooks/firs",
+        request_hash=IdempotencyStore.compute_request_hash(body),
+    )
+
+
+@pytest.mark.asyncio
+async def test_atomic_reservation_replay_and_conflict(monkeypatch):
+    store_module._SUCCEEDED_CACHE.clear()
+    store_module._MEM_CACHE.clear()
+    engine, session_factory = await _session_factory()
+    async with session_factory() as db:
+        # Service labels are scoped under a stable UUID instead of failing to bind
+        assert await _begin(db, "firs_webhook", "evt-1", {"a": 1}) == (False, None, None, False)
+        assert await _begin(db, "firs_webhook", "evt-1", {"a": 1}) == (True, None, None, False)
+        assert await _begin(db, "firs_webhook", "evt-1", {"a": 2}) == (True, None, None, True)
+        assert store_module._MEM_CACHE == {}
+
+        row = (await db.execute(select(IdempotencyKey))).scalars().one()
+        assert row.requester_id == store_module._requester_uuid("firs_webhook")
+        assert row.status == IdempotencyStatus.IN_PROGRESS
+
+        await IdempotencyStore.finalize_success(
+            db, requester_id="firs_webhook", key="evt-1", response={"ok": True}, status_code=202,
+        )
+
+        # SUCCEEDED replays come from the hot tier without a database round trip
+        async def fail_execute(*args, **kwargs):
+            raise AssertionError("database touched")
+
+        monkeypatch.setattr(db, "execute", fail_execute)
+        assert await _begin(db, "firs_webhook", "evt-1", {"a": 1}) == (True, {"ok": True}, 202, False)
+        assert await _begin(db, "firs_webhook", "evt-1", {"a": 2}) == (True, None, None, True)
+        monkeypatch.undo()
+
+        # Another worker (empty hot tier) reads the SUCCEEDED row in the same single statement
+        store_module._SUCCEEDED_CACHE.clear()
+        assert await _begin(db, "firs_webhook", "evt-1", {"a": 1}) == (True, {"ok": True}, 202, False)
+        assert len(store_module._SUCCEEDED_CACHE) == 1
+
+        # Same key under a different requester is a separate reservation
+        user_id = str(uuid.uuid4())
+        assert await _begin(db, user_id, "evt-1", {"a": 1}) == (False, None, None, False)
+        assert (await db.execute(select(func.count()).select_from(IdempotencyKey))).scalar_one() == 2
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_deletes_in_bounded_chunks():
+    engine, session_factory = await _session_factory()
+    old = datetime.utcnow() - timedelta(days=30)
+    async with session_factory() as db:
+        for index in range(25):
+            created_at = old if index < 23 else datetime.utcnow()
+            db.add(IdempotencyKey(
+                requester_id=uuid.uuid4(), key=f"k-{index}", method="POST", endpoint="/x",
+                request_hash="h", status=IdempotencyStatus.SUCCEEDED,
+                created_at=created_at, updated_at=created_at,
+            ))
+        await db.commit()
+
+        assert await IdempotencyStore.cleanup(db, older_than_days=7, batch_size=10, max_batches=2) == 20
+        assert await IdempotencyStore.cleanup(db, older_than_days=7, batch_size=10) == 3
+        assert await IdempotencyStore.cleanup(db, older_than_days=7, batch_size=10) == 0
+        assert (await db.execute(select(func.count()).select_from(IdempotencyKey))).scalar_one() == 2
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_finalize_without_returning_support_checks_rowcount(monkeypatch):
+    store_module._SUCCEEDED_CACHE.clear()
+    store_module._MEM_CACHE.clear()
+    # Treat SQLite like a dialect without UPSERT/RETURNING support
+    monkeypatch.setattr(store_module, "_UPSERT_DIALECTS", {})
+    engine, session_factory = await _session_factory()
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    async with session_factory() as db:
+        assert await _begin(db, "firs_webhook", "evt-1", {"a": 1}) == (False, None, None, False)
+        await IdempotencyStore.finalize_success(
+            db, requester_id="firs_webhook", key="evt-1", response={"ok": True}, status_code=202,
+        )
+        # Unknown keys update nothing and are not cached
+        await IdempotencyStore.finalize_success(
+            db, requester_id="firs_webhook", key="evt-missing", response={"ok": True}, status_code=202,
+        )
+
+        row = (await db.execute(select(IdempotencyKey))).scalars().one()
+        assert row.status == IdempotencyStatus.SUCCEEDED
+        assert list(store_module._SUCCEEDED_CACHE) == [(store_module._requester_uuid("firs_webhook"), "evt-1")]
+        assert store_module._MEM_CACHE == {}
+    assert not any("RETURNING" in sql for sql in statements)
+    await engine.dispose()
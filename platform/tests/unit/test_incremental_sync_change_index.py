@@ -0,0 +1,182 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from si_services.data_extraction.change_index import ChangeIndex
+from si_services.data_extraction.erp_data_extractor import ERPAdapter, ERPDataExtractor, ERPType, InvoiceData
+from si_services.data_extraction.incremental_sync import (
+    IncrementalSyncService,
+    SyncConfig,
+    SyncResult,
+    SyncStatus,
+)
+
+BASE = datetime(2026, 5, 1, 8, 0, 0)
+
+
+def _invoice(index: int, total: float = 100.0) -> InvoiceData:
+    updated = BASE + timedelta(minutes=index)
+    return InvoiceData(
+        invoice_id=f"inv_{index}", invoice_number=f"INV-{index}", invoice_date=updated, due_date=None,
+        customer_id="c1", customer_name="Customer", customer_tin=None, currency="NGN",
+        subtotal=total, tax_amount=0.0, total_amount=total, line_items=[], payment_terms=None,
+        notes=None, status="posted", created_at=updated, updated_at=updated,
+    )
+
+
+class _FakeAdapter(ERPAdapter):
+    def __init__(self, invoices):
+        super().__init__({})
+        self.invoices = invoices
+        self.filters = []
+
+    async def connect(self):
+        return True
+
+    async def disconnect(self):
+        pass
+
+    async def test_connection(self):
+        return True
+
+    async def extract_invoices(self, filters):
+        self.filters.append(filters)
+        return [i for i in self.invoices if not filters.start_date or i.updated_at >= filters.start_date]
+
+    async def get_invoice_count(self, filters):
+        return len(self.invoices)
+
+    async def validate_credentials(self):
+        return True
+
+
+class _PagedAdapter(_FakeAdapter):
+    """Serves keyset pages and refuses whole-table extraction."""
+
+    def __init__(self, invoices):
+        super().__init__(invoices)
+        self.pages = []
+
+    async def extract_invoices(self, filters):
+        raise AssertionError("paged adapters must not load the full extract")
+
+    async def fetch_invoice_page(self, filters, after, limit):
+        self.pages.append((after, limit))
+        ordered = sorted(self.invoices, key=lambda i: (i.updated_at, i.invoice_id))
+        return [
+            i for i in ordered
+            if (not filters.start_date or i.updated_at >= filters.start_date)
+            and (after is None or (i.updated_at, i.invoice_id) > after)
+        ][:limit]
+
+
+async def _run(tmp_path, adapter, force_full_sync=False, fail=(), saves=None):
+    extractor = ERPDataExtractor()
+    extractor.register_adapter(ERPType.ODOO, adapter)
+    service = IncrementalSyncService(
+        SyncConfig(sync_state_storage_path=str(tmp_path), max_sync_batch_size=4, tenant_id="t1"), extractor
+    )
+    process_change, save_sync_state = service._process_change, service._save_sync_state
+
+    async def failing_process_change(change, sync_result):
+        if change.record_id in fail:
+            raise RuntimeError("erp write failed")
+        await process_change(change, sync_result)
+
+    async def recording_save_sync_state(erp_type, sync_state):
+        if saves is not None:
+            saves.append(sync_state.last_sync_timestamp)
+        await save_sync_state(erp_type, sync_state)
+
+    service._process_change = failing_process_change
+    service._save_sync_state = recording_save_sync_state
+    result = SyncResult(sync_id="s", erp_type=ERPType.ODOO, status=SyncStatus.PENDING,
+                        start_time=datetime.now(), end_time=None)
+    await service._perform_sync(result, force_full_sync)
+    await service.close()
+    return result
+
+
+@pytest.mark.asyncio
+async def test_restart_skips_unchanged_records(tmp_path):
+    adapter = _FakeAdapter([_invoice(i) for i in range(10)])
+    first = await _run(tmp_path, adapter)
+    assert first.status == SyncStatus.COMPLETED
+    assert (first.records_created, first.records_skipped) == (10, 0)
+
+    state = json.loads((tmp_path / "odoo_sync_state.json").read_text())
+    assert state["sync_watermarks"]["last_checkpoint"] == (BASE + timedelta(minutes=9)).isoformat()
+    assert not list(tmp_path.glob(".odoo_sync_state.json.*"))
+
+    # A fresh service with a forced full resync only reprocesses changed records
+    adapter.invoices[3] = _invoice(3, total=250.0)
+    adapter.invoices.append(_invoice(10))
+    second = await _run(tmp_path, adapter, force_full_sync=True)
+    assert second.records_processed == 11
+    assert (second.records_created, second.records_updated, second.records_skipped) == (1, 1, 9)
+
+
+@pytest.mark.asyncio
+async def test_lost_state_file_resumes_from_index_watermark(tmp_path):
+    adapter = _FakeAdapter([_invoice(i) for i in range(6)])
+    await _run(tmp_path, adapter)
+    (tmp_path / "odoo_sync_state.json").unlink()
+
+    result = await _run(tmp_path, adapter)
+    # Resumes from the last checkpoint minus the overlap window instead of a full sync
+    assert adapter.filters[-1].start_date == BASE + timedelta(minutes=5) - timedelta(minutes=5)
+    assert result.records_created == 0
+    assert result.records_skipped == result.records_processed
+
+
+@pytest.mark.asyncio
+async def test_failed_record_stays_inside_the_next_sync_window(tmp_path):
+    adapter = _FakeAdapter([_invoice(i) for i in range(10)])
+    saves = []
+    first = await _run(tmp_path, adapter, fail={"inv_5"}, saves=saves)
+    assert first.records_failed == 1
+
+    # One save per page; the checkpoint stops at the page before the failure
+    assert saves == [BASE + timedelta(minutes=3)] * 4
+    state = json.loads((tmp_path / "odoo_sync_state.json").read_text())
+    assert datetime.fromisoformat(state["last_sync_timestamp"]) <= BASE + timedelta(minutes=5)
+
+    second = await _run(tmp_path, adapter)
+    assert adapter.filters[-1].start_date <= BASE + timedelta(minutes=5)
+    assert second.records_failed == 0
+    assert second.records_created == 1
+    state = json.loads((tmp_path / "odoo_sync_state.json").read_text())
+    assert datetime.fromisoformat(state["last_sync_timestamp"]) == second.start_time
+
+
+@pytest.mark.asyncio
+async def test_paged_adapter_is_read_page_by_page(tmp_path):
+    adapter = _PagedAdapter([_invoice(i) for i in reversed(range(10))])
+    result = await _run(tmp_path, adapter)
+
+    assert result.status == SyncStatus.COMPLETED
+    assert result.records_created == 10
+    assert adapter.pages == [
+        (None, 4),
+        ((BASE + timedelta(minutes=3), "inv_3"), 4),
+        ((BASE + timedelta(minutes=7), "inv_7"), 4),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commit_pages_do_not_interleave_transactions(tmp_path):
+    index = ChangeIndex(str(tmp_path / "index.db"))
+
+    async def sync(erp_type):
+        for page in range(8):
+            records = [(f"{erp_type}-{page}-{n}", "h", BASE) for n in range(500)]
+            await index.commit_page("t1", erp_type, records, BASE + timedelta(minutes=page))
+
+    await asyncio.gather(sync("odoo"), sync("sap"), index.reset("t1", "netsuite"))
+
+    assert await index.count_records("t1", "odoo") == 4000
+    assert await index.count_records("t1", "sap") == 4000
+    assert (await index.get_watermark("t1", "sap")).records_checkpointed == 4000
+    await index.close()
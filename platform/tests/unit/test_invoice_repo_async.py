@@ -49,10 +49,8 @@ async def _dispose_async_engine(engine) -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_invoice_record_from_submission(monkeypatch):
-    db_path = os.path.join(CURRENT_DIR, "invoice_repo_test1.db")
-    if os.path.exists(db_path):
-        os.remove(db_path)
+async def test_get_invoice_record_from_submission(monkeypatch, tmp_path):
+    db_path = tmp_path / "invoice_repo_test1.db"
     monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
     engine = init_async_engine()
 
@@ -106,10 +104,8 @@ async def test_get_invoice_record_from_submission(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_get_invoice_record_from_correlation(monkeypatch):
-    db_path = os.path.join(CURRENT_DIR, "invoice_repo_test2.db")
-    if os.path.exists(db_path):
-        os.remove(db_path)
+async def test_get_invoice_record_from_correlation(monkeypatch, tmp_path):
+    db_path = tmp_path / "invoice_repo_test2.db"
     monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
     engine = init_async_engine()
 
@@ -157,3 +153,67 @@ async def test_get_invoice_record_from_correlation(monkeypatch):
         assert record.irn == "IRN-98765"
 
     await _dispose_async_engine(engine)
+
+
+@pytest.mark.asyncio
+async def test_get_invoice_records_bulk_preserves_order_and_precedence():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    await _create_minimal_schema(engine)
+
+    org_id = uuid.uuid4()
+    by_id = uuid.uuid4()
+    SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name="Bulk Org"))
+        await db.flush()
+        for submission_id, number, irn in ((by_id, "INV-1", "IRN-1"), (uuid.uuid4(), "INV-2", "IRN-2")):
+            db.add(
+                FIRSSubmission(
+                    id=submission_id,
+                    organization_id=org_id,
+                    invoice_number=number,
+                    invoice_data={"invoiceNumber": number},
+                    total_amount=100,
+                    irn=irn,
+                )
+            )
+        db.add(
+            SIAPPCorrelation(
+                correlation_id="COR-3",
+                organization_id=org_id,
+                si_invoice_id="SI-3",
+                si_transaction_ids=["TX-3"],
+                irn="IRN-3",
+                si_generated_at=datetime.now(timezone.utc),
+                invoice_number="INV-3",
+                total_amount=100,
+                customer_name="Bulk Customer",
+                invoice_data={"invoiceNumber": "INV-3"},
+                current_status=CorrelationStatus.SI_GENERATED,
+            )
+        )
+        await db.commit()
+
+        records = await invoice_repo.get_invoice_records_bulk(
+            db,
+            organization_id=str(org_id),
+            references=[
+                invoice_repo.InvoiceReference(irn="IRN-3"),
+                # Submission ID wins over a conflicting invoice number
+                invoice_repo.InvoiceReference(submission_id=str(by_id), invoice_number="INV-2"),
+                invoice_repo.InvoiceReference(invoice_number="INV-2"),
+                # Every supplied correlation identifier has to match
+                invoice_repo.InvoiceReference(correlation_id="COR-3", si_invoice_id="SI-other"),
+                invoice_repo.InvoiceReference(),
+            ],
+        )
+
+        assert [record and record.invoice_number for record in records] == [
+            "INV-3", "INV-1", "INV-2", None, None,
+        ]
+        assert records[0].source == "si_correlation"
+        assert records[1].irn == "IRN-1"
+
+    await engine.dispose()
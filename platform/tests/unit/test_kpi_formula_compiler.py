@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from hybrid_services.analytics_aggregation.kpi_calculator import (
+    KPICalculator,
+    KPICategory,
+    KPIDefinition,
+    KPIFrequency,
+    KPIType,
+)
+from hybrid_services.analytics_aggregation.kpi_formula import FormulaError, compile_formula
+from hybrid_services.analytics_aggregation.unified_metrics import AggregatedMetric, AggregationMethod
+
+
+def test_formula_dialect_and_substring_names():
+    milestone = compile_formula(
+        "(taxpayer_count >= 80 AND compliance_sustained = true) ? 100 : (taxpayer_count/80) * 100"
+    )
+    assert milestone.variables == {"taxpayer_count", "compliance_sustained"}
+    assert milestone.evaluate_scalar({"taxpayer_count": 90, "compliance_sustained": True}) == 100.0
+    assert milestone.evaluate_scalar({"taxpayer_count": 40, "compliance_sustained": True}) == 50.0
+
+    # "revenue" is a substring of "revenue_total"; names resolve as identifiers
+    formula = compile_formula("revenue_total - revenue")
+    assert formula.evaluate_scalar({"revenue": 1, "revenue_total": 5}) == 4.0
+
+    nested = compile_formula("a > 1 ? (b > 1 ? 2 : 3) : 4")
+    assert nested.evaluate_rows([{"a": 2, "b": 2}, {"a": 2, "b": 0}, {"a": 0}]).tolist() == [2, 3, 4]
+
+
+@pytest.mark.parametrize("formula", [
+    "__import__('os').system('true')",
+    "a.__class__",
+    "[a for a in b]",
+    "open('x')",
+    "'text'",
+    "a if",
+])
+def test_unsafe_or_invalid_formulas_are_rejected(formula):
+    with pytest.raises(FormulaError):
+        compile_formula(formula)
+
+
+def test_vectorized_evaluation_with_safe_division():
+    formula = compile_formula("total_revenue / (si_users + app_taxpayers)")
+    result = formula.evaluate({
+        "total_revenue": np.array([100.0, 50.0, 10.0]),
+        "si_users": np.array([5.0, 0.0, 0.0]),
+        "app_taxpayers": np.array([5.0, 0.0, 2.0]),
+    })
+    assert result.tolist() == [10.0, 0.0, 5.0]
+
+
+class _StubMetrics:
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    async def aggregate_metrics(self, metric_ids, time_range, aggregation_method=None, dimensions=None):
+        self.calls.append(list(metric_ids))
+        values = self.values.get((dimensions or {}).get("tenant_id"), self.values.get(None, {}))
+        return [
+            AggregatedMetric(
+                metric_id=metric_id,
+                aggregated_value=values[metric_id],
+                aggregation_method=AggregationMethod.SUM,
+                aggregation_period="test",
+                source_count=1,
+                confidence_level=1.0,
+                timestamp=time_range[1],
+                dimensions=dimensions or {},
+                breakdown={},
+            )
+            for metric_id in metric_ids if metric_id in values
+        ]
+
+
+def _definition(kpi_id, formula, source_metrics, method="formula"):
+    return KPIDefinition(
+        kpi_id=kpi_id,
+        name=kpi_id,
+        description="",
+        category=KPICategory.FINANCIAL,
+        kpi_type=KPIType.RATIO,
+        calculation_method=method,
+        source_metrics=source_metrics,
+        calculation_formula=formula,
+        unit="ratio",
+        target_value=None,
+        thresholds={},
+        frequency=KPIFrequency.DAILY,
+        is_higher_better=True,
+        tags=[],
+    )
+
+
+@pytest.mark.asyncio
+async def test_registration_validates_referenced_metrics():
+    calculator = KPICalculator(unified_metrics=_StubMetrics({}))
+
+    with pytest.raises(FormulaError):
+        await calculator.register_kpi_definition(_definition("bad", "a / missing", ["a"]))
+    assert "bad" not in calculator.kpi_definitions
+
+    await calculator.register_kpi_definition(_definition("margin", "(revenue - cost) / revenue * 100", ["revenue", "cost"]))
+    assert "margin" in calculator.compiled_formulas
+
+
+@pytest.mark.asyncio
+async def test_multiple_kpis_share_one_aggregation_and_batch_per_tenant():
+    metrics = _StubMetrics({
+        None: {"si_revenue": 300.0, "app_grant_revenue": 100.0, "marketing_spend": 50.0,
+               "sales_spend": 50.0, "new_customers_acquired": 4.0},
+        "t1": {"si_revenue": 10.0, "app_grant_revenue": 30.0},
+        "t2": {"si_revenue": 0.0, "app_grant_revenue": 0.0},
+    })
+    calculator = KPICalculator(unified_metrics=metrics)
+    now = datetime.now(timezone.utc)
+    time_range = (now - timedelta(days=1), now)
+
+    calculations = await calculator.calculate_multiple_kpis(
+        ["si_revenue_contribution", "total_revenue", "customer_acquisition_cost"], time_range
+    )
+    values = {c.kpi_id: c.calculated_value for c in calculations}
+    assert values == {"si_revenue_contribution": 75.0, "total_revenue": 400.0, "customer_acquisition_cost": 25.0}
+    assert len(metrics.calls) == 1
+
+    per_tenant = await calculator.calculate_kpi_for_dimensions(
+        "si_revenue_contribution", time_range, [{"tenant_id": "t1"}, {"tenant_id": "t2"}]
+    )
+    assert per_tenant == [25.0, 0.0]
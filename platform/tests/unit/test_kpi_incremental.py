@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from hybrid_services.analytics_aggregation.kpi_calculator import KPICalculator
+from hybrid_services.analytics_aggregation.kpi_graph import KPIDependencyGraph
+from hybrid_services.analytics_aggregation.unified_metrics import AggregatedMetric, AggregationMethod
+
+
+def test_graph_propagates_dirty_flags_to_composites():
+    graph = KPIDependencyGraph()
+    graph.set_kpi("total", ["si", "app"])
+    graph.set_kpi("per_user", ["total", "users"])
+    graph.set_kpi("unrelated", ["uptime"])
+
+    before = {kpi: graph.version(kpi) for kpi in ("total", "per_user", "unrelated")}
+    assert graph.mark_dirty(["si"]) == {"total", "per_user"}
+    assert graph.version("unrelated") == before["unrelated"]
+    assert graph.version("per_user") == before["per_user"] + 1
+
+    assert graph.topological_order(["per_user", "total"]) == ["total", "per_user"]
+    assert graph.upstream_kpis(["per_user"]) == {"per_user", "total"}
+    assert graph.metric_inputs("per_user") == ["users"]
+
+    with pytest.raises(ValueError):
+        graph.set_kpi("total", ["per_user"])
+
+
+class _CountingMetrics:
+    def __init__(self, values):
+        self.values = values
+        self.requested = []
+        self.latest = {}
+
+    def get_latest_data_time(self, metric_ids):
+        times = [self.latest[metric_id] for metric_id in metric_ids if metric_id in self.latest]
+        return max(times) if times else None
+
+    async def aggregate_metrics(self, metric_ids, time_range, aggregation_method=None, dimensions=None):
+        self.requested.append(sorted(metric_ids))
+        return [
+            AggregatedMetric(
+                metric_id=metric_id,
+                aggregated_value=self.values[metric_id],
+                aggregation_method=AggregationMethod.SUM,
+                aggregation_period="test",
+                source_count=1,
+                confidence_level=1.0,
+                timestamp=time_range[1],
+                dimensions={},
+                breakdown={},
+            )
+            for metric_id in metric_ids if metric_id in self.values
+        ]
+
+
+REVENUE_KPIS = [
+    "total_revenue",
+    "si_revenue_contribution",
+    "customer_acquisition_cost",
+    "revenue_per_user",
+]
+
+
+@pytest.mark.asyncio
+async def test_metric_update_recomputes_only_affected_kpis():
+    metrics = _CountingMetrics({
+        "si_revenue": 300.0, "app_grant_revenue": 100.0, "si_users": 3.0, "app_taxpayers": 1.0,
+        "marketing_spend": 40.0, "sales_spend": 60.0, "new_customers_acquired": 4.0,
+    })
+    calculator = KPICalculator(unified_metrics=metrics)
+    now = datetime.now(timezone.utc)
+    window = (now - timedelta(days=30), now)
+
+    first = {c.kpi_id: c.calculated_value for c in await calculator.calculate_multiple_kpis(REVENUE_KPIS, window)}
+    # revenue_per_user consumes the total_revenue KPI
+    assert first["revenue_per_user"] == 100.0
+    assert calculator.get_incremental_stats()["recomputes"] == 4
+
+    # Unchanged inputs: served from the memo, no aggregation at all
+    calls = len(metrics.requested)
+    await calculator.calculate_multiple_kpis(REVENUE_KPIS, window)
+    assert len(metrics.requested) == calls
+    assert calculator.get_incremental_stats()["memo_hits"] == 4
+
+    # Another period or a shifted window is a different calculation
+    await calculator.calculate_multiple_kpis(REVENUE_KPIS, window, "previous")
+    await calculator.calculate_multiple_kpis(REVENUE_KPIS, (window[0] + timedelta(seconds=30), now + timedelta(seconds=30)))
+    assert calculator.get_incremental_stats()["memo_hits"] == 4
+
+    metrics.values["si_revenue"] = 700.0
+    await calculator._handle_metrics_updated({"metric_id": "si_revenue"})
+    stats = calculator.get_incremental_stats()
+    # total_revenue, both contributions, and the composites revenue_per_user / revenue_per_transaction
+    assert stats["kpis_invalidated"] == 5
+
+    recomputes = stats["recomputes"]
+    updated = {c.kpi_id: c.calculated_value for c in await calculator.calculate_multiple_kpis(REVENUE_KPIS, window)}
+    # CAC did not depend on si_revenue and is still memoized for the dashboard window
+    assert calculator.get_incremental_stats()["recomputes"] - recomputes == 3
+    assert updated["revenue_per_user"] == 200.0
+    assert updated["customer_acquisition_cost"] == first["customer_acquisition_cost"]
+
+
+@pytest.mark.asyncio
+async def test_newer_input_data_invalidates_memo_without_an_event():
+    metrics = _CountingMetrics({
+        "si_revenue": 300.0, "app_grant_revenue": 100.0, "si_users": 3.0, "app_taxpayers": 1.0,
+        "marketing_spend": 40.0, "sales_spend": 60.0, "new_customers_acquired": 4.0,
+    })
+    calculator = KPICalculator(unified_metrics=metrics)
+    end = datetime(2026, 5, 1, tzinfo=timezone.utc)
+    window = (end - timedelta(days=30), end)
+    metrics.latest["si_revenue"] = end - timedelta(hours=2)
+
+    await calculator.calculate_multiple_kpis(REVENUE_KPIS, window)
+    await calculator.calculate_multiple_kpis(REVENUE_KPIS, window)
+    assert calculator.get_incremental_stats()["memo_hits"] == 4
+
+    # A value recorded later for si_revenue makes the memo stale for every KPI reading it
+    metrics.latest["si_revenue"] = end - timedelta(hours=1)
+    metrics.values["si_revenue"] = 700.0
+    updated = {c.kpi_id: c.calculated_value for c in await calculator.calculate_multiple_kpis(REVENUE_KPIS, window)}
+    stats = calculator.get_incremental_stats()
+    assert stats["memo_hits"] == 5
+    assert stats["recomputes"] == 7
+    assert updated["revenue_per_user"] == 200.0
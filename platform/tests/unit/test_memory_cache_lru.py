@@ -0,0 +1,48 @@
+import time
+
+from core_platform.data_management.cache_manager import MemoryCache, tenant_partition_key
+
+
+def test_lru_order_and_eviction():
+    cache = MemoryCache(max_size=3)
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper())
+
+    assert cache.get("a") == "A"
+    cache.set("d", "D")
+
+    assert cache.get("b") is None
+    assert list(cache._cache) == ["c", "a", "d"]
+    assert cache.size() == 3
+
+
+def test_ttl_expiry_is_lazy_and_overwrites_are_respected(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = MemoryCache(max_size=10)
+
+    cache.set("short", 1, ttl=5)
+    cache.set("rewritten", 2, ttl=5)
+    cache.set("rewritten", 3, ttl=60)
+    cache.set("forever", 4)
+
+    now[0] += 10
+    assert cache.purge_expired() == 1
+    assert cache.get("short") is None
+    assert cache.get("rewritten") == 3
+    assert cache.get("forever") == 4
+
+
+def test_tenant_partitions_clear_without_scanning():
+    cache = MemoryCache(max_size=100, partition_key=tenant_partition_key)
+    for i in range(5):
+        cache.set(f"tenant:org-1:invoice:{i}", i)
+        cache.set(f"tenant:org-2:invoice:{i}", i)
+    cache.set("global:settings", {})
+    cache.delete("tenant:org-1:invoice:0")
+
+    assert cache.delete_partition("tenant:org-1:") == 4
+    assert cache.get("tenant:org-1:invoice:1") is None
+    assert cache.get("tenant:org-2:invoice:1") == 1
+    assert cache.size() == 6
+    assert "tenant:org-1:" not in cache._partitions
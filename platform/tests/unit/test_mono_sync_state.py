@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import fakeredis.aioredis
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core_platform.data_management.models import BankingSyncCursor, BankingSyncDedupeKey
+from platform.backend.external_integrations.financial_systems.banking.open_banking.providers.mono.sync_state import (
+    BloomFilter,
+    RedisSyncStateStore,
+    SqlSyncStateStore,
+)
+from platform.backend.external_integrations.financial_systems.banking.open_banking.providers.mono.transaction_sync import (
+    InMemorySyncStateStore,
+    MonoTransactionSyncService,
+)
+from platform.backend.external_integrations.connector_framework.shared_utilities.retry_manager import RetryConfig, RetryManager
+
+
+async def _sql_store(**kwargs):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(BankingSyncCursor.__table__.create)
+        await conn.run_sync(BankingSyncDedupeKey.__table__.create)
+    return engine, SqlSyncStateStore(async_sessionmaker(bind=engine, expire_on_commit=False), **kwargs)
+
+
+def test_bloom_filter_round_trips_and_stays_near_error_rate():
+    bloom = BloomFilter(capacity=2000, error_rate=1e-3)
+    for index in range(2000):
+        bloom.add(f"seen-{index}")
+    restored = BloomFilter(2000, 1e-3, data=bloom.to_bytes(), items=bloom.items)
+    assert all(f"seen-{index}" in restored for index in range(2000))
+    false_positives = sum(f"other-{index}" in restored for index in range(20000))
+    assert false_positives <= 60
+    assert restored.saturated
+    with pytest.raises(ValueError):
+        BloomFilter(4000, 1e-3, data=bloom.to_bytes())
+
+
+@pytest.mark.asyncio
+async def test_sql_store_batches_pages_and_folds_expired_keys_into_filter():
+    engine, store = await _sql_store(retention_days=30, prune_batch_size=2, filter_capacity=1000, filter_error_rate=1e-4)
+
+    assert await store.register_transactions("acct-1", ["a", "b", "a", "c"]) == [True, True, False, True]
+    assert await store.register_transactions("acct-1", ["c", "d"]) == [False, True]
+    assert await store.register_transaction("acct-2", "a") is True
+
+    await store.set_cursor("acct-1", "cursor-2")
+    await store.set_cursor("acct-1", "cursor-3")
+    assert await store.get_cursor("acct-1") == "cursor-3"
+    assert await store.get_cursor("acct-9") is None
+
+    # Everything for acct-1 ages out: exact rows become filter bits
+    later = datetime.now(timezone.utc) + timedelta(days=31)
+    assert await store.prune("acct-1", now=later, max_batches=1) == 2
+    assert await store.prune_expired(now=later) == 3  # two left on acct-1, one on acct-2
+    async with store._session_factory() as session:
+        assert (await session.execute(select(func.count()).select_from(BankingSyncDedupeKey))).scalar_one() == 0
+        cursor_row = await session.get(BankingSyncCursor, ("mono", "acct-1"))
+        assert (cursor_row.cursor, cursor_row.seen_filter_items) == ("cursor-3", 4)
+
+    # A fresh store (another worker) still rejects the folded keys
+    other = SqlSyncStateStore(store._session_factory, retention_days=30, filter_capacity=1000, filter_error_rate=1e-4)
+    assert await other.register_transactions("acct-1", ["a", "d", "e"]) == [False, False, True]
+    assert other.stats["probable_duplicates"] == 2
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_redis_store_matches_sql_semantics():
+    redis = fakeredis.aioredis.FakeRedis()
+    store = RedisSyncStateStore(redis, retention_days=30, prune_batch_size=2, filter_capacity=1000, filter_error_rate=1e-4)
+
+    assert await store.register_transactions("acct-1", ["a", "b", "a"]) == [True, True, False]
+    assert await store.register_transaction("acct-1", "b") is False
+    await store.set_cursor("acct-1", "cursor-2")
+    assert await store.get_cursor("acct-1") == "cursor-2"
+
+    assert await store.prune("acct-1", now=datetime.now(timezone.utc) + timedelta(days=31)) == 2
+    assert await redis.zcard("banking_sync:mono:acct-1:seen") == 0
+    assert await store.register_transactions("acct-1", ["a", "c"]) == [False, True]
+    assert store.stats["probable_duplicates"] == 1
+
+    await store.set_cursor("acct-1", None)
+    assert await store.get_cursor("acct-1") is None
+    await redis.aclose()
+
+
+class _SlowClient:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def get(self, path, params=None):
+        account_id = path.split("/")[3]
+        if account_id == "broken":
+            raise RuntimeError("upstream down")
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {
+            "paging": {},
+            "data": [
+                {"id": f"{account_id}-tx-{index}", "amount": 100 * (index + 1), "date": "2024-05-01",
+                 "narration": "POS", "type": "debit", "category": "pos", "balance": 1000}
+                for index in range(3)
+            ],
+        }
+
+
+@pytest.mark.asyncio
+async def test_sync_accounts_bounds_concurrency_and_isolates_failures():
+    client = _SlowClient()
+    events = []
+
+    async def emit(name, payload):
+        events.append((name, payload))
+
+    service = MonoTransactionSyncService(
+        client,
+        InMemorySyncStateStore(),
+        emit,
+        retry_manager=RetryManager(RetryConfig(max_attempts=1, initial_delay_seconds=0, enable_jitter=False)),
+        concurrency=5,
+    )
+    accounts = [f"acct-{index}" for index in range(8)] + ["broken"]
+
+    outcome = await service.sync_accounts(accounts, concurrency=3)
+
+    assert client.peak == 3
+    assert sorted(outcome.results) == sorted(accounts[:-1])
+    assert list(outcome.errors) == ["broken"]
+    assert outcome.transactions_fetched == 24
+    batch = [payload for name, payload in events if name == "mono.fetch.batch_completed"]
+    assert batch[0]["succeeded"] == 8 and batch[0]["failed"] == 1 and batch[0]["concurrency"] == 3
+
+    # Re-syncing delivers nothing new
+    again = await service.sync_accounts(accounts[:2])
+    assert again.transactions_fetched == 0
@@ -0,0 +1,134 @@
+import random
+import sqlite3
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from external_integrations.financial_systems.banking.open_banking.transaction_processing.duplicate_detector import (
+    DetectionRule,
+    DuplicateAction,
+    DuplicateDetector,
+    DuplicateStrategy,
+)
+
+_COLUMNS = ("id", "amount", "account_number", "description", "date", "reference")
+
+
+class SqliteDatabase:
+    """The fetch_all/execute surface DuplicateDetector queries, over sqlite3."""
+
+    def __init__(self, history):
+        self.conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(
+            """
+            CREATE TABLE transactions (id TEXT, amount REAL, account_number TEXT, description TEXT,
+                                       date TIMESTAMP, reference TEXT);
+            CREATE TABLE transaction_hashes (id TEXT PRIMARY KEY, hash TEXT);
+            CREATE TABLE duplicate_detections (transaction_id TEXT, is_duplicate INTEGER, matches_count INTEGER,
+                                               detection_timestamp TIMESTAMP, details TEXT);
+            """
+        )
+        self.conn.executemany(
+            "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)",
+            [tuple(getattr(tx, column) for column in _COLUMNS) for tx in history],
+        )
+        self.window_queries = 0
+
+    async def fetch_all(self, query, params=()):
+        if "date BETWEEN" in query:
+            self.window_queries += 1
+        return self.conn.execute(query, tuple(params)).fetchall()
+
+    async def execute(self, query, params=()):
+        self.conn.execute(query, tuple(params))
+
+
+class DictCache:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.values[key] = value
+
+
+def _corpus(seed):
+    rng = random.Random(seed)
+    start = datetime(2024, 5, 1, 9, 0)
+
+    def transaction(tx_id):
+        return SimpleNamespace(
+            id=tx_id,
+            amount=rng.randrange(1, 40) * 250.5,
+            account_number=rng.choice(["0123456789", "0987654321", "1122334455"]),
+            description=rng.choice(["POS purchase", "POS purchas", "Transfer to GTB", "ATM withdrawal", None]),
+            date=start + timedelta(minutes=rng.randrange(0, 24 * 60)),
+            reference=rng.choice(["REF-1", "REF-2", None]),
+        )
+
+    history = [transaction(f"hist-{index}") for index in range(150)]
+    batch = []
+    for index in range(250):
+        roll = rng.random()
+        if roll < 0.15 and batch:
+            batch.append(SimpleNamespace(**{**vars(rng.choice(batch)).copy(), "id": f"copy-{index}"}))
+        elif roll < 0.2:
+            batch.append(SimpleNamespace(**{**vars(rng.choice(history)).copy(), "id": f"replay-{index}"}))
+        elif roll < 0.23 and batch:
+            batch.append(rng.choice(batch))  # same id delivered twice
+        else:
+            batch.append(transaction(f"tx-{index}"))
+    return history, batch
+
+
+def _rules():
+    return [
+        DetectionRule(
+            name="cross_account_window",
+            strategy=DuplicateStrategy.TIME_WINDOW,
+            fields=["amount"],
+            time_window_minutes=30,
+            confidence_threshold=0.7,
+            action=DuplicateAction.FLAG,
+        )
+    ]
+
+
+def _findings(results):
+    return [
+        (
+            result.transaction_id,
+            result.is_duplicate,
+            result.recommended_action,
+            [
+                (m.original_transaction_id, m.detection_rule, m.confidence, round(m.confidence_score, 9))
+                for m in result.matches or []
+            ],
+        )
+        for result in results
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", [1, 2, 3])
+async def test_indexed_batches_match_pairwise_detector(seed):
+    history, batch = _corpus(seed)
+    outcomes = {}
+    for indexed in (False, True):
+        database = SqliteDatabase(history)
+        detector = DuplicateDetector(database, DictCache(), indexed_batches=indexed)
+        results = await detector.check_batch_duplicates(batch, custom_rules=_rules())
+        outcomes[indexed] = (_findings(results), database.window_queries)
+
+    assert outcomes[True][0] == outcomes[False][0]
+    findings = outcomes[True][0]
+    rules_hit = {match[1] for *_, matches in findings for match in matches}
+    assert {"batch_internal", "cross_account_window", "time_window_similar"} <= rules_hit
+
+    # One range query per batch instead of one per transaction and time-window rule
+    assert outcomes[True][1] == 1
+    assert outcomes[False][1] > len(batch)
@@ -0,0 +1,77 @@
+import asyncio
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from starlette.requests import Request
+
+from core_platform.security.rate_limiter import (
+    ProductionRateLimiter,
+    RateLimitRule,
+    RateLimitType,
+    RateLimitWindow,
+)
+
+pytest.importorskip("lupa")  # fakeredis needs lupa to run Lua scripts
+
+
+def _request(path="/api/v1/invoices", ip="203.0.113.7"):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [(b"x-forwarded-for", ip.encode())],
+        "client": (ip, 1234),
+    })
+
+
+def _limiter(**kwargs):
+    limiter = ProductionRateLimiter(
+        redis_client=fakeredis.FakeRedis(decode_responses=True), **kwargs
+    )
+    limiter.rules.clear()
+    limiter.add_rule(RateLimitRule(
+        name="tight_per_ip", limit_type=RateLimitType.PER_IP, max_requests=5,
+        window=RateLimitWindow.MINUTE, window_seconds=60,
+        endpoint_pattern="/api/v1/*", priority=50,
+    ))
+    limiter.add_rule(RateLimitRule(
+        name="global", limit_type=RateLimitType.GLOBAL, max_requests=1000,
+        window=RateLimitWindow.MINUTE, window_seconds=60, priority=10,
+    ))
+    return limiter
+
+
+@pytest.mark.asyncio
+async def test_same_instant_requests_are_all_counted_in_one_round_trip():
+    limiter = _limiter(async_redis_client=fakeredis.aioredis.FakeRedis(decode_responses=True))
+
+    results = await asyncio.gather(*(limiter.check_rate_limit(_request()) for _ in range(8)))
+    allowed = [ok for ok, _ in results]
+
+    assert allowed.count(True) == 5
+    blocked = next(info for ok, info in results if not ok)
+    assert blocked["rule_violated"] == "tight_per_ip"
+    assert 1 <= blocked["retry_after"] <= 60
+
+    # Rejected requests are not recorded against any window
+    status = await limiter.get_rate_limit_status("global", "global")
+    assert status["current_count"] == 5
+
+
+@pytest.mark.asyncio
+async def test_sync_client_fallback_and_cached_rule_resolution():
+    limiter = _limiter()
+
+    ok, info = await limiter.check_rate_limit(_request())
+    assert ok and info["rules_checked"] == 2
+    assert info["limits"]["tight_per_ip"]["remaining"] == 4
+
+    assert [r.name for r in limiter._find_applicable_rules("/api/v1/x", None, None)] == ["tight_per_ip", "global"]
+    assert [r.name for r in limiter._find_applicable_rules("/health", None, None)] == ["global"]
+    assert ("/api/v1/x", None) in limiter._rule_cache
+
+    limiter.remove_rule("global")
+    assert not limiter._rule_cache
+    assert [r.name for r in limiter._find_applicable_rules("/health", None, None)] == []
@@ -0,0 +1,85 @@
+import random
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from external_integrations.connector_framework.classification_engine import (
+    KeywordAutomaton,
+    NigerianRuleFallback,
+    PatternMatcher,
+)
+from external_integrations.connector_framework.classification_engine.classification_models import (
+    TransactionClassificationRequest,
+    UserContext,
+)
+
+
+def _reference_narration_matches(matcher, narration):
+    """Original per-keyword substring scan, kept as the behavioural reference."""
+    narration_lower = narration.lower()
+    expected = []
+    for pattern_data in matcher.business_patterns.values():
+        for keyword in pattern_data['keywords']:
+            if keyword in narration_lower:
+                expected.append((keyword, pattern_data['weight']))
+    for pattern_data in matcher.personal_patterns.values():
+        for keyword in pattern_data['keywords']:
+            if keyword in narration_lower:
+                expected.append((keyword, -pattern_data['weight']))
+    for group in ('major_markets', 'business_districts', 'industrial_areas'):
+        for location in matcher.nigerian_business_locations[group]:
+            if location in narration_lower:
+                expected.append((location, None))
+    return expected
+
+
+def test_keyword_automaton_reports_overlapping_keywords():
+    automaton = KeywordAutomaton(['payment', 'payment for goods', 'goods', 'abc', 'cde'])
+
+    assert automaton.find_all('xxABCDE Payment for GOODS') == {
+        'payment', 'payment for goods', 'goods', 'abc', 'cde'
+    }
+    assert automaton.find_all('nothing here') == set()
+    assert KeywordAutomaton([]).find_all('payment') == set()
+
+
+def test_compiled_matcher_matches_substring_reference():
+    matcher = PatternMatcher()
+    keywords = [entry[0] for entry in matcher._narration_entries + matcher._location_entries]
+    rng = random.Random(7)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz /'
+
+    for _ in range(2000):
+        narration = ''.join(rng.choice(alphabet) for _ in range(30))
+        for _ in range(rng.randint(0, 3)):
+            position = rng.randint(0, len(narration))
+            narration = narration[:position] + rng.choice(keywords).upper() + narration[position:]
+
+        hits = matcher.find_keywords(narration)
+        actual = [(m.match_text, m.weight) for m in matcher._analyze_narration_patterns(narration, hits)]
+        actual += [(m.match_text, None) for m in matcher._analyze_location_patterns(narration, None, hits)]
+
+        assert actual == _reference_narration_matches(matcher, narration)
+
+
+@pytest.mark.asyncio
+async def test_classify_transactions_preserves_order():
+    fallback = NigerianRuleFallback()
+    context = UserContext(user_id='u1', organization_id='org1')
+    requests = [
+        TransactionClassificationRequest(
+            transaction_id=f'tx-{i}', amount=Decimal('50000'), narration=narration,
+            date=datetime(2024, 5, 6), time='10:30', user_context=context, request_id=f'req-{i}'
+        )
+        for i, narration in enumerate([
+            'Payment for goods supplied at Alaba market',
+            'Monthly salary and family upkeep',
+        ])
+    ]
+
+    results = await fallback.classify_transactions(requests)
+
+    assert [r.request_id for r in results] == ['req-0', 'req-1']
+    assert results[0].is_business_income is True
+    assert results[1].is_business_income is False
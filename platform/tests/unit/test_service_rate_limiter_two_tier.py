@@ -0,0 +1,197 @@
+import asyncio
+import multiprocessing
+from multiprocessing.managers import BaseManager
+
+import pytest
+
+from hybrid_services.service_access_control.token_lease import (
+    InMemoryTokenStore,
+    RedisTokenStore,
+    SharedTokenStore,
+    TwoTierConfig,
+    TwoTierTokenLimiter,
+)
+
+CAPACITY = 200
+REFILL_RATE = 0.0001  # effectively no refill during the test
+
+
+_SHARED_STORE = InMemoryTokenStore()
+
+
+def _shared_store():
+    return _SHARED_STORE
+
+
+class _StoreManager(BaseManager):
+    pass
+
+
+# Every proxy refers to the single store living in the manager process
+_StoreManager.register("TokenStore", callable=_shared_store)
+
+
+class _ProxyTokenStore(SharedTokenStore):
+    """Async adapter over a manager proxy of InMemoryTokenStore (one IPC call per borrow/return)"""
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.calls = 0
+
+    async def take(self, key, requested, capacity, refill_rate):
+        self.calls += 1
+        return self.proxy.take_now(key, requested, capacity, refill_rate)
+
+    async def give_back(self, key, tokens, capacity, refill_rate):
+        self.calls += 1
+        return self.proxy.give_back_now(key, tokens, capacity, refill_rate)
+
+
+def _worker(address, authkey, attempts, results):
+    manager = _StoreManager(address=address, authkey=authkey)
+    manager.connect()
+    store = _ProxyTokenStore(manager.TokenStore())
+
+    async def run():
+        limiter = TwoTierTokenLimiter(store, TwoTierConfig(lease_fraction=0.05))
+        allowed = 0
+        for _ in range(attempts):
+            if await limiter.consume("org:1", CAPACITY, REFILL_RATE):
+                allowed += 1
+            await asyncio.sleep(0)
+        await limiter.close()
+        return allowed
+
+    allowed = asyncio.run(run())
+    results.put((allowed, store.calls))
+
+
+def test_multi_process_workers_never_exceed_global_limit():
+    try:
+        ctx = multiprocessing.get_context("fork")
+    except ValueError:
+        pytest.skip("fork start method not available")
+
+    manager = _StoreManager(ctx=ctx)
+    manager.start()
+    try:
+        results = ctx.Queue()
+        workers = [
+            ctx.Process(target=_worker, args=(manager.address, manager._authkey, 150, results))
+            for _ in range(4)
+        ]
+        for proc in workers:
+            proc.start()
+        outcomes = [results.get(timeout=60) for _ in workers]
+        for proc in workers:
+            proc.join(timeout=60)
+    finally:
+        manager.shutdown()
+
+    total_allowed = sum(allowed for allowed, _ in outcomes)
+    total_calls = sum(calls for _, calls in outcomes)
+
+    # 600 attempts against a 200-token bucket: never over-admit, and since each
+    # worker keeps borrowing until the shared bucket is empty, nothing is stranded.
+    assert total_allowed == CAPACITY
+    # Lease size is 10 tokens, so shared-store traffic is far below one call per check.
+    assert total_calls < 600 / 3
+
+
+@pytest.mark.asyncio
+async def test_local_hits_skip_store_and_close_returns_tokens():
+    store = InMemoryTokenStore()
+    limiter = TwoTierTokenLimiter(store, TwoTierConfig(lease_fraction=0.1, low_water_fraction=0.0))
+
+    for _ in range(10):
+        assert await limiter.consume("k", 100, 1.0)
+
+    stats = limiter.get_stats()
+    assert stats["borrows"] == 1
+    assert stats["local_hits"] == 9
+
+    await limiter.consume("k", 100, 1.0)  # borrows a second lease of 10, spends 1
+    await limiter.close()
+    granted, remaining = store.take_now("k", 0, 100, 0.0)
+    assert granted == 0
+    assert remaining == pytest.approx(89, abs=0.5)
+
+
+@pytest.mark.asyncio
+async def test_idle_leases_are_returned_on_reconcile():
+    store = InMemoryTokenStore()
+    limiter = TwoTierTokenLimiter(
+        store, TwoTierConfig(lease_fraction=0.5, low_water_fraction=0.0, idle_return_seconds=0.0)
+    )
+    assert await limiter.consume("k", 10, 0.0)
+    assert limiter.get_stats()["leased_tokens"] == 4
+
+    await limiter.reconcile()
+
+    assert limiter.get_stats()["leased_tokens"] == 0
+    assert store.take_now("k", 10, 10, 0.0)[0] == 9
+    await limiter.close()
+
+
+class _FailingStore(SharedTokenStore):
+    def __init__(self):
+        self.calls = 0
+
+    async def take(self, key, requested, capacity, refill_rate):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+    async def give_back(self, key, tokens, capacity, refill_rate):
+        raise ConnectionError("redis down")
+
+
+@pytest.mark.asyncio
+async def test_store_outage_falls_back_to_local_bucket():
+    store = _FailingStore()
+    limiter = TwoTierTokenLimiter(store, TwoTierConfig(reconcile_interval_seconds=60.0))
+
+    allowed = [await limiter.consume("k", 20, 0.0) for _ in range(25)]
+
+    # Fails open to a per-worker limit, not closed, and does not retry the store per request
+    assert allowed == [True] * 20 + [False] * 5
+    stats = limiter.get_stats()
+    assert (stats["fallback_allowed"], stats["denied"], store.calls) == (20, 5, 1)
+    limiter._reconcile_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_changed_limit_returns_old_lease_to_store():
+    store = InMemoryTokenStore()
+    limiter = TwoTierTokenLimiter(store, TwoTierConfig(lease_fraction=0.5, low_water_fraction=0.0))
+    assert await limiter.consume("k", 10, 0.0)  # leases 5, spends 1
+
+    assert await limiter.consume("k", 20, 0.0)  # new limit: the 4 leftover tokens go back
+    await asyncio.gather(*limiter._background)
+    await limiter.close()
+
+    # 10 - 2 spent; the old slice's 4 tokens would be stranded without the hand-back
+    assert store.take_now("k", 100, 20, 0.0)[0] == 8
+
+
+@pytest.mark.asyncio
+async def test_redis_store_is_atomic_and_bounded():
+    pytest.importorskip("lupa")
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis()
+    store = RedisTokenStore(client)
+
+    granted, remaining = await store.take("org:1", 30, 50, 0.0)
+    assert (granted, remaining) == (30, 20.0)
+    granted, remaining = await store.take("org:1", 30, 50, 0.0)
+    assert (granted, remaining) == (20, 0.0)
+    assert await store.give_back("org:1", 100, 50, 0.0) == 50.0
+
+    limiters = [TwoTierTokenLimiter(store, TwoTierConfig(lease_fraction=0.1)) for _ in range(3)]
+    await store.take("org:2", 0, 40, 0.0)
+    decisions = await asyncio.gather(*(
+        limiter.consume("org:2", 40, 0.0) for limiter in limiters for _ in range(30)
+    ))
+    assert sum(decisions) == 40
+    for limiter in limiters:
+        await limiter.close()
+    await client.aclose()
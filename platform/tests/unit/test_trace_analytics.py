@@ -0,0 +1,113 @@
+import asyncio
+import dataclasses
+import random
+import threading
+from datetime import timedelta
+
+import pytest
+
+from core_platform.monitoring.trace_collector import (
+    LatencySketch,
+    SpanStatus,
+    TailSamplingConfig,
+    TraceCollector,
+)
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_latency_sketch_quantiles_within_relative_accuracy_and_merge():
+    rng = random.Random(5)
+    values = [rng.lognormvariate(4, 1.2) for _ in range(20000)]
+    left, right, whole = LatencySketch(), LatencySketch(), LatencySketch()
+    for index, value in enumerate(values):
+        (left if index % 2 else right).add(value)
+        whole.add(value)
+    left.merge(right)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = _exact_quantile(values, q)
+        assert abs(whole.quantile(q) - exact) <= exact * 0.02
+        assert left.quantile(q) == whole.quantile(q)
+    assert (left.count, left.min, left.max) == (len(values), min(values), max(values))
+
+
+@pytest.mark.asyncio
+async def test_operation_dependency_and_error_analytics_are_incremental():
+    collector = TraceCollector(tail_sampling=TailSamplingConfig(default_latency_threshold_ms=10_000))
+    collector.default_sample_rate = 1.0
+
+    for index in range(50):
+        root = collector.start_span("submit", "api_gateway", "core")
+        child = collector.start_span("transmit", "firs_communication", "app")
+        collector.active_spans[child].start_time -= timedelta(milliseconds=10 * (index + 1))
+        failed = index % 10 == 0
+        collector.finish_span(child, error="FIRS timeout\ntraceback" if failed else None)
+        collector.finish_span(root)
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    performance = collector.get_operation_performance(hours=1)
+    transmit = performance["firs_communication.transmit"]
+    assert (transmit["call_count"], transmit["error_count"]) == (50, 5)
+    assert transmit["min_duration_ms"] >= 10 and transmit["max_duration_ms"] >= 500
+    assert abs(transmit["p95_duration_ms"] - 475) <= 475 * 0.03
+    assert performance["api_gateway.submit"]["call_count"] == 50
+
+    assert collector.get_service_dependencies(hours=1) == {"api_gateway": ["firs_communication"]}
+
+    errors = collector.get_error_analysis(hours=1)
+    assert (errors["total_traces"], errors["error_traces"], errors["error_spans"]) == (50, 5, 5)
+    assert errors["common_errors"] == [{"message": "FIRS timeout", "count": 5}]
+    assert collector.stats["error_rate"] == pytest.approx(5 / 100 * 100)
+
+    # Re-assembling a known trace only folds in spans not seen before
+    trace = next(iter(collector.traces.values()))
+    collector._update_trace_stats(trace, previous=trace)
+    assert collector.get_operation_performance(hours=1)["firs_communication.transmit"]["call_count"] == 50
+    assert collector.get_error_analysis(hours=1)["total_traces"] == 50
+
+    # Retention drops whole hours of analytics
+    assert collector._prune_analytics(trace.start_time + timedelta(hours=2)) >= 1
+    assert collector.get_operation_performance(hours=1) == {}
+
+
+def test_analytics_readers_do_not_race_recording_threads():
+    collector = TraceCollector(tail_sampling=TailSamplingConfig(default_latency_threshold_ms=10_000))
+    collector.default_sample_rate = 1.0
+    root = collector.start_span("submit", "api_gateway", "core")
+    collector.finish_span(collector.start_span("transmit", "firs_communication", "app"), error="FIRS timeout")
+    collector.finish_span(root)
+    template = next(iter(collector.traces.values()))
+
+    def record():
+        # Every trace adds operations, dependencies and error messages to the live bucket
+        for index in range(2000):
+            spans = [
+                dataclasses.replace(
+                    span, span_id=f"{span.span_id}-{index}", operation_name=f"{span.operation_name}-{index}",
+                    error=f"{span.error}-{index}" if span.error else None,
+                    service_name=f"{span.service_name}-{index % 50}",
+                )
+                for span in template.spans
+            ]
+            for span in spans:
+                if span.parent_span_id:
+                    span.parent_span_id = f"{span.parent_span_id}-{index}"
+            collector._record_trace_analytics(dataclasses.replace(template, spans=spans))
+
+    writer = threading.Thread(target=record)
+    writer.start()
+    try:
+        while writer.is_alive():
+            collector.get_operation_performance(hours=1)
+            collector.get_service_dependencies(hours=1)
+            collector.get_error_analysis(hours=1)
+    finally:
+        writer.join()
+
+    calls = sum(stats["call_count"] for stats in collector.get_operation_performance(hours=1).values())
+    assert calls == collector.get_error_analysis(hours=1)["total_spans"]
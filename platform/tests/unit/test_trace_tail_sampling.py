@@ -0,0 +1,89 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from core_platform.monitoring.trace_collector import (
+    SpanStatus,
+    TailSamplingConfig,
+    TraceCollector,
+)
+
+
+def _collector(**overrides) -> TraceCollector:
+    config = TailSamplingConfig(**{"decision_window_seconds": 5.0, "default_latency_threshold_ms": 500.0, **overrides})
+    collector = TraceCollector(tail_sampling=config)
+    collector.default_sample_rate = 0.0  # healthy traces are dropped unless a rule keeps them
+    return collector
+
+
+def _run_trace(collector, operation="handle", child_ms=0, child_status=SpanStatus.OK):
+    root = collector.start_span(operation, "api_gateway", "core")
+    child = collector.start_span("call_firs", "firs_communication", "app")
+    if child_ms:
+        collector.active_spans[child].start_time -= timedelta(milliseconds=child_ms)
+    collector.finish_span(child, status=child_status)
+    trace_id = collector.active_spans[root].trace_id
+    collector.finish_span(root)
+    return trace_id
+
+
+@pytest.mark.asyncio
+async def test_tail_sampling_keeps_errors_and_slow_traces_and_drops_the_rest():
+    collector = _collector()
+    finished = []
+    collector.add_trace_finished_handler(finished.append)
+    collector.set_latency_threshold("call_firs", 100.0, service_name="firs_communication")
+
+    healthy = _run_trace(collector)
+    errored = _run_trace(collector, child_status=SpanStatus.ERROR)
+    slow = _run_trace(collector, child_ms=250)
+    await asyncio.sleep(0)
+
+    assert healthy not in collector.traces
+    assert collector.traces[errored].error_count == 1
+    assert collector.traces[slow].span_count == 2
+    assert {t.trace_id for t in finished} == {errored, slow}
+
+    health = collector.get_trace_collector_health()["tail_sampling"]
+    assert health["buffered_spans"] == 0
+    assert (health["traces_kept_error"], health["traces_kept_latency"], health["traces_dropped"]) == (1, 1, 1)
+    assert health["spans_dropped"] == 2
+    assert health["decisions_on_root"] == 3
+
+    # Sampling rules still apply to healthy traces
+    collector.add_sampling_rule("all_handle", "All", sample_rate=1.0, operation_patterns=["^handle$"])
+    assert _run_trace(collector) in collector.traces
+
+
+@pytest.mark.asyncio
+async def test_tail_buffer_respects_memory_budget_and_decision_window():
+    collector = _collector(max_buffered_spans=4)
+    # Child spans whose root lives in another service: decided by window or budget
+    trace_ids = []
+    for index in range(4):
+        span_id = collector.start_span("consume", "queue_worker", "core", trace_id=f"t{index}", parent_span_id="remote")
+        collector.finish_span(span_id, status=SpanStatus.ERROR if index == 0 else SpanStatus.OK)
+        span_id = collector.start_span("consume", "queue_worker", "core", trace_id=f"t{index}", parent_span_id="remote")
+        collector.finish_span(span_id)
+        trace_ids.append(f"t{index}")
+
+    health = collector.get_trace_collector_health()["tail_sampling"]
+    assert health["buffered_spans"] <= 4
+    assert health["buffer_occupancy"] <= 1.0
+    assert health["decisions_on_budget"] == 2
+    assert "t0" in collector.traces  # errored trace survives an early decision
+
+    assert collector.flush_tail_buffer() == 0
+    for buffered in collector._tail_buffer.values():
+        buffered.first_seen = time.monotonic() - 10
+    assert collector.flush_tail_buffer() == 2
+    health = collector.get_trace_collector_health()["tail_sampling"]
+    assert (health["buffered_traces"], health["decisions_on_window"]) == (0, 2)
+
+    # Late span of a dropped trace follows the decision
+    span_id = collector.start_span("consume", "queue_worker", "core", trace_id="t1", parent_span_id="remote")
+    collector.finish_span(span_id, status=SpanStatus.ERROR)
+    assert "t1" not in collector.traces
+    assert collector.get_trace_collector_health()["tail_sampling"]["late_spans"] == 1
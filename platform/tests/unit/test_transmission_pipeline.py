@@ -221,3 +221,84 @@ async def test_run_b2c_reporting_job_queues_pending(monkeypatch):
 
     assert result["queued"]
     assert queued_requests
+
+
+@pytest.mark.asyncio
+async def test_prepare_invoices_bounded_concurrency_keeps_order(monkeypatch):
+    import asyncio
+
+    service = TransmissionService(message_router=DummyRouter())
+    monkeypatch.setenv("APP_TRANSMISSION_AUTO_SIGN", "false")
+    monkeypatch.setattr(
+        "app_services.transmission.transmission_service.build_firs_invoice",
+        lambda inv: dict(inv),
+    )
+    in_flight = {"now": 0, "peak": 0}
+    batches = []
+
+    async def fake_validate_batch(self, payloads, *, organization_id, invoice_numbers, max_workers):
+        batches.append((len(payloads), max_workers))
+        return [ValueError("invalid_invoice:3") if p["n"] == 3 else {"overall_status": "compliant"} for p in payloads]
+
+    async def fake_complete(self, firs_invoice, validation_report, *, organization_id, options=None):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        # Later invoices finish first to prove results keep input order
+        await asyncio.sleep(0.001 * (10 - firs_invoice["n"]))
+        in_flight["now"] -= 1
+        return {"n": firs_invoice["n"]}, {}, []
+
+    monkeypatch.setattr(TransmissionService, "_validate_invoices", fake_validate_batch)
+    monkeypatch.setattr(TransmissionService, "_complete_prepared_invoice", fake_complete)
+
+    outcomes = await service._prepare_invoices_for_submission(
+        [{"n": n} for n in range(8)],
+        organization_id="org-1",
+        options={"prepare_concurrency": 3},
+    )
+
+    # One validation call for the whole batch, workers capped by the limit
+    assert batches == [(8, min(3, os.cpu_count() or 1))]
+    assert in_flight["peak"] == 3
+    assert isinstance(outcomes[3], ValueError)
+    assert [outcome[0]["n"] for i, outcome in enumerate(outcomes) if i != 3] == [0, 1, 2, 4, 5, 6, 7]
+
+
+@pytest.mark.asyncio
+async def test_prepare_invoices_overlaps_synchronous_signing(monkeypatch):
+    import asyncio
+    import time
+
+    service = TransmissionService(message_router=DummyRouter())
+    monkeypatch.setattr(
+        "app_services.transmission.transmission_service.build_firs_invoice",
+        lambda inv: dict(inv),
+    )
+
+    async def fake_validate_batch(self, payloads, *, organization_id, invoice_numbers, max_workers):
+        return [{"overall_status": "compliant", "summary": {"total_errors": 0}} for _ in payloads]
+
+    async def fake_get_cert(self, organization_id):
+        return "cert-123"
+
+    def blocking_sign(document, certificate_id):
+        # A synchronous signer (e.g. an HSM call) that never yields to the loop
+        time.sleep(0.05)
+        return {"signature": document["invoice_number"], "certificate_id": certificate_id}
+
+    monkeypatch.setattr(TransmissionService, "_validate_invoices", fake_validate_batch)
+    monkeypatch.setattr(TransmissionService, "_get_signing_certificate_id", fake_get_cert)
+    monkeypatch.setattr(service._digital_certificate_service, "sign_invoice_document", blocking_sign)
+    monkeypatch.setenv("APP_TRANSMISSION_AUTO_SIGN", "true")
+
+    started = time.perf_counter()
+    outcomes = await service._prepare_invoices_for_submission(
+        [{"invoice_number": f"INV-{n}"} for n in range(8)],
+        organization_id="org-1",
+        concurrency=8,
+    )
+    elapsed = time.perf_counter() - started
+
+    assert [outcome[1]["signature"]["signature"] for outcome in outcomes] == [f"INV-{n}" for n in range(8)]
+    # Eight 50 ms signatures one after another would take 0.4 s
+    assert elapsed < 0.25
@@ -0,0 +1,125 @@
+import math
+import random
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from hybrid_services.analytics_aggregation.trend_analyzer import TrendAnalyzer, TrendType
+from hybrid_services.analytics_aggregation.trend_online import OnlineSeriesStats
+from hybrid_services.analytics_aggregation.unified_metrics import AggregatedMetric, AggregationMethod
+
+ORIGIN = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+def _value(hour_index: int) -> float:
+    return 100 + 0.8 * hour_index + 15 * math.sin(2 * math.pi * hour_index / 24)
+
+
+def test_sliding_window_matches_batch_fits():
+    random.seed(3)
+    series = OnlineSeriesStats(ORIGIN)
+    values = []
+    for i in range(500):
+        value = _value(i) + random.gauss(0, 2)
+        series.append(ORIGIN + timedelta(hours=i), value)
+        values.append(value)
+        series.evict_before(ORIGIN + timedelta(hours=i - 71))
+
+    window = values[-72:]
+    x_values = list(range(428, 500))
+    fit = series.linear.fit()
+    expected = stats.linregress(x_values, window)
+    assert len(series) == 72
+    assert fit.slope == pytest.approx(expected.slope, rel=1e-9)
+    assert fit.intercept == pytest.approx(expected.intercept, rel=1e-9)
+    assert fit.r_value == pytest.approx(expected.rvalue, rel=1e-9)
+    assert fit.std_err == pytest.approx(expected.stderr, rel=1e-9)
+    assert fit.p_value == pytest.approx(expected.pvalue, rel=1e-6)
+
+    for lag, corr in series.autocorrelations():
+        assert corr == pytest.approx(np.corrcoef(window[:-lag], window[lag:])[0, 1], abs=1e-9)
+    assert series.stdev() == pytest.approx(np.std(window, ddof=1), rel=1e-9)
+
+
+def test_ewma_flags_spikes_at_ingest():
+    series = OnlineSeriesStats(ORIGIN, warmup_points=10)
+    for i in range(30):
+        series.append(ORIGIN + timedelta(hours=i), 50 + (i % 3))
+    assert series.append(ORIGIN + timedelta(hours=30), 500)["z_score"] > 2.5
+    assert series.append(ORIGIN + timedelta(hours=31), 51) is None
+
+    series.evict_before(ORIGIN + timedelta(hours=31))
+    assert not series.anomalies
+
+
+class _HourlyMetrics:
+    metric_definitions = {"submissions": object()}
+
+    def __init__(self):
+        self.calls = 0
+
+    async def aggregate_metrics(self, metric_ids, time_range, aggregation_method=None, dimensions=None):
+        self.calls += 1
+        hour_index = int((time_range[0] - ORIGIN).total_seconds() // 3600)
+        return [
+            AggregatedMetric(
+                metric_id=metric_ids[0],
+                aggregated_value=_value(hour_index),
+                aggregation_method=AggregationMethod.SUM,
+                aggregation_period="hour",
+                source_count=1,
+                confidence_level=1.0,
+                timestamp=datetime.now(timezone.utc),
+                dimensions={},
+                breakdown={},
+            )
+        ]
+
+
+@pytest.mark.asyncio
+async def test_analyzer_only_fetches_new_buckets_and_refit_agrees():
+    metrics = _HourlyMetrics()
+    analyzer = TrendAnalyzer(unified_metrics=metrics, kpi_calculator=object())
+    window = timedelta(hours=48)
+    end = ORIGIN + timedelta(hours=72)
+
+    first = await analyzer.analyze_metric_trend("submissions", (end - window, end))
+    assert metrics.calls == 48
+    assert any(p.pattern_type == TrendType.LINEAR for p in first.detected_patterns)
+
+    later = end + timedelta(hours=3)
+    online = await analyzer.analyze_metric_trend("submissions", (later - window, later))
+    # Only the three newly completed buckets are aggregated
+    assert metrics.calls == 51
+    assert len(online.data_points) == 48
+    assert online.data_points[0].timestamp == ORIGIN + timedelta(hours=27)
+    assert analyzer.get_online_stats()["points_evicted"] == 3
+
+    refit = await analyzer.analyze_metric_trend("submissions", (later - window, later), refit=True)
+    online_linear = next(p for p in online.detected_patterns if p.pattern_type == TrendType.LINEAR)
+    refit_linear = next(p for p in refit.detected_patterns if p.pattern_type == TrendType.LINEAR)
+    assert online_linear.slope == pytest.approx(refit_linear.slope, rel=1e-9)
+    assert online_linear.metadata["intercept"] == pytest.approx(refit_linear.metadata["intercept"], rel=1e-9)
+    assert online.seasonality["hourly_pattern"] == pytest.approx(refit.seasonality["hourly_pattern"])
+
+    online_prediction = await analyzer.predict_metric_trend("submissions", (later - window, later), prediction_horizon=1)
+    refit_prediction = await analyzer.predict_metric_trend(
+        "submissions", (later - window, later), prediction_horizon=1, refit=True
+    )
+    assert [p["predicted_value"] for p in online_prediction.predicted_values] == pytest.approx(
+        [p["predicted_value"] for p in refit_prediction.predicted_values], rel=1e-9
+    )
+
+
+def test_scipy_is_not_imported_at_startup():
+    backend = Path(__file__).resolve().parents[2] / "backend"
+    code = (
+        "import sys; import hybrid_services.analytics_aggregation.trend_analyzer; "
+        "sys.exit('scipy' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, "-c", code], cwd=backend).returncode == 0
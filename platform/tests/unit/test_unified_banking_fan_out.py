@@ -0,0 +1,153 @@
+import asyncio
+import importlib
+import logging
+import sys
+import time
+import types
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+_OPEN_BANKING = "external_integrations.financial_systems.banking.open_banking"
+_UNIFIED = f"{_OPEN_BANKING}.providers.unified_banking"
+
+
+class _StubConnector:
+    def __init__(self, config=None):
+        self.config = config
+
+
+def _stub(monkeypatch, name, **attrs):
+    module = types.ModuleType(name)
+    module.__path__ = []
+    for key, value in attrs.items():
+        setattr(module, key, value)
+    monkeypatch.setitem(sys.modules, name, module)
+
+
+@pytest.fixture
+def aggregator_module(monkeypatch):
+    """Import the aggregator with the shared helpers and connectors it expects stubbed out."""
+    _stub(monkeypatch, "external_integrations.shared")
+    _stub(monkeypatch, "external_integrations.shared.logging", get_logger=logging.getLogger)
+    _stub(monkeypatch, "external_integrations.shared.exceptions", IntegrationError=type("IntegrationError", (Exception,), {}))
+    _stub(monkeypatch, "external_integrations.shared.config", BaseConfig=object)
+    _stub(monkeypatch, f"{_OPEN_BANKING}.base", BaseBankingConnector=_StubConnector)
+    _stub(monkeypatch, f"{_OPEN_BANKING}.providers.base", BaseBankingConnector=_StubConnector)
+    _stub(monkeypatch, f"{_OPEN_BANKING}.providers.providers")
+    _stub(monkeypatch, f"{_OPEN_BANKING}.providers.providers.mono")
+    _stub(monkeypatch, f"{_OPEN_BANKING}.providers.providers.mono.connector", MonoBankingConnector=_StubConnector)
+    _stub(monkeypatch, f"{_OPEN_BANKING}.providers.providers.stitch")
+    _stub(monkeypatch, f"{_OPEN_BANKING}.providers.providers.stitch.connector", StitchBankingConnector=_StubConnector)
+
+    yield importlib.import_module(f"{_UNIFIED}.aggregator")
+
+    for name in [name for name in sys.modules if name.startswith(_UNIFIED)]:
+        del sys.modules[name]
+
+
+class _Provider:
+    """Answers after ``latency`` seconds, or raises ``error``; records cancellation."""
+
+    def __init__(self, latency, error=None):
+        self.latency = latency
+        self.error = error
+        self.cancelled = False
+
+    async def fetch(self, account_id):
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(transactions=[account_id], query_metadata={})
+
+
+def _aggregator(module, providers, deadline=5.0):
+    models = sys.modules[f"{_UNIFIED}.models"]
+    aggregator = module.UnifiedBankingAggregator(
+        models.AggregatorConfig(default_timeout=30.0, request_deadline_seconds=deadline)
+    )
+    for provider_type, provider in providers.items():
+        aggregator.providers[provider_type] = provider
+        aggregator.provider_status[provider_type] = models.ProviderStatus.HEALTHY
+    aggregator.is_initialized = True
+
+    async def get_transactions_from_provider(provider, provider_type, account_id, **kwargs):
+        return await provider.fetch(account_id)
+
+    aggregator._get_transactions_from_provider = get_transactions_from_provider
+    return aggregator
+
+
+def _call(aggregator):
+    return aggregator._transactions_call("acct-1", datetime(2024, 5, 1), datetime(2024, 5, 31), None)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_returns_partial_results_at_the_deadline(aggregator_module):
+    Provider = aggregator_module.BankingProviderType
+    fast, slow = _Provider(0.01), _Provider(30)
+    aggregator = _aggregator(aggregator_module, {Provider.MONO: fast, Provider.STITCH: slow})
+
+    started = time.monotonic()
+    results, report = await aggregator._fan_out("get_transactions", _call(aggregator), deadline_seconds=0.2)
+
+    assert time.monotonic() - started < 1.0
+    assert list(results) == [Provider.MONO]
+    assert report.deadline_exceeded and report.partial
+    assert report.timed_out == [Provider.STITCH]
+    assert slow.cancelled
+    assert aggregator.metrics.successful_requests == 1
+    assert aggregator.metrics.failed_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_fan_out_stops_once_min_responses_answered(aggregator_module):
+    Provider = aggregator_module.BankingProviderType
+    fast, slow = _Provider(0.01), _Provider(30)
+    aggregator = _aggregator(aggregator_module, {Provider.MONO: fast, Provider.STITCH: slow})
+
+    results, report = await aggregator._fan_out("get_transactions", _call(aggregator), min_responses=1)
+
+    assert list(results) == [Provider.MONO]
+    assert report.cancelled == [Provider.STITCH]
+    assert not report.deadline_exceeded and not report.partial
+    assert slow.cancelled
+
+
+@pytest.mark.asyncio
+async def test_get_transactions_fails_over_when_selected_provider_fails(aggregator_module):
+    Provider = aggregator_module.BankingProviderType
+    broken, backup = _Provider(0.01, error=RuntimeError("bank down")), _Provider(0.02)
+    aggregator = _aggregator(aggregator_module, {Provider.MONO: broken, Provider.STITCH: backup})
+
+    async def select(account_id, preference=None):
+        return Provider.MONO, broken
+
+    aggregator._select_provider_for_transactions = select
+
+    response = await aggregator.get_transactions("acct-1", datetime(2024, 5, 1), datetime(2024, 5, 31))
+
+    assert response.transactions == ["acct-1"]
+    assert response.query_metadata["fan_out"]["failed"] == {"mono": "bank down"}
+    assert response.query_metadata["failover"]["responded"] == ["stitch"]
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_caller_cancels_provider_calls(aggregator_module):
+    Provider = aggregator_module.BankingProviderType
+    first, second = _Provider(30), _Provider(30)
+    aggregator = _aggregator(aggregator_module, {Provider.MONO: first, Provider.STITCH: second})
+
+    caller = asyncio.create_task(aggregator._fan_out("get_transactions", _call(aggregator)))
+    await asyncio.sleep(0.05)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    assert first.cancelled and second.cancelled
+    assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())